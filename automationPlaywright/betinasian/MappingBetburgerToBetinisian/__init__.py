@@ -12,6 +12,7 @@ Directory Structure:
     │   ├── soccer.py
     │   └── README.md
     ├── mapping.py        # Unified interface
+    ├── market_table.py   # Precompiled (sport, market_id) -> bet_type templates
     └── __init__.py       # This file
 
 Unified Interface Usage:
@@ -58,6 +59,14 @@ from .mapping import (
     validate_mapping,
     build_bet_type_from_spider
 )
+from .market_table import (
+    MarketTemplate,
+    MARKET_TABLE,
+    get_market_template,
+    translate_market,
+    translate_markets,
+    translate_market_spec
+)
 
 __all__ = [
     # Sport modules
@@ -77,6 +86,14 @@ __all__ = [
     'validate_mapping',
     'build_bet_type_from_spider',
 
+    # Precompiled market table
+    'MarketTemplate',
+    'MARKET_TABLE',
+    'get_market_template',
+    'translate_market',
+    'translate_markets',
+    'translate_market_spec',
+
     # Object-oriented interface
     'MarketMapper'
 ]
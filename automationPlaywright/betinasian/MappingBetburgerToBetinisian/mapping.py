@@ -394,8 +394,8 @@ def build_bet_type_from_spider(
     """
     Build BetInAsian bet_type string directly from spider market parameters
 
-    This is a convenience function that combines parse_spider_market() and
-    bet_type_builder.build() into a single call.
+    Uses the precompiled MARKET_TABLE (market_table.py): one dict lookup plus a
+    format call, same result as parse_spider_market() + bet_type_builder.build().
 
     Args:
         sport_type: Sport type ("basket", "soccer", "fb", etc.)
@@ -429,15 +429,11 @@ def build_bet_type_from_spider(
         >>> build_bet_type_from_spider("tennis", "17", -5.5)
         None
     """
-    # Step 1: Parse spider market to get mapping
-    mapping = parse_spider_market(sport_type, spider_market_id, handicap_value)
+    from .market_table import get_market_template
 
-    if not mapping:
-        return None
+    template = get_market_template(sport_type, spider_market_id)
 
-    # Step 2: Build bet_type string from mapping
-    from .bet_type_builder import build
-
-    bet_type = build(mapping, home_score, away_score)
+    if not template:
+        return None
 
-    return bet_type
+    return template.bet_type(handicap_value, home_score, away_score)
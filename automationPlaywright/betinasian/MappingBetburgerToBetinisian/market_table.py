@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+Precompiled Market Table
+
+Expands every (sport, spider_market_id) of the sport-specific mapping modules into a
+frozen MarketTemplate at import time:
+- bet_type format string (IR / simple / custom format already resolved by bet_type_builder)
+- line_id conversion (handicap * 4, sign inverted for away handicaps)
+- spider_period -> BetInAsian sport (period_mapper, including corner markets)
+
+A lookup is then one dict access plus a %-format, instead of
+parse_spider_market() -> dict copy -> bet_type_builder.build() on every GetOdd.
+
+Usage:
+    from MappingBetburgerToBetinisian import translate_market
+
+    bet_type, sport = translate_market("fb", "17", -0.5, "1st half", home_score=1, away_score=2)
+    # ("for,ir,1,2,ah,h,-2", "fb_ht")
+"""
+
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from utils.marketSpec import MarketSpec
+
+from . import basket, soccer
+from .bet_type_builder import build
+from .mapping import SPORT_MODULES
+
+
+class MarketTemplate(NamedTuple):
+    """Frozen bet_type template for one (sport, spider_market_id)"""
+    sport: str                          # canonical sport ("basket" / "soccer")
+    market_id: str
+    line_format: Optional[str]          # %-format string when handicap_value is given
+    plain_format: Optional[str]         # %-format string when handicap_value is None
+    uses_scores: bool                   # IR format: formats take (home_score, away_score[, line_id])
+    line_sign: int                      # -1 for away handicaps (line_id is the home line)
+    period_sports: Mapping[str, str]    # spider_period -> BetInAsian sport
+    default_sport: str                  # BetInAsian sport for unknown periods
+
+    def bet_type(self, handicap_value: Optional[float] = None, home_score: int = 0, away_score: int = 0) -> Optional[str]:
+        """Format bet_type (same result as build_bet_type_from_spider)"""
+        if handicap_value is not None and self.line_format is not None:
+            line_id = int(self.line_sign * float(handicap_value) * 4)
+            if self.uses_scores:
+                return self.line_format % (home_score, away_score, line_id)
+            return self.line_format % line_id
+        if self.plain_format is None:
+            return None
+        if self.uses_scores:
+            return self.plain_format % (home_score, away_score)
+        return self.plain_format
+
+    def bet_type_for_line(self, line: Optional[int], home_score: int = 0, away_score: int = 0) -> Optional[str]:
+        """Format bet_type from a fixed-point line (MarketSpec.line, handicap * 100)"""
+        if line is None or self.line_format is None:
+            return self.bet_type(None, home_score, away_score)
+        line_id = int(self.line_sign * line / 25)
+        if self.uses_scores:
+            return self.line_format % (home_score, away_score, line_id)
+        return self.line_format % line_id
+
+    def betinasian_sport(self, spider_period: Optional[str] = None) -> str:
+        """Map spider_period to BetInAsian sport (period_mapper, case-insensitive)"""
+        if spider_period:
+            return self.period_sports.get(spider_period.lower(), self.default_sport)
+        return self.default_sport
+
+
+# Placeholders substituted into mappings before bet_type_builder.build(),
+# then turned into %s (builder output always orders them home, away, line)
+_LINE_PLACEHOLDER = "\x00line\x00"
+_HOME_PLACEHOLDER = "\x00home\x00"
+_AWAY_PLACEHOLDER = "\x00away\x00"
+
+
+def _to_percent_format(template: Optional[str]) -> Optional[str]:
+    if template is None:
+        return None
+    template = template.replace("%", "%%")
+    for placeholder in (_HOME_PLACEHOLDER, _AWAY_PLACEHOLDER, _LINE_PLACEHOLDER):
+        template = template.replace(placeholder, "%s")
+    return template
+
+
+def _compile_sport(sport: str, sport_module, period_sport) -> Dict[str, MarketTemplate]:
+    """Compile all market IDs of one sport module"""
+    templates = {}
+    for market_id in sport_module.SPIDER_TO_BETINASIAN_MARKET:
+        plain_mapping = sport_module.parse_spider_market(market_id, None)
+        plain_format = build(plain_mapping, _HOME_PLACEHOLDER, _AWAY_PLACEHOLDER)
+
+        line_format = None
+        line_sign = 1
+        if sport_module.needs_line_id(market_id):
+            line_format = build(
+                dict(plain_mapping, line_id=_LINE_PLACEHOLDER),
+                _HOME_PLACEHOLDER,
+                _AWAY_PLACEHOLDER
+            )
+            # Probe the sign convention of parse_spider_market (away handicaps are inverted)
+            line_sign = 1 if sport_module.parse_spider_market(market_id, 1.0)["line_id"] > 0 else -1
+
+        uses_scores = _HOME_PLACEHOLDER in (line_format or plain_format or "")
+
+        period_sports, default_sport = period_sport(market_id)
+        templates[market_id] = MarketTemplate(
+            sport=sport,
+            market_id=market_id,
+            line_format=_to_percent_format(line_format),
+            plain_format=_to_percent_format(plain_format),
+            uses_scores=uses_scores,
+            line_sign=line_sign,
+            period_sports=period_sports,
+            default_sport=default_sport
+        )
+    return templates
+
+
+def _basket_periods(market_id: str) -> Tuple[Mapping[str, str], str]:
+    periods = {
+        period.lower(): basket.map_period_to_sport(period)
+        for period in basket.period_mapper.PERIOD_TO_SPORT
+    }
+    return MappingProxyType(periods), basket.map_period_to_sport(None)
+
+
+def _soccer_periods(market_id: str) -> Tuple[Mapping[str, str], str]:
+    periods = {
+        period.lower(): soccer.map_period_to_sport(period, market_id)
+        for period in soccer.period_mapper.PERIOD_TO_BASE_SPORT
+    }
+    return MappingProxyType(periods), soccer.map_period_to_sport(None, market_id)
+
+
+_COMPILED = {
+    basket: _compile_sport("basket", basket, _basket_periods),
+    soccer: _compile_sport("soccer", soccer, _soccer_periods)
+}
+
+# (sport alias, spider_market_id) -> MarketTemplate, for every alias in SPORT_MODULES
+MARKET_TABLE: Mapping[Tuple[str, str], MarketTemplate] = MappingProxyType({
+    (alias, market_id): template
+    for alias, sport_module in SPORT_MODULES.items()
+    for market_id, template in _COMPILED[sport_module].items()
+})
+
+
+def get_market_template(sport_type: str, spider_market_id: Any) -> Optional[MarketTemplate]:
+    """
+    Get the precompiled template of a spider market
+
+    Args:
+        sport_type: Sport type ("basket", "soccer", "fb", etc.)
+        spider_market_id: Spider market ID (str or int)
+
+    Returns:
+        MarketTemplate or None (unsupported sport / unknown market)
+    """
+    if not sport_type:
+        return None
+    key = (sport_type, str(spider_market_id))
+    template = MARKET_TABLE.get(key)
+    if template is None and not sport_type.islower():
+        template = MARKET_TABLE.get((sport_type.lower(), key[1]))
+    return template
+
+
+def translate_market(
+    sport_type: str,
+    spider_market_id: Any,
+    handicap_value: Optional[float] = None,
+    spider_period: Optional[str] = None,
+    home_score: int = 0,
+    away_score: int = 0
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Translate spider market parameters to (bet_type, BetInAsian sport)
+
+    Args:
+        sport_type: Sport type ("basket", "soccer", "fb", etc.)
+        spider_market_id: Spider market ID
+        handicap_value: Handicap value, optional
+        spider_period: Spider period ("Full Time", "1st half", ...), optional
+        home_score: Home team score for IR format (default: 0)
+        away_score: Away team score for IR format (default: 0)
+
+    Returns:
+        (bet_type, betinasian_sport); (None, None) if cannot map
+
+    Examples:
+        >>> translate_market("basket", "17", -5.5, "1st qtr")
+        ("for,ah,h,-22", "basket_q1")
+
+        >>> translate_market("fb", "51", 10.5, "Full Time", 1, 0)
+        ("for,ir,1,0,ahover,42", "fb_corn")
+    """
+    template = get_market_template(sport_type, spider_market_id)
+    if template is None:
+        return None, None
+    return (
+        template.bet_type(handicap_value, home_score, away_score),
+        template.betinasian_sport(spider_period)
+    )
+
+
+def translate_markets(items: Iterable[Dict[str, Any]]) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Bulk translate: many orders at once
+
+    Args:
+        items: [{
+            "sport_type": "fb",
+            "spider_market_id": "17",
+            "handicap_value": -0.5,         # optional
+            "spider_period": "Full Time",   # optional
+            "home_score": 0,                # optional
+            "away_score": 0                 # optional
+        }, ...]
+
+    Returns:
+        [(bet_type, betinasian_sport), ...] in the same order as items
+
+    Examples:
+        >>> translate_markets([
+        ...     {"sport_type": "basket", "spider_market_id": "1"},
+        ...     {"sport_type": "tennis", "spider_market_id": "1"}
+        ... ])
+        [("for,ml,h", "basket"), (None, None)]
+    """
+    results = []
+    for item in items:
+        template = get_market_template(item.get("sport_type"), item.get("spider_market_id"))
+        if template is None:
+            results.append((None, None))
+            continue
+        results.append((
+            template.bet_type(
+                item.get("handicap_value"),
+                item.get("home_score", 0),
+                item.get("away_score", 0)
+            ),
+            template.betinasian_sport(item.get("spider_period"))
+        ))
+    return results
+
+
+def translate_market_spec(
+    spec: MarketSpec,
+    home_score: int = 0,
+    away_score: int = 0
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Translate a parsed MarketSpec (utils.marketSpec) to (bet_type, BetInAsian sport)
+
+    Args:
+        spec: MarketSpec parsed once per dispatch message
+        home_score: Home team score for IR format (default: 0)
+        away_score: Away team score for IR format (default: 0)
+
+    Returns:
+        (bet_type, betinasian_sport); (None, None) if the market has no BetInAsian mapping
+
+    Examples:
+        >>> spec = parse_market_spec("soccer", "Total Over(10.5) - Corners", "1st half", "10.5")
+        >>> translate_market_spec(spec, 1, 0)
+        ("for,ir,1,0,ahover,42", "fb_corn_ht")
+    """
+    if spec is None or spec.market_id is None:
+        return None, None
+    template = MARKET_TABLE.get((spec.sport, spec.market_id))
+    if template is None:
+        return None, None
+    return (
+        template.bet_type_for_line(spec.line, home_score, away_score),
+        template.period_sports.get(spec.period, template.default_sport)
+    )
@@ -7,6 +7,8 @@ import logging
 from ..interface import AutomationBase
 from .operations import (
     prepare_work,
+    apply_subscription_plan,
+    get_subscription_mode,
     GetBalance,
     GetOdd,
     BettingOrder,
@@ -36,6 +38,7 @@ class BetInAsianAutomation(AutomationBase):
         self.online_platform = kwargs.get("online_platform", self.config)
 
         self.order_record: Dict[str, Dict[str, Any]] = {}
+        self.registor_replica: Any = None  # change-feed replica, enabled in prepare_work
         self._is_supplementary_order: bool = False
         self.BIA_CYCLING: bool = True
 
@@ -57,6 +60,8 @@ class BetInAsianAutomation(AutomationBase):
         # logger.info("[%s] BetInAsian automation initialized", self.handler_name)
 
     prepare_work = prepare_work
+    apply_subscription_plan = apply_subscription_plan
+    get_subscription_mode = get_subscription_mode
     GetBalance = GetBalance
     GetOdd = GetOdd
     BettingOrder = BettingOrder
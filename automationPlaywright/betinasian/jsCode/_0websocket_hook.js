@@ -4,6 +4,31 @@
     // Save original WebSocket constructor
     const OriginalWebSocket = window.WebSocket;
 
+    // ========== Debug capture (off by default) ==========
+    // Fixed-size circular buffer of raw frame strings, enabled via
+    // window.enableMessageCapture(). Production frames never touch it.
+    const capture = {
+        enabled: false,
+        size: 100,
+        sampleEvery: 1,     // keep 1 of every N frames
+        buffer: [],
+        head: 0,            // next write position
+        filled: 0,
+        seen: 0
+    };
+
+    function captureFrame(count, raw) {
+        capture.seen++;
+        if (capture.seen % capture.sampleEvery !== 0) {
+            return;
+        }
+        capture.buffer[capture.head] = { count: count, timestamp: Date.now(), raw: raw };
+        capture.head = (capture.head + 1) % capture.size;
+        if (capture.filled < capture.size) {
+            capture.filled++;
+        }
+    }
+
     // Override WebSocket constructor
     window.WebSocket = function (...args) {
         // Create original WebSocket instance
@@ -26,28 +51,26 @@
             ws.addEventListener('message', function (event) {
                 messageCount++;
 
+                if (capture.enabled) {
+                    captureFrame(messageCount, event.data);
+                }
+
+                // Worker mode: registor lives in a Web Worker, forward the raw frame untouched
+                if (window.__registorWorker) {
+                    window.__registorWorker.postMessage(event.data);
+                    return;
+                }
+
                 try {
                     const data = JSON.parse(event.data);
 
-                    // Store all messages for Python access (legacy)
-                    window.__wsMessages = window.__wsMessages || [];
-                    window.__wsMessages.push({
-                        count: messageCount,
-                        timestamp: Date.now(),
-                        data: data
-                    });
-
-                    // Keep only last 100 messages to prevent memory issues
-                    if (window.__wsMessages.length > 100) {
-                        window.__wsMessages.shift();
-                    }
-
                     // ========== 注册到数据存储器 ==========
                     if (window.registerMessage) {
                         // 处理批量消息
                         if (Array.isArray(data)) {
                             // 批量消息: [ [msg1], [msg2], [msg3], ... ]
-                            data.forEach(message => {
+                            for (let i = 0; i < data.length; i++) {
+                                const message = data[i];
                                 if (Array.isArray(message)) {
                                     // 常规消息: length >= 3 (例如 ["event", [sport, key], data])
                                     // API 消息: length = 2 (例如 ["api", {ts, data: [...]}])
@@ -58,7 +81,7 @@
                                         window.registerMessage(message);
                                     }
                                 }
-                            });
+                            }
                         }
                     }
 
@@ -118,17 +141,75 @@
         };
     };
 
-    // Helper function: Get recent messages
+    // Helper function: Enable debug capture
+    // options: {size: buffer length (default 100), sampleEvery: keep 1 of every N frames (default 1)}
+    window.enableMessageCapture = function (options = {}) {
+        const size = Math.max(1, options.size || 100);
+        const sampleEvery = Math.max(1, options.sampleEvery || 1);
+
+        capture.size = size;
+        capture.sampleEvery = sampleEvery;
+        capture.buffer = new Array(size);
+        capture.head = 0;
+        capture.filled = 0;
+        capture.seen = 0;
+        capture.enabled = true;
+        return true;
+    };
+
+    // Helper function: Disable debug capture and release the buffer
+    window.disableMessageCapture = function () {
+        capture.enabled = false;
+        capture.buffer = [];
+        capture.head = 0;
+        capture.filled = 0;
+        return true;
+    };
+
+    // Helper function: Get capture status
+    window.getMessageCaptureStatus = function () {
+        return {
+            enabled: capture.enabled,
+            size: capture.size,
+            sampleEvery: capture.sampleEvery,
+            captured: capture.filled,
+            seen: capture.seen
+        };
+    };
+
+    // Helper function: Get recent messages (only available while capture is enabled)
+    // Frames are stored raw and parsed here, oldest first
     window.getRecentMessages = function (count = 10) {
-        if (!window.__wsMessages || window.__wsMessages.length === 0) {
-            return [];
+        const n = Math.min(count, capture.filled);
+        const messages = [];
+
+        for (let i = n; i > 0; i--) {
+            const index = (capture.head - i + capture.size) % capture.size;
+            const entry = capture.buffer[index];
+            if (!entry) continue;
+
+            let data;
+            try {
+                data = JSON.parse(entry.raw);
+            } catch (e) {
+                data = entry.raw;
+            }
+            messages.push({ count: entry.count, timestamp: entry.timestamp, data: data });
         }
-        return window.__wsMessages.slice(-count);
+
+        return messages;
     };
 
     // Helper function: Clear message history
     window.clearMessageHistory = function () {
-        window.__wsMessages = [];
+        capture.buffer = capture.enabled ? new Array(capture.size) : [];
+        capture.head = 0;
+        capture.filled = 0;
     };
 
+    // Allow enabling capture before the hook runs (e.g. from another init script)
+    if (window.__WS_DEBUG_CAPTURE) {
+        window.enableMessageCapture(window.__WS_DEBUG_CAPTURE === true ? {} : window.__WS_DEBUG_CAPTURE);
+    }
+
 })();
@@ -0,0 +1,136 @@
+// 紧凑传输编码 (Compact Codec)
+// 职责: 批量查询结果跨 CDP 传输前编码为紧凑 JSON 字符串,Python 侧用 compact_codec.py 解码
+//
+// 普通 page.evaluate 返回深层对象时,Playwright 逐个值序列化,Python 再逐个重建 dict;
+// 编码后只传一个字符串,且:
+// - 元素全为普通对象的数组 → 列式表 {"$t": 列名, "$n": 行数, "$c": [列数组...]}
+// - 指定字段 (sport / bookie / competition_name ...) 的字符串值 → 字符串表下标,
+//   这些字段的其它非空值包装为 {"$r": 值}
+//
+// 输出: JSON.stringify({"$s": 字符串表, "$i": 驻留字段名, "$v": 编码后的值})
+// 说明: 列式表中缺失的字段编码为 null,解码后为 None (原 dict 中不存在该 key)
+
+const DEFAULT_INTERN_FIELDS = ['sport', 'period', 'scope', 'bookie', 'competition_name', 'currency', 'state', 'code'];
+
+class CompactCodec {
+    constructor() {
+        this.stats = {
+            encoded: 0,
+            last_rows: 0,
+            last_chars: 0
+        };
+    }
+
+    /**
+     * 编码任意查询结果
+     * @param {*} value - 查询结果
+     * @param {Array<string>} internFields - 需要字符串驻留的字段名
+     * @returns {string} 紧凑 JSON 字符串
+     */
+    encode(value, internFields = DEFAULT_INTERN_FIELDS) {
+        const ctx = {
+            intern: new Set(internFields),
+            strings: [],
+            stringIndex: new Map(),
+            rows: 0
+        };
+
+        const encoded = this.encodeValue(value, ctx);
+        const text = JSON.stringify({
+            $s: ctx.strings,
+            $i: Array.from(ctx.intern),
+            $v: encoded
+        });
+
+        this.stats.encoded++;
+        this.stats.last_rows = ctx.rows;
+        this.stats.last_chars = text.length;
+        return text;
+    }
+
+    encodeValue(value, ctx) {
+        if (value === null || value === undefined || typeof value !== 'object') {
+            return value === undefined ? null : value;
+        }
+
+        if (Array.isArray(value)) {
+            if (value.length > 0 && value.every(item => this.isPlainObject(item))) {
+                return this.encodeTable(value, ctx);
+            }
+            return value.map(item => this.encodeValue(item, ctx));
+        }
+
+        if (value instanceof Map) {
+            return this.encodeValue(Object.fromEntries(value), ctx);
+        }
+
+        const result = {};
+        for (const key of Object.keys(value)) {
+            result[key] = this.encodeField(key, value[key], ctx);
+        }
+        return result;
+    }
+
+    /**
+     * 对象数组 → 列式表
+     */
+    encodeTable(rows, ctx) {
+        const columns = [];
+        const columnIndex = new Map();
+
+        for (const row of rows) {
+            for (const key of Object.keys(row)) {
+                if (!columnIndex.has(key)) {
+                    columnIndex.set(key, columns.length);
+                    columns.push(key);
+                }
+            }
+        }
+
+        const data = columns.map(() => new Array(rows.length));
+        for (let r = 0; r < rows.length; r++) {
+            const row = rows[r];
+            for (let c = 0; c < columns.length; c++) {
+                data[c][r] = this.encodeField(columns[c], row[columns[c]], ctx);
+            }
+        }
+
+        ctx.rows += rows.length;
+        return { $t: columns, $n: rows.length, $c: data };
+    }
+
+    encodeField(key, value, ctx) {
+        if (!ctx.intern.has(key)) {
+            return this.encodeValue(value, ctx);
+        }
+
+        if (typeof value === 'string') {
+            let index = ctx.stringIndex.get(value);
+            if (index === undefined) {
+                index = ctx.strings.length;
+                ctx.strings.push(value);
+                ctx.stringIndex.set(value, index);
+            }
+            return index;
+        }
+
+        // 驻留字段的非字符串值原样包装,避免与字符串下标混淆
+        if (value === null || value === undefined) {
+            return null;
+        }
+        return { $r: this.encodeValue(value, ctx) };
+    }
+
+    isPlainObject(value) {
+        return value !== null && typeof value === 'object' && !Array.isArray(value) && !(value instanceof Map);
+    }
+
+    getStats() {
+        return { ...this.stats };
+    }
+}
+
+// 全局单例
+if (typeof window !== 'undefined') {
+    window.__compactCodec = new CompactCodec();
+}
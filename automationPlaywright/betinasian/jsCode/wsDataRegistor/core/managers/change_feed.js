@@ -0,0 +1,331 @@
+// 变更流 (Change Feed)
+// 职责: 把 registor 的增量变更按批次推送给 Python 副本,Python 侧读取变为本地查找
+//
+// 记录的变更 (同一批次内按 key 合并,只保留最后状态):
+// - event upsert / remove
+// - betslip 价格变化 (pmm_store 重算后)
+// - order 变化 (状态迁移 / bet_bar 变化)
+//
+// 批次格式:
+// {
+//   seq, ts, snapshot,            // snapshot=true 时 Python 侧先清空副本
+//   events: [event], removed_events: [event_key],
+//   betslips: [betslip], removed_betslips: [betslip_id],
+//   orders: [order], removed_orders: [order_id]
+// }
+//
+// 推送通道: window.__registorDeltaSink (worker 模式) 或 window.__registorOnDeltas (Playwright binding)
+// 未启用时所有记录方法直接返回,不产生任何开销
+
+class ChangeFeed {
+    constructor() {
+        this.enabled = false;
+
+        // 配置项
+        this.config = {
+            intervalMs: 100,     // 每 100ms 推送一次
+            heartbeatMs: 1000    // 无变更时每 1 秒推送一次空批次,Python 侧据此判断副本是否新鲜
+        };
+
+        // 待推送的变更 (key → 最新对象 / 删除标记)
+        this.pendingEvents = new Map();      // event_key → event
+        this.removedEvents = new Set();
+        this.pendingBetslips = new Set();    // betslip_id (推送时读取最新状态)
+        this.removedBetslips = new Set();
+        this.pendingOrders = new Set();      // order_id (推送时通过 queryOrderById 生成)
+        this.removedOrders = new Set();
+        this.snapshotRequested = false;
+
+        // 统计信息
+        this.stats = {
+            seq: 0,
+            batches_sent: 0,
+            snapshots_sent: 0,
+            batches_dropped: 0,
+            last_flush: null,
+            last_batch_size: 0
+        };
+
+        this.flushTimer = null;
+    }
+
+    // ==================== 记录变更 ====================
+
+    eventUpserted(event) {
+        if (!this.enabled) return;
+        this.removedEvents.delete(event.event_key);
+        this.pendingEvents.set(event.event_key, event);
+    }
+
+    eventRemoved(eventKey) {
+        if (!this.enabled) return;
+        this.pendingEvents.delete(eventKey);
+        this.removedEvents.add(eventKey);
+    }
+
+    betslipChanged(betslipId) {
+        if (!this.enabled) return;
+        this.removedBetslips.delete(betslipId);
+        this.pendingBetslips.add(betslipId);
+    }
+
+    betslipRemoved(betslipId) {
+        if (!this.enabled) return;
+        this.pendingBetslips.delete(betslipId);
+        this.removedBetslips.add(betslipId);
+    }
+
+    orderChanged(orderId) {
+        if (!this.enabled) return;
+        this.removedOrders.delete(orderId);
+        this.pendingOrders.add(orderId);
+    }
+
+    orderRemoved(orderId) {
+        if (!this.enabled) return;
+        this.pendingOrders.delete(orderId);
+        this.removedOrders.add(orderId);
+    }
+
+    /**
+     * 下一批次推送完整快照 (clearAllData 之后调用)
+     */
+    requestSnapshot() {
+        if (!this.enabled) return;
+        this.snapshotRequested = true;
+    }
+
+    // ==================== 序列化 ====================
+
+    /**
+     * betslip 转为可传输对象 (bookies Map → 普通对象)
+     */
+    serializeBetslip(betslip) {
+        const bookies = {};
+        for (const [bookie, data] of betslip.bookies) {
+            bookies[bookie] = data;
+        }
+
+        return {
+            betslip_id: betslip.betslip_id,
+            sport: betslip.sport,
+            event_id: betslip.event_id,
+            bet_type: betslip.bet_type,
+            bookies: bookies,
+            best_odds: betslip.best_odds,
+            best_executable: betslip.best_executable,
+            best_executable_reason: betslip.best_executable_reason,
+            updated_at: betslip.updated_at
+        };
+    }
+
+    serializeOrder(orderId) {
+        if (!window.queryData || !window.queryData.queryOrderById) {
+            return null;
+        }
+        return window.queryData.queryOrderById(orderId);
+    }
+
+    // ==================== 推送 ====================
+
+    getSink() {
+        if (typeof window.__registorDeltaSink === 'function') {
+            return window.__registorDeltaSink;
+        }
+        if (typeof window.__registorOnDeltas === 'function') {
+            return window.__registorOnDeltas;
+        }
+        return null;
+    }
+
+    hasPending() {
+        return this.pendingEvents.size > 0 || this.removedEvents.size > 0 ||
+            this.pendingBetslips.size > 0 || this.removedBetslips.size > 0 ||
+            this.pendingOrders.size > 0 || this.removedOrders.size > 0;
+    }
+
+    /**
+     * 生成完整快照批次
+     */
+    buildSnapshot() {
+        const batch = this.newBatch(true);
+
+        for (const event of window.__eventsStore.getAll()) {
+            batch.events.push(event);
+        }
+        if (window.pmmStore) {
+            for (const betslip of window.pmmStore.store.values()) {
+                batch.betslips.push(this.serializeBetslip(betslip));
+            }
+        }
+        if (window.orderStore) {
+            for (const orderId of window.orderStore.store.keys()) {
+                const order = this.serializeOrder(orderId);
+                if (order) batch.orders.push(order);
+            }
+        }
+
+        return batch;
+    }
+
+    /**
+     * 生成增量批次 (推送成功后由 flush 清空待推送集合)
+     */
+    buildDelta() {
+        const batch = this.newBatch(false);
+
+        for (const event of this.pendingEvents.values()) {
+            batch.events.push(event);
+        }
+        batch.removed_events = Array.from(this.removedEvents);
+
+        for (const betslipId of this.pendingBetslips) {
+            const betslip = window.pmmStore ? window.pmmStore.store.get(betslipId) : null;
+            if (betslip) {
+                batch.betslips.push(this.serializeBetslip(betslip));
+            } else {
+                batch.removed_betslips.push(betslipId);
+            }
+        }
+        for (const betslipId of this.removedBetslips) {
+            batch.removed_betslips.push(betslipId);
+        }
+
+        for (const orderId of this.pendingOrders) {
+            const order = this.serializeOrder(orderId);
+            if (order) {
+                batch.orders.push(order);
+            } else {
+                batch.removed_orders.push(orderId);
+            }
+        }
+        for (const orderId of this.removedOrders) {
+            batch.removed_orders.push(orderId);
+        }
+
+        return batch;
+    }
+
+    newBatch(snapshot) {
+        return {
+            seq: 0,
+            ts: Date.now(),
+            snapshot: snapshot,
+            events: [],
+            removed_events: [],
+            betslips: [],
+            removed_betslips: [],
+            orders: [],
+            removed_orders: []
+        };
+    }
+
+    resetPending() {
+        this.pendingEvents.clear();
+        this.removedEvents.clear();
+        this.pendingBetslips.clear();
+        this.removedBetslips.clear();
+        this.pendingOrders.clear();
+        this.removedOrders.clear();
+        this.snapshotRequested = false;
+    }
+
+    /**
+     * 推送一个批次 (定时调用)
+     * @param {boolean} force - 无变更时也推送 (心跳)
+     * @returns {boolean} 是否推送
+     */
+    flush(force = false) {
+        const now = Date.now();
+        const heartbeatDue = this.stats.last_flush === null ||
+            now - this.stats.last_flush >= this.config.heartbeatMs;
+
+        if (!force && !this.snapshotRequested && !this.hasPending() && !heartbeatDue) {
+            return false;
+        }
+
+        // 没有推送通道或推送失败时保留待推送的变更 (包括快照请求),下次重试
+        const sink = this.getSink();
+        if (!sink) {
+            this.stats.batches_dropped++;
+            return false;
+        }
+
+        const batch = this.snapshotRequested ? this.buildSnapshot() : this.buildDelta();
+        batch.seq = this.stats.seq + 1;
+        try {
+            sink(batch);
+        } catch (e) {
+            console.error('[ChangeFeed] Sink error:', e);
+            this.stats.batches_dropped++;
+            return false;
+        }
+
+        // 序号只在推送成功后递增,Python 侧不会因失败的批次看到缺口
+        this.stats.seq = batch.seq;
+        this.resetPending();
+        this.stats.batches_sent++;
+        if (batch.snapshot) {
+            this.stats.snapshots_sent++;
+        }
+        this.stats.last_flush = now;
+        this.stats.last_batch_size = batch.events.length + batch.betslips.length + batch.orders.length +
+            batch.removed_events.length + batch.removed_betslips.length + batch.removed_orders.length;
+        return true;
+    }
+
+    // ==================== 启停 ====================
+
+    /**
+     * 启用变更流: 先推送完整快照,之后每 intervalMs 推送增量
+     * @param {Object} options - {intervalMs, heartbeatMs}
+     * @returns {Object} 统计信息
+     */
+    enable(options = {}) {
+        Object.assign(this.config, options);
+
+        this.enabled = true;
+        this.resetPending();
+        this.snapshotRequested = true;
+        this.flush(true);
+
+        if (this.flushTimer) {
+            clearInterval(this.flushTimer);
+        }
+        this.flushTimer = setInterval(() => {
+            this.flush();
+        }, this.config.intervalMs);
+
+        return this.getStats();
+    }
+
+    disable() {
+        this.enabled = false;
+        this.resetPending();
+        if (this.flushTimer) {
+            clearInterval(this.flushTimer);
+            this.flushTimer = null;
+        }
+    }
+
+    /**
+     * 获取统计信息
+     * @returns {Object}
+     */
+    getStats() {
+        return {
+            enabled: this.enabled,
+            ...this.stats,
+            pending_events: this.pendingEvents.size + this.removedEvents.size,
+            pending_betslips: this.pendingBetslips.size + this.removedBetslips.size,
+            pending_orders: this.pendingOrders.size + this.removedOrders.size,
+            has_sink: this.getSink() !== null,
+            config: { ...this.config }
+        };
+    }
+}
+
+// 全局单例
+if (typeof window !== 'undefined') {
+    window.__changeFeed = new ChangeFeed();
+}
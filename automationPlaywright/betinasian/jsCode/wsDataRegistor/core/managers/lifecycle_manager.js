@@ -0,0 +1,351 @@
+// 生命周期管理器
+// 职责: 按时间/生命周期淘汰数据,避免全天运行后 events / offers / bets 无限增长
+//
+// 淘汰规则:
+// - event: 离开 in-running 超过 eventEvictMs,或 in-running 期间超过 eventStaleMs 没有更新
+// - offers: 随所属 event 一起淘汰 (offers_hcap + offers_event,连同索引)
+// - bet: 所属订单进入 FINISHED 后超过 betRetentionMs
+//
+// 与 pmm_store / order_store 一样使用带版本号的最小堆,过期检查只看堆顶
+
+// ==================== Expiry Heap (Min-Heap) ====================
+class LifecycleHeap {
+    constructor() {
+        this.heap = [];               // {expires_at, key, version}
+        this.versionMap = new Map();  // key → version (只保留仍在计划中的 key)
+        this.seq = 0;                 // 全局递增版本号,删除 key 后重新调度也不会与旧条目撞号
+    }
+
+    get size() {
+        return this.heap.length;
+    }
+
+    push(key, expires_at) {
+        // 新版本覆盖旧版本,旧条目在弹出时被识别并跳过
+        const version = ++this.seq;
+        this.versionMap.set(key, version);
+
+        this.heap.push({ expires_at, key, version });
+        this._bubbleUp(this.heap.length - 1);
+    }
+
+    remove(key) {
+        this.versionMap.delete(key);
+    }
+
+    popExpired(now) {
+        const expired = [];
+
+        while (this.heap.length > 0 && this.heap[0].expires_at < now) {
+            const entry = this._extractMin();
+
+            // 版本不一致说明期间被重新调度或取消
+            if (this.versionMap.get(entry.key) !== entry.version) {
+                continue;
+            }
+
+            this.versionMap.delete(entry.key);
+            expired.push(entry.key);
+        }
+
+        return expired;
+    }
+
+    clear() {
+        this.heap = [];
+        this.versionMap.clear();
+    }
+
+    _bubbleUp(index) {
+        while (index > 0) {
+            const parent = Math.floor((index - 1) / 2);
+            if (this.heap[parent].expires_at <= this.heap[index].expires_at) break;
+            [this.heap[parent], this.heap[index]] = [this.heap[index], this.heap[parent]];
+            index = parent;
+        }
+    }
+
+    _extractMin() {
+        const min = this.heap[0];
+        const last = this.heap.pop();
+        if (this.heap.length > 0) {
+            this.heap[0] = last;
+            this._sinkDown(0);
+        }
+        return min;
+    }
+
+    _sinkDown(index) {
+        while (true) {
+            const left = 2 * index + 1;
+            const right = 2 * index + 2;
+            let smallest = index;
+
+            if (left < this.heap.length && this.heap[left].expires_at < this.heap[smallest].expires_at) {
+                smallest = left;
+            }
+            if (right < this.heap.length && this.heap[right].expires_at < this.heap[smallest].expires_at) {
+                smallest = right;
+            }
+            if (smallest === index) break;
+
+            [this.heap[index], this.heap[smallest]] = [this.heap[smallest], this.heap[index]];
+            index = smallest;
+        }
+    }
+}
+
+class LifecycleManager {
+    constructor(config = {}) {
+        // 配置项
+        this.config = {
+            eventEvictMs: config.eventEvictMs || 10 * 60 * 1000,      // 离开 in-running 后保留 10 分钟
+            eventStaleMs: config.eventStaleMs || 30 * 60 * 1000,      // in-running 但 30 分钟无更新视为已消失
+            betRetentionMs: config.betRetentionMs || 30 * 60 * 1000,  // FINISHED 订单的 bets 保留 30 分钟
+            sweepInterval: config.sweepInterval || 30000              // 每 30 秒检查一次堆顶
+        };
+
+        // 过期队列
+        this.eventQueue = new LifecycleHeap();  // event_key → 淘汰时间
+        this.betQueue = new LifecycleHeap();    // order_id → bets 淘汰时间
+
+        // 统计信息
+        this.stats = {
+            evicted_events: 0,
+            evicted_offers: 0,
+            evicted_bets: 0,
+            last_sweep: null
+        };
+
+        this.sweepTimer = null;
+        this.startSweep();
+    }
+
+    // ==================== Events ====================
+
+    /**
+     * event 更新后调用 (由 EventHandler 触发)
+     * @param {Object} event - 合并后的事件对象
+     * @param {boolean} wasInRunning - 本次更新前是否处于 in-running
+     */
+    onEventUpdated(event, wasInRunning) {
+        const eventKey = event.event_key;
+
+        if (event.isInRunning) {
+            // 进入 (或回到) in-running 时调度一次;
+            // 之后的频繁更新不再入堆,到期时按 lastUpdate 重新判断 (见 getEventDeadline)
+            event.leftInRunningAt = null;
+            if (!wasInRunning || !this.eventQueue.versionMap.has(eventKey)) {
+                this.eventQueue.push(eventKey, event.lastUpdate + this.config.eventStaleMs);
+            }
+            return;
+        }
+
+        if (wasInRunning) {
+            // 刚离开 in-running: 从离开时刻开始计时
+            event.leftInRunningAt = Date.now();
+            this.eventQueue.push(eventKey, event.leftInRunningAt + this.config.eventEvictMs);
+        }
+
+        // 从未进入 in-running 的赛前比赛不淘汰
+    }
+
+    /**
+     * 计算 event 的实际淘汰时间
+     * @param {Object} event
+     * @returns {number|null} 淘汰时间戳,null 表示不需要淘汰
+     */
+    getEventDeadline(event) {
+        if (event.isInRunning) {
+            return event.lastUpdate + this.config.eventStaleMs;
+        }
+        if (event.leftInRunningAt) {
+            return event.leftInRunningAt + this.config.eventEvictMs;
+        }
+        return null;
+    }
+
+    /**
+     * 淘汰单个 event 及其 offers (同时清理所有索引)
+     * @param {string} eventKey
+     * @returns {Object} {eventDeleted, offersHcapDeleted, offersEventDeleted}
+     */
+    evictEvent(eventKey) {
+        const result = {
+            eventDeleted: false,
+            offersHcapDeleted: false,
+            offersEventDeleted: false
+        };
+
+        // 1. event + 索引
+        const event = window.__eventsStore.get(eventKey);
+        if (event) {
+            const sportPeriod = `${event.sport}${event.period ? '_' + event.period.toLowerCase() : ''}`;
+            window.__eventsManager.removeEventIndexes(event, sportPeriod);
+            result.eventDeleted = window.__eventsStore.delete(eventKey);
+        }
+
+        // 2. offers_hcap + 索引
+        const hcap = window.__offersHcapStore.get(eventKey);
+        if (hcap) {
+            window.__offersHcapManager.removeIndexes(eventKey, hcap.raw_data);
+            result.offersHcapDeleted = window.__offersHcapStore.delete(eventKey);
+        }
+
+        // 3. offers_event + 索引
+        const offersEvent = window.__offersEventStore.get(eventKey);
+        if (offersEvent) {
+            window.__offersEventManager.removeIndexes(eventKey, offersEvent.raw_data);
+            result.offersEventDeleted = window.__offersEventStore.delete(eventKey);
+        }
+
+        // 4. 本地订阅状态 (比赛已结束,不再发送 unwatch)
+        if (window.__watchManager) {
+            window.__watchManager.watchedEvents.delete(eventKey);
+        }
+        if (window.__subscriptionManager) {
+            window.__subscriptionManager.watchedHcaps.delete(eventKey);
+        }
+
+        this.eventQueue.remove(eventKey);
+
+        if (result.eventDeleted && window.__changeFeed) {
+            window.__changeFeed.eventRemoved(eventKey);
+        }
+
+        return result;
+    }
+
+    // ==================== Bets ====================
+
+    /**
+     * 订单进入 FINISHED 时调用 (由 order_store 触发)
+     * @param {string} orderId
+     */
+    onOrderFinished(orderId) {
+        this.betQueue.push(orderId, Date.now() + this.config.betRetentionMs);
+    }
+
+    /**
+     * 删除某个订单的所有 bets
+     * @param {string} orderId
+     * @returns {number} 删除数量
+     */
+    evictBetsOfOrder(orderId) {
+        if (!window.betStore) {
+            return 0;
+        }
+
+        const bets = window.betStore.getBetsByOrder(orderId);
+        for (const bet of bets) {
+            window.betStore.deleteBet(bet.bet_id);
+        }
+        return bets.length;
+    }
+
+    // ==================== Sweep ====================
+
+    /**
+     * 启动周期性淘汰
+     */
+    startSweep() {
+        if (this.sweepTimer) {
+            return;
+        }
+
+        this.sweepTimer = setInterval(() => {
+            this.sweep();
+        }, this.config.sweepInterval);
+    }
+
+    /**
+     * 执行一次淘汰 (只弹出已到期的堆顶条目)
+     * @returns {Object} {events, bets}
+     */
+    sweep() {
+        const now = Date.now();
+        let events = 0;
+        let bets = 0;
+
+        for (const eventKey of this.eventQueue.popExpired(now)) {
+            // 堆里的时间只是下界: 期间有更新则按实际淘汰时间重新入堆
+            const event = window.__eventsStore.get(eventKey);
+            const deadline = event ? this.getEventDeadline(event) : now;
+            if (deadline === null) {
+                continue;
+            }
+            if (deadline > now) {
+                this.eventQueue.push(eventKey, deadline);
+                continue;
+            }
+
+            const result = this.evictEvent(eventKey);
+            if (result.eventDeleted) {
+                events++;
+            }
+            this.stats.evicted_offers += (result.offersHcapDeleted ? 1 : 0) + (result.offersEventDeleted ? 1 : 0);
+        }
+
+        for (const orderId of this.betQueue.popExpired(now)) {
+            // 订单被重新打开 (理论上不会) 则保留
+            const order = window.orderStore ? window.orderStore.store.get(orderId) : null;
+            if (order && order.state !== 'FINISHED') {
+                continue;
+            }
+            bets += this.evictBetsOfOrder(orderId);
+        }
+
+        this.stats.evicted_events += events;
+        this.stats.evicted_bets += bets;
+        this.stats.last_sweep = now;
+
+        if (events > 0 || bets > 0) {
+            console.log(`[LifecycleManager] Evicted ${events} events, ${bets} bets`);
+        }
+
+        return { events, bets };
+    }
+
+    /**
+     * 更新配置 (供 Python 调用)
+     * @param {Object} newConfig
+     */
+    updateConfig(newConfig) {
+        const oldInterval = this.config.sweepInterval;
+        Object.assign(this.config, newConfig);
+
+        if (this.config.sweepInterval !== oldInterval && this.sweepTimer) {
+            clearInterval(this.sweepTimer);
+            this.sweepTimer = null;
+            this.startSweep();
+        }
+    }
+
+    /**
+     * 获取统计信息
+     * @returns {Object}
+     */
+    getStats() {
+        return {
+            ...this.stats,
+            event_heap_size: this.eventQueue.size,
+            bet_heap_size: this.betQueue.size,
+            scheduled_events: this.eventQueue.versionMap.size,
+            scheduled_orders: this.betQueue.versionMap.size,
+            config: { ...this.config }
+        };
+    }
+
+    /**
+     * 清空所有淘汰计划
+     */
+    clear() {
+        this.eventQueue.clear();
+        this.betQueue.clear();
+    }
+}
+
+// 全局单例
+if (typeof window !== 'undefined') {
+    window.__lifecycleManager = new LifecycleManager();
+}
@@ -1,5 +1,9 @@
 // 订阅管理器
 // 职责: 管理 WebSocket 订阅请求,自动订阅符合条件的事件
+//
+// 订阅模式 (由 Python 侧 OnlinePlatform 的订阅规划统一指定):
+// - discovery: 自动订阅所有符合条件的 in-running 比赛 (赔率源 feed 页面)
+// - targeted:  只订阅本页面有 betslip 或未完成订单的比赛 (其余账号)
 
 class SubscriptionManager {
     constructor(config = {}) {
@@ -7,7 +11,9 @@ class SubscriptionManager {
         this.config = {
             sports: config.sports || ['basket'],           // 要订阅的运动列表
             autoSubscribeDelay: config.autoSubscribeDelay || 10000,  // 延迟订阅时间(毫秒)
-            onlyNormalEvents: true                         // 只处理 event_type === 'normal'
+            onlyNormalEvents: true,                        // 只处理 event_type === 'normal'
+            mode: config.mode || 'discovery',              // 订阅模式: discovery / targeted
+            targetSyncDelay: 500                           // targeted 模式下目标变化后延迟同步时间(毫秒)
         };
 
         // 订阅状态表
@@ -21,13 +27,16 @@ class SubscriptionManager {
         this.firstEventTime = null;        // 第一个符合条件的event时间
         this.subscribeTimer = null;        // 订阅定时器
         this.periodicTimer = null;         // 周期性检查定时器
+        this.targetSyncTimer = null;       // targeted 模式同步定时器
 
         // 统计信息
         this.stats = {
             totalReceived: 0,              // 收到的event总数
             filteredOut: 0,                // 被过滤掉的数量
             addedToCandidates: 0,          // 添加到候选列表的数量
-            subscribed: 0                  // 已订阅数量
+            subscribed: 0,                 // 已订阅数量
+            targetSyncs: 0,                // targeted 模式同步次数
+            unsubscribed: 0                // targeted 模式退订数量
         };
     }
 
@@ -39,6 +48,11 @@ class SubscriptionManager {
     onEventReceived(event, sportPeriod) {
         this.stats.totalReceived++;
 
+        // targeted 模式不做自动发现,订阅由 syncTargets() 决定
+        if (this.config.mode === 'targeted') {
+            return;
+        }
+
         // 过滤1: 只处理 normal 事件
         if (event.event_type !== 'normal') {
             this.stats.filteredOut++;
@@ -219,6 +233,11 @@ class SubscriptionManager {
      * 检查并更新订阅 (只检测新加入的正在进行的比赛)
      */
     checkAndUpdateSubscriptions() {
+        if (this.config.mode === 'targeted') {
+            this.syncTargets();
+            return;
+        }
+
         // 从 eventsStore 中重新查询正在进行的篮球比赛
         const inRunningEvents = window.queryData.inRunningSport('basket');
 
@@ -242,6 +261,144 @@ class SubscriptionManager {
         }
     }
 
+    // ==================== targeted 模式 ====================
+
+    /**
+     * 切换订阅模式 (供 Python 调用)
+     * - targeted: 立即退订目标以外的比赛,只保留有 betslip / 未完成订单的比赛
+     * - discovery: 恢复自动订阅,立即补订正在进行的比赛
+     * @param {string} mode - 'discovery' | 'targeted'
+     * @returns {Object} {mode, watched, unwatched, total}
+     */
+    setMode(mode) {
+        if (mode !== 'discovery' && mode !== 'targeted') {
+            throw new Error(`Unknown subscription mode: ${mode}`);
+        }
+
+        this.config.mode = mode;
+        this.candidates = [];
+
+        let result;
+        if (mode === 'targeted') {
+            result = this.syncTargets();
+        } else {
+            const subscribedBefore = this.stats.subscribed;
+            this.checkAndUpdateSubscriptions();
+            const watched = this.stats.subscribed - subscribedBefore;
+            result = { watched: watched, unwatched: 0, total: watched };
+        }
+
+        this.startPeriodicCheck();
+        return { mode, ...result };
+    }
+
+    /**
+     * 收集本页面需要订阅的比赛: pmmStore 中的 betslip + 未完成的订单
+     * @returns {Set<string>} event_key 集合
+     */
+    collectTargets() {
+        const targets = new Set();
+
+        if (window.pmmStore) {
+            for (const betslip of window.pmmStore.store.values()) {
+                targets.add(betslip.event_id);
+            }
+        }
+
+        if (window.orderStore) {
+            for (const order of window.orderStore.store.values()) {
+                if (order.state !== 'FINISHED' && order.state !== 'EXPIRED_LOCAL') {
+                    targets.add(order.event_id);
+                }
+            }
+        }
+
+        return targets;
+    }
+
+    /**
+     * 目标可能变化时调用 (新 betslip / 新订单),合并短时间内的多次变化
+     */
+    requestTargetSync() {
+        if (this.config.mode !== 'targeted' || this.targetSyncTimer) {
+            return;
+        }
+
+        this.targetSyncTimer = setTimeout(() => {
+            this.targetSyncTimer = null;
+            this.syncTargets();
+        }, this.config.targetSyncDelay);
+    }
+
+    /**
+     * 按目标集合增量订阅 / 退订 (targeted 模式)
+     * @returns {Object} {watched, unwatched, total}
+     */
+    syncTargets() {
+        const targets = this.collectTargets();
+        this.stats.targetSyncs++;
+
+        // 退订目标以外的比赛
+        const toUnwatch = Array.from(this.watchedHcaps.values()).filter(event =>
+            !targets.has(event.event_key)
+        );
+
+        // 订阅尚未订阅的目标 (只订阅 eventsStore 中存在的比赛,需要 competition_id / sport)
+        const toWatch = [];
+        for (const eventKey of targets) {
+            if (this.watchedHcaps.has(eventKey)) continue;
+            const event = window.__eventsStore.get(eventKey);
+            if (event) {
+                toWatch.push(event);
+            }
+        }
+
+        let unwatchedCount = 0;
+        let watchedCount = 0;
+
+        if (toUnwatch.length > 0) {
+            const unwatchList = toUnwatch.map(event => [
+                event.competition_id,
+                event.sport,
+                event.event_key
+            ]);
+
+            const unwatchSent = window.sendWebSocketData(JSON.stringify(["unwatch_hcaps", unwatchList]));
+            if (unwatchSent) {
+                unwatchedCount = toUnwatch.length;
+                toUnwatch.forEach(event => {
+                    this.watchedHcaps.delete(event.event_key);
+                    this.lastSubscribed.delete(event.event_key);
+                    this.stats.unsubscribed++;
+                });
+            }
+        }
+
+        if (toWatch.length > 0) {
+            const watchList = toWatch.map(event => [
+                event.competition_id,
+                event.sport,
+                event.event_key
+            ]);
+
+            const watchSent = window.sendWebSocketData(JSON.stringify(["watch_hcaps", watchList]));
+            if (watchSent) {
+                watchedCount = toWatch.length;
+                toWatch.forEach(event => {
+                    this.watchedHcaps.set(event.event_key, event);
+                    this.lastSubscribed.add(event.event_key);
+                    this.stats.subscribed++;
+                });
+            }
+        }
+
+        return {
+            watched: watchedCount,
+            unwatched: unwatchedCount,
+            total: watchedCount + unwatchedCount
+        };
+    }
+
     /**
      * 更新配置 (供 Python 调用)
      * @param {Object} newConfig
@@ -266,6 +423,7 @@ class SubscriptionManager {
     getStats() {
         return {
             ...this.stats,
+            mode: this.config.mode,
             pendingCandidates: this.candidates.length,
             watchedCount: this.watchedHcaps.size,
             firstEventTime: this.firstEventTime ? new Date(this.firstEventTime).toISOString() : null,
@@ -282,7 +440,9 @@ class SubscriptionManager {
             totalReceived: 0,
             filteredOut: 0,
             addedToCandidates: 0,
-            subscribed: 0
+            subscribed: 0,
+            targetSyncs: 0,
+            unsubscribed: 0
         };
     }
 
@@ -298,6 +458,10 @@ class SubscriptionManager {
             clearTimeout(this.subscribeTimer);
             this.subscribeTimer = null;
         }
+        if (this.targetSyncTimer) {
+            clearTimeout(this.targetSyncTimer);
+            this.targetSyncTimer = null;
+        }
         this.resetStats();
     }
 }
@@ -247,6 +247,7 @@ window.betStore = {
             total_orders: indexes.byOrder.size,
             total_bookies: indexes.byBookie.size,
             total_events: indexes.byEvent.size,
+            eviction_heap_size: window.__lifecycleManager ? window.__lifecycleManager.betQueue.size : 0,
             by_status: Array.from(indexes.byStatus.entries()).map(([status, set]) => ({
                 status,
                 count: set.size
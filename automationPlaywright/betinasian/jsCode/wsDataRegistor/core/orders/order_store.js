@@ -162,6 +162,11 @@ function updateStateIndex(order_id, oldState, newState) {
         }
         indexes.byState.get(newState).add(order_id);
     }
+
+    // FINISHED 订单的 bets 在保留期后由生命周期管理器淘汰
+    if (newState === 'FINISHED' && oldState !== 'FINISHED' && window.__lifecycleManager) {
+        window.__lifecycleManager.onOrderFinished(order_id);
+    }
 }
 
 function detachIndexes(order) {
@@ -292,6 +297,10 @@ function storeOrder(rawOrderData) {
             console.warn('[Order Store] State machine not available');
         }
 
+        if (window.__changeFeed) {
+            window.__changeFeed.orderChanged(order_id);
+        }
+
         return existing;
     } else {
         // Create new order
@@ -329,11 +338,24 @@ function storeOrder(rawOrderData) {
         orderStore.set(order_id, order);
         attachIndexes(order);
 
+        if (order.state === 'FINISHED' && window.__lifecycleManager) {
+            window.__lifecycleManager.onOrderFinished(order_id);
+        }
+
         // Push to expiry queue if expires_at is valid
         if (expires_at !== undefined && expires_at !== null) {
             expiryQueue.push(order_id, expires_at);
         }
 
+        if (window.__changeFeed) {
+            window.__changeFeed.orderChanged(order_id);
+        }
+
+        // Targeted subscription mode: watch this event's offers
+        if (window.__subscriptionManager) {
+            window.__subscriptionManager.requestTargetSync();
+        }
+
         return order;
     }
 }
@@ -360,6 +382,10 @@ function markOrderExpired(order_id) {
 
     updateStateIndex(order_id, oldState, 'EXPIRED_LOCAL');
 
+    if (window.__changeFeed) {
+        window.__changeFeed.orderChanged(order_id);
+    }
+
     console.log(`[Order Store] Order expired locally: ${order_id}`);
 }
 
@@ -371,6 +397,10 @@ function deleteOrder(order_id) {
     detachIndexes(order);
     orderStore.delete(order_id);
     expiryQueue.remove(order_id);
+
+    if (window.__changeFeed) {
+        window.__changeFeed.orderRemoved(order_id);
+    }
 }
 
 // ==================== Get Bet Bar (Computed on demand) ====================
@@ -478,6 +508,10 @@ function applyBetsToOrder(order_id) {
         }
     }
 
+    if (window.__changeFeed) {
+        window.__changeFeed.orderChanged(order_id);
+    }
+
     return true;
 }
 
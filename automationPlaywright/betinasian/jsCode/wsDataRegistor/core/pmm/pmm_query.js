@@ -4,13 +4,6 @@
  * Query functions for PMM data
  */
 
-// Bookie priority for tie-breaking
-const BOOKIE_PRIORITY = {
-    'bf': 3,      // Betfair (sharp book)
-    'bdaq': 2,    // Betdaq
-    'mbook': 1    // Matchbook
-};
-
 /**
  * Query betslip by ID
  *
@@ -54,6 +47,9 @@ function queryMarket(event_id, bet_type) {
 /**
  * Get best executable price with tie-breaking
  *
+ * Reads the live market aggregate kept by pmmStore (betslips are already ranked
+ * by price, available amount, updated time and bookie priority), no per-call sort.
+ *
  * @param {string} event_id - Event ID
  * @param {string} bet_type - Bet type
  * @param {number} requiredAmount - Required stake amount (default: 10)
@@ -61,9 +57,9 @@ function queryMarket(event_id, bet_type) {
  * @returns {Object} Result object
  */
 function getBestExecutablePrice(event_id, bet_type, requiredAmount = 10, requiredCurrency = 'GBP') {
-    const betslips = queryMarket(event_id, bet_type);
+    const market = window.pmmStore ? window.pmmStore.getMarketAggregate(`${event_id}|${bet_type}`) : null;
 
-    if (betslips.length === 0) {
+    if (!market) {
         return {
             success: false,
             reason: "no_betslip",
@@ -72,31 +68,9 @@ function getBestExecutablePrice(event_id, bet_type, requiredAmount = 10, require
         };
     }
 
-    // Find all executable betslips
-    const executables = betslips
-        .filter(b => b.best_executable !== null)
-        .sort((a, b) => {
-            // Tie-breaker rules:
-            // 1. Price (higher is better)
-            if (b.best_executable.price !== a.best_executable.price) {
-                return b.best_executable.price - a.best_executable.price;
-            }
-            // 2. Available amount (larger is better)
-            if (b.best_executable.available.amount !== a.best_executable.available.amount) {
-                return b.best_executable.available.amount - a.best_executable.available.amount;
-            }
-            // 3. Updated time (more recent is better)
-            if (b.best_executable.updated_at !== a.best_executable.updated_at) {
-                return b.best_executable.updated_at - a.best_executable.updated_at;
-            }
-            // 4. Bookie priority
-            const priorityA = BOOKIE_PRIORITY[a.best_executable.bookie] || 0;
-            const priorityB = BOOKIE_PRIORITY[b.best_executable.bookie] || 0;
-            return priorityB - priorityA;
-        });
-
-    if (executables.length > 0) {
-        const best = executables[0];
+    const bestExecutable = market.executables.head();
+    if (bestExecutable) {
+        const best = window.pmmStore.store.get(bestExecutable.id);
         return {
             success: true,
             betslip_id: best.betslip_id,
@@ -110,18 +84,16 @@ function getBestExecutablePrice(event_id, bet_type, requiredAmount = 10, require
     }
 
     // Fallback: no executable price, return best odds + reason
-    const best_odds_betslip = betslips
-        .filter(b => b.best_odds !== null)
-        .sort((a, b) => b.best_odds.price - a.best_odds.price)[0];
-
-    if (best_odds_betslip) {
+    const bestOdds = market.bestOdds.head();
+    if (bestOdds) {
+        const best_odds_betslip = window.pmmStore.store.get(bestOdds.id);
         return {
             success: false,
             reason: best_odds_betslip.best_executable_reason || "not_executable",
             event_id: best_odds_betslip.event_id,
             bet_type: best_odds_betslip.bet_type,
             best_odds: best_odds_betslip.best_odds,
-            filtered_reasons: best_odds_betslip.filtered_reasons
+            filtered_reasons: window.pmmStore.getFilteredReasons(best_odds_betslip)
         };
     }
 
@@ -234,120 +206,128 @@ function queryByBookie(bookie) {
  * Returns a Promise that resolves when PMM data is stable and ready to use.
  * Python side can await page.evaluate() to wait for this Promise.
  *
+ * Driven by pmmStore.subscribeBetslip(): readiness is only re-evaluated when the
+ * betslip's best_executable actually changes, and a single timer fires once the
+ * current value has been stable for stableMs (no polling).
+ *
  * @param {string} betslip_id - Betslip ID
  * @param {number} requiredAmount - Required stake amount (default: 10)
  * @param {string} requiredCurrency - Required currency (default: "GBP")
  * @param {Object} options - Configuration options
- * @param {number} options.pollInterval - Polling interval in ms (default: 50)
- * @param {number} options.stableMs - Stable duration in ms (default: 400)
+ * @param {number} options.pollInterval - Deprecated, ignored (kept for compatibility)
+ * @param {number} options.stableMs - Stable duration in ms (default: 300)
  * @param {number} options.totalTimeout - Total timeout in ms (default: 4000)
- * @param {number} options.minUpdates - Minimum update count (default: 2)
+ * @param {number} options.minUpdates - Minimum update count (default: 1)
  * @returns {Promise<Object>} Wait result
  */
 async function waitForPMMReady(betslip_id, requiredAmount = 10, requiredCurrency = 'GBP', options = {}) {
     const {
-        pollInterval = 50,      // 轮询间隔 50ms
         stableMs = 300,         // 稳定时间 300ms
         totalTimeout = 4000,    // 总超时 4 秒
         minUpdates = 1          // 最少更新次数（改为 1，避免单次推送卡死）
     } = options;
 
+    if (!window.pmmStore || !window.pmmStore.subscribeBetslip) {
+        return {
+            ready: false,
+            reason: 'pmm_store_not_available',
+            elapsed: 0,
+            update_count: 0
+        };
+    }
+
     const startTime = Date.now();
     let lastSignature = null;
     let stableStartTime = null;
     let updateCount = 0;
 
     return new Promise((resolve) => {
-        const checkInterval = setInterval(() => {
-            const elapsed = Date.now() - startTime;
-
-            // 超时检查
-            if (elapsed > totalTimeout) {
-                clearInterval(checkInterval);
-                resolve({
-                    ready: false,
-                    reason: 'timeout',
-                    elapsed: elapsed,
-                    update_count: updateCount
-                });
-                return;
-            }
-
-            // 查询 betslip
-            const betslip = queryBetslipById(betslip_id);
+        let stableTimer = null;
+        let timeoutTimer = null;
+        let unsubscribe = null;
+        let settled = false;
+
+        const finish = (result) => {
+            if (settled) return;
+            settled = true;
+            clearTimeout(stableTimer);
+            clearTimeout(timeoutTimer);
+            if (unsubscribe) unsubscribe();
+            resolve(result);
+        };
 
-            // 检查 betslip 是否存在
-            if (!betslip) {
-                // 重置稳定计时
-                lastSignature = null;
-                stableStartTime = null;
-                return;
-            }
+        const resetStable = () => {
+            lastSignature = null;
+            stableStartTime = null;
+            clearTimeout(stableTimer);
+            stableTimer = null;
+        };
 
-            // ===== 关键改进：检查 best_executable 是否满足要求 =====
+        // 稳定计时到期：当前值在 stableMs 内没有变化
+        const onStable = (betslip) => {
             const executable = betslip.best_executable;
+            const stableDuration = Date.now() - stableStartTime;
+            finish({
+                ready: true,
+                elapsed: Date.now() - startTime,
+                update_count: updateCount,
+                stable_duration: stableDuration,
+                has_executable: true,
+                has_odds: betslip.best_odds !== null,
+                best_price: executable.price,
+                best_bookie: executable.bookie,
+                best_amount: executable.available?.amount || 0
+            });
+        };
 
-            // 如果没有可执行赔率，继续等待（不计入稳定）
-            if (!executable) {
-                lastSignature = null;
-                stableStartTime = null;
-                return;
-            }
-
-            // 检查货币是否匹配
-            if (executable.available?.currency !== requiredCurrency) {
-                lastSignature = null;
-                stableStartTime = null;
-                return;
-            }
-
-            // 检查金额是否满足
-            const availableAmount = executable.available?.amount || 0;
-            if (availableAmount < requiredAmount) {
-                lastSignature = null;
-                stableStartTime = null;
+        // best_executable 变化时评估一次
+        const evaluate = (betslip) => {
+            if (settled) return;
+
+            // betslip 不存在 / 无可执行赔率 / 货币不匹配 / 金额不足 → 继续等待（不计入稳定）
+            const executable = betslip ? betslip.best_executable : null;
+            const availableAmount = executable?.available?.amount || 0;
+            if (!executable ||
+                executable.available?.currency !== requiredCurrency ||
+                availableAmount < requiredAmount) {
+                resetStable();
                 return;
             }
 
-            // ===== 计算当前签名（用于判断是否稳定） =====
             const currentSignature = JSON.stringify({
                 best_price: executable.price,
                 best_amount: availableAmount,
                 bookie: executable.bookie,
                 bookie_count: betslip.bookies.size
             });
-
-            // 检测变化
-            if (currentSignature !== lastSignature) {
-                updateCount++;
-                lastSignature = currentSignature;
-                stableStartTime = Date.now();
+            if (currentSignature === lastSignature) {
                 return;
             }
 
-            // 检查是否稳定
-            if (stableStartTime) {
-                const stableDuration = Date.now() - stableStartTime;
-
-                // 满足条件：稳定时间足够 且 更新次数足够
-                // 或者：稳定时间超过 2 倍（给单次推送一个出路）
-                if ((stableDuration >= stableMs && updateCount >= minUpdates) ||
-                    (stableDuration >= stableMs * 2)) {
-                    clearInterval(checkInterval);
-                    resolve({
-                        ready: true,
-                        elapsed: elapsed,
-                        update_count: updateCount,
-                        stable_duration: stableDuration,
-                        has_executable: true,
-                        has_odds: betslip.best_odds !== null,
-                        best_price: executable.price,
-                        best_bookie: executable.bookie,
-                        best_amount: availableAmount
-                    });
-                }
-            }
-        }, pollInterval);
+            updateCount++;
+            lastSignature = currentSignature;
+            stableStartTime = Date.now();
+
+            // 满足条件：稳定时间足够 且 更新次数足够
+            // 或者：稳定时间超过 2 倍（给单次推送一个出路）
+            const waitMs = updateCount >= minUpdates ? stableMs : stableMs * 2;
+            clearTimeout(stableTimer);
+            stableTimer = setTimeout(() => onStable(betslip), waitMs);
+        };
+
+        timeoutTimer = setTimeout(() => {
+            finish({
+                ready: false,
+                reason: 'timeout',
+                elapsed: Date.now() - startTime,
+                update_count: updateCount
+            });
+        }, totalTimeout);
+
+        unsubscribe = window.pmmStore.subscribeBetslip(betslip_id, evaluate);
+
+        // 订阅前可能已经有数据
+        evaluate(queryBetslipById(betslip_id));
     });
 }
 
@@ -361,6 +341,39 @@ async function waitForPMMReady(betslip_id, requiredAmount = 10, requiredCurrency
  * @returns {Object} Result with total amount and breakdown by bookie
  */
 function getTotalAmountAtPrice(event_id, bet_type, targetPrice, requiredCurrency = 'GBP') {
+    const market = window.pmmStore ? window.pmmStore.getMarketAggregate(`${event_id}|${bet_type}`) : null;
+
+    // Market depth ladder is kept in the store currency; other currencies use the full scan
+    if (market && requiredCurrency === window.pmmStore.marketCurrency) {
+        const depth = window.pmmStore.getMarketDepthAtPrice(market, targetPrice);
+        const bookieBreakdown = depth.bookies.map(entry => ({
+            bookie: entry.bookie,
+            betslip_id: entry.betslip_id,
+            total_amount: entry.total_amount,
+            tiers: entry.tiers,
+            currency: requiredCurrency
+        }));
+        bookieBreakdown.sort((a, b) => b.total_amount - a.total_amount);
+
+        return {
+            success: depth.total_amount > 0,
+            event_id: event_id,
+            bet_type: bet_type,
+            target_price: targetPrice,
+            currency: requiredCurrency,
+            total_amount: depth.total_amount,
+            bookie_count: bookieBreakdown.length,
+            bookies: bookieBreakdown
+        };
+    }
+
+    return scanTotalAmountAtPrice(event_id, bet_type, targetPrice, requiredCurrency);
+}
+
+/**
+ * Total amount at price by scanning every betslip of the market
+ */
+function scanTotalAmountAtPrice(event_id, bet_type, targetPrice, requiredCurrency = 'GBP') {
     const betslips = queryMarket(event_id, bet_type);
 
     if (betslips.length === 0) {
@@ -382,7 +395,8 @@ function getTotalAmountAtPrice(event_id, bet_type, targetPrice, requiredCurrency
     // Collect all tiers from all betslips
     for (const betslip of betslips) {
         for (const [bookie, data] of betslip.bookies.entries()) {
-            const { status, price_tiers, last_update, top_available } = data;
+            const { status, last_update, top_available } = data;
+            const price_tiers = data.depth_tiers || data.price_tiers;
 
             // Filter checks (same as best_executable)
             // 1. Status check
@@ -459,6 +473,7 @@ window.queryData.pmmMarket = queryMarket;
 window.queryData.getBestPrice = getBestExecutablePrice;
 window.queryData.getAllPrices = getAllPrices;
 window.queryData.getTotalAmountAtPrice = getTotalAmountAtPrice;
+window.queryData.getMarketLadder = (event_id, bet_type) => window.pmmStore.getMarketLadder(`${event_id}|${bet_type}`);
 window.queryData.pmmByEvent = queryByEvent;
 window.queryData.pmmByBookie = queryByBookie;
 window.queryData.waitForPMMReady = waitForPMMReady;  // Wait for PMM data to be ready
@@ -8,11 +8,16 @@
  * - Index consistency management
  * - Efficient expiry cleanup (min-heap)
  * - Dirty flag batch recomputation
+ * - Incremental best price (per-betslip sorted price lists, only changed bookies are re-placed)
+ * - Live per-market aggregate (ranked betslips + depth ladder) for O(1) market queries
+ * - Per-betslip change notification (best_executable)
+ * - Change feed to the Python replica (every recomputed betslip)
  */
 
 // ==================== Config ====================
 const PMM_EXPIRE_MS = 30000;  // 30 seconds
 const MAX_PRICE_TIERS = 3;     // Keep max 3 price tiers
+const MAX_DEPTH_TIERS = 10;    // Price levels kept per bookie for the market depth ladder
 
 // ==================== Store ====================
 const pmmStore = new Map();  // betslip_id → BetslipData
@@ -111,12 +116,476 @@ class ExpiryQueue {
 
 const expiryQueue = new ExpiryQueue();
 
+// ==================== Incremental Price Index ====================
+// Per betslip: bookies sorted by (price desc, first-seen asc).
+// Tie-break by first-seen order matches the Map iteration order of the full recompute.
+class BookiePriceList {
+    constructor() {
+        this.items = [];            // {bookie, price, seq}
+        this.entries = new Map();   // bookie → entry
+    }
+
+    get size() {
+        return this.items.length;
+    }
+
+    head() {
+        return this.items.length > 0 ? this.items[0] : null;
+    }
+
+    upsert(bookie, price, seq) {
+        this.remove(bookie);
+        const entry = { bookie, price, seq };
+        this.items.splice(this._position(price, seq), 0, entry);
+        this.entries.set(bookie, entry);
+    }
+
+    remove(bookie) {
+        const entry = this.entries.get(bookie);
+        if (!entry) return;
+        this.items.splice(this._position(entry.price, entry.seq), 1);
+        this.entries.delete(bookie);
+    }
+
+    // Binary search: first index whose entry ranks after (price, seq)
+    _position(price, seq) {
+        let lo = 0;
+        let hi = this.items.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            const item = this.items[mid];
+            if (item.price > price || (item.price === price && item.seq < seq)) {
+                lo = mid + 1;
+            } else {
+                hi = mid;
+            }
+        }
+        return lo;
+    }
+}
+
+const priceIndexes = new Map();  // betslip_id → {all, executable, seq, nextSeq}
+
+function getPriceIndex(betslip_id) {
+    let index = priceIndexes.get(betslip_id);
+    if (!index) {
+        index = {
+            all: new BookiePriceList(),         // every bookie with a price (best_odds)
+            executable: new BookiePriceList(),  // bookies passing the time-independent filters (best_executable)
+            seq: new Map(),                     // bookie → first-seen order
+            nextSeq: 0
+        };
+        priceIndexes.set(betslip_id, index);
+    }
+    return index;
+}
+
+/**
+ * Re-place one bookie in its betslip's price lists (O(log n) search)
+ */
+function updatePriceIndex(betslip, bookie) {
+    const index = getPriceIndex(betslip.betslip_id);
+    const data = betslip.bookies.get(bookie);
+
+    if (!index.seq.has(bookie)) {
+        index.seq.set(bookie, index.nextSeq++);
+    }
+    const seq = index.seq.get(bookie);
+
+    if (!data || !data.top_price || data.top_price <= 1.0) {
+        index.all.remove(bookie);
+        index.executable.remove(bookie);
+        return;
+    }
+
+    index.all.upsert(bookie, data.top_price, seq);
+
+    if (getStaticReason(data) === null) {
+        index.executable.upsert(bookie, data.top_price, seq);
+    } else {
+        index.executable.remove(bookie);
+    }
+}
+
+function toPriceResult(bookie, data) {
+    return {
+        bookie: bookie,
+        price: data.top_price,
+        available: data.top_available,
+        updated_at: data.last_update
+    };
+}
+
+/**
+ * Best prices from the index
+ *
+ * Expiry is the only time-dependent filter: expired heads are dropped from the
+ * executable list until that bookie's next update re-inserts it.
+ */
+function readBestPrice(betslip) {
+    const index = getPriceIndex(betslip.betslip_id);
+    const now = Date.now();
+
+    const bestOddsEntry = index.all.head();
+    const best_odds = bestOddsEntry ? toPriceResult(bestOddsEntry.bookie, betslip.bookies.get(bestOddsEntry.bookie)) : null;
+
+    let best_executable = null;
+    while (index.executable.size > 0) {
+        const entry = index.executable.head();
+        const data = betslip.bookies.get(entry.bookie);
+        if (now - data.last_update > PMM_EXPIRE_MS) {
+            index.executable.remove(entry.bookie);
+            continue;
+        }
+        best_executable = toPriceResult(entry.bookie, data);
+        break;
+    }
+
+    return { best_odds, best_executable };
+}
+
+// ==================== Market Aggregates ====================
+// Per market ("event_id|bet_type"), updated after each recompute:
+// - executables: betslips ranked by best_executable (same tie-break as getBestPrice)
+// - bestOdds: betslips ranked by best_odds price
+// - ladder: price → tier amounts of eligible bookies (status success, GBP), for depth queries
+//   (built from depth_tiers: up to MAX_DEPTH_TIERS levels of each bookie's price list)
+const MARKET_CURRENCY = 'GBP';  // storePMMBookie records every price in GBP
+
+// Bookie priority for tie-breaking
+const BOOKIE_PRIORITY = {
+    'bf': 3,      // Betfair (sharp book)
+    'bdaq': 2,    // Betdaq
+    'mbook': 1    // Matchbook
+};
+
+class RankedList {
+    constructor(compare) {
+        this.compare = compare;     // (keyA, keyB) → negative when A ranks first
+        this.items = [];            // {id, key}
+        this.entries = new Map();   // id → entry
+    }
+
+    get size() {
+        return this.items.length;
+    }
+
+    head() {
+        return this.items.length > 0 ? this.items[0] : null;
+    }
+
+    upsert(id, key) {
+        this.remove(id);
+        const entry = { id, key };
+        this.items.splice(this._position(key), 0, entry);
+        this.entries.set(id, entry);
+    }
+
+    remove(id) {
+        const entry = this.entries.get(id);
+        if (!entry) return;
+        this.items.splice(this._position(entry.key), 1);
+        this.entries.delete(id);
+    }
+
+    _position(key) {
+        let lo = 0;
+        let hi = this.items.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (this.compare(this.items[mid].key, key) < 0) {
+                lo = mid + 1;
+            } else {
+                hi = mid;
+            }
+        }
+        return lo;
+    }
+}
+
+// Tie-breaker rules: price, available amount, updated time, bookie priority, then first seen
+function compareExecutableKeys(a, b) {
+    return (b.price - a.price) ||
+        (b.amount - a.amount) ||
+        (b.updated_at - a.updated_at) ||
+        (b.priority - a.priority) ||
+        (a.seq - b.seq);
+}
+
+function compareOddsKeys(a, b) {
+    return (b.price - a.price) || (a.seq - b.seq);
+}
+
+const marketAggregates = new Map();  // market_key → MarketAggregate
+
+function getMarketAggregate(market_key) {
+    return marketAggregates.get(market_key) || null;
+}
+
+function ensureMarketAggregate(betslip) {
+    let market = marketAggregates.get(betslip.market_key);
+    if (!market) {
+        market = {
+            market_key: betslip.market_key,
+            event_id: betslip.event_id,
+            bet_type: betslip.bet_type,
+            betslipSeq: new Map(),                          // betslip_id → first-seen order
+            nextSeq: 0,
+            executables: new RankedList(compareExecutableKeys),
+            bestOdds: new RankedList(compareOddsKeys),
+            contributions: new Map(),                       // "betslip_id|bookie" → {bookie, betslip_id, tiers, last_update}
+            ladder: new Map(),                              // price → Map("betslip_id|bookie#i" → {contribution, tier})
+            ladderPrices: [],                               // prices, descending
+            oldestUpdate: null                              // min last_update of contributions (null = recompute)
+        };
+        marketAggregates.set(betslip.market_key, market);
+    }
+    if (!market.betslipSeq.has(betslip.betslip_id)) {
+        market.betslipSeq.set(betslip.betslip_id, market.nextSeq++);
+    }
+    return market;
+}
+
+function addLadderTier(market, price, tierKey, item) {
+    let level = market.ladder.get(price);
+    if (!level) {
+        level = new Map();
+        market.ladder.set(price, level);
+
+        // Insert price keeping descending order
+        let lo = 0;
+        let hi = market.ladderPrices.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (market.ladderPrices[mid] > price) lo = mid + 1; else hi = mid;
+        }
+        market.ladderPrices.splice(lo, 0, price);
+    }
+    level.set(tierKey, item);
+}
+
+function removeLadderTier(market, price, tierKey) {
+    const level = market.ladder.get(price);
+    if (!level) return;
+    level.delete(tierKey);
+    if (level.size === 0) {
+        market.ladder.delete(price);
+        const index = market.ladderPrices.indexOf(price);
+        if (index !== -1) market.ladderPrices.splice(index, 1);
+    }
+}
+
+function removeContribution(market, key) {
+    const contribution = market.contributions.get(key);
+    if (!contribution) return;
+
+    contribution.tiers.forEach((tier, i) => removeLadderTier(market, tier.price, `${key}#${i}`));
+    market.contributions.delete(key);
+
+    if (market.oldestUpdate === contribution.last_update) {
+        market.oldestUpdate = null;
+    }
+}
+
+function updateContribution(market, betslip, bookie) {
+    const key = `${betslip.betslip_id}|${bookie}`;
+    removeContribution(market, key);
+
+    const data = betslip.bookies.get(bookie);
+    if (!data || data.status?.code !== 'success' || data.top_available?.currency !== MARKET_CURRENCY) {
+        return;
+    }
+
+    // Already stale on arrival (late upstream timestamp): never counted
+    if (Date.now() - data.last_update > PMM_EXPIRE_MS) {
+        return;
+    }
+
+    const tiers = (data.depth_tiers || data.price_tiers || []).filter(tier => tier.price > 1.0);
+    if (tiers.length === 0) {
+        return;
+    }
+
+    const contribution = {
+        bookie: bookie,
+        betslip_id: betslip.betslip_id,
+        tiers: tiers,
+        last_update: data.last_update,
+        depth: null  // per-query scratch entry
+    };
+    market.contributions.set(key, contribution);
+    tiers.forEach((tier, i) => addLadderTier(market, tier.price, `${key}#${i}`, { contribution, tier }));
+
+    if (market.oldestUpdate !== null && data.last_update < market.oldestUpdate) {
+        market.oldestUpdate = data.last_update;
+    }
+}
+
+/**
+ * Drop expired contributions (only scans when the oldest one may have expired)
+ */
+function purgeExpiredContributions(market, now) {
+    if (market.oldestUpdate === null) {
+        market.oldestUpdate = Infinity;
+        for (const contribution of market.contributions.values()) {
+            if (contribution.last_update < market.oldestUpdate) {
+                market.oldestUpdate = contribution.last_update;
+            }
+        }
+    }
+
+    if (now - market.oldestUpdate <= PMM_EXPIRE_MS) {
+        return;
+    }
+
+    for (const [key, contribution] of Array.from(market.contributions)) {
+        if (now - contribution.last_update > PMM_EXPIRE_MS) {
+            removeContribution(market, key);
+        }
+    }
+    market.oldestUpdate = null;
+}
+
+/**
+ * Re-rank one betslip in its market and refresh the changed bookies' ladder tiers
+ */
+function updateMarketAggregate(betslip, bookies) {
+    const market = ensureMarketAggregate(betslip);
+    const seq = market.betslipSeq.get(betslip.betslip_id);
+    const executable = betslip.best_executable;
+
+    if (executable) {
+        market.executables.upsert(betslip.betslip_id, {
+            price: executable.price,
+            amount: executable.available.amount,
+            updated_at: executable.updated_at,
+            priority: BOOKIE_PRIORITY[executable.bookie] || 0,
+            seq: seq
+        });
+    } else {
+        market.executables.remove(betslip.betslip_id);
+    }
+
+    if (betslip.best_odds) {
+        market.bestOdds.upsert(betslip.betslip_id, { price: betslip.best_odds.price, seq: seq });
+    } else {
+        market.bestOdds.remove(betslip.betslip_id);
+    }
+
+    for (const bookie of bookies) {
+        updateContribution(market, betslip, bookie);
+    }
+}
+
+function removeFromMarketAggregate(betslip) {
+    const market = marketAggregates.get(betslip.market_key);
+    if (!market) return;
+
+    market.executables.remove(betslip.betslip_id);
+    market.bestOdds.remove(betslip.betslip_id);
+    for (const bookie of betslip.bookies.keys()) {
+        removeContribution(market, `${betslip.betslip_id}|${bookie}`);
+    }
+    market.betslipSeq.delete(betslip.betslip_id);
+
+    if (market.betslipSeq.size === 0) {
+        marketAggregates.delete(betslip.market_key);
+    }
+}
+
+/**
+ * Depth at or above a price (eligible, non-expired tiers)
+ *
+ * @returns {Object} {total_amount, bookies: [{bookie, betslip_id, total_amount, tiers}]}
+ */
+function getMarketDepthAtPrice(market, targetPrice) {
+    purgeExpiredContributions(market, Date.now());
+
+    let totalAmount = 0;
+    const entries = [];
+
+    for (const price of market.ladderPrices) {
+        if (price < targetPrice) break;
+
+        for (const { contribution, tier } of market.ladder.get(price).values()) {
+            let entry = contribution.depth;
+            if (!entry) {
+                entry = {
+                    bookie: contribution.bookie,
+                    betslip_id: contribution.betslip_id,
+                    total_amount: 0,
+                    tiers: []
+                };
+                contribution.depth = entry;
+                entries.push(contribution);
+            }
+            entry.total_amount += tier.max;
+            entry.tiers.push({ price: tier.price, amount: tier.max, min: tier.min });
+            totalAmount += tier.max;
+        }
+    }
+
+    const bookies = [];
+    for (const contribution of entries) {
+        if (contribution.depth.total_amount > 0) {
+            bookies.push(contribution.depth);
+        }
+        contribution.depth = null;
+    }
+
+    return {
+        total_amount: totalAmount,
+        bookies: bookies
+    };
+}
+
+/**
+ * Depth ladder + per-bookie top tier of a market
+ *
+ * @returns {Object|null} {levels: [{price, amount, bookies}], bookies: [{bookie, betslip_id, top_tier, last_update}]}
+ */
+function getMarketLadder(market_key) {
+    const market = marketAggregates.get(market_key);
+    if (!market) return null;
+
+    purgeExpiredContributions(market, Date.now());
+
+    const levels = market.ladderPrices.map(price => {
+        let amount = 0;
+        let bookies = 0;
+        for (const { tier } of market.ladder.get(price).values()) {
+            amount += tier.max;
+            bookies++;
+        }
+        return { price, amount, bookies };
+    });
+
+    const bookies = Array.from(market.contributions.values()).map(contribution => ({
+        bookie: contribution.bookie,
+        betslip_id: contribution.betslip_id,
+        top_tier: contribution.tiers[0],
+        last_update: contribution.last_update
+    }));
+
+    return {
+        market_key: market.market_key,
+        event_id: market.event_id,
+        bet_type: market.bet_type,
+        currency: MARKET_CURRENCY,
+        levels,
+        bookies
+    };
+}
+
 // ==================== Dirty Flag Batch Recomputation ====================
-const dirtyBetslips = new Set();
+const dirtyBetslips = new Map();  // betslip_id → Set(bookie) updated since last recompute
 let recomputeScheduled = false;
 
-function markDirty(betslip_id) {
-    dirtyBetslips.add(betslip_id);
+function markDirty(betslip_id, bookie) {
+    if (!dirtyBetslips.has(betslip_id)) {
+        dirtyBetslips.set(betslip_id, new Set());
+    }
+    dirtyBetslips.get(betslip_id).add(bookie);
 
     // Schedule batch recomputation
     if (!recomputeScheduled) {
@@ -129,19 +598,94 @@ function markDirty(betslip_id) {
 }
 
 function recomputeAllDirty() {
-    for (const betslip_id of dirtyBetslips) {
+    const changed = [];
+
+    for (const [betslip_id, bookies] of dirtyBetslips) {
         const betslip = pmmStore.get(betslip_id);
         if (!betslip) continue;
 
-        const result = calculateBestPrice(betslip.bookies);
+        const previous = betslip.best_executable;
+        const previousBookieCount = betslip.executable_bookie_count;
+
+        // Only the updated bookies are re-placed; best prices are read from the list heads
+        for (const bookie of bookies) {
+            updatePriceIndex(betslip, bookie);
+        }
+
+        const result = readBestPrice(betslip);
         betslip.best_odds = result.best_odds;
         betslip.best_executable = result.best_executable;
-        betslip.best_executable_reason = result.best_executable_reason;
-        betslip.filtered_reasons = result.filtered_reasons;
+        // Summary reason needs every bookie, only computed when nothing is executable
+        betslip.best_executable_reason = result.best_executable ? null : summarizeReasons(betslip.bookies);
+        betslip.executable_bookie_count = betslip.bookies.size;
         betslip.updated_at = Date.now();
+
+        updateMarketAggregate(betslip, bookies);
+
+        if (window.__changeFeed) {
+            window.__changeFeed.betslipChanged(betslip_id);
+        }
+
+        if (!isSameExecutable(previous, betslip.best_executable) ||
+            previousBookieCount !== betslip.executable_bookie_count) {
+            changed.push(betslip_id);
+        }
     }
 
     dirtyBetslips.clear();
+
+    // Notify after the whole batch is consistent
+    for (const betslip_id of changed) {
+        notifyBetslipListeners(betslip_id);
+    }
+}
+
+function isSameExecutable(a, b) {
+    if (a === b) return true;
+    if (!a || !b) return false;
+    return a.price === b.price &&
+        a.bookie === b.bookie &&
+        a.available?.amount === b.available?.amount &&
+        a.available?.currency === b.available?.currency;
+}
+
+// ==================== Betslip Change Listeners ====================
+const betslipListeners = new Map();  // betslip_id → Set(callback)
+
+/**
+ * Subscribe to best_executable changes of one betslip
+ *
+ * Callback receives the betslip object (or null when it was deleted).
+ * Returns an unsubscribe function.
+ */
+function subscribeBetslip(betslip_id, callback) {
+    if (!betslipListeners.has(betslip_id)) {
+        betslipListeners.set(betslip_id, new Set());
+    }
+    betslipListeners.get(betslip_id).add(callback);
+
+    return () => {
+        const listeners = betslipListeners.get(betslip_id);
+        if (!listeners) return;
+        listeners.delete(callback);
+        if (listeners.size === 0) {
+            betslipListeners.delete(betslip_id);
+        }
+    };
+}
+
+function notifyBetslipListeners(betslip_id) {
+    const listeners = betslipListeners.get(betslip_id);
+    if (!listeners) return;
+
+    const betslip = pmmStore.get(betslip_id) || null;
+    for (const callback of Array.from(listeners)) {
+        try {
+            callback(betslip);
+        } catch (e) {
+            console.error('[PMM] Betslip listener error:', e);
+        }
+    }
 }
 
 // ==================== Index Management ====================
@@ -224,15 +768,24 @@ function deleteBetslip(betslip_id) {
 
     // Fixed entry point: detach indexes → delete from store → remove from queue
     detachIndexes(betslip);
+    removeFromMarketAggregate(betslip);
     pmmStore.delete(betslip_id);
+    priceIndexes.delete(betslip_id);
+    dirtyBetslips.delete(betslip_id);
     expiryQueue.remove(betslip_id);
+
+    if (window.__changeFeed) {
+        window.__changeFeed.betslipRemoved(betslip_id);
+    }
+
+    notifyBetslipListeners(betslip_id);
 }
 
 // ==================== Price Tiers Extraction (O(n)) ====================
-function extractTop3Tiers(price_list) {
+function extractTop3Tiers(price_list, maxTiers = MAX_PRICE_TIERS) {
     if (!price_list || price_list.length === 0) return [];
 
-    // Extract top 3 tiers in O(n) using insertion sort
+    // Extract top N tiers in O(n) using insertion sort
     const top3 = [];
 
     for (const item of price_list) {
@@ -253,13 +806,13 @@ function extractTop3Tiers(price_list) {
                 break;
             }
         }
-        if (!inserted && top3.length < MAX_PRICE_TIERS) {
+        if (!inserted && top3.length < maxTiers) {
             top3.push(tier);
         }
 
-        // Keep max 3
-        if (top3.length > MAX_PRICE_TIERS) {
-            top3.length = MAX_PRICE_TIERS;
+        // Keep max N
+        if (top3.length > maxTiers) {
+            top3.length = maxTiers;
         }
     }
 
@@ -284,10 +837,12 @@ function storePMMBookie(betslip, bookie, pmmData) {
     let top_price = null;
     let top_available = null;
     let price_tiers = [];
+    let depth_tiers = [];
 
     if (price_list && price_list.length > 0) {
-        // Extract top 3 tiers
-        price_tiers = extractTop3Tiers(price_list);
+        // Extract top 3 tiers (executability) and the deeper ladder (stake sizing)
+        depth_tiers = extractTop3Tiers(price_list, MAX_DEPTH_TIERS);
+        price_tiers = depth_tiers.slice(0, MAX_PRICE_TIERS);
 
         if (price_tiers.length > 0) {
             const best = price_tiers[0];
@@ -305,6 +860,7 @@ function storePMMBookie(betslip, bookie, pmmData) {
         top_price: top_price,
         top_available: top_available,
         price_tiers: price_tiers,
+        depth_tiers: depth_tiers,
         last_update: incoming_ts
     });
 
@@ -317,7 +873,97 @@ function storePMMBookie(betslip, bookie, pmmData) {
     return true;  // Updated
 }
 
-// ==================== Calculate Best Price ====================
+// ==================== Executability Filters ====================
+/**
+ * Time-independent filter reason of one bookie (null = executable while fresh)
+ */
+function getStaticReason(data, requiredAmount = 10, requiredCurrency = 'GBP') {
+    const { status, top_price, top_available, price_tiers } = data;
+
+    // Check if price exists
+    if (!top_price || top_price <= 1.0) {
+        return "no_price";
+    }
+
+    // 1. Status check
+    if (status?.code !== "success") {
+        return `status_${status?.code || 'unknown'}`;
+    }
+
+    // 2. Liquidity check
+    if (!top_available || top_available.amount <= 0) {
+        return "no_liquidity";
+    }
+
+    // 3. Currency check
+    if (top_available.currency !== requiredCurrency) {
+        return `currency_mismatch_${top_available.currency}`;
+    }
+
+    // 4. Min stake check (from tiers)
+    let canStake = false;
+    if (price_tiers && price_tiers.length > 0) {
+        for (const tier of price_tiers) {
+            if (tier.price === top_price && tier.min <= requiredAmount && tier.max >= requiredAmount) {
+                canStake = true;
+                break;
+            }
+        }
+    } else if (top_available.amount >= requiredAmount) {
+        canStake = true;
+    }
+
+    if (!canStake) {
+        return `min_stake_${requiredAmount}`;
+    }
+
+    return null;
+}
+
+/**
+ * Full filter reason of one bookie (expiry is checked right after status)
+ */
+function getBookieReason(data, now, requiredAmount = 10, requiredCurrency = 'GBP') {
+    const reason = getStaticReason(data, requiredAmount, requiredCurrency);
+    if (reason === "no_price" || (reason && reason.startsWith('status_'))) {
+        return reason;
+    }
+    if (now - data.last_update > PMM_EXPIRE_MS) {
+        return "expired";
+    }
+    return reason;
+}
+
+function summarizeFilteredReasons(reasons) {
+    if (reasons.every(r => r.startsWith('status_'))) {
+        return "all_suspended";
+    } else if (reasons.every(r => r === 'expired')) {
+        return "all_expired";
+    } else if (reasons.every(r => r === 'no_liquidity')) {
+        return "no_liquidity";
+    }
+    return "mixed_issues";
+}
+
+function summarizeReasons(bookies) {
+    const now = Date.now();
+    const reasons = [];
+    for (const data of bookies.values()) {
+        const reason = getBookieReason(data, now);
+        if (reason) reasons.push(reason);
+    }
+    return summarizeFilteredReasons(reasons);
+}
+
+/**
+ * Per-bookie filter reasons (diagnostics only, computed on demand)
+ */
+function getFilteredReasons(betslip) {
+    return calculateBestPrice(betslip.bookies).filtered_reasons;
+}
+
+// ==================== Calculate Best Price (full scan) ====================
+// Reference implementation over all bookies; the hot path uses the incremental index.
 function calculateBestPrice(bookies, requiredAmount = 10, requiredCurrency = 'GBP') {
     const now = Date.now();
 
@@ -326,16 +972,10 @@ function calculateBestPrice(bookies, requiredAmount = 10, requiredCurrency = 'GB
     const filtered_reasons = {};
 
     for (const [bookie, data] of bookies.entries()) {
-        const { status, top_price, top_available, price_tiers, last_update } = data;
-
-        // Check if price exists
-        if (!top_price || top_price <= 1.0) {
-            filtered_reasons[bookie] = "no_price";
-            continue;
-        }
+        const { top_price, top_available, last_update } = data;
 
         // Update best_odds (no executability check, only price)
-        if (!best_odds || top_price > best_odds.price) {
+        if (top_price && top_price > 1.0 && (!best_odds || top_price > best_odds.price)) {
             best_odds = {
                 bookie: bookie,
                 price: top_price,
@@ -344,47 +984,9 @@ function calculateBestPrice(bookies, requiredAmount = 10, requiredCurrency = 'GB
             };
         }
 
-        // ===== Executability Filters =====
-
-        // 1. Status check
-        if (status?.code !== "success") {
-            filtered_reasons[bookie] = `status_${status?.code || 'unknown'}`;
-            continue;
-        }
-
-        // 2. Expiry check
-        if (now - last_update > PMM_EXPIRE_MS) {
-            filtered_reasons[bookie] = "expired";
-            continue;
-        }
-
-        // 3. Liquidity check
-        if (!top_available || top_available.amount <= 0) {
-            filtered_reasons[bookie] = "no_liquidity";
-            continue;
-        }
-
-        // 4. Currency check
-        if (top_available.currency !== requiredCurrency) {
-            filtered_reasons[bookie] = `currency_mismatch_${top_available.currency}`;
-            continue;
-        }
-
-        // 5. Min stake check (from tiers)
-        let canStake = false;
-        if (price_tiers && price_tiers.length > 0) {
-            for (const tier of price_tiers) {
-                if (tier.price === top_price && tier.min <= requiredAmount && tier.max >= requiredAmount) {
-                    canStake = true;
-                    break;
-                }
-            }
-        } else if (top_available.amount >= requiredAmount) {
-            canStake = true;
-        }
-
-        if (!canStake) {
-            filtered_reasons[bookie] = `min_stake_${requiredAmount}`;
+        const reason = getBookieReason(data, now, requiredAmount, requiredCurrency);
+        if (reason) {
+            filtered_reasons[bookie] = reason;
             continue;
         }
 
@@ -399,25 +1001,10 @@ function calculateBestPrice(bookies, requiredAmount = 10, requiredCurrency = 'GB
         }
     }
 
-    // Generate summary reason
-    let best_executable_reason = null;
-    if (!best_executable) {
-        const reasons = Object.values(filtered_reasons);
-        if (reasons.every(r => r.startsWith('status_'))) {
-            best_executable_reason = "all_suspended";
-        } else if (reasons.every(r => r === 'expired')) {
-            best_executable_reason = "all_expired";
-        } else if (reasons.every(r => r === 'no_liquidity')) {
-            best_executable_reason = "no_liquidity";
-        } else {
-            best_executable_reason = "mixed_issues";
-        }
-    }
-
     return {
         best_odds,
         best_executable,
-        best_executable_reason,
+        best_executable_reason: best_executable ? null : summarizeFilteredReasons(Object.values(filtered_reasons)),
         filtered_reasons: Object.keys(filtered_reasons).length > 0 ? filtered_reasons : undefined
     };
 }
@@ -446,7 +1033,7 @@ function storePMM(pmmData) {
             best_odds: null,
             best_executable: null,
             best_executable_reason: null,
-            filtered_reasons: undefined,
+            executable_bookie_count: 0,
             created_at: Date.now(),
             updated_at: Date.now(),
             expires_at: Date.now() + PMM_EXPIRE_MS
@@ -454,7 +1041,13 @@ function storePMM(pmmData) {
 
         pmmStore.set(betslip_id, betslip);
         attachIndexes(betslip);
+        ensureMarketAggregate(betslip);
         expiryQueue.push(betslip_id, betslip.expires_at);
+
+        // Targeted subscription mode: watch this event's offers
+        if (window.__subscriptionManager) {
+            window.__subscriptionManager.requestTargetSync();
+        }
     }
 
     const betslip = pmmStore.get(betslip_id);
@@ -467,7 +1060,7 @@ function storePMM(pmmData) {
         updateBetslipExpiry(betslip);
 
         // Mark dirty for batch recomputation
-        markDirty(betslip_id);
+        markDirty(betslip_id, bookie);
     }
 }
 
@@ -488,6 +1081,15 @@ window.pmmStore = {
     // Functions
     storePMM: storePMM,
     deleteBetslip: deleteBetslip,
+    subscribeBetslip: subscribeBetslip,
+    calculateBestPrice: calculateBestPrice,
+    getFilteredReasons: getFilteredReasons,
+
+    // Market aggregates
+    marketCurrency: MARKET_CURRENCY,
+    getMarketAggregate: getMarketAggregate,
+    getMarketDepthAtPrice: getMarketDepthAtPrice,
+    getMarketLadder: getMarketLadder,
 
     // Stats
     getStats: function() {
@@ -497,7 +1099,10 @@ window.pmmStore = {
             total_markets: indexes.byMarket.size,
             total_bookies: indexes.byBookie.size,
             dirty_count: dirtyBetslips.size,
-            heap_size: expiryQueue.heap.length
+            price_indexes: priceIndexes.size,
+            market_aggregates: marketAggregates.size,
+            heap_size: expiryQueue.heap.length,
+            listener_betslips: betslipListeners.size
         };
     }
 };
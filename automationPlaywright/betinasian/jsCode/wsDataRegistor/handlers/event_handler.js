@@ -52,6 +52,7 @@ class EventHandler {
             // 7. 完整重索引流程: 先移除旧索引,再建立新索引
             const oldEvent = window.__eventsStore.get(eventKey);
             const oldSportPeriod = oldEvent ? `${oldEvent.sport}${oldEvent.period ? '_' + oldEvent.period.toLowerCase() : ''}` : null;
+            const wasInRunning = oldEvent ? oldEvent.isInRunning === true : false;
 
             // 更新 store
             const event = window.__eventsStore.update(eventKey, eventData);
@@ -64,11 +65,21 @@ class EventHandler {
             // 建立新索引 (基于最终合并后的数据)
             window.__eventsManager.indexEvent(event, sportPeriod);
 
+            // 8. 通知生命周期管理器 (离开 in-running 后按时淘汰)
+            if (window.__lifecycleManager) {
+                window.__lifecycleManager.onEventUpdated(event, wasInRunning);
+            }
+
             // 9. 通知订阅管理器
             if (window.__subscriptionManager) {
                 window.__subscriptionManager.onEventReceived(event, sportPeriod);
             }
 
+            // 10. 记录变更 (推送给 Python 副本)
+            if (window.__changeFeed) {
+                window.__changeFeed.eventUpserted(event);
+            }
+
             return true;
 
         } catch (error) {
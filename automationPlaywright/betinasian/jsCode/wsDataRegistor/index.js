@@ -174,6 +174,7 @@
 
         // ===== 统计信息 =====
         stats: () => window.__queryEngine.getStats(),
+        lifecycleStats: () => window.getLifecycleStats(),
 
         // ===== 余额查询 =====
         balance: () => window.__balanceStore.get()
@@ -271,6 +272,12 @@
         window.__messageRouter.resetStats();
         window.__apiHandler.clearAll();
         window.__subscriptionManager.clearAll();
+        if (window.__lifecycleManager) {
+            window.__lifecycleManager.clear();
+        }
+        if (window.__changeFeed) {
+            window.__changeFeed.requestSnapshot();
+        }
     };
 
     /**
@@ -279,18 +286,61 @@
      * @returns {Object} {eventDeleted, offersHcapDeleted, offersEventDeleted}
      */
     window.deleteEvent = function(eventKey) {
-        // 删除 event
-        const eventDeleted = window.__eventsStore.delete(eventKey);
+        // 删除 event + 两个 offers 存储,同时清理索引
+        if (window.__lifecycleManager) {
+            return window.__lifecycleManager.evictEvent(eventKey);
+        }
 
-        // 删除相关 offers (两个存储)
+        const eventDeleted = window.__eventsStore.delete(eventKey);
         const offersHcapDeleted = window.__offersHcapStore.delete(eventKey);
         const offersEventDeleted = window.__offersEventStore.delete(eventKey);
 
-        // TODO: 清理索引 (需要知道原始event的信息)
-
         return { eventDeleted, offersHcapDeleted, offersEventDeleted };
     };
 
+    // ========== 全局 API: 生命周期淘汰 ==========
+
+    /**
+     * 配置淘汰策略
+     * @param {Object} config - {eventEvictMs, eventStaleMs, betRetentionMs, sweepInterval}
+     */
+    window.configureLifecycle = function(config) {
+        if (window.__lifecycleManager) {
+            window.__lifecycleManager.updateConfig(config);
+            return true;
+        }
+        return false;
+    };
+
+    /**
+     * 获取淘汰统计信息 (含堆大小)
+     */
+    window.getLifecycleStats = function() {
+        return window.__lifecycleManager ? window.__lifecycleManager.getStats() : null;
+    };
+
+    // ========== 全局 API: 变更流 (Python 副本) ==========
+
+    /**
+     * 启用变更流: 推送完整快照后按 intervalMs 推送增量
+     * @param {Object} options - {intervalMs, heartbeatMs}
+     */
+    window.enableChangeFeed = function(options) {
+        return window.__changeFeed ? window.__changeFeed.enable(options || {}) : null;
+    };
+
+    window.disableChangeFeed = function() {
+        if (window.__changeFeed) {
+            window.__changeFeed.disable();
+            return true;
+        }
+        return false;
+    };
+
+    window.getChangeFeedStats = function() {
+        return window.__changeFeed ? window.__changeFeed.getStats() : null;
+    };
+
     // ========== 全局 API: 订阅管理 ==========
 
     /**
@@ -305,6 +355,14 @@
         return false;
     };
 
+    /**
+     * 切换订阅模式 (由 OnlinePlatform 的订阅规划调用)
+     * @param {string} mode - 'discovery' (自动订阅所有 in-running 比赛) | 'targeted' (只订阅有 betslip / 未完成订单的比赛)
+     */
+    window.setSubscriptionMode = function(mode) {
+        return window.__subscriptionManager.setMode(mode);
+    };
+
     /**
      * 获取订阅统计信息
      */
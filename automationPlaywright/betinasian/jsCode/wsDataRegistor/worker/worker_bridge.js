@@ -0,0 +1,125 @@
+// Registor Worker 桥接 (在页面主线程执行)
+// 职责: 用打包好的 registor 源码启动 Web Worker,并把主线程的 registor API 换成消息转发
+//
+// 启动后:
+// - _0websocket_hook.js 检测到 window.__registorWorker,直接转发原始帧,主线程不再 JSON.parse / 路由
+// - window.registorEvaluate(source, arg) 在 worker 内执行查询,返回 Promise
+// - window.queryData / getSubscriptionStats 等全局 API 变为返回 Promise 的代理
+
+(function () {
+    /**
+     * 启动 registor worker
+     * @param {string} bundleSource - worker_runtime.js + 所有 registor 文件拼接后的源码
+     * @returns {Promise<boolean>} worker 启动并通过探测返回 true
+     */
+    window.__startRegistorWorker = async function (bundleSource) {
+        if (window.__registorWorker) {
+            return true;
+        }
+
+        let worker;
+        let blobUrl;
+        try {
+            blobUrl = URL.createObjectURL(new Blob([bundleSource], { type: 'text/javascript' }));
+            worker = new Worker(blobUrl);
+        } catch (e) {
+            // 站点 CSP 不允许 blob worker 时回退到主线程模式
+            console.warn('[RegistorWorker] 无法创建 worker:', e);
+            return false;
+        }
+
+        const pending = new Map();  // id → {resolve, reject}
+        let nextId = 0;
+
+        worker.onmessage = function (event) {
+            const payload = event.data;
+            if (!payload) return;
+
+            if (payload.type === 'result') {
+                const entry = pending.get(payload.id);
+                if (!entry) return;
+                pending.delete(payload.id);
+                if (payload.ok) {
+                    entry.resolve(payload.value);
+                } else {
+                    entry.reject(new Error(payload.error));
+                }
+            } else if (payload.type === 'ws_send') {
+                window.sendWebSocketData(payload.data);
+            } else if (payload.type === 'deltas') {
+                // 变更流批次转交 Python binding
+                if (typeof window.__registorOnDeltas === 'function') {
+                    window.__registorOnDeltas(payload.batch);
+                }
+            }
+        };
+
+        worker.onerror = function (e) {
+            console.error('[RegistorWorker] worker error:', e.message || e);
+        };
+
+        const evaluate = function (source, arg) {
+            return new Promise((resolve, reject) => {
+                const id = ++nextId;
+                pending.set(id, { resolve, reject });
+                worker.postMessage({ type: 'evaluate', id: id, source: String(source), arg: arg });
+            });
+        };
+
+        // 探测: 确认 registor 在 worker 内加载完成 (也能发现 CSP 禁止 eval 的情况)
+        try {
+            const ready = await Promise.race([
+                evaluate('() => typeof window.registerMessage === "function" && typeof window.queryData === "object"'),
+                new Promise(resolve => setTimeout(() => resolve(false), 5000))
+            ]);
+            if (!ready) {
+                throw new Error('registor not ready');
+            }
+        } catch (e) {
+            console.warn('[RegistorWorker] worker 探测失败,回退到主线程模式:', e);
+            worker.terminate();
+            URL.revokeObjectURL(blobUrl);
+            return false;
+        }
+
+        window.__registorWorker = worker;
+        window.registorEvaluate = evaluate;
+
+        // ========== 主线程 API 代理 ==========
+        const call = (path) => (...args) => evaluate(
+            '(args) => ' + path + '(...args)',
+            args
+        );
+
+        window.registerMessage = function (message) {
+            worker.postMessage({ type: 'message', message: message });
+            return true;
+        };
+
+        window.queryData = new Proxy({}, {
+            get: (target, name) => (typeof name === 'string' ? call('window.queryData.' + name) : undefined)
+        });
+
+        for (const name of [
+            'getSubscriptionStats',
+            'configureSubscription',
+            'setSubscriptionMode',
+            'manualSubscribe',
+            'isWatched',
+            'getRouterStats',
+            'getLifecycleStats',
+            'configureLifecycle',
+            'enableChangeFeed',
+            'disableChangeFeed',
+            'getChangeFeedStats',
+            'clearAllData',
+            'deleteEvent',
+            'getWorkerStats'
+        ]) {
+            window[name] = call('window.' + name);
+        }
+
+        console.log('[RegistorWorker] registor 已迁移到 worker');
+        return true;
+    };
+})();
@@ -0,0 +1,130 @@
+// Registor Worker 运行时 (在 Web Worker 内执行,打包时放在所有 registor 文件之前)
+// 职责: 提供 window 兼容层,接收主线程转发的原始帧并路由,响应主线程的查询请求
+//
+// 主线程 → worker:
+//   "<raw frame string>"                      原始 cpricefeed 帧 (直接转发,主线程不解析)
+//   {type: 'message', message}                单条已解析消息 (registerMessage 兼容)
+//   {type: 'evaluate', id, source, arg}       执行查询代码 (与 page.evaluate 语义一致)
+// worker → 主线程:
+//   {type: 'result', id, ok, value | error}   查询结果
+//   {type: 'ws_send', data}                   需要通过 cpricefeed 发送的数据 (watch / unwatch)
+//   {type: 'deltas', batch}                   变更流批次 (由主线程转交 Python binding)
+
+self.window = self;
+
+// ========== WebSocket 兼容层 (实际发送由主线程完成) ==========
+const workerSocket = {
+    readyState: 1,
+    send: function (data) {
+        self.postMessage({ type: 'ws_send', data: data });
+    }
+};
+
+window.getWebSocketInstance = function () {
+    return workerSocket;
+};
+
+window.sendWebSocketData = function (data) {
+    workerSocket.send(data);
+    return true;
+};
+
+// ========== 变更流推送 (worker 内无法直接调用 Playwright binding) ==========
+window.__registorDeltaSink = function (batch) {
+    self.postMessage({ type: 'deltas', batch: batch });
+};
+
+// ========== 帧处理 (与 _0websocket_hook.js 相同的过滤规则) ==========
+let frameCount = 0;
+
+function handleFrame(raw) {
+    frameCount++;
+
+    let data;
+    try {
+        data = JSON.parse(raw);
+    } catch (e) {
+        return;
+    }
+
+    if (!window.registerMessage || !Array.isArray(data)) {
+        return;
+    }
+
+    for (let i = 0; i < data.length; i++) {
+        const message = data[i];
+        if (Array.isArray(message)) {
+            const isRegularMessage = message.length >= 3;
+            const isApiMessage = message.length === 2 && message[0] === 'api';
+
+            if (isRegularMessage || isApiMessage) {
+                try {
+                    window.registerMessage(message);
+                } catch (e) {
+                    // Silent error
+                }
+            }
+        }
+    }
+}
+
+// ========== 查询执行 ==========
+// source 可以是函数表达式 (以 arg 调用)、普通表达式,或语句 (与 page.evaluate 一致,
+// 例如 "window.configureSubscription({...});"),编译结果按 source 缓存
+const compiledSources = new Map();
+
+function compileSource(source) {
+    let compiled = compiledSources.get(source);
+    if (!compiled) {
+        try {
+            compiled = new Function(
+                'arg',
+                'const __value = (' + source + '\n);\n' +
+                'return typeof __value === "function" ? __value(arg) : __value;'
+            );
+        } catch (e) {
+            if (!(e instanceof SyntaxError)) {
+                throw e;
+            }
+            // 不是表达式: 按语句执行 (结果为 undefined)
+            compiled = new Function('arg', source);
+        }
+        compiledSources.set(source, compiled);
+    }
+    return compiled;
+}
+
+async function handleEvaluate({ id, source, arg }) {
+    try {
+        const value = await compileSource(source)(arg);
+        self.postMessage({ type: 'result', id: id, ok: true, value: value });
+    } catch (e) {
+        self.postMessage({ type: 'result', id: id, ok: false, error: String(e && e.message || e) });
+    }
+}
+
+self.onmessage = function (event) {
+    const payload = event.data;
+
+    if (typeof payload === 'string') {
+        handleFrame(payload);
+        return;
+    }
+
+    if (!payload) {
+        return;
+    }
+
+    if (payload.type === 'evaluate') {
+        handleEvaluate(payload);
+    } else if (payload.type === 'message' && window.registerMessage) {
+        window.registerMessage(payload.message);
+    }
+};
+
+window.getWorkerStats = function () {
+    return {
+        frames: frameCount,
+        compiled_sources: compiledSources.size
+    };
+};
@@ -7,7 +7,29 @@ from .inject_hook import (
     inject_websocket_hook,
     check_websocket_status,
     get_recent_ws_messages,
-    send_websocket_data
+    set_ws_message_capture,
+    send_websocket_data,
+    set_subscription_mode,
+    get_subscription_mode
+)
+
+from .registor_worker import (
+    is_worker_mode,
+    start_registor_worker,
+    evaluate_registor
+)
+
+from .registor_replica import (
+    RegistorReplica,
+    get_replica,
+    enable_change_feed,
+    disable_change_feed
+)
+
+from .compact_codec import (
+    is_compact_enabled,
+    decode_compact,
+    evaluate_compact
 )
 
 from .inject_registors import (
@@ -42,7 +64,26 @@ __all__ = [
     'inject_websocket_hook',
     'check_websocket_status',
     'get_recent_ws_messages',
+    'set_ws_message_capture',
     'send_websocket_data',
+    'set_subscription_mode',
+    'get_subscription_mode',
+
+    # Worker 模式
+    'is_worker_mode',
+    'start_registor_worker',
+    'evaluate_registor',
+
+    # 变更流副本
+    'RegistorReplica',
+    'get_replica',
+    'enable_change_feed',
+    'disable_change_feed',
+
+    # 紧凑传输模式
+    'is_compact_enabled',
+    'decode_compact',
+    'evaluate_compact',
 
     # 数据注册器相关
     'inject_data_registors',
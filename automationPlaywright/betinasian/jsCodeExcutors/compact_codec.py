@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+BetInAsian 紧凑传输模式
+
+批量查询 (inRunningSport 比赛列表 / getAllPrices bookie 列表 / 订单列表) 的结果
+在页面内由 compact_codec.js 编码为一个紧凑 JSON 字符串:
+- 对象数组 → 列式表,重复的 key 只传一次
+- sport / bookie / competition_name 等字段的字符串 → 字符串表下标
+
+Python 侧 json.loads 一次后按列还原为 dict 列表,返回结构与普通查询一致
+(列式表中缺失的字段还原为 None)
+"""
+from typing import Any, Dict, List, Optional, Sequence
+import json
+import logging
+
+from .registor_worker import evaluate_registor
+
+logger = logging.getLogger(__name__)
+
+
+def is_compact_enabled(compact: Optional[bool] = None) -> bool:
+    """
+    查询函数的 compact 参数为 None 时取 settings.BETINASIAN_COMPACT_TRANSFER
+    """
+    if compact is not None:
+        return compact
+    try:
+        from configs.settings import Settings as settings
+        return bool(getattr(settings, 'BETINASIAN_COMPACT_TRANSFER', False))
+    except ImportError:
+        return False
+
+
+def decode_compact(payload: str) -> Any:
+    """
+    解码 compact_codec.js 的输出
+
+    Args:
+        payload: 紧凑 JSON 字符串
+
+    Returns:
+        还原后的查询结果 (结构与普通 page.evaluate 返回值一致)
+    """
+    envelope = json.loads(payload)
+    strings: List[str] = envelope['$s']
+    intern = frozenset(envelope['$i'])
+    return _decode_value(envelope['$v'], strings, intern)
+
+
+def _decode_value(value: Any, strings: List[str], intern: frozenset) -> Any:
+    if isinstance(value, list):
+        return [_decode_value(item, strings, intern) for item in value]
+
+    if not isinstance(value, dict):
+        return value
+
+    if '$t' in value:
+        return _decode_table(value, strings, intern)
+
+    return {
+        key: _decode_field(key, item, strings, intern)
+        for key, item in value.items()
+    }
+
+
+def _decode_table(table: Dict[str, Any], strings: List[str], intern: frozenset) -> List[Dict]:
+    columns = table['$t']
+    if not columns:
+        return [{} for _ in range(table['$n'])]
+
+    decoded_columns = [
+        _decode_column(key, column, strings, intern)
+        for key, column in zip(columns, table['$c'])
+    ]
+    return [dict(zip(columns, row)) for row in zip(*decoded_columns)]
+
+
+def _decode_column(key: str, column: List[Any], strings: List[str], intern: frozenset) -> List[Any]:
+    # 快速路径: 驻留列直接查表,纯标量列原样返回
+    if key in intern:
+        return [
+            strings[item] if type(item) is int else _decode_field(key, item, strings, intern)
+            for item in column
+        ]
+    if not any(isinstance(item, (dict, list)) for item in column):
+        return column
+    return [_decode_value(item, strings, intern) for item in column]
+
+
+def _decode_field(key: str, value: Any, strings: List[str], intern: frozenset) -> Any:
+    if key in intern:
+        if isinstance(value, int) and not isinstance(value, bool):
+            return strings[value]
+        if isinstance(value, dict) and '$r' in value:
+            return _decode_value(value['$r'], strings, intern)
+        return value
+    return _decode_value(value, strings, intern)
+
+
+async def evaluate_compact(
+    page: Any,
+    expression: str,
+    arg: Any = None,
+    intern_fields: Optional[Sequence[str]] = None
+) -> Any:
+    """
+    以紧凑模式执行 registor 查询 (自动适配 worker 模式)
+
+    Args:
+        page: Playwright Page 对象
+        expression: JS 函数表达式或普通表达式 (与 evaluate_registor 相同)
+        arg: 传给函数表达式的参数
+        intern_fields: 需要字符串驻留的字段名 (默认使用 compact_codec.js 的默认列表)
+
+    Returns:
+        解码后的查询结果
+
+    Examples:
+        >>> events = await evaluate_compact(page, 'window.queryData.inRunningSport("fb")')
+    """
+    wrapped = (
+        "async (__compactArg) => {\n"
+        f"    const __value = ({expression}\n);\n"
+        "    const __result = await (typeof __value === 'function' ? __value(__compactArg.arg) : __value);\n"
+        "    return window.__compactCodec.encode(__result, __compactArg.intern || undefined);\n"
+        "}"
+    )
+    payload = await evaluate_registor(
+        page,
+        wrapped,
+        {'arg': arg, 'intern': list(intern_fields) if intern_fields else None}
+    )
+    return decode_compact(payload)
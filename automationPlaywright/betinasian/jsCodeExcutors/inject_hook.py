@@ -2,12 +2,64 @@
 """
 BetInAsian Hook 注入器
 """
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+import json
 import logging
 from utils import get_js_loader
+from .registor_worker import start_registor_worker, evaluate_registor
 
 logger = logging.getLogger(__name__)
 
+# 数据注册器文件加载顺序 (按依赖关系)
+REGISTOR_FILES = [
+    # 第1层: Events 模块
+    ('wsDataRegistor/core/events/events_store.js', 'Events Store'),
+    ('wsDataRegistor/core/events/events_manager.js', 'Events Manager'),
+
+    # Offers 模块
+    ('wsDataRegistor/core/offers/offers_hcap_store.js', 'Offers Hcap Store'),
+    ('wsDataRegistor/core/offers/offers_event_store.js', 'Offers Event Store'),
+    ('wsDataRegistor/core/offers/offers_hcap_manager.js', 'Offers Hcap Manager'),
+    ('wsDataRegistor/core/offers/offers_event_manager.js', 'Offers Event Manager'),
+
+    # Balance 模块
+    ('wsDataRegistor/core/balance/balance_store.js', 'Balance Store'),
+
+    # Managers 模块
+    ('wsDataRegistor/core/managers/watch_manager.js', 'Watch Manager'),
+    ('wsDataRegistor/core/managers/subscription_manager.js', 'Subscription Manager'),
+    ('wsDataRegistor/core/managers/lifecycle_manager.js', 'Lifecycle Manager'),
+    ('wsDataRegistor/core/managers/change_feed.js', 'Change Feed'),
+
+    # PMM (Price Match Message) 模块
+    ('wsDataRegistor/core/pmm/pmm_store.js', 'PMM Store'),
+    ('wsDataRegistor/core/pmm/pmm_query.js', 'PMM Query'),
+    ('wsDataRegistor/core/pmm/pmm_handler.js', 'PMM Handler'),
+
+    # Order & Bet 模块
+    ('wsDataRegistor/core/orders/order_adapter.js', 'Order Adapter'),
+    ('wsDataRegistor/core/orders/bet_adapter.js', 'Bet Adapter'),
+    ('wsDataRegistor/core/orders/order_state_machine.js', 'Order State Machine'),
+    ('wsDataRegistor/core/orders/order_store.js', 'Order Store'),
+    ('wsDataRegistor/core/orders/bet_store.js', 'Bet Store'),
+    ('wsDataRegistor/core/orders/order_query.js', 'Order Query'),
+
+    # 第2层: Handler 模块
+    ('wsDataRegistor/handlers/event_handler.js', 'Event Handler'),
+    ('wsDataRegistor/handlers/offers_handler.js', 'Offers Handler'),
+    ('wsDataRegistor/handlers/api_handler.js', 'API Handler'),
+    ('wsDataRegistor/handlers/order_handler.js', 'Order Handler'),
+    ('wsDataRegistor/handlers/bet_handler.js', 'Bet Handler'),
+
+    # 第3层: Router 和 Query Engine
+    ('wsDataRegistor/message_router.js', 'Message Router'),
+    ('wsDataRegistor/query_engine.js', 'Query Engine'),
+    ('wsDataRegistor/compact_codec.js', 'Compact Codec'),
+
+    # 第4层: 统一入口
+    ('wsDataRegistor/index.js', 'Main Index')
+]
+
 
 def load_js_file(file_name: str, platform_name: str = 'betinasian') -> str:
     """
@@ -36,10 +88,30 @@ def load_js_file(file_name: str, platform_name: str = 'betinasian') -> str:
         return ""
 
 
+def build_configure_subscription_source(subscribe_sports) -> str:
+    """
+    构造配置订阅策略的 JS 代码 (主线程 / worker 模式共用)
+
+    Args:
+        subscribe_sports: 订阅的运动类型列表
+
+    Returns:
+        str: 调用 window.configureSubscription 的语句
+    """
+    sports_json = json.dumps(subscribe_sports)
+    return f"""
+                window.configureSubscription({{
+                    sports: {sports_json},
+                    autoSubscribeDelay: 10000
+                }});
+            """
+
+
 async def inject_websocket_hook(
     page: Any,
     handler_name: str = "BetInAsian",
-    subscribe_sports: list = None
+    subscribe_sports: list = None,
+    worker_mode: bool = False
 ) -> bool:
     """
     注入 WebSocket Hook 和数据注册器到页面
@@ -48,6 +120,7 @@ async def inject_websocket_hook(
         page: Playwright Page 对象
         handler_name: 处理器名称(用于日志)
         subscribe_sports: 要自动订阅的运动列表,如 ['basket', 'fb'],默认 ['basket']
+        worker_mode: 数据注册器运行在 Web Worker 中 (不可用时自动回退到主线程)
 
     Returns:
         bool: 注入成功返回 True,失败返回 False
@@ -98,55 +171,17 @@ async def inject_websocket_hook(
         # ========== 第2步: 加载并注入数据注册器 ==========
         print(f"\n[{handler_name}] 📦 开始加载数据注册器系统...")
 
-        # 定义加载顺序 (按依赖关系)
-        registor_files = [
-            # 第1层: Events 模块
-            ('wsDataRegistor/core/events/events_store.js', 'Events Store'),
-            ('wsDataRegistor/core/events/events_manager.js', 'Events Manager'),
-
-            # Offers 模块
-            ('wsDataRegistor/core/offers/offers_hcap_store.js', 'Offers Hcap Store'),
-            ('wsDataRegistor/core/offers/offers_event_store.js', 'Offers Event Store'),
-            ('wsDataRegistor/core/offers/offers_hcap_manager.js', 'Offers Hcap Manager'),
-            ('wsDataRegistor/core/offers/offers_event_manager.js', 'Offers Event Manager'),
-
-            # Balance 模块
-            ('wsDataRegistor/core/balance/balance_store.js', 'Balance Store'),
-
-            # Managers 模块
-            ('wsDataRegistor/core/managers/watch_manager.js', 'Watch Manager'),
-            ('wsDataRegistor/core/managers/subscription_manager.js', 'Subscription Manager'),
-
-            # PMM (Price Match Message) 模块
-            ('wsDataRegistor/core/pmm/pmm_store.js', 'PMM Store'),
-            ('wsDataRegistor/core/pmm/pmm_query.js', 'PMM Query'),
-            ('wsDataRegistor/core/pmm/pmm_handler.js', 'PMM Handler'),
-
-            # Order & Bet 模块
-            ('wsDataRegistor/core/orders/order_adapter.js', 'Order Adapter'),
-            ('wsDataRegistor/core/orders/bet_adapter.js', 'Bet Adapter'),
-            ('wsDataRegistor/core/orders/order_state_machine.js', 'Order State Machine'),
-            ('wsDataRegistor/core/orders/order_store.js', 'Order Store'),
-            ('wsDataRegistor/core/orders/bet_store.js', 'Bet Store'),
-            ('wsDataRegistor/core/orders/order_query.js', 'Order Query'),
-
-            # 第2层: Handler 模块
-            ('wsDataRegistor/handlers/event_handler.js', 'Event Handler'),
-            ('wsDataRegistor/handlers/offers_handler.js', 'Offers Handler'),
-            ('wsDataRegistor/handlers/api_handler.js', 'API Handler'),
-            ('wsDataRegistor/handlers/order_handler.js', 'Order Handler'),
-            ('wsDataRegistor/handlers/bet_handler.js', 'Bet Handler'),
-
-            # 第3层: Router 和 Query Engine
-            ('wsDataRegistor/message_router.js', 'Message Router'),
-            ('wsDataRegistor/query_engine.js', 'Query Engine'),
-
-            # 第4层: 统一入口
-            ('wsDataRegistor/index.js', 'Main Index')
-        ]
-
-        # 按顺序加载和执行
-        for file_path, name in registor_files:
+        # Worker 模式: 所有 store / 索引放进 worker,主线程只转发原始帧
+        use_worker = False
+        if worker_mode:
+            use_worker = await start_registor_worker(
+                page,
+                [file_path for file_path, _ in REGISTOR_FILES],
+                handler_name=handler_name
+            )
+
+        # 按顺序加载和执行 (主线程模式)
+        for file_path, name in ([] if use_worker else REGISTOR_FILES):
             code = load_js_file(file_name=file_path, platform_name='betinasian')
 
             if not code:
@@ -177,6 +212,9 @@ async def inject_websocket_hook(
             'Balance Store': 'window.__balanceStore',
             'Watch Manager': 'window.__watchManager',
             'Subscription Manager': 'window.__subscriptionManager',
+            'Lifecycle Manager': 'window.__lifecycleManager',
+            'Change Feed': 'window.__changeFeed',
+            'Compact Codec': 'window.__compactCodec',
             'PMM Store': 'window.pmmStore',
             'PMM Handler': 'window.__pmmHandler',
             'Order Adapter': 'window.orderAdapter',
@@ -191,7 +229,11 @@ async def inject_websocket_hook(
         all_ok = True
         for name, check_expr in checks.items():
             try:
-                result = await page.evaluate(f"typeof {check_expr}")
+                # Hook 始终在主线程,其余模块在 worker 模式下位于 worker 内
+                if check_expr == 'window.getWebSocketStatus':
+                    result = await page.evaluate(f"typeof {check_expr}")
+                else:
+                    result = await evaluate_registor(page, f"typeof {check_expr}")
                 expected = 'function' if 'register' in check_expr or 'getWebSocketStatus' in check_expr else 'object'
 
                 if result != expected:
@@ -209,16 +251,9 @@ async def inject_websocket_hook(
 
         # ========== 第4步: 配置订阅策略 ==========
         print(f"\n[{handler_name}] ⚙️ 配置订阅策略...")
-        import json
-        sports_json = json.dumps(subscribe_sports)
 
         try:
-            await page.evaluate(f"""
-                window.configureSubscription({{
-                    sports: {sports_json},
-                    autoSubscribeDelay: 10000
-                }});
-            """)
+            await evaluate_registor(page, build_configure_subscription_source(subscribe_sports))
             print(f"[{handler_name}] ✅ 订阅策略已配置: {subscribe_sports}")
         except Exception as e:
             print(f"[{handler_name}] ❌ 配置订阅策略失败: {e}")
@@ -253,10 +288,47 @@ async def check_websocket_status(page: Any, handler_name: str = "BetInAsian") ->
         return {"error": str(e)}
 
 
+async def set_ws_message_capture(
+    page: Any,
+    enabled: bool = True,
+    size: int = 100,
+    sample_every: int = 1,
+    handler_name: str = "BetInAsian"
+) -> bool:
+    """
+    开启/关闭 cpricefeed 原始消息采集 (仅调试用,默认关闭)
+
+    Args:
+        page: Playwright Page 对象
+        enabled: True 开启, False 关闭并释放缓冲区
+        size: 环形缓冲区长度
+        sample_every: 每 N 条消息采样 1 条
+        handler_name: 处理器名称
+
+    Returns:
+        bool: 设置成功返回 True
+    """
+    try:
+        if enabled:
+            result = await page.evaluate(
+                "(options) => window.enableMessageCapture(options)",
+                {"size": size, "sampleEvery": sample_every}
+            )
+        else:
+            result = await page.evaluate("() => window.disableMessageCapture()")
+        print(f"[{handler_name}] 🐞 消息采集已{'开启' if enabled else '关闭'}")
+        return bool(result)
+    except Exception as e:
+        logger.error(f"[{handler_name}] 设置消息采集失败: {e}")
+        return False
+
+
 async def get_recent_ws_messages(page: Any, count: int = 10, handler_name: str = "BetInAsian") -> list:
     """
     获取最近的 WebSocket 消息
 
+    需要先调用 set_ws_message_capture 开启采集,否则返回空列表
+
     Args:
         page: Playwright Page 对象
         count: 获取消息数量
@@ -296,3 +368,55 @@ async def send_websocket_data(page: Any, data: str, handler_name: str = "BetInAs
     except Exception as e:
         logger.error(f"[{handler_name}] 发送 WebSocket 数据失败: {e}")
         return False
+
+
+async def set_subscription_mode(page: Any, mode: str, handler_name: str = "BetInAsian") -> bool:
+    """
+    切换 hcaps 订阅模式 (由 OnlinePlatform 的订阅规划调用)
+
+    Args:
+        page: Playwright Page 对象
+        mode: 'discovery' 自动订阅所有 in-running 比赛 (赔率源 feed 页面);
+              'targeted' 只订阅本页面有 betslip / 未完成订单的比赛
+        handler_name: 处理器名称
+
+    Returns:
+        bool: 切换成功返回 True
+    """
+    try:
+        result = await evaluate_registor(
+            page,
+            "(mode) => window.setSubscriptionMode(mode)",
+            mode
+        )
+        print(f"[{handler_name}] ✅ 订阅模式: {mode} "
+              f"(新订阅 {result.get('watched')}, 退订 {result.get('unwatched')})")
+        return True
+    except Exception as e:
+        logger.error(f"[{handler_name}] 切换订阅模式失败: {e}")
+        return False
+
+
+async def get_subscription_mode(page: Any, handler_name: str = "BetInAsian") -> Optional[str]:
+    """
+    读取页面当前的 hcaps 订阅模式
+
+    页面刷新或重新注入 registor 后会回到默认的 'discovery',
+    订阅规划据此判断是否需要重新下发
+
+    Args:
+        page: Playwright Page 对象
+        handler_name: 处理器名称
+
+    Returns:
+        'discovery' | 'targeted'; registor 未注入或读取失败返回 None
+    """
+    try:
+        stats = await evaluate_registor(
+            page,
+            "window.getSubscriptionStats ? window.getSubscriptionStats() : null"
+        )
+        return stats.get('mode') if stats else None
+    except Exception as e:
+        logger.debug(f"[{handler_name}] 读取订阅模式失败: {e}")
+        return None
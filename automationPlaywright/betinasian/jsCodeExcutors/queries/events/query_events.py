@@ -2,16 +2,21 @@
 """
 BetInAsian 事件查询工具
 """
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional
 import logging
 
+from ...registor_worker import evaluate_registor
+from ...registor_replica import get_replica
+from ...compact_codec import is_compact_enabled, evaluate_compact
+
 logger = logging.getLogger(__name__)
 
 
 async def query_betinasian_events(
     page: Any,
     sport_type: str,
-    in_running_only: bool = True
+    in_running_only: bool = True,
+    compact: Optional[bool] = None
 ) -> List[Dict]:
     """
     查询 betinasian 的比赛事件
@@ -20,6 +25,7 @@ async def query_betinasian_events(
         page: Playwright Page 对象
         sport_type: 运动类型 (如: 'fb', 'basket')
         in_running_only: 是否只查询正在进行的比赛 (默认 True)
+        compact: 是否使用紧凑传输 (默认取 settings.BETINASIAN_COMPACT_TRANSFER)
 
     Returns:
         List[Dict]: 比赛列表
@@ -41,9 +47,14 @@ async def query_betinasian_events(
         True
     """
     try:
+        # 变更流副本新鲜时直接本地查找
+        replica = get_replica(page)
+        if replica is not None and in_running_only:
+            return replica.in_running_events(sport_type)
+
         # 🔍 调试：先检查 window.queryData 是否存在
         # logger.info(f"🔍 检查 window.queryData 是否存在...")
-        check_result = await page.evaluate('''
+        check_result = await evaluate_registor(page, '''
             () => {
                 return {
                     queryData_exists: typeof window.queryData !== 'undefined',
@@ -78,7 +89,8 @@ async def query_betinasian_events(
         # 执行查询（使用 asyncio.wait_for 添加超时保护）
         import asyncio
         try:
-            events = await asyncio.wait_for(page.evaluate(js_code), timeout=5.0)  # 5秒超时
+            evaluate = evaluate_compact if is_compact_enabled(compact) else evaluate_registor
+            events = await asyncio.wait_for(evaluate(page, js_code), timeout=5.0)  # 5秒超时
         except asyncio.TimeoutError:
             logger.error(f"❌ page.evaluate 超时 (5秒)")
             return []
@@ -169,7 +181,12 @@ async def get_event_score(
             }})()
         '''
 
-        result = await page.evaluate(js_code)
+        # 变更流副本新鲜时直接本地查找
+        replica = get_replica(page)
+        if replica is not None and replica.get_event(event_key) is not None:
+            result = replica.get_event_score(event_key)
+        else:
+            result = await evaluate_registor(page, js_code)
 
         if result.get('error'):
             logger.warning(f"未找到比赛: {event_key}")
@@ -226,14 +243,14 @@ async def query_active_markets(
         # logger.info(f"{'='*60}")
 
         # 获取 Offers Store 总数
-        total_offers_hcap = await page.evaluate('window.__offersHcapStore.count()')
-        total_offers_event = await page.evaluate('window.__offersEventStore.count()')
+        total_offers_hcap = await evaluate_registor(page, 'window.__offersHcapStore.count()')
+        total_offers_event = await evaluate_registor(page, 'window.__offersEventStore.count()')
         # logger.info(f"Offers Hcap Store 总事件数: {total_offers_hcap}")
         # logger.info(f"Offers Event Store 总事件数: {total_offers_event}")
 
         # 获取前10个 offers 的样本 (hcap)
         if total_offers_hcap > 0:
-            sample_offers_hcap = await page.evaluate('''
+            sample_offers_hcap = await evaluate_registor(page, '''
                 Array.from(window.getOffersHcapData().values()).slice(0, 10).map(o => ({
                     event_key: o.event_key,
                     offer_types: Object.keys(o.raw_data)
@@ -245,7 +262,7 @@ async def query_active_markets(
 
         # 获取前10个 offers_event 的样本
         if total_offers_event > 0:
-            sample_offers_event = await page.evaluate('''
+            sample_offers_event = await evaluate_registor(page, '''
                 Array.from(window.getOffersEventData().values()).slice(0, 10).map(o => ({
                     event_key: o.event_key,
                     offer_types: Object.keys(o.raw_data)
@@ -257,7 +274,7 @@ async def query_active_markets(
 
         # 查询该 event 的 offers
         offers_js = f'window.queryData.offers("{event_key}")'
-        offers = await page.evaluate(offers_js)
+        offers = await evaluate_registor(page, offers_js)
 
         logger.info(f"\n目标比赛 ({event_key}) offers:")
 
@@ -6,6 +6,10 @@ Python interface for querying order and bet data from browser stores
 """
 from typing import Dict, Any, List, Optional
 import logging
+
+from ...registor_worker import evaluate_registor
+from ...registor_replica import get_replica
+from ...compact_codec import is_compact_enabled, evaluate_compact
 import json
 
 logger = logging.getLogger(__name__)
@@ -52,7 +56,15 @@ async def get_order_by_id(
         }
     """
     try:
-        result = await page.evaluate(
+        # 变更流副本新鲜时直接本地查找 (订单监控的轮询不再触发 page.evaluate)
+        replica = get_replica(page)
+        if replica is not None:
+            order = replica.get_order(order_id)
+            if order is not None:
+                return order
+
+        result = await evaluate_registor(
+            page,
             """
             (order_id) => {
                 if (!window.queryData || !window.queryData.queryOrderById) {
@@ -94,7 +106,8 @@ async def get_order_by_id(
 
 async def get_orders_by_status(
     page,
-    status: str
+    status: str,
+    compact: Optional[bool] = None
 ) -> List[Dict[str, Any]]:
     """
     Get orders by status
@@ -102,12 +115,15 @@ async def get_orders_by_status(
     Args:
         page: Playwright Page object
         status: Order status (CREATED, OPEN, PLACED, FINISHED, EXPIRED_LOCAL)
+        compact: Use compact columnar transfer (default: settings.BETINASIAN_COMPACT_TRANSFER)
 
     Returns:
         List of order data
     """
     try:
-        result = await page.evaluate(
+        evaluate = evaluate_compact if is_compact_enabled(compact) else evaluate_registor
+        result = await evaluate(
+            page,
             """
             (status) => {
                 if (!window.queryData || !window.queryData.getOrdersByStatus) {
@@ -143,7 +159,8 @@ async def get_orders_by_status(
 
 async def get_orders_by_event(
     page,
-    event_id: str
+    event_id: str,
+    compact: Optional[bool] = None
 ) -> List[Dict[str, Any]]:
     """
     Get orders by event
@@ -151,12 +168,15 @@ async def get_orders_by_event(
     Args:
         page: Playwright Page object
         event_id: Event ID
+        compact: Use compact columnar transfer (default: settings.BETINASIAN_COMPACT_TRANSFER)
 
     Returns:
         List of order data
     """
     try:
-        result = await page.evaluate(
+        evaluate = evaluate_compact if is_compact_enabled(compact) else evaluate_registor
+        result = await evaluate(
+            page,
             """
             (event_id) => {
                 if (!window.queryData || !window.queryData.getOrdersByEvent) {
@@ -226,7 +246,8 @@ async def get_order_with_bets(
         }
     """
     try:
-        result = await page.evaluate(
+        result = await evaluate_registor(
+            page,
             """
             (order_id) => {
                 if (!window.queryData || !window.queryData.getOrderWithBets) {
@@ -299,7 +320,8 @@ async def check_order_slippage(
         }
     """
     try:
-        result = await page.evaluate(
+        result = await evaluate_registor(
+            page,
             """
             (order_id) => {
                 if (!window.queryData || !window.queryData.checkOrderSlippage) {
@@ -355,7 +377,8 @@ async def get_bet_by_id(
         Bet data with slippage
     """
     try:
-        result = await page.evaluate(
+        result = await evaluate_registor(
+            page,
             """
             (bet_id) => {
                 if (!window.queryData || !window.queryData.queryBetById) {
@@ -410,7 +433,8 @@ async def get_bets_by_order(
         List of bet data
     """
     try:
-        result = await page.evaluate(
+        result = await evaluate_registor(
+            page,
             """
             (order_id) => {
                 if (!window.queryData || !window.queryData.getBetsByOrder) {
@@ -470,7 +494,8 @@ async def get_order_bet_stats(page) -> Dict[str, Any]:
         }
     """
     try:
-        result = await page.evaluate(
+        result = await evaluate_registor(
+            page,
             """
             () => {
                 if (!window.queryData || !window.queryData.getOrderBetStats) {
@@ -9,6 +9,7 @@ Functions:
 - get_all_prices: Get all bookie prices for a market
 - get_total_amount_at_price: Get total amount available at a specific price
 - get_price_by_betslip_id: Get best price for a specific betslip
+- get_stake_plan: Plan a stake against the market depth ladder (VWAP / limit price)
 - get_pmm_stats: Get PMM store statistics
 - wait_for_pmm_ready: Wait for PMM data to be ready and stable
 """
@@ -18,6 +19,8 @@ from .get_price import (
     get_all_prices,
     get_total_amount_at_price,
     get_price_by_betslip_id,
+    get_stake_plan,
+    plan_stake_on_ladder,
     get_pmm_stats
 )
 from .wait_pmm_ready import wait_for_pmm_ready
@@ -27,6 +30,8 @@ __all__ = [
     'get_all_prices',
     'get_total_amount_at_price',
     'get_price_by_betslip_id',
+    'get_stake_plan',
+    'plan_stake_on_ladder',
     'get_pmm_stats',
     'wait_for_pmm_ready'
 ]
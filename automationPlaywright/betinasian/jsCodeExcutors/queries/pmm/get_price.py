@@ -4,8 +4,12 @@ BetInAsian Get Price
 
 Get best executable price from PMM (Price Match Message) data
 """
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import logging
+
+from ...registor_worker import evaluate_registor
+from ...registor_replica import get_replica
+from ...compact_codec import is_compact_enabled, evaluate_compact
 import json
 
 logger = logging.getLogger(__name__)
@@ -53,7 +57,8 @@ async def get_best_price(
         logger.info(f"Getting best price: event_id={event_id}, bet_type={bet_type}")
 
         # Call window.queryData.getBestPrice()
-        result = await page.evaluate(
+        result = await evaluate_registor(
+            page,
             """
             (params) => {
                 if (!window.queryData || !window.queryData.getBestPrice) {
@@ -107,7 +112,8 @@ async def get_best_price(
 async def get_all_prices(
     page,
     event_id: str,
-    bet_type: str
+    bet_type: str,
+    compact: Optional[bool] = None
 ) -> Dict[str, Any]:
     """
     Get all bookie prices for a market
@@ -116,6 +122,7 @@ async def get_all_prices(
         page: Playwright Page object
         event_id: Event ID
         bet_type: Bet type
+        compact: Use compact columnar transfer (default: settings.BETINASIAN_COMPACT_TRANSFER)
 
     Returns:
         {
@@ -133,7 +140,9 @@ async def get_all_prices(
     try:
         logger.info(f"Getting all prices: event_id={event_id}, bet_type={bet_type}")
 
-        result = await page.evaluate(
+        evaluate = evaluate_compact if is_compact_enabled(compact) else evaluate_registor
+        result = await evaluate(
+            page,
             """
             (params) => {
                 if (!window.queryData || !window.queryData.getAllPrices) {
@@ -226,7 +235,8 @@ async def get_total_amount_at_price(
     try:
         logger.info(f"Getting total amount at price: event_id={event_id}, bet_type={bet_type}, target_price={target_price}")
 
-        result = await page.evaluate(
+        result = await evaluate_registor(
+            page,
             """
             (params) => {
                 if (!window.queryData || !window.queryData.getTotalAmountAtPrice) {
@@ -275,6 +285,148 @@ async def get_total_amount_at_price(
         }
 
 
+def plan_stake_on_ladder(
+    levels: List[Dict[str, Any]],
+    stake: float,
+    min_price: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Walk a depth ladder from the best price down and fill the stake
+
+    Args:
+        levels: Ladder levels [{'price', 'amount', 'bookies'}], best price first
+        stake: Stake to fill (ladder currency)
+        min_price: Lowest acceptable price (levels below it are not used)
+
+    Returns:
+        {
+            'stake': 100.0,
+            'filled': 80.0,            # Amount fillable at >= min_price
+            'fully_filled': False,
+            'vwap': 1.92,              # Volume-weighted average price of the filled part
+            'best_price': 1.95,
+            'limit_price': 1.9,        # Worst level used (limit price that covers the fill)
+            'fills': [{'price': 1.95, 'amount': 50.0, 'cumulative': 50.0}, ...]
+        }
+    """
+    remaining = stake
+    filled = 0.0
+    weighted = 0.0
+    fills = []
+
+    for level in levels:
+        if remaining <= 0:
+            break
+        price = level.get('price') or 0
+        if min_price is not None and price < min_price:
+            break
+        amount = min(level.get('amount') or 0, remaining)
+        if amount <= 0:
+            continue
+
+        remaining -= amount
+        filled += amount
+        weighted += amount * price
+        fills.append({'price': price, 'amount': amount, 'cumulative': filled})
+
+    return {
+        'stake': stake,
+        'filled': filled,
+        'fully_filled': remaining <= 1e-9,
+        'vwap': weighted / filled if filled > 0 else None,
+        'best_price': fills[0]['price'] if fills else None,
+        'limit_price': fills[-1]['price'] if fills else None,
+        'fills': fills
+    }
+
+
+async def get_stake_plan(
+    page,
+    event_id: str,
+    bet_type: str,
+    stake: float,
+    min_price: Optional[float] = None,
+    required_currency: str = "GBP"
+) -> Dict[str, Any]:
+    """
+    Plan a stake against the market depth ladder (achievable VWAP / limit price)
+
+    The ladder aggregates up to MAX_DEPTH_TIERS price levels of every eligible
+    bookie in the market (pmm_store marketAggregates). Reads the change-feed
+    replica when it is fresh, otherwise queryData.getMarketLadder().
+
+    Args:
+        page: Playwright Page object
+        event_id: Event ID
+        bet_type: Bet type
+        stake: Stake to fill, in the ladder currency
+        min_price: Lowest acceptable price (default: no limit)
+        required_currency: Ladder currency (only "GBP" is aggregated)
+
+    Returns:
+        plan_stake_on_ladder() result plus 'success', 'source' and 'levels';
+        {'success': False, 'reason': 'xxx'} when no ladder is available
+
+    Examples:
+        >>> plan = await get_stake_plan(page, "2026-01-06,41236,40814", "for,ml,a", 200, min_price=1.9)
+        >>> if not plan['fully_filled']:
+        ...     print(f"Only {plan['filled']} available, VWAP {plan['vwap']}")
+    """
+    try:
+        ladder = None
+        source = 'replica'
+
+        replica = get_replica(page)
+        if replica:
+            ladder = replica.market_ladder(event_id, bet_type, required_currency)
+
+        if ladder is None:
+            source = 'page'
+            ladder = await evaluate_registor(
+                page,
+                """
+                (params) => {
+                    if (!window.queryData || !window.queryData.getMarketLadder) {
+                        return null;
+                    }
+                    return window.queryData.getMarketLadder(params.event_id, params.bet_type);
+                }
+                """,
+                {
+                    "event_id": event_id,
+                    "bet_type": bet_type
+                }
+            )
+
+        if not ladder or ladder.get('currency') != required_currency:
+            return {
+                'success': False,
+                'reason': 'no_ladder' if not ladder else 'currency_not_supported'
+            }
+
+        plan = plan_stake_on_ladder(ladder.get('levels') or [], stake, min_price)
+        logger.info(
+            f"Stake plan ({source}): stake={stake}, filled={plan['filled']:.2f}, "
+            f"vwap={plan['vwap']}, limit={plan['limit_price']}"
+        )
+        return {
+            'success': True,
+            'source': source,
+            'currency': required_currency,
+            'min_price': min_price,
+            'levels': len(ladder.get('levels') or []),
+            **plan
+        }
+
+    except Exception as e:
+        logger.error(f"❌ Exception in get_stake_plan: {e}")
+        return {
+            'success': False,
+            'error': str(e),
+            'reason': 'exception'
+        }
+
+
 async def get_price_by_betslip_id(
     page,
     betslip_id: str,
@@ -320,8 +472,19 @@ async def get_price_by_betslip_id(
     try:
         logger.info(f"Getting price by betslip_id: {betslip_id}")
 
+        # Local lookup when the change-feed replica is fresh and holds this betslip
+        replica = get_replica(page)
+        result = replica.price_by_betslip(betslip_id, required_amount, required_currency) if replica else None
+        if result is not None:
+            if result.get('success'):
+                logger.info(f"✅ 找到最佳赔率 (副本): {result.get('bookie')} @ {result.get('price')}")
+            else:
+                logger.warning(f"⚠️ 未找到最佳赔率 (副本): {result.get('reason')}")
+            return result
+
         # Call window.queryData.queryBetslipById() then extract best price
-        result = await page.evaluate(
+        result = await evaluate_registor(
+            page,
             """
             (params) => {
                 if (!window.queryData || !window.queryData.queryBetslipById) {
@@ -514,7 +677,8 @@ async def get_pmm_stats(page) -> Dict[str, Any]:
         }
     """
     try:
-        result = await page.evaluate(
+        result = await evaluate_registor(
+            page,
             """
             () => {
                 const stats = {};
@@ -7,6 +7,8 @@ Wait for PMM data to be stable and ready for execution
 from typing import Dict, Any, Optional
 import logging
 
+from ...registor_worker import evaluate_registor
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,12 +31,15 @@ async def wait_for_pmm_ready(
     3. Available amount >= required_amount
     4. Data is stable (no changes for stable_ms milliseconds)
 
+    The page side is notification-driven: readiness is re-evaluated only when
+    pmmStore recomputes a different best_executable for this betslip.
+
     Args:
         page: Playwright Page object
         betslip_id: Betslip ID from CreateBetslip response
         required_amount: Required stake amount (default: 10.0)
         required_currency: Required currency (default: "GBP")
-        poll_interval: Polling interval in ms (default: 50)
+        poll_interval: Deprecated, ignored by the page (kept for compatibility)
         stable_ms: Stable duration in ms (default: 300)
         total_timeout: Total timeout in ms (default: 4000)
         min_updates: Minimum update count (default: 1)
@@ -78,7 +83,8 @@ async def wait_for_pmm_ready(
                    f"amount={required_amount} {required_currency}")
 
         # Call window.queryData.waitForPMMReady()
-        result = await page.evaluate(
+        result = await evaluate_registor(
+            page,
             """
             (params) => {
                 if (!window.queryData || !window.queryData.waitForPMMReady) {
@@ -0,0 +1,458 @@
+# -*- coding: utf-8 -*-
+"""
+BetInAsian 数据注册器 Python 副本
+
+浏览器内的 change_feed.js 每隔 intervalMs 把增量变更 (event / betslip 价格 / order)
+批量推送到 Python,这里按批次应用到本地副本:
+- GetOdd / BettingOrder / 订单监控的读取变为本地字典查找,不再每次 page.evaluate
+- 副本不新鲜 (未启用 / 心跳超时 / 序号缺口后尚未收到快照) 时,查询函数自动回退到页面查询
+
+副本数据结构与对应的页面查询返回值一致:
+- events: 与 window.__eventsStore 中的事件对象相同
+- orders: 与 queryData.queryOrderById() 返回值相同 (含 bet_bar / state_summary)
+- betslips: pmm_store 的 betslip,bookies 为 {bookie: data}
+"""
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import time
+import weakref
+
+from .registor_worker import evaluate_registor
+
+logger = logging.getLogger(__name__)
+
+BINDING_NAME = '__registorOnDeltas'
+
+# 页面 → 副本 (页面关闭后自动移除)
+_replicas: "weakref.WeakKeyDictionary[Any, RegistorReplica]" = weakref.WeakKeyDictionary()
+
+
+class RegistorReplica:
+    """registor 数据的本地副本 (由变更流批次驱动)"""
+
+    def __init__(self, max_idle: float = 3.0):
+        """
+        Args:
+            max_idle: 超过该秒数没有收到批次 (含心跳) 视为不新鲜
+        """
+        self.max_idle = max_idle
+
+        self.events: Dict[str, Dict] = {}      # event_key → event
+        self.betslips: Dict[str, Dict] = {}    # betslip_id → betslip
+        self.orders: Dict[str, Dict] = {}      # str(order_id) → order (JS 侧 id 可能是数字)
+
+        # 索引
+        self._in_running: Dict[str, set] = {}  # sport → {event_key}
+        self._by_market: Dict[str, set] = {}   # "event_id|bet_type" → {betslip_id}
+
+        self.last_seq: Optional[int] = None
+        self.last_received_at: Optional[float] = None
+
+        # 序号出现缺口后副本已与页面不一致,在收到下一个快照前不可读取
+        self.stale = False
+        self.snapshot_requested_at: Optional[float] = None
+
+        self.stats = {
+            'batches': 0,
+            'snapshots': 0,
+            'seq_gaps': 0,
+            'snapshot_requests': 0,
+            'batches_skipped': 0,
+            'events_applied': 0,
+            'betslips_applied': 0,
+            'orders_applied': 0
+        }
+
+    # ==================== 批次应用 ====================
+
+    def apply(self, batch: Dict[str, Any]) -> None:
+        """
+        应用一个变更批次
+
+        Args:
+            batch: change_feed.js 推送的批次
+        """
+        seq = batch.get('seq')
+
+        if batch.get('snapshot'):
+            self.clear()
+            self.stale = False
+            self.snapshot_requested_at = None
+            self.stats['snapshots'] += 1
+        else:
+            if self.last_seq is not None and seq is not None and seq != self.last_seq + 1 and not self.stale:
+                # binding 调用按顺序到达,出现缺口说明页面侧丢批: 副本已不一致,等待快照
+                self.stats['seq_gaps'] += 1
+                self.stale = True
+                logger.warning(f"⚠️ 变更流序号不连续: {self.last_seq} → {seq},副本停用直到收到快照")
+            if self.stale:
+                # 不一致的副本上继续应用增量没有意义,只记录序号 (心跳仍然更新)
+                self.stats['batches_skipped'] += 1
+                self.last_seq = seq
+                self.last_received_at = time.monotonic()
+                return
+
+        for event_key in batch.get('removed_events') or ():
+            self._remove_event(event_key)
+        for event in batch.get('events') or ():
+            self._upsert_event(event)
+
+        for betslip_id in batch.get('removed_betslips') or ():
+            self._remove_betslip(betslip_id)
+        for betslip in batch.get('betslips') or ():
+            self._upsert_betslip(betslip)
+
+        for order_id in batch.get('removed_orders') or ():
+            self.orders.pop(str(order_id), None)
+        for order in batch.get('orders') or ():
+            self.orders[str(order['order_id'])] = order
+
+        self.stats['batches'] += 1
+        self.stats['events_applied'] += len(batch.get('events') or ())
+        self.stats['betslips_applied'] += len(batch.get('betslips') or ())
+        self.stats['orders_applied'] += len(batch.get('orders') or ())
+        self.last_seq = seq
+        self.last_received_at = time.monotonic()
+
+    def _upsert_event(self, event: Dict) -> None:
+        event_key = event.get('event_key')
+        old = self.events.get(event_key)
+        if old is not None:
+            self._unindex_event(old)
+        self.events[event_key] = event
+        if event.get('isInRunning') and event.get('sport'):
+            self._in_running.setdefault(event['sport'], set()).add(event_key)
+
+    def _remove_event(self, event_key: str) -> None:
+        old = self.events.pop(event_key, None)
+        if old is not None:
+            self._unindex_event(old)
+
+    def _unindex_event(self, event: Dict) -> None:
+        keys = self._in_running.get(event.get('sport'))
+        if keys is not None:
+            keys.discard(event.get('event_key'))
+            if not keys:
+                del self._in_running[event.get('sport')]
+
+    def _upsert_betslip(self, betslip: Dict) -> None:
+        betslip_id = betslip['betslip_id']
+        if betslip_id not in self.betslips:
+            market_key = f"{betslip.get('event_id')}|{betslip.get('bet_type')}"
+            self._by_market.setdefault(market_key, set()).add(betslip_id)
+        self.betslips[betslip_id] = betslip
+
+    def _remove_betslip(self, betslip_id: str) -> None:
+        old = self.betslips.pop(betslip_id, None)
+        if old is None:
+            return
+        market_key = f"{old.get('event_id')}|{old.get('bet_type')}"
+        ids = self._by_market.get(market_key)
+        if ids is not None:
+            ids.discard(betslip_id)
+            if not ids:
+                del self._by_market[market_key]
+
+    def clear(self) -> None:
+        """清空副本 (收到快照批次时调用)"""
+        self.events.clear()
+        self.betslips.clear()
+        self.orders.clear()
+        self._in_running.clear()
+        self._by_market.clear()
+
+    # ==================== 状态 ====================
+
+    def needs_snapshot(self) -> bool:
+        """副本不一致且 (尚未请求快照 / 上次请求已超过 max_idle 仍未收到) 时需要请求快照"""
+        if not self.stale:
+            return False
+        if self.snapshot_requested_at is None:
+            return True
+        return time.monotonic() - self.snapshot_requested_at > self.max_idle
+
+    def is_fresh(self) -> bool:
+        """副本是否可用于读取 (已收到快照、未出现序号缺口且心跳未超时)"""
+        if self.last_received_at is None or self.stale:
+            return False
+        return time.monotonic() - self.last_received_at <= self.max_idle
+
+    def get_stats(self) -> Dict[str, Any]:
+        age = None if self.last_received_at is None else round(time.monotonic() - self.last_received_at, 3)
+        return {
+            **self.stats,
+            'fresh': self.is_fresh(),
+            'stale': self.stale,
+            'last_seq': self.last_seq,
+            'age_seconds': age,
+            'events': len(self.events),
+            'betslips': len(self.betslips),
+            'orders': len(self.orders)
+        }
+
+    # ==================== 查询 (与页面查询返回结构一致) ====================
+
+    def in_running_events(self, sport: str) -> List[Dict]:
+        """等同于 queryData.inRunningSport(sport)"""
+        return [self.events[key] for key in self._in_running.get(sport, ()) if key in self.events]
+
+    def get_event(self, event_key: str) -> Optional[Dict]:
+        return self.events.get(event_key)
+
+    def get_event_score(self, event_key: str) -> Dict[str, Any]:
+        """等同于 get_event_score() 中的页面脚本"""
+        event = self.events.get(event_key)
+        if event is None:
+            return {'error': 'Event not found', 'has_score': False}
+
+        ir_status = event.get('ir_status') or {}
+        score = ir_status.get('score') if isinstance(ir_status, dict) else None
+        if not isinstance(score, list):
+            return {
+                'event_key': event.get('event_key'),
+                'has_score': False,
+                'is_in_running': event.get('isInRunning') or False,
+                'home_team': event.get('home'),
+                'away_team': event.get('away')
+            }
+
+        home_score, away_score = (score + [None, None])[:2]
+        return {
+            'event_key': event.get('event_key'),
+            'home_score': home_score,
+            'away_score': away_score,
+            'home_team': event.get('home'),
+            'away_team': event.get('away'),
+            'has_score': True,
+            'is_in_running': event.get('isInRunning') or False,
+            'raw_score': score,
+            'ir_status': ir_status
+        }
+
+    def get_order(self, order_id: str) -> Optional[Dict]:
+        """等同于 queryData.queryOrderById(order_id)"""
+        return self.orders.get(str(order_id))
+
+    def get_betslip(self, betslip_id: str) -> Optional[Dict]:
+        return self.betslips.get(betslip_id)
+
+    def get_betslips_by_market(self, event_id: str, bet_type: str) -> List[Dict]:
+        ids = self._by_market.get(f"{event_id}|{bet_type}", ())
+        return [self.betslips[i] for i in ids if i in self.betslips]
+
+    def price_by_betslip(
+        self,
+        betslip_id: str,
+        required_amount: float = 10.0,
+        required_currency: str = "GBP"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        等同于 get_price_by_betslip_id() 中的页面脚本 (不含 debug_info)
+
+        Returns:
+            价格结果; 副本中没有该 betslip 时返回 None (调用方回退到页面查询)
+        """
+        betslip = self.betslips.get(betslip_id)
+        if betslip is None:
+            return None
+
+        valid_bookies = []
+        for bookie, data in (betslip.get('bookies') or {}).items():
+            if (data.get('status') or {}).get('code') != 'success':
+                continue
+
+            top_available = data.get('top_available')
+            if not top_available or top_available.get('currency') != required_currency:
+                continue
+
+            executable_tiers = [
+                tier for tier in (data.get('price_tiers') or [])
+                if tier.get('min', 0) <= required_amount
+            ]
+            if not executable_tiers:
+                continue
+
+            # 优先选择 max 最大的,其次选择赔率最高的 (与页面脚本一致)
+            tier = max(executable_tiers, key=lambda t: (t.get('max', 0), t.get('price', 0)))
+            valid_bookies.append({
+                'bookie': bookie,
+                'price': tier.get('price'),
+                'available': top_available,
+                'status': data.get('status'),
+                'updated_at': data.get('last_update'),
+                'tier': tier
+            })
+
+        if not valid_bookies:
+            return {
+                'success': False,
+                'reason': 'no_executable_price',
+                'betslip_id': betslip.get('betslip_id'),
+                'event_id': betslip.get('event_id'),
+                'bet_type': betslip.get('bet_type')
+            }
+
+        best = max(valid_bookies, key=lambda b: b['price'])
+        return {
+            'success': True,
+            'betslip_id': betslip.get('betslip_id'),
+            'event_id': betslip.get('event_id'),
+            'bet_type': betslip.get('bet_type'),
+            'bookie': best['bookie'],
+            'price': best['price'],
+            'available': best['available'],
+            'updated_at': best['updated_at'],
+            'tier': best['tier'],
+            'all_bookies': len(valid_bookies)
+        }
+
+
+    def market_ladder(
+        self,
+        event_id: str,
+        bet_type: str,
+        currency: str = "GBP",
+        expire_ms: int = 30000
+    ) -> Optional[Dict[str, Any]]:
+        """
+        等同于 queryData.getMarketLadder(event_id, bet_type) 的 levels 部分
+
+        Returns:
+            {'currency', 'levels': [{'price', 'amount', 'bookies'}]} (价格从高到低);
+            副本中没有该市场的 betslip 时返回 None (调用方回退到页面查询)
+        """
+        betslips = self.get_betslips_by_market(event_id, bet_type)
+        if not betslips:
+            return None
+
+        now_ms = time.time() * 1000
+        ladder: Dict[float, List[float]] = {}  # price → [amount, bookies]
+        for betslip in betslips:
+            for data in (betslip.get('bookies') or {}).values():
+                if (data.get('status') or {}).get('code') != 'success':
+                    continue
+                if (data.get('top_available') or {}).get('currency') != currency:
+                    continue
+                if now_ms - (data.get('last_update') or 0) > expire_ms:
+                    continue
+
+                for tier in (data.get('depth_tiers') or data.get('price_tiers') or []):
+                    price = tier.get('price') or 0
+                    if price <= 1.0:
+                        continue
+                    level = ladder.setdefault(price, [0.0, 0])
+                    level[0] += tier.get('max') or 0
+                    level[1] += 1
+
+        return {
+            'currency': currency,
+            'levels': [
+                {'price': price, 'amount': amount, 'bookies': bookies}
+                for price, (amount, bookies) in sorted(ladder.items(), reverse=True)
+            ]
+        }
+
+
+def get_replica(page: Any) -> Optional[RegistorReplica]:
+    """
+    获取页面的新鲜副本
+
+    Returns:
+        RegistorReplica: 副本已启用且新鲜; 否则返回 None (调用方走页面查询)
+    """
+    try:
+        replica = _replicas.get(page)
+    except TypeError:
+        return None
+    if replica is not None and replica.is_fresh():
+        return replica
+    return None
+
+
+def _on_deltas(source: Dict[str, Any], batch: Dict[str, Any]) -> None:
+    """binding 回调: 按来源页面找到副本并应用批次 (副本不一致时请求页面推送快照)"""
+    page = source.get('page')
+    replica = _replicas.get(page)
+    if replica is None or not batch:
+        return
+    try:
+        replica.apply(batch)
+    except Exception as e:
+        logger.error(f"❌ 应用变更批次失败: {e}", exc_info=True)
+        return
+
+    if replica.needs_snapshot():
+        replica.snapshot_requested_at = time.monotonic()
+        replica.stats['snapshot_requests'] += 1
+        asyncio.get_running_loop().create_task(_request_snapshot(page))
+
+
+async def _request_snapshot(page: Any) -> None:
+    """让页面的变更流在下一批次推送完整快照"""
+    try:
+        await evaluate_registor(page, "() => window.__changeFeed && window.__changeFeed.requestSnapshot()")
+    except Exception as e:
+        logger.warning(f"请求变更流快照失败: {e}")
+
+
+async def enable_change_feed(
+    page: Any,
+    replica: Optional[RegistorReplica] = None,
+    interval_ms: int = 100,
+    heartbeat_ms: int = 1000,
+    handler_name: str = "BetInAsian"
+) -> Optional[RegistorReplica]:
+    """
+    启用变更流,把 registor 数据同步到 Python 副本
+
+    需要在 inject_websocket_hook 之后调用 (worker 模式同样适用)
+
+    Args:
+        page: Playwright Page 对象
+        replica: 复用的副本对象 (默认新建)
+        interval_ms: 批次推送间隔
+        heartbeat_ms: 无变更时的心跳间隔 (副本据此判断新鲜度)
+        handler_name: 处理器名称(用于日志)
+
+    Returns:
+        RegistorReplica: 启用成功返回副本,失败返回 None (查询继续走页面)
+    """
+    if replica is None:
+        replica = RegistorReplica(max_idle=max(3.0, heartbeat_ms * 3 / 1000))
+
+    try:
+        _replicas[page] = replica
+        try:
+            await page.expose_binding(BINDING_NAME, _on_deltas)
+        except Exception as e:
+            # 同一页面重复调用 prepare_work 时 binding 已存在,回调按页面查找副本,可直接复用
+            if 'already registered' not in str(e):
+                raise
+
+        stats = await evaluate_registor(
+            page,
+            "(options) => window.enableChangeFeed(options)",
+            {'intervalMs': interval_ms, 'heartbeatMs': heartbeat_ms}
+        )
+    except Exception as e:
+        _replicas.pop(page, None)
+        logger.error(f"[{handler_name}] ❌ 启用变更流失败: {e}")
+        return None
+
+    if not stats or not stats.get('enabled'):
+        _replicas.pop(page, None)
+        print(f"[{handler_name}] ⚠️ 变更流不可用,继续使用页面查询")
+        return None
+
+    print(f"[{handler_name}] ✅ 变更流已启用 (每 {interval_ms}ms 同步到 Python 副本)")
+    return replica
+
+
+async def disable_change_feed(page: Any) -> None:
+    """停止变更流,之后的查询回到页面查询"""
+    _replicas.pop(page, None)
+    try:
+        await evaluate_registor(page, "() => window.disableChangeFeed()")
+    except Exception as e:
+        logger.warning(f"停止变更流失败: {e}")
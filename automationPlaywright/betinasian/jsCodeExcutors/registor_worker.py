@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+BetInAsian 数据注册器 Worker 模式
+
+可选模式: 把 wsDataRegistor 的所有 store / 索引放进页面的 Web Worker,
+cpricefeed 原始帧由 hook 直接转发给 worker,主线程不再做 JSON.parse 和路由,
+高峰期的推送不会拖慢 page.evaluate 和下单请求
+
+查询统一通过 evaluate_registor() 执行:
+- 普通模式: 等同于 page.evaluate
+- Worker 模式: 把同一段 JS 发送到 worker 内执行,返回结果结构不变
+"""
+from typing import Any, Iterable
+import logging
+import weakref
+
+from utils import get_js_loader
+
+logger = logging.getLogger(__name__)
+
+PLATFORM_NAME = 'betinasian'
+WORKER_RUNTIME_FILE = 'wsDataRegistor/worker/worker_runtime.js'
+WORKER_BRIDGE_FILE = 'wsDataRegistor/worker/worker_bridge.js'
+
+# 已启用 worker 模式的页面 (页面关闭后自动移除)
+_worker_pages: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+def is_worker_mode(page: Any) -> bool:
+    """页面是否运行在 worker 模式"""
+    try:
+        return page in _worker_pages
+    except TypeError:
+        return False
+
+
+def build_worker_bundle(registor_files: Iterable[str]) -> str:
+    """
+    拼接 worker 源码: worker_runtime.js + 按依赖顺序排列的 registor 文件
+
+    每个文件包在独立的块作用域里,与逐个 page.evaluate 的行为一致
+    (各文件顶层的 const / class 不会互相冲突)
+
+    Args:
+        registor_files: 相对于 jsCode 目录的文件路径列表
+
+    Returns:
+        str: worker 源码,任一文件缺失时返回空字符串
+    """
+    js_loader = get_js_loader()
+    parts = []
+
+    for file_path in [WORKER_RUNTIME_FILE, *registor_files]:
+        content = js_loader.get_js_content(PLATFORM_NAME, file_path)
+        if content is None:
+            logger.error(f"[{PLATFORM_NAME}] Worker 打包失败,文件未找到: {file_path}")
+            return ""
+        parts.append(f"// ===== {file_path} =====\n{{\n{content}\n}}\n")
+
+    return "\n".join(parts)
+
+
+async def start_registor_worker(
+    page: Any,
+    registor_files: Iterable[str],
+    handler_name: str = "BetInAsian"
+) -> bool:
+    """
+    在页面中启动 registor worker
+
+    Args:
+        page: Playwright Page 对象
+        registor_files: registor 文件列表 (与主线程模式的加载顺序相同)
+        handler_name: 处理器名称(用于日志)
+
+    Returns:
+        bool: 启动成功返回 True; 失败 (例如站点 CSP 禁止 blob worker) 返回 False,调用方应回退到主线程模式
+    """
+    js_loader = get_js_loader()
+    bridge_code = js_loader.get_js_content(PLATFORM_NAME, WORKER_BRIDGE_FILE)
+    bundle = build_worker_bundle(registor_files)
+
+    if not bridge_code or not bundle:
+        return False
+
+    try:
+        await page.evaluate(bridge_code)
+        started = await page.evaluate(
+            "(bundle) => window.__startRegistorWorker(bundle)",
+            bundle
+        )
+    except Exception as e:
+        logger.error(f"[{handler_name}] ❌ 启动 registor worker 失败: {e}")
+        return False
+
+    if started:
+        _worker_pages.add(page)
+        print(f"[{handler_name}] ✅ 数据注册器已运行在 Web Worker 中")
+    else:
+        print(f"[{handler_name}] ⚠️ Web Worker 不可用,回退到主线程模式")
+
+    return bool(started)
+
+
+async def evaluate_registor(page: Any, expression: str, arg: Any = None) -> Any:
+    """
+    执行 registor 查询 (自动适配 worker 模式)
+
+    Args:
+        page: Playwright Page 对象
+        expression: JS 函数表达式或普通表达式 (与 page.evaluate 相同)
+        arg: 传给函数表达式的参数
+
+    Returns:
+        查询结果
+
+    Examples:
+        >>> await evaluate_registor(page, "(id) => window.queryData.queryOrderById(id)", order_id)
+    """
+    if is_worker_mode(page):
+        return await page.evaluate(
+            "([source, arg]) => window.registorEvaluate(source, arg)",
+            [expression, arg]
+        )
+
+    if arg is None:
+        return await page.evaluate(expression)
+    return await page.evaluate(expression, arg)
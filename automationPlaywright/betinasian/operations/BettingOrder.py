@@ -5,22 +5,75 @@ BetInAsian 下注订单
 简化的下单流程：
 1. 从 order_record 获取 betslip_id（需要先调用 GetOdd）
 2. 实时查询最新价格（通过 get_price_by_betslip_id）
-3. 提交订单
+3. 按市场深度梯队规划下注额 (可选, settings.BETINASIAN_DEPTH_SIZING) 并提交订单
 4. 等待订单数据（可选）
 5. 查询订单结果
 6. 监控订单状态（可选）
 """
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 import logging
+import math
 import asyncio
-from ..jsCodeExcutors.queries.pmm import get_price_by_betslip_id
+from ..jsCodeExcutors.queries.pmm import get_price_by_betslip_id, get_stake_plan
 from ..jsCodeExcutors.http_executors import place_order, delete_betslip
+from ..jsCodeExcutors.registor_worker import evaluate_registor
 
 from configs.settings import Settings as settings
 
 logger = logging.getLogger(__name__)
 
 
+async def _size_stake_by_depth(
+    page,
+    event_id: str,
+    bet_type: str,
+    price: float,
+    stake: float,
+    currency: str
+) -> Tuple[float, float, Optional[Dict[str, Any]]]:
+    """
+    按市场深度梯队规划下注额 (本地查询,不发网络请求)
+
+    BetInAsian 的订单以限价在所有 bookie 中成交 (价格 >= 限价),
+    因此"拆分到多个价格档位"等价于一张限价为最差档位的订单:
+    - 限价 order_odds 处深度足够: 价格和下注额不变
+    - 深度不足但在允许滑点内足够: 限价下调到覆盖下注额的最差档位
+    - 滑点内仍不足: 下注额缩减为可成交量 (梯队为空时不调整,避免数据暂缺时误拦截)
+
+    Returns:
+        (price, stake, plan): 调整后的限价 / 下注额,以及规划结果 (未规划时为 None)
+    """
+    fx = settings.BETINASIAN_DEPTH_FX_TO_GBP.get(currency)
+    if not fx or not price:
+        logger.info(f"  - 深度规划跳过: 货币 {currency} 未配置 GBP 折算比例")
+        return price, stake, None
+
+    min_price = price * (1 - settings.BETINASIAN_DEPTH_MAX_SLIPPAGE)
+    plan = await get_stake_plan(page, event_id, bet_type, stake * fx, min_price=min_price)
+    if not plan.get('success'):
+        logger.warning(f"⚠️ 深度规划失败: {plan.get('reason')}")
+        return price, stake, plan
+
+    logger.info(f"📊 深度规划: 可成交 {plan['filled']:.2f}/{plan['stake']:.2f} GBP, "
+                f"VWAP {plan['vwap']}, 最差档位 {plan['limit_price']} ({plan['source']})")
+
+    if plan['filled'] <= 0:
+        logger.warning(f"⚠️ 梯队中没有 >= {min_price:.3f} 的深度,按原价格和下注额提交")
+        return price, stake, plan
+
+    if plan['limit_price'] < price:
+        logger.info(f"  - 限价下调: {price} → {plan['limit_price']}")
+        price = plan['limit_price']
+
+    if not plan['fully_filled']:
+        sized_stake = math.floor(plan['filled'] / fx * 10) / 10
+        if 0 < sized_stake < stake:
+            logger.warning(f"⚠️ 深度不足,下注额缩减: {stake} → {sized_stake} {currency}")
+            stake = sized_stake
+
+    return price, stake, plan
+
+
 async def BettingOrder(
     self,
     dispatch_message: Dict[str, Any],
@@ -227,6 +280,13 @@ async def BettingOrder(
         # ========== Step 3: 提交订单 ==========
         best_price = cached_data.get('order_odds')
         best_bookie = cached_data.get('bookie')
+
+        depth_plan = None
+        if settings.BETINASIAN_DEPTH_SIZING:
+            best_price, stake, depth_plan = await _size_stake_by_depth(
+                self.page, event_id, bet_type, best_price, stake, currency
+            )
+
         logger.info("\n📤 Step 3: 提交订单...")
         logger.info(f"  - Price: {best_price} (来自 {best_bookie})")
         logger.info(f"  - Stake: {stake} {currency}")
@@ -318,6 +378,7 @@ async def BettingOrder(
             'status': 'order_created',
             'betting_amount': stake,
             'betting_odd': best_price,
+            'depth_plan': depth_plan,
             'needs_monitoring': True,  # 标识：需要后台监控
         }
 
@@ -428,7 +489,7 @@ async def BettingOrder(
 
                     # 检查 Bet Store 状态
                     logger.info("\n🔍 检查 Bet Store 状态...")
-                    bet_info = await self.page.evaluate("""
+                    bet_info = await evaluate_registor(self.page, """
                         (order_id) => {
                             // Bet Store 信息
                             const bet_store_exists = !!window.betStore;
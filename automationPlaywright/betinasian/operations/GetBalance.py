@@ -9,6 +9,8 @@ import logging
 import time
 import math
 
+from ..jsCodeExcutors.registor_worker import evaluate_registor
+
 logger = logging.getLogger(__name__)
 
 
@@ -70,7 +72,8 @@ async def GetBalance(self, **kwargs) -> Dict[str, Any]:
         logger.info(f"[{handler_name}] 开始获取余额...")
 
         # 从 WebSocket 数据存储查询余额
-        balance_data = await self.page.evaluate(
+        balance_data = await evaluate_registor(
+            self.page,
             """
             () => {
                 if (!window.queryData || !window.queryData.balance) {
@@ -2,18 +2,26 @@
 """
 BetInAsian 获取赔率
 """
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 import asyncio
 import time
-from utils.matchGameName import fuzzy_match_teams
+from utils.matchGameName import fuzzy_match_teams_batch
 from ..jsCodeExcutors.queries.events.query_events import query_betinasian_events, query_active_markets, get_event_score
-from ..MappingBetburgerToBetinisian import build_bet_type_from_spider
+from utils.marketSpec import market_spec_from_bet_data
+from ..MappingBetburgerToBetinisian import translate_market_spec
 from ..jsCodeExcutors.http_executors import create_betslip, delete_betslip
 from ..jsCodeExcutors.queries.pmm import get_price_by_betslip_id, wait_for_pmm_ready
+from ..jsCodeExcutors.registor_replica import get_replica
 
 logger = logging.getLogger(__name__)
 
+# 进行中的队名匹配批次 (运动类型 → 批次),所有账号共享: 比赛列表是公开数据,各页面一致
+_match_batches: Dict[str, Dict[str, Any]] = {}
+
+# 批次发起者被取消时写入的结果,等待者据此重新发起匹配
+_BATCH_RETRY = object()
+
 
 def _create_error_response(handler_name: str, order_id: str, message: str) -> Dict[str, Any]:
     """
@@ -38,6 +46,82 @@ def _create_error_response(handler_name: str, order_id: str, message: str) -> Di
     }
 
 
+async def _match_teams_coalesced(
+    self,
+    spider_home: str,
+    spider_away: str,
+    spider_sport_type: str
+) -> Tuple[List[Dict], Optional[Dict]]:
+    """
+    合并同时到达的队名匹配请求 (跨账号)
+
+    第一个请求立即查询比赛列表; 查询进行期间到达的同一运动的请求 (任意账号) 加入同一批次,
+    查询完成后用 fuzzy_match_teams_batch 一次匹配所有队名 (不额外增加等待时间)
+
+    变更流副本新鲜时比赛列表是同步读取的,没有可合并的等待,直接匹配本请求;
+    发起者被取消时只有它自己收到 CancelledError,等待者重新发起匹配
+
+    Returns:
+        (events, match_result): 比赛列表与本请求的匹配结果
+    """
+    replica = get_replica(self.page)
+    if replica is not None:
+        events = replica.in_running_events(spider_sport_type)
+        if not events:
+            return events, None
+        return events, fuzzy_match_teams_batch(
+            [(spider_home, spider_away)], events, threshold=0.8, platform='betinasian'
+        )[0]
+
+    while True:
+        batch = _match_batches.get(spider_sport_type)
+        if batch is None:
+            break
+        slot = len(batch['pairs'])
+        batch['pairs'].append((spider_home, spider_away))
+        outcome = await asyncio.shield(batch['future'])
+        if outcome is _BATCH_RETRY:
+            continue
+        events, results = outcome
+        return events, results[slot] if results else None
+
+    batch = {
+        'pairs': [(spider_home, spider_away)],
+        'future': asyncio.get_running_loop().create_future()
+    }
+    _match_batches[spider_sport_type] = batch
+
+    try:
+        try:
+            events = await query_betinasian_events(
+                page=self.page,
+                sport_type=spider_sport_type,
+                in_running_only=True
+            )
+        finally:
+            # 之后到达的请求开始新的批次
+            _match_batches.pop(spider_sport_type, None)
+
+        results = None
+        if events:
+            results = fuzzy_match_teams_batch(batch['pairs'], events, threshold=0.8, platform='betinasian')
+            if len(batch['pairs']) > 1:
+                logger.info(f"🔗 合并匹配 {len(batch['pairs'])} 组队名 ({spider_sport_type})")
+    except asyncio.CancelledError:
+        # 取消只属于发起者,等待者重新发起匹配
+        batch['future'].set_result(_BATCH_RETRY)
+        raise
+    except Exception as e:
+        # 查询失败时批次内其他请求一并失败
+        batch['future'].set_exception(e)
+        # 没有其他请求等待时避免 "exception never retrieved"
+        batch['future'].exception()
+        raise
+
+    batch['future'].set_result((events, results))
+    return events, results[0] if results else None
+
+
 async def get_event_key_by_team_name(
     self,
     spider_home: str,
@@ -80,12 +164,13 @@ async def get_event_key_by_team_name(
     """
     # logger.info(f"开始匹配比赛: {spider_home} vs {spider_away} ({spider_sport_type})")
 
-    # 1. 查询 betinasian 比赛列表
+    # 1. 查询 betinasian 比赛列表 (同时到达的请求合并为一次查询和一次批量匹配)
     # logger.info(f"📡 查询 BetInAsian 比赛列表...")
-    events = await query_betinasian_events(
-        page=self.page,
-        sport_type=spider_sport_type,
-        in_running_only=True
+    events, match_result = await _match_teams_coalesced(
+        self,
+        spider_home=spider_home,
+        spider_away=spider_away,
+        spider_sport_type=spider_sport_type
     )
 
     if not events:
@@ -103,19 +188,12 @@ async def get_event_key_by_team_name(
     #     for i, evt in enumerate(events[:5], 1):
     #         logger.info(f"  [{i}] {evt.get('home')} vs {evt.get('away')} ({evt.get('competition_name')})")
 
-    # 2. 队名匹配 (先精确匹配,失败后模糊匹配)
+    # 2. 队名匹配结果 (先精确匹配,失败后模糊匹配; 已在批次中完成)
     # logger.info(f"\n🔍 开始队名匹配...")
     # logger.info(f"  - 目标主队: {spider_home}")
     # logger.info(f"  - 目标客队: {spider_away}")
     # logger.info(f"  - 匹配阈值: 0.8")
 
-    match_result = fuzzy_match_teams(
-        spider_home=spider_home,
-        spider_away=spider_away,
-        events=events,
-        threshold=0.8
-    )
-
     if match_result:
         logger.info(f"匹配成功: event_key={match_result['event_key']}, "
                    f"type={match_result['match_type']}, score={match_result['score']:.2f}")
@@ -343,10 +421,11 @@ async def GetOdd(
         logger.warning(f"提取时间信息失败: {e}")
         match_phase = "UNKNOWN"
 
-    # 4. 验证必需参数
-    if not spider_market_id:
-        logger.error(f"❌ 缺少必需参数: spider_market_id")
-        return _create_error_response(handler_name, order_id, '缺少必需参数: spider_market_id')
+    # 4. 验证必需参数 (盘口解析为 MarketSpec, 见 utils/marketSpec)
+    market_spec = market_spec_from_bet_data(bet_data)
+    if market_spec is None:
+        logger.error(f"❌ 缺少或无法识别盘口参数: spider_market_id={spider_market_id}")
+        return _create_error_response(handler_name, order_id, f'缺少或无法识别盘口参数: spider_market_id={spider_market_id}')
 
     print(f"\n📊 盘口参数:")
     print(f"  - 爬虫盘口ID: {spider_market_id}")
@@ -361,10 +440,9 @@ async def GetOdd(
         足球 IR 格式盘口会使用实时比分:
         ("fb", "17", -0.5, home_score=1, away_score=2) -> "for,ir,1,2,ah,h,-2"
     """
-    bet_type = build_bet_type_from_spider(
-        sport_type=spider_sport_type,
-        spider_market_id=spider_market_id,
-        handicap_value=spider_handicap_value,
+    # 同时得到 spider_period 对应的 BetInAsian sport (预编译表,见 market_table.py)
+    bet_type, mapped_sport = translate_market_spec(
+        market_spec,
         home_score=home_score if spider_sport_type in ['fb', 'soccer'] else 0,
         away_score=away_score if spider_sport_type in ['fb', 'soccer'] else 0
     )
@@ -386,30 +464,15 @@ async def GetOdd(
     # 5.5 映射 spider_period 到 BetInAsian sport
     betinasian_sport = spider_sport_type
     print(f"  - 爬虫时段: {spider_period}")
-    # 足球时段映射
-    if spider_sport_type in ['fb', 'soccer']:
-        from ..MappingBetburgerToBetinisian.soccer.period_mapper import map_period_to_sport
-        betinasian_sport = map_period_to_sport(
-            spider_period=spider_period,
-            spider_market_id=spider_market_id
-        )
+    if spider_sport_type in ['fb', 'soccer', 'basket', 'basketball']:
+        betinasian_sport = mapped_sport
         if betinasian_sport != spider_sport_type:
-            print(f"\n🔄 时段映射 (足球):")
+            print(f"\n🔄 时段映射:")
             print(f"  - 爬虫时段: {spider_period}")
             print(f"  - 爬虫盘口ID: {spider_market_id}")
             print(f"  - 映射前: {spider_sport_type}")
             print(f"  - 映射后: {betinasian_sport}")
 
-    # 篮球时段映射
-    elif spider_sport_type in ['basket', 'basketball']:
-        from ..MappingBetburgerToBetinisian.basket.period_mapper import map_period_to_sport
-        betinasian_sport = map_period_to_sport(spider_period=spider_period)
-        if betinasian_sport != spider_sport_type:
-            print(f"\n🔄 时段映射 (篮球):")
-            print(f"  - 爬虫时段: {spider_period}")
-            print(f"  - 映射前: {spider_sport_type}")
-            print(f"  - 映射后: {betinasian_sport}")
-
     # 6. 调用 create_betslip, 申请一个 betslip ,并且会触发 ws 中接收 pmm 的数据.
     print(f"\n{'='*60}")
     print(f"📋 创建投注单")
@@ -2,7 +2,7 @@
 """
 BetInAsian 操作方法模块
 """
-from .prepare_work import prepare_work
+from .prepare_work import prepare_work, apply_subscription_plan, get_subscription_mode
 from .GetBalance import GetBalance
 from .GetOdd import GetOdd
 from .BettingOrder import BettingOrder, MonitorOrderStatus
@@ -11,6 +11,8 @@ from .CancelOrder import CancelOrder
 
 __all__ = [
     'prepare_work',
+    'apply_subscription_plan',
+    'get_subscription_mode',
     'GetBalance',
     'GetOdd',
     'BettingOrder',
@@ -2,7 +2,7 @@
 """
 BetInAsian 准备工作
 """
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
 import asyncio
 
@@ -22,6 +22,8 @@ async def prepare_work(
         target_url: 目标页面 URL
         subscribe_sports: 要订阅的运动列表,如 ['basket', 'fb'],默认 ['basket']
         **kwargs: 额外参数
+            - worker_mode: 数据注册器是否运行在 Web Worker 中 (默认取 settings.BETINASIAN_REGISTOR_WORKER)
+            - change_feed: 是否把 registor 变更同步到 Python 副本 (默认取 settings.BETINASIAN_CHANGE_FEED)
 
     Returns:
         {
@@ -73,11 +75,14 @@ async def prepare_work(
 
         # 导入注入函数
         from automationPlaywright.betinasian.jsCodeExcutors import inject_websocket_hook, check_websocket_status
+        from automationPlaywright.betinasian.jsCodeExcutors.registor_worker import evaluate_registor
+        from configs.settings import Settings as settings
 
         hook_success = await inject_websocket_hook(
             target_page,
             handler_name="BetInAsian",
-            subscribe_sports=subscribe_sports
+            subscribe_sports=subscribe_sports,
+            worker_mode=kwargs.get('worker_mode', settings.BETINASIAN_REGISTOR_WORKER)
         )
 
         if not hook_success:
@@ -105,11 +110,20 @@ async def prepare_work(
 
         # 查看订阅统计
         try:
-            sub_stats = await target_page.evaluate("window.getSubscriptionStats()")
+            sub_stats = await evaluate_registor(target_page, "window.getSubscriptionStats()")
             logger.info(f"订阅统计: {sub_stats}")
         except Exception as e:
             logger.warning(f"获取订阅统计失败: {e}")
 
+        # 启用变更流: 之后的比赛 / 价格 / 订单查询优先读本地副本
+        if kwargs.get('change_feed', settings.BETINASIAN_CHANGE_FEED):
+            from automationPlaywright.betinasian.jsCodeExcutors.registor_replica import enable_change_feed
+            self.registor_replica = await enable_change_feed(
+                target_page,
+                interval_ms=settings.BETINASIAN_CHANGE_FEED_INTERVAL_MS,
+                handler_name="BetInAsian"
+            )
+
         # ========== 第6步: 获取账户余额 ==========
         logger.info("获取账户余额...")
         try:
@@ -137,3 +151,37 @@ async def prepare_work(
             'page': None,
             'ws_status': None
         }
+
+
+async def apply_subscription_plan(self, mode: str, **kwargs) -> bool:
+    """
+    应用 OnlinePlatform 的跨账号订阅规划
+
+    赔率源 (feed) 账号负责发现,订阅所有 in-running 比赛的 hcaps;
+    其余账号只订阅自己有 betslip / 未完成订单的比赛,降低每个页面的 WS 流量和内存
+
+    Args:
+        mode: 'discovery' | 'targeted'
+
+    Returns:
+        bool: 切换成功返回 True
+    """
+    if not self.page:
+        return False
+
+    from automationPlaywright.betinasian.jsCodeExcutors import set_subscription_mode
+    return await set_subscription_mode(self.page, mode, handler_name=self.handler_name)
+
+
+async def get_subscription_mode(self, **kwargs) -> Optional[str]:
+    """
+    读取页面当前的订阅模式 (页面刷新 / 重新注入后会回到 'discovery')
+
+    Returns:
+        'discovery' | 'targeted'; 页面或 registor 不可用时返回 None
+    """
+    if not self.page:
+        return None
+
+    from automationPlaywright.betinasian.jsCodeExcutors import get_subscription_mode as read_subscription_mode
+    return await read_subscription_mode(self.page, handler_name=self.handler_name)
@@ -4,14 +4,30 @@ PIN888 handler 模块
 
 from .findHandicap import find_handicap
 from .findHandicapForArbitrage import find_handicap_for_arbitrage
-from .mappingBetParamsToIds import map_bet_params_to_ids
+from .mappingBetParamsToIds import (
+    map_bet_params_to_ids,
+    get_id_resolver_stats,
+    clear_id_resolver_cache,
+)
 from .pom import Pin888POM
-from .arbitrageRange import calculate_arbitrage_range
+from .arbitrageRange import calculate_arbitrage_range, ArbitrageRange, rank_lines_in_range
+from .sessionState import (
+    save_session_state,
+    restore_session_state,
+    delete_session_state,
+)
 
 __all__ = [
     'find_handicap',
     'find_handicap_for_arbitrage',
     'map_bet_params_to_ids',
+    'get_id_resolver_stats',
+    'clear_id_resolver_cache',
     'Pin888POM',
-    'calculate_arbitrage_range'
+    'calculate_arbitrage_range',
+    'ArbitrageRange',
+    'rank_lines_in_range',
+    'save_session_state',
+    'restore_session_state',
+    'delete_session_state',
 ]
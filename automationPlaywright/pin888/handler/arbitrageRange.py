@@ -3,7 +3,78 @@
 PIN888 平台套利补单区间计算
 根据成功平台的盘口参数,计算 PIN888 可补单的区间条件
 """
-from typing import Callable, Optional
+from typing import Callable, List, Optional, Sequence, Union
+import math
+
+
+class ArbitrageRange:
+    """
+    补单区间 [low, high] (闭区间,无界一侧为 ±inf)
+
+    可以像原来的 lambda 一样逐个调用 (condition(2.5)),
+    也可以用 rank_lines 一次性批量评估某个盘口的所有 (参数, 赔率) 线
+    """
+
+    __slots__ = ('low', 'high', 'description')
+
+    def __init__(self, low: float = -math.inf, high: float = math.inf, description: str = ''):
+        self.low = low
+        self.high = high
+        self.description = description
+
+    def __call__(self, value: float) -> bool:
+        return self.low <= value <= self.high
+
+    def rank_lines(
+        self,
+        params: Sequence[float],
+        odds: Sequence[float],
+        min_odds: Optional[float] = None
+    ) -> List[int]:
+        """
+        批量评估所有盘口线
+
+        Args:
+            params: 每条线的盘口参数 (points / spread)
+            odds: 每条线对应方向的赔率
+            min_odds: 可接受的最低赔率 (None 表示只要求赔率 > 0)
+
+        Returns:
+            list: 满足区间且赔率可接受的下标,按赔率从高到低排序 (赔率相同保持原顺序)
+        """
+        low, high = self.low, self.high
+        floor = min_odds if min_odds is not None else 0.0
+        indexes = [
+            i for i, (param, odd) in enumerate(zip(params, odds))
+            if low <= param <= high and odd > 0 and odd >= floor
+        ]
+        indexes.sort(key=odds.__getitem__, reverse=True)
+        return indexes
+
+    def __repr__(self):
+        return f"ArbitrageRange({self.low}, {self.high})"
+
+
+def rank_lines_in_range(
+    params: Sequence[float],
+    odds: Sequence[float],
+    range_condition: Union[ArbitrageRange, Callable],
+    min_odds: Optional[float] = None
+) -> List[int]:
+    """
+    批量评估 (参数, 赔率) 线,兼容普通的 lambda 区间条件
+
+    Returns:
+        list: 满足条件的下标,按赔率从高到低排序
+    """
+    if isinstance(range_condition, ArbitrageRange):
+        return range_condition.rank_lines(params, odds, min_odds)
+
+    return ArbitrageRange().rank_lines(
+        [param if range_condition(param) else math.nan for param in params],
+        odds,
+        min_odds
+    )
 
 
 def calculate_arbitrage_range(
@@ -18,8 +89,9 @@ def calculate_arbitrage_range(
         success_platform_handicap_param: 成功平台盘口参数 (如 "2.5", "-1.5")
 
     返回:
-        callable: lambda 函数,用于判断某个值是否在补单区间内
-                  例如: lambda y: y >= 2.5 (对手方 Over 2.5,我方需要 Under Y, Y >= 2.5)
+        ArbitrageRange: 补单区间,可直接调用判断某个值是否在区间内,
+                        也可用 rank_lines 批量评估所有盘口线
+                        例如: Y >= 2.5 (对手方 Over 2.5,我方需要 Under Y, Y >= 2.5)
         None: 不支持的盘口类型
 
     示例:
@@ -60,8 +132,8 @@ def calculate_arbitrage_range(
     if is_total:
         if "over" in success_platform_handicap_lower:
             # 对手: Over X → 我方: Under Y (Y >= X)
-            condition = lambda y: y >= success_value
             description = f"Under Y (Y >= {success_value})"
+            condition = ArbitrageRange(low=success_value, description=description)
 
             print(f"📊 [PIN888 套利区间] 成功方: Over {success_value}")
             print(f"📊 [PIN888 套利区间] 补单区间: {description}")
@@ -69,8 +141,8 @@ def calculate_arbitrage_range(
 
         elif "under" in success_platform_handicap_lower:
             # 对手: Under X → 我方: Over Y (Y <= X)
-            condition = lambda y: y <= success_value
             description = f"Over Y (Y <= {success_value})"
+            condition = ArbitrageRange(high=success_value, description=description)
 
             print(f"📊 [PIN888 套利区间] 成功方: Under {success_value}")
             print(f"📊 [PIN888 套利区间] 补单区间: {description}")
@@ -85,12 +157,12 @@ def calculate_arbitrage_range(
             # 对手: Handicap1(X)
             if success_value < 0:
                
-                condition = lambda y: y <= -success_value
                 description = f"Handicap2 Y <= {-success_value}"
+                condition = ArbitrageRange(high=-success_value, description=description)
             else:
                 
-                condition = lambda y: y >= -success_value
                 description = f"Handicap2 Y >= {-success_value}"
+                condition = ArbitrageRange(low=-success_value, description=description)
 
             print(f"📊 [PIN888 套利区间] 成功方: Handicap1({success_value})")
             print(f"📊 [PIN888 套利区间] 补单区间: {description}")
@@ -100,12 +172,12 @@ def calculate_arbitrage_range(
             # 对手: Handicap2(X)
             if success_value < 0:
                 # X < 0 → 我方: Handicap1 Y (Y >= X)
-                condition = lambda y: y <= -success_value
                 description = f"Handicap1 Y <= {-success_value}"
+                condition = ArbitrageRange(high=-success_value, description=description)
             else:
                 # X > 0 → 我方: Handicap1 Y (Y <= X)
-                condition = lambda y: y >= -success_value
                 description = f"Handicap1 Y >= {-success_value}"
+                condition = ArbitrageRange(low=-success_value, description=description)
 
             print(f"📊 [PIN888 套利区间] 成功方: Handicap2({success_value})")
             print(f"📊 [PIN888 套利区间] 补单区间: {description}")
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+PIN888 页面详情订阅 (EVENT_DETAILS_EURO_ODDS) 的引用计数
+
+一个页面同一时间只能订阅一场比赛的详情 (window.___detailFullOdds 只有一份)。
+GetOdd / SupplementaryOrder / 借用 feed 页面的其他账号都通过 acquire() 占用订阅:
+- 同一场比赛的使用者共享订阅,最后一个 release() 时才取消订阅
+- 借用者 (borrow=True) 只能在页面空闲或正在订阅同一场比赛时使用,否则返回 None (回退到自己的页面)
+- 本账号的使用者可以切换到其他比赛,旧的占用随之失效 (其 release 被忽略,补单循环会发现订阅已切换并重新订阅)
+
+所有判断和订阅 / 取消订阅都在同一把锁内执行
+"""
+from typing import Any, Optional
+import asyncio
+import logging
+
+from ..jsCodeExecutors import subscribe_events_detail_euro, unsubscribe_events_detail_euro
+from ..jsCodeExecutors.subscribeEventsDetailEuro import get_detail_full_odds
+
+logger = logging.getLogger(__name__)
+
+
+class DetailLease:
+    """一次对详情订阅的占用 (release 可以重复调用)"""
+
+    __slots__ = ('event_id', 'data', 'generation', 'released')
+
+    def __init__(self, event_id: str, data: Any, generation: int):
+        self.event_id = event_id
+        self.data = data
+        self.generation = generation
+        self.released = False
+
+
+class DetailSubscription:
+    """
+    页面详情订阅的占用管理 (每个 Pin888Automation 一个)
+
+    Example:
+        >>> lease = await self.detail_subscription.acquire(event_id)
+        >>> if lease:
+        ...     odds = lease.data
+        ...     await self.detail_subscription.release(lease)
+    """
+
+    def __init__(self, automation: Any):
+        self._automation = automation
+        self.lock = asyncio.Lock()
+        self.event_id: Optional[str] = None
+        self.refs = 0
+        self.generation = 0
+
+    @property
+    def page(self):
+        return self._automation.page
+
+    def _lendable(self, event_id: str) -> bool:
+        """借用者能否使用本页面: 页面空闲 (且不在补单),或正在订阅同一场比赛"""
+        if self.refs > 0:
+            return self.event_id == event_id
+        return not getattr(self._automation, '_is_SupplementaryOrder', False)
+
+    def can_lend(self, event_id: Any) -> bool:
+        """acquire(borrow=True) 是否可能成功 (不加锁的预判)"""
+        return self._lendable(str(event_id))
+
+    async def acquire(self, event_id: Any, borrow: bool = False) -> Optional[DetailLease]:
+        """
+        占用某场比赛的详情订阅
+
+        Args:
+            event_id: 比赛ID
+            borrow: 是否为其他账号借用
+
+        Returns:
+            DetailLease (data 为当前详情数据); 订阅失败或借用时页面被占用返回 None
+        """
+        if event_id in (None, ''):
+            return None
+        key = str(event_id)
+
+        async with self.lock:
+            if borrow and not self._lendable(key):
+                logger.debug(f"[{self._automation.handler_name}] 详情订阅正被 eventId={self.event_id} 占用,不能借用")
+                return None
+
+            shared = self.refs > 0 and self.event_id == key
+            if shared:
+                data = await get_detail_full_odds(self.page)
+                if data and str(data.get('eventId')) == key:
+                    self.refs += 1
+                    return DetailLease(key, data, self.generation)
+            elif self.refs > 0:
+                logger.info(
+                    f"[{self._automation.handler_name}] 详情订阅从 eventId={self.event_id} 切换到 {key}"
+                )
+
+            data = await subscribe_events_detail_euro(self.page, event_id)
+            if not data:
+                await unsubscribe_events_detail_euro(self.page, event_id)
+                self.event_id = None
+                self.refs = 0
+                self.generation += 1
+                return None
+
+            if shared:
+                self.refs += 1
+            else:
+                self.generation += 1
+                self.event_id = key
+                self.refs = 1
+            return DetailLease(key, data, self.generation)
+
+    async def release(self, lease: Optional[DetailLease]):
+        """释放占用,最后一个使用者释放时取消订阅 (订阅已被切换的旧占用直接忽略)"""
+        if lease is None or lease.released:
+            return
+        lease.released = True
+
+        async with self.lock:
+            if lease.generation != self.generation or lease.event_id != self.event_id:
+                return
+            self.refs -= 1
+            if self.refs > 0:
+                return
+            self.refs = 0
+            self.event_id = None
+            await unsubscribe_events_detail_euro(self.page, lease.event_id)
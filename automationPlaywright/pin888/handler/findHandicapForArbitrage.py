@@ -4,6 +4,8 @@ PIN888 平台区间补单(套利匹配)逻辑
 
 import re
 
+from .arbitrageRange import ArbitrageRange
+
 
 def find_handicap_for_arbitrage(bet_data, detail_full_odds, success_platform_handicap, success_platform_handicap_param):
     """
@@ -57,7 +59,7 @@ def find_handicap_for_arbitrage(bet_data, detail_full_odds, success_platform_han
         if "over" in success_platform_handicap_lower:
             # 对手: Over X → 我方: Under Y (Y >= X)
             target_direction = "under"
-            condition = lambda y: y >= success_value
+            condition = ArbitrageRange(low=success_value)
             description = f"寻找 Under Y (Y >= {success_value})"
 
             print(f"📊 [PIN888 套利匹配] 对手盘口: Over {success_value}")
@@ -66,7 +68,7 @@ def find_handicap_for_arbitrage(bet_data, detail_full_odds, success_platform_han
         elif "under" in success_platform_handicap_lower:
             # 对手: Under X → 我方: Over Y (Y <= X)
             target_direction = "over"
-            condition = lambda y: y <= success_value
+            condition = ArbitrageRange(high=success_value)
             description = f"寻找 Over Y (Y <= {success_value})"
 
             print(f"📊 [PIN888 套利匹配] 对手盘口: Under {success_value}")
@@ -79,10 +81,10 @@ def find_handicap_for_arbitrage(bet_data, detail_full_odds, success_platform_han
         if "handicap1" in success_platform_handicap_lower:
             target_direction = "handicap2"
             if success_value < 0:
-                condition = lambda y: success_value <= y <= 0
+                condition = ArbitrageRange(low=success_value, high=0)
                 description = f"寻找 Handicap2 Y ({success_value} <= Y <= 0)"
             else:
-                condition = lambda y: -success_value <= y <= 0
+                condition = ArbitrageRange(low=-success_value, high=0)
                 description = f"寻找 Handicap2 Y ({-success_value} <= Y <= 0)"
 
             print(f"📊 [PIN888 套利匹配] 对手盘口: Handicap1({success_value})")
@@ -91,10 +93,10 @@ def find_handicap_for_arbitrage(bet_data, detail_full_odds, success_platform_han
         elif "handicap2" in success_platform_handicap_lower:
             target_direction = "handicap1"
             if success_value < 0:
-                condition = lambda y: success_value <= y <= 0
+                condition = ArbitrageRange(low=success_value, high=0)
                 description = f"寻找 Handicap1 Y ({success_value} <= Y <= 0)"
             else:
-                condition = lambda y: -success_value <= y <= 0
+                condition = ArbitrageRange(low=-success_value, high=0)
                 description = f"寻找 Handicap1 Y ({-success_value} <= Y <= 0)"
 
             print(f"📊 [PIN888 套利匹配] 对手盘口: Handicap2({success_value})")
@@ -103,8 +105,10 @@ def find_handicap_for_arbitrage(bet_data, detail_full_odds, success_platform_han
             print(f"❌ [PIN888 套利匹配] 无法识别的 Handicap 类型: {success_platform_handicap}")
             return None
 
-    # 步骤4: 从 detail_full_odds 中筛选符合条件的盘口
-    candidates = []
+    # 步骤4: 从 detail_full_odds 中收集方向匹配的选项 (参数, 赔率)
+    entries = []
+    values = []
+    odds_list = []
 
     normal_markets = detail_full_odds.get('normal', [])
     if not normal_markets:
@@ -149,32 +153,31 @@ def find_handicap_for_arbitrage(bet_data, detail_full_odds, success_platform_han
                         selection_value = float(match.group(1))
                     else:
                         continue
-            except (ValueError, IndexError):
+                selection_odds = float(selection.get('odds'))
+            except (ValueError, IndexError, TypeError):
                 continue
 
-            # 检查是否符合区间条件
-            if not condition(selection_value):
-                print(f"      ✗ 跳过: {selection_name} (数值: {selection_value}) - 不符合条件")
-                continue
-            else:
-                print(f"      ✓ 符合: {selection_name} (数值: {selection_value}, 赔率: {selection.get('odds')})")
-
-            # 符合条件,加入候选列表
-            candidates.append({
-                'odds': selection.get('odds'),
-                'selection': selection,
-                'selection_value': selection_value,
-                'market': market,
-                'gap': abs(selection_value - success_value)
-            })
-
-    # 步骤5: 选择赔率最高的候选项
-    if not candidates:
-        print(f"❌ [PIN888 套利匹配] 未找到符合条件的盘口")
+            entries.append((selection, market))
+            values.append(selection_value)
+            odds_list.append(selection_odds)
+
+    # 步骤5: 一次性按区间条件筛选,并按赔率从高到低排序
+    ranked = condition.rank_lines(values, odds_list)
+    if not ranked:
+        print(f"❌ [PIN888 套利匹配] 未找到符合条件的盘口 (共 {len(values)} 个同方向选项)")
         return None
 
-    # 按赔率排序,选择最高的
-    best = max(candidates, key=lambda x: x['odds'])
+    candidates = [
+        {
+            'odds': entries[i][0].get('odds'),
+            'selection': entries[i][0],
+            'selection_value': values[i],
+            'market': entries[i][1],
+            'gap': abs(values[i] - success_value)
+        }
+        for i in ranked
+    ]
+    best = candidates[0]
 
     print(f"\n✅ [PIN888 套利匹配] 找到 {len(candidates)} 个候选项,选择赔率最高的:")
     print(f"  选项: {best['selection'].get('name')}")
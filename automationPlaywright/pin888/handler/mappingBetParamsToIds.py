@@ -3,7 +3,13 @@
 Pin888 投注参数到ID的映射模块
 将投注类型、脚本等映射为 _1a, _2b, _3c, _4d, _5e 参数
 使用明确的输入输出参数,不依赖 msg 字典
+
+同一盘口的 ID 只有 lineID / market_group_id / specials_event_id 会变化
+(SupplementaryOrder 每次重试只有这几个值不同),
+所以按其余参数缓存 ID 模板 (_resolve_id_template),每次调用只填入这几个值
 """
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 
 
 def transform_period_to_number(period: str) -> int | None:
@@ -504,7 +510,7 @@ def map_basketball_team_win(
     }
 
 
-def map_bet_params_to_ids(
+def _dispatch_mapper(
     sport_type: str,              # 'soccer' 或 'basketball' (必需)
     handicap: str,                # 盘口类型 (必需)
     period: str,                  # 时段 (必需)
@@ -518,26 +524,7 @@ def map_bet_params_to_ids(
     specials_event_id: int = 0    # 特殊盘口 event_id (可选,默认0)
 ) -> dict | None:
     """
-    将投注参数映射为Pin888所需的ID格式(主函数)
-
-    使用明确的输入参数,不依赖 msg 字典
-
-    参数:
-        sport_type: 运动类型 ('soccer', 'basketball')
-        handicap: 盘口类型
-        period: 时段
-        direction: 方向 (home/away/over/under, 可选)
-        match: 匹配类型 (over/under/even/odd, 可选)
-        handicap_param: 盘口参数 (可选)
-        line_id: lineID
-        market_group_id: market_group_id
-        is_alt: 是否为备用盘口
-        specials_i: 特殊盘口 i
-        specials_event_id: 特殊盘口 event_id
-
-    返回:
-        dict: {'oddsID': str, 'oddsSelectionsType': str, 'selectionID': str}
-        None: 如果映射失败
+    按盘口类型调用对应的映射函数 (不缓存,参数说明见 map_bet_params_to_ids)
     """
     # 构造参数字典,传递给各个映射函数
     params = {
@@ -610,3 +597,128 @@ def map_bet_params_to_ids(
     else:
         print(f"❌ [PIN888] mappingBetParamsToIds 未知的投注类型: {handicap}")
         return None
+
+
+# 模板占位符: 用它们代替每次调用都会变化的 ID 调用映射函数,再替换为 %-format 字段
+_VOLATILE_PLACEHOLDERS = {
+    'line_id': '\x00line_id\x00',
+    'market_group_id': '\x00market_group_id\x00',
+    'specials_event_id': '\x00specials_event_id\x00'
+}
+
+
+def _to_id_format(text: str) -> str:
+    text = text.replace('%', '%%')
+    for name, placeholder in _VOLATILE_PLACEHOLDERS.items():
+        text = text.replace(placeholder, f'%({name})s')
+    return text
+
+
+# typed=True: 各映射函数自行格式化 handicap_param 等参数,10 与 10.0 可能生成不同的 ID,不能共用缓存条目
+@lru_cache(maxsize=1024, typed=True)
+def _resolve_id_template(
+    sport_type: str,
+    handicap: str,
+    period: str,
+    direction: str,
+    match: str,
+    handicap_param: Any,
+    is_alt: bool,
+    specials_i: int
+) -> Optional[Tuple[str, str, str]]:
+    """
+    解析一个盘口的 ID 模板 (结果缓存,映射失败的 None 也缓存)
+
+    返回:
+        (oddsID 模板, oddsSelectionsType, selectionID 模板) 或 None
+    """
+    result = _dispatch_mapper(
+        sport_type=sport_type,
+        handicap=handicap,
+        period=period,
+        direction=direction,
+        match=match,
+        handicap_param=handicap_param,
+        is_alt=is_alt,
+        specials_i=specials_i,
+        **_VOLATILE_PLACEHOLDERS
+    )
+    if result is None:
+        return None
+    return (
+        _to_id_format(result['oddsID']),
+        result['oddsSelectionsType'],
+        _to_id_format(result['selectionID'])
+    )
+
+
+def map_bet_params_to_ids(
+    sport_type: str,              # 'soccer' 或 'basketball' (必需)
+    handicap: str,                # 盘口类型 (必需)
+    period: str,                  # 时段 (必需)
+    direction: str = '',          # 方向 (可选,允许空值)
+    match: str = '',              # 匹配类型 (可选,允许空值)
+    handicap_param: str = '',     # 盘口参数 (可选,允许空值)
+    line_id: int = 0,             # lineID (可选,默认0)
+    market_group_id: int = 0,     # market_group_id (可选,默认0)
+    is_alt: bool = False,         # 是否备用盘口 (可选,默认False)
+    specials_i: int = 0,          # 特殊盘口 i (可选,默认0)
+    specials_event_id: int = 0    # 特殊盘口 event_id (可选,默认0)
+) -> dict | None:
+    """
+    将投注参数映射为Pin888所需的ID格式(主函数)
+
+    使用明确的输入参数,不依赖 msg 字典;
+    除 line_id / market_group_id / specials_event_id 外的参数相同时复用缓存的 ID 模板
+
+    参数:
+        sport_type: 运动类型 ('soccer', 'basketball')
+        handicap: 盘口类型
+        period: 时段
+        direction: 方向 (home/away/over/under, 可选)
+        match: 匹配类型 (over/under/even/odd, 可选)
+        handicap_param: 盘口参数 (可选)
+        line_id: lineID
+        market_group_id: market_group_id
+        is_alt: 是否为备用盘口
+        specials_i: 特殊盘口 i
+        specials_event_id: 特殊盘口 event_id
+
+    返回:
+        dict: {'oddsID': str, 'oddsSelectionsType': str, 'selectionID': str}
+        None: 如果映射失败
+    """
+    template = _resolve_id_template(
+        sport_type, handicap, period, direction, match, handicap_param, bool(is_alt), specials_i
+    )
+    if template is None:
+        return None
+
+    odds_format, selections_type, selection_format = template
+    ids = {
+        'line_id': line_id,
+        'market_group_id': market_group_id,
+        'specials_event_id': specials_event_id
+    }
+    return {
+        'oddsID': odds_format % ids,
+        'oddsSelectionsType': selections_type,
+        'selectionID': selection_format % ids
+    }
+
+
+def get_id_resolver_stats() -> Dict[str, Any]:
+    """ID 模板缓存的命中统计"""
+    info = _resolve_id_template.cache_info()
+    total = info.hits + info.misses
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'hit_rate': info.hits / total if total else 0.0,
+        'size': info.currsize
+    }
+
+
+def clear_id_resolver_cache() -> None:
+    """清空 ID 模板缓存"""
+    _resolve_id_template.cache_clear()
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+PIN888 登录会话快照 (基于 Playwright storage state, 按 ads_id 存储)
+
+重启后先用快照恢复 cookies / localStorage,再用余额请求探测会话是否有效,
+有效则整个登录流程 (以及其中的固定等待) 都可以跳过
+"""
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+import json
+import logging
+import os
+
+from configs.settings import Settings as settings
+
+logger = logging.getLogger(__name__)
+
+PLATFORM_NAME = 'pin888'
+
+
+def session_state_path(ads_id: str) -> str:
+    """
+    获取会话快照文件路径
+
+    Args:
+        ads_id: 指纹浏览器 ID
+
+    Returns:
+        str: 快照文件路径 (例如: sessionStates/pin888_k1abc.json)
+    """
+    return os.path.join(settings.SESSION_STATE_DIR, f"{PLATFORM_NAME}_{ads_id}.json")
+
+
+async def save_session_state(page: Any, ads_id: str) -> bool:
+    """
+    保存当前浏览器上下文的 storage state (cookies + localStorage)
+
+    Args:
+        page: Playwright Page 对象
+        ads_id: 指纹浏览器 ID
+
+    Returns:
+        bool: 保存成功返回 True
+    """
+    if not ads_id:
+        return False
+
+    try:
+        state = await page.context.storage_state()
+        path = session_state_path(ads_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # 先写临时文件再替换,避免中途退出留下半个快照
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        logger.info(f"[{PLATFORM_NAME}] 💾 会话快照已保存: {ads_id}")
+        return True
+
+    except Exception as e:
+        logger.warning(f"[{PLATFORM_NAME}] ⚠️ 保存会话快照失败 ({ads_id}): {e}")
+        return False
+
+
+def load_session_state(ads_id: str) -> Optional[Dict[str, Any]]:
+    """
+    读取会话快照
+
+    Returns:
+        dict: {'cookies': [...], 'origins': [...]},不存在或损坏时返回 None
+    """
+    if not ads_id:
+        return None
+
+    path = session_state_path(ads_id)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"[{PLATFORM_NAME}] ⚠️ 会话快照损坏,忽略 ({ads_id}): {e}")
+        return None
+
+
+async def restore_session_state(page: Any, ads_id: str) -> bool:
+    """
+    将会话快照恢复到当前页面的浏览器上下文
+
+    cookies 通过 context.add_cookies 写入;
+    localStorage 只恢复与当前页面同源的部分 (请求头参数 v-hucode / token 等都在这里)
+
+    Args:
+        page: Playwright Page 对象
+        ads_id: 指纹浏览器 ID
+
+    Returns:
+        bool: 有快照且恢复成功返回 True (调用方需要刷新页面并重新探测)
+    """
+    state = load_session_state(ads_id)
+    if not state:
+        return False
+
+    try:
+        cookies = state.get('cookies') or []
+        if cookies:
+            await page.context.add_cookies(cookies)
+
+        parsed_url = urlparse(page.url)
+        page_origin = f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+        for origin in state.get('origins') or []:
+            if origin.get('origin') != page_origin:
+                continue
+            items = {item['name']: item['value'] for item in origin.get('localStorage') or []}
+            if items:
+                await page.evaluate(
+                    """(items) => {
+                        for (const [name, value] of Object.entries(items)) {
+                            localStorage.setItem(name, value);
+                        }
+                    }""",
+                    items
+                )
+
+        logger.info(f"[{PLATFORM_NAME}] ♻️ 已恢复会话快照: {ads_id} ({len(cookies)} cookies)")
+        return True
+
+    except Exception as e:
+        logger.warning(f"[{PLATFORM_NAME}] ⚠️ 恢复会话快照失败 ({ads_id}): {e}")
+        return False
+
+
+def delete_session_state(ads_id: str) -> bool:
+    """
+    删除会话快照 (快照已失效时调用,避免下次重启重复尝试)
+
+    Returns:
+        bool: 删除成功返回 True
+    """
+    path = session_state_path(ads_id) if ads_id else None
+    if not path or not os.path.exists(path):
+        return False
+
+    try:
+        os.remove(path)
+        return True
+    except OSError as e:
+        logger.warning(f"[{PLATFORM_NAME}] ⚠️ 删除会话快照失败 ({ads_id}): {e}")
+        return False
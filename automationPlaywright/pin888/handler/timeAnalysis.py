@@ -1,7 +1,15 @@
 """
 PIN888 平台 - 比赛时间分析
 将不同运动项目的时间转换为统一的倒计时格式
+
+MatchClock: 每场比赛一个时钟模型,用每帧详情的分析结果校准,
+两帧之间按本地单调时钟外推,剩余时间的判断不需要再访问页面
 """
+from typing import Any, Dict, Optional
+import time
+
+# 时钟超过该时间 (秒) 没有收到新帧则丢弃
+CLOCK_MAX_IDLE = 3 * 3600
 
 
 def analyze_remaining_time(sport_type, match_state_type):
@@ -153,6 +161,129 @@ def _analyze_basketball_time(elapsed_data):
     }
 
 
+# ==================== 比赛时钟模型 ====================
+
+class MatchClock:
+    """
+    单场比赛的时钟模型
+
+    - observe(): 用一帧详情的 analyze_remaining_time 结果校准
+    - remaining_seconds(): 从最近一帧按 time.monotonic() 外推
+
+    时钟是否在走由相邻两帧推断: 同一阶段剩余时间没有减少 (篮球暂停 / 足球中场) 视为停表,
+    停表期间不外推; 新阶段的第一帧按走表处理 (剩余时间只会被低估,对临近结束的判断更保守)
+
+    Example:
+        >>> clock = observe_match_clock('1619490559', 'soccer', {'match_phase': 'FirstHalf', 'remaining_seconds': 1079})
+        >>> clock.remaining_seconds()    # 10 秒后
+        1069
+    """
+
+    __slots__ = ('event_id', 'sport_type', 'match_phase', 'running',
+                 '_frame_remaining', '_frame_at', '_version')
+
+    def __init__(self, event_id: str, sport_type: str):
+        self.event_id = event_id
+        self.sport_type = sport_type
+        self.match_phase: Optional[str] = None
+        self.running = False
+        self._frame_remaining = 0
+        self._frame_at: Optional[float] = None
+        self._version: Any = None
+
+    def observe(self, remaining_time: Dict[str, Any], version: Any = None, now: Optional[float] = None):
+        """
+        用一帧详情校准时钟
+
+        Args:
+            remaining_time: analyze_remaining_time 的返回值
+            version: 详情版本号,与上一帧相同时忽略 (心跳重复拿到的同一帧不能重置外推起点)
+            now: time.monotonic() 时间 (测试用)
+        """
+        if version is not None and version == self._version:
+            return
+        now = time.monotonic() if now is None else now
+
+        match_phase = remaining_time['match_phase']
+        remaining = remaining_time['remaining_seconds']
+
+        if self._frame_at is None or match_phase != self.match_phase:
+            self.running = remaining > 0
+        elif remaining < self._frame_remaining:
+            self.running = True
+        elif now - self._frame_at >= 1.0:
+            self.running = False
+
+        self.match_phase = match_phase
+        self._frame_remaining = remaining
+        self._frame_at = now
+        self._version = version
+
+    def remaining_seconds(self, now: Optional[float] = None) -> int:
+        """当前阶段的剩余秒数 (外推值)"""
+        if self._frame_at is None:
+            return 0
+        if not self.running:
+            return self._frame_remaining
+        now = time.monotonic() if now is None else now
+        return max(0, int(self._frame_remaining - (now - self._frame_at)))
+
+    def frame_age(self, now: Optional[float] = None) -> float:
+        """距离最近一帧的秒数"""
+        if self._frame_at is None:
+            return float('inf')
+        now = time.monotonic() if now is None else now
+        return now - self._frame_at
+
+    def snapshot(self) -> Dict[str, Any]:
+        """与 analyze_remaining_time 相同结构的当前时间"""
+        return {
+            'match_phase': self.match_phase,
+            'remaining_seconds': self.remaining_seconds()
+        }
+
+
+_match_clocks: Dict[str, MatchClock] = {}
+
+
+def observe_match_clock(
+    event_id: Any,
+    sport_type: str,
+    remaining_time: Optional[Dict[str, Any]],
+    version: Any = None
+) -> Optional[MatchClock]:
+    """
+    用一帧详情校准比赛时钟 (首次出现的比赛创建时钟)
+
+    Returns:
+        MatchClock; event_id 或 remaining_time 为空时返回 None
+    """
+    if not event_id or not remaining_time:
+        return None
+
+    key = str(event_id)
+    clock = _match_clocks.get(key)
+    if clock is None:
+        _prune_match_clocks()
+        clock = MatchClock(key, sport_type)
+        _match_clocks[key] = clock
+    clock.observe(remaining_time, version)
+    return clock
+
+
+def get_match_clock(event_id: Any) -> Optional[MatchClock]:
+    """获取比赛时钟,没有收到过该比赛的详情时返回 None"""
+    if not event_id:
+        return None
+    return _match_clocks.get(str(event_id))
+
+
+def _prune_match_clocks():
+    now = time.monotonic()
+    for key in [key for key, clock in _match_clocks.items() if clock.frame_age(now) > CLOCK_MAX_IDLE]:
+        del _match_clocks[key]
+
+
 # ==================== 测试代码 ====================
 if __name__ == "__main__":
     print("=== 足球测试 ===")
@@ -0,0 +1,44 @@
+// 等待详情赔率 (___detailFullOdds) 发生变化
+// 由 _0websocket_hook.js 在每次收到 EVENT_DETAILS_EURO_ODDS FULL_ODDS 时唤醒
+// 超时后同样返回当前快照 (作为兜底心跳)
+
+const sinceSeq = __SINCE_SEQ__;    // 将被 Python 替换为上次处理的版本号
+const timeoutMs = __TIMEOUT_MS__;  // 将被 Python 替换为心跳超时 (毫秒)
+
+return new Promise(resolve => {
+    const snapshot = (changed) => ({
+        seq: window.___detailSeq || 0,
+        changed: changed,
+        odds: window.___detailFullOdds || null
+    });
+
+    // 已经有更新的版本,直接返回
+    if ((window.___detailSeq || 0) > sinceSeq && window.___detailFullOdds) {
+        resolve(snapshot(true));
+        return;
+    }
+
+    window.__detailWaiters = window.__detailWaiters || [];
+
+    let finished = false;
+    let timer = null;
+
+    const onChange = () => {
+        if (finished) return;
+        finished = true;
+        clearTimeout(timer);
+        resolve(snapshot(true));
+    };
+
+    timer = setTimeout(() => {
+        if (finished) return;
+        finished = true;
+        const index = window.__detailWaiters.indexOf(onChange);
+        if (index >= 0) {
+            window.__detailWaiters.splice(index, 1);
+        }
+        resolve(snapshot(false));
+    }, timeoutMs);
+
+    window.__detailWaiters.push(onChange);
+});
@@ -5,6 +5,26 @@
 
     // Save original WebSocket constructor
     const OriginalWebSocket = window.WebSocket;
+
+    // 详情赔率变化通知: ___detailSeq 每收到一次 FULL_ODDS 递增,
+    // __detailWaiters 中的回调在数据更新时被一次性唤醒
+    window.___detailSeq = window.___detailSeq || 0;
+    window.__detailWaiters = window.__detailWaiters || [];
+
+    function notifyDetailWaiters() {
+        const waiters = window.__detailWaiters;
+        if (!waiters || waiters.length === 0) {
+            return;
+        }
+        window.__detailWaiters = [];
+        waiters.forEach(callback => {
+            try {
+                callback();
+            } catch (e) {
+                console.log('detail waiter 执行失败:', e);
+            }
+        });
+    }
     console.log('hook start');
     // Override WebSocket constructor
     window.WebSocket = function (...args) {
@@ -130,6 +150,9 @@
                         if (data.type === 'FULL_ODDS') {
                             // 构造并存储FULL_ODDS数据
                             window.___detailFullOdds = data.odds;
+                            // 版本号递增,并唤醒等待详情变化的 waiter (补单循环使用)
+                            window.___detailSeq = (window.___detailSeq || 0) + 1;
+                            notifyDetailWaiters();
                             console.log('✅ 收到FULL_ODDS数据，已存储到window.___detailFullOdds');
                         }
 
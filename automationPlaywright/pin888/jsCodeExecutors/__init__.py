@@ -9,6 +9,7 @@ from .subscribeLiveEuroOdds import subscribe_live_euro_odds
 from .requestAllOddsSelections import request_all_odds_selections
 from .requestBuyV2 import request_buy_v2
 from .requestMyBets import request_my_bets, parse_my_bets_response
+from .waitDetailOddsChange import wait_detail_odds_change, get_detail_seq
 
 __all__ = [
     'subscribe_events_detail_euro',
@@ -17,5 +18,7 @@ __all__ = [
     'request_all_odds_selections',
     'request_buy_v2',
     'request_my_bets',
-    'parse_my_bets_response'
+    'parse_my_bets_response',
+    'wait_detail_odds_change',
+    'get_detail_seq'
 ]
@@ -2,14 +2,107 @@
 """
 Pin888 请求所有赔率选项
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import logging
 import time
+import asyncio
+import weakref
+
+from configs.settings import Settings as settings
 
 logger = logging.getLogger(__name__)
 
 
+# ==================== 单飞 (single-flight) + 短 TTL 缓存 ====================
+# 按 page (即账号) 隔离: {page: {(odds_id, selection_id): ...}}
+_inflight_requests: "weakref.WeakKeyDictionary[Any, Dict[Tuple[str, str], asyncio.Future]]" = weakref.WeakKeyDictionary()
+_response_cache: "weakref.WeakKeyDictionary[Any, Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]]]" = weakref.WeakKeyDictionary()
+# 每个 page 最多缓存的响应数 (超出时丢弃最早写入的)
+RESPONSE_CACHE_MAX_SIZE = 256
+
+
+def _store_response(page_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]],
+                    key: Tuple[str, str], response: Dict[str, Any]) -> None:
+    """写入缓存,同时清理过期条目并限制容量"""
+    now = time.monotonic()
+    expired = [k for k, (ts, _) in page_cache.items() if now - ts > settings.ODDS_SELECTION_CACHE_TTL]
+    for k in expired:
+        del page_cache[k]
+
+    page_cache.pop(key, None)
+    page_cache[key] = (now, response)
+    # dict 保持插入顺序,最前面的就是最早写入的
+    while len(page_cache) > RESPONSE_CACHE_MAX_SIZE:
+        del page_cache[next(iter(page_cache))]
+
+
 async def request_all_odds_selections(
+    page: Any,
+    odds_id: str,
+    selection_id: str,
+    odds_selections_type: str,
+    handler_name: str = 'pin888',
+    use_cache: bool = True
+) -> Optional[Dict[str, Any]]:
+    """
+    获取所有赔率选项 (同一账号内合并相同请求)
+
+    同一 page 上 (odds_id, selection_id) 相同的并发请求只发送一次 HTTP 请求,
+    成功响应在 ODDS_SELECTION_CACHE_TTL 秒内直接复用 (例如 GetOdd 之后紧接着补单)
+
+    Args:
+        page: Playwright Page 对象
+        odds_id: 完整的oddsId字符串 (例如: "123456|0|1|0|0|0")
+        selection_id: 完整的selectionId字符串 (例如: "789012|123456|0|1|0|0|0|0")
+        odds_selections_type: 赔率选择类型 (例如: "NORMAL")
+        handler_name: Handler 名称 (用于日志)
+        use_cache: 是否允许复用缓存/进行中的请求,False 时强制重新请求
+
+    Returns:
+        同 _request_all_odds_selections
+    """
+    if not use_cache or not odds_id or not selection_id:
+        return await _request_all_odds_selections(
+            page, odds_id, selection_id, odds_selections_type, handler_name
+        )
+
+    key = (str(odds_id), str(selection_id))
+
+    # 1. 短 TTL 缓存命中
+    page_cache = _response_cache.setdefault(page, {})
+    cached = page_cache.get(key)
+    if cached and time.monotonic() - cached[0] <= settings.ODDS_SELECTION_CACHE_TTL:
+        logger.debug(f"[{handler_name}] RequestAllOddsSelections 缓存命中: {odds_id}")
+        return cached[1]
+
+    # 2. 已有相同请求进行中,等待其结果
+    page_inflight = _inflight_requests.setdefault(page, {})
+    future = page_inflight.get(key)
+    if future is not None:
+        logger.debug(f"[{handler_name}] RequestAllOddsSelections 合并进行中的请求: {odds_id}")
+        return await asyncio.shield(future)
+
+    # 3. 发起请求,结果共享给等待者
+    future = asyncio.get_running_loop().create_future()
+    page_inflight[key] = future
+    try:
+        response = await _request_all_odds_selections(
+            page, odds_id, selection_id, odds_selections_type, handler_name
+        )
+    except BaseException:
+        # 被取消时等待者拿到 None,由各自的调用方按失败处理
+        future.set_result(None)
+        raise
+    finally:
+        page_inflight.pop(key, None)
+
+    if response:
+        _store_response(page_cache, key, response)
+    future.set_result(response)
+    return response
+
+
+async def _request_all_odds_selections(
     page: Any,
     odds_id: str,
     selection_id: str,
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+PIN888 平台 - 等待详情赔率变化 (EVENT_DETAILS_EURO_ODDS)
+"""
+from typing import Dict, Any, Optional
+import logging
+
+from utils import get_js_loader
+
+logger = logging.getLogger(__name__)
+
+
+async def get_detail_seq(page: Any) -> int:
+    """
+    获取当前详情赔率版本号 (window.___detailSeq)
+
+    Args:
+        page: Playwright Page 对象
+
+    Returns:
+        int: 当前版本号,获取失败返回 0
+    """
+    try:
+        seq = await page.evaluate("() => window.___detailSeq || 0")
+        return int(seq or 0)
+    except Exception as e:
+        logger.debug(f"[PIN888] 获取 ___detailSeq 失败: {e}")
+        return 0
+
+
+async def wait_detail_odds_change(
+    page: Any,
+    since_seq: int,
+    timeout: float = 2.0,
+    handler_name: str = 'pin888'
+) -> Optional[Dict[str, Any]]:
+    """
+    等待详情赔率发生变化 (由 WS FULL_ODDS 推送唤醒),超时则返回当前快照
+
+    Args:
+        page: Playwright Page 对象
+        since_seq: 上次已处理的版本号
+        timeout: 兜底心跳超时 (秒)
+        handler_name: Handler 名称 (用于日志)
+
+    Returns:
+        {
+            'seq': int,        # 当前版本号
+            'changed': bool,   # True: 推送唤醒, False: 心跳超时
+            'odds': dict|None  # 当前 ___detailFullOdds (订阅已取消时为 None)
+        }
+        执行失败返回 None
+
+    Examples:
+        >>> result = await wait_detail_odds_change(page, since_seq=3, timeout=2.0)
+        >>> result['changed']
+        True
+    """
+    try:
+        js_loader = get_js_loader()
+        js_template = js_loader.get_js_content('pin888', 'Wait_detailOddsChange.js')
+
+        if not js_template:
+            logger.error(f"[{handler_name}] 加载 Wait_detailOddsChange.js 失败")
+            return None
+
+        timeout_ms = max(int(timeout * 1000), 0)
+        js_code = js_template.replace('__SINCE_SEQ__', str(int(since_seq or 0)))
+        js_code = js_code.replace('__TIMEOUT_MS__', str(timeout_ms))
+
+        wrapped_code = f"(() => {{ {js_code} }})()"
+        return await page.evaluate(wrapped_code)
+
+    except Exception as e:
+        logger.error(f"[{handler_name}] 等待详情赔率变化失败: {e}")
+        return None
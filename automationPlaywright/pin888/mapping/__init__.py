@@ -2,6 +2,6 @@
 """
 Pin888 映射模块
 """
-from .mapping import map_handicap_full, map_sport_base
+from .mapping import map_handicap_full, map_market_spec, map_sport_base
 
-__all__ = ['map_handicap_full', 'map_sport_base']
+__all__ = ['map_handicap_full', 'map_market_spec', 'map_sport_base']
@@ -1,3 +1,6 @@
+from utils.marketSpec import MarketSpec, parse_market_spec
+
+
 def map_sport_base(sport_type: str) -> dict | None:
     """
     映射基础运动信息 (sportId 和 period_num)
@@ -71,393 +74,235 @@ def map_handicap_full(
         print(f"  period: {period}")
         return None
 
-    # 标准化输入
-    sport_type = sport_type.lower().strip()
-    handicap = handicap.strip()
-    period = period.strip()
-
-    # 初始化返回字典
-    result = {}
-
-    # 根据运动类型进行映射
-    match sport_type:
-        case 'soccer':
-            match handicap.lower():
-                case "1" | "2" | "x":
-                    result['mapped_market'] = 'normal'
-                    result['mapped_handicap'] = 'moneyLine'
-
-                    period_lower = period.lower()
-                    if period_lower in ['full time', 'hidden period']:
-                        result['mapped_period'] = '0'
-                    elif period_lower in ['1st half', '2nd half']:
-                        result['mapped_period'] = '1'
-                    else:
-                        return None
-
-                    handicap_lower = handicap.lower()
-                    if handicap_lower == '1':
-                        result['mapped_match'] = 'homePrice'
-                        result['mapped_handicap_param'] = 'homePrice'
-                    elif handicap_lower == '2':
-                        result['mapped_match'] = 'awayPrice'
-                        result['mapped_handicap_param'] = 'awayPrice'
-                    elif handicap_lower == 'x':
-                        result['mapped_match'] = 'drawPrice'
-                        result['mapped_handicap_param'] = 'drawPrice'
-                    else:
-                        print(f"❌ [PIN888 Mapping] 不支持的盘口: {handicap}")
-                        return None
-
-                case '1x' | "x2" | '12':
-                    result['mapped_market'] = 'specials'
-
-                    period_lower = period.lower()
-                    if period_lower in ['full time', 'hidden period']:
-                        result['mapped_handicap'] = 'Double Chance'
-                    elif period_lower == '1st half':
-                        result['mapped_handicap'] = 'Double Chance 1st Half'
-                    elif period_lower == '2nd half':
-                        result['mapped_handicap'] = 'Double Chance 2nd Half'
-                    else:
-                        return None
-
-                    handicap_lower = handicap.lower()
-                    if handicap_lower == '1x':
-                        if not home_team:
-                            print(f"❌ [PIN888 Mapping] 1X盘口需要home_team参数")
-                            return None
-                        result['mapped_handicap_param'] = home_team + ' or Draw'
-                    elif handicap_lower == 'x2':
-                        if not away_team:
-                            print(f"❌ [PIN888 Mapping] X2盘口需要away_team参数")
-                            return None
-                        result['mapped_handicap_param'] = 'Draw or ' + away_team
-                    elif handicap_lower == '12':
-                        if not home_team or not away_team:
-                            print(f"❌ [PIN888 Mapping] 12盘口需要home_team和away_team参数")
-                            return None
-                        result['mapped_handicap_param'] = home_team + ' or ' + away_team
-                    else:
-                        print(f"❌ [PIN888 Mapping] 不支持的盘口: {handicap}")
-                        return None
-
-                case "odd" | "even":
-                    result['mapped_market'] = 'specials'
-
-                    period_lower = period.lower()
-                    if period_lower in ['full time', 'hidden period']:
-                        result['mapped_handicap'] = "Total Goals Odd/Even"
-                    elif period_lower == '1st half':
-                        result['mapped_handicap'] = "Total Goals Odd/Even 1st Half"
-                    elif period_lower == '2nd half':
-                        result['mapped_handicap'] = "Total Goals Odd/Even 2nd Half"
-                    else:
-                        return None
-
-                    handicap_lower = handicap.lower()
-                    if handicap_lower == 'odd':
-                        result['mapped_match'] = 'Odd'
-                        result['mapped_handicap_param'] = 'Odd'
-                    elif handicap_lower == 'even':
-                        result['mapped_match'] = 'Even'
-                        result['mapped_handicap_param'] = 'Even'
-                    else:
-                        return None
-
-                case "both to score" | "one scoreless" | "both teams to score":
-                    result['mapped_market'] = 'specials'
-
-                    period_lower = period.lower()
-                    if period_lower in ['full time', 'hidden period']:
-                        result['mapped_handicap'] = "Both Teams To Score?"
-                    elif period_lower == '1st half':
-                        result['mapped_handicap'] = "Both Teams To Score? 1st Half"
-                    elif period_lower == '2nd half':
-                        result['mapped_handicap'] = "Both Teams To Score? 2nd Half"
-                    else:
-                        return None
-
-                    handicap_lower = handicap.lower()
-                    if handicap_lower == 'both to score':
-                        result['mapped_match'] = 'n'
-                        result['mapped_handicap_param'] = 'Yes'
-                    elif handicap_lower == 'one scoreless':
-                        result['mapped_match'] = 'n'
-                        result['mapped_handicap_param'] = 'No'
-                    else:
-                        return None
-
-                case "asian handicap1(0.0)/draw no bet" | "asian handicap2(0.0)/draw no bet":
-                    result['mapped_market'] = 'specials'
-
-                    period_lower = period.lower()
-                    if period_lower in ['full time', 'hidden period']:
-                        result['mapped_handicap'] = 'Draw No Bet'
-                    elif period_lower == '1st half':
-                        result['mapped_handicap'] = 'Draw No Bet 1st Half'
-                    elif period_lower == '2nd half':
-                        result['mapped_handicap'] = 'Draw No Bet 2nd Half'
-                    else:
-                        return None
-
-                    handicap_lower = handicap.lower()
-                    if handicap_lower == 'asian handicap1(0.0)/draw no bet':
-                        if not home_team:
-                            print(f"❌ [PIN888 Mapping] Draw No Bet需要home_team参数")
-                            return None
-                        result['mapped_match'] = 'n'
-                        result['mapped_handicap_param'] = home_team
-                    elif handicap_lower == 'asian handicap2(0.0)/draw no bet':
-                        if not away_team:
-                            print(f"❌ [PIN888 Mapping] Draw No Bet需要away_team参数")
-                            return None
-                        result['mapped_match'] = 'n'
-                        result['mapped_handicap_param'] = away_team
-                    else:
-                        return None
-
-                case "team1 win" | "team2 win":
-                    result['mapped_market'] = 'normal'
-                    result['mapped_handicap'] = 'moneyLine'
-
-                    period_lower = period.lower()
-                    if period_lower in ['full time', 'hidden period']:
-                        result['mapped_period'] = '0'
-                    elif period_lower in ['1st half', '2nd half']:
-                        result['mapped_period'] = '1'
-                    else:
-                        print(period_lower)
-                        return None
-
-                    handicap_lower = handicap.lower()
-                    if handicap_lower == 'team1 win':
-                        result['mapped_direction'] = 'home'
-                        result['mapped_handicap_param'] = 'homePrice'
-                    elif handicap_lower == 'team2 win':
-                        result['mapped_direction'] = 'away'
-                        result['mapped_handicap_param'] = 'awayPrice'
-                    else:
-                        print(handicap_lower)
-                        return None
-
-                case _:
-                    handicap_lower = handicap.lower()
-
-                    # Total Over/Under 匹配
-                    if (handicap_lower.startswith('total over(') or handicap_lower.startswith('total under(')) and ('corners' not in handicap_lower) and ('for' not in handicap_lower):
-                        result['mapped_market'] = 'normal'
-                        result['mapped_handicap'] = 'overUnder'
-                        result['mapped_match'] = 'points'
-
-                        period_lower = period.lower()
-                        if period_lower in ['full time', 'hidden period']:
-                            result['mapped_period'] = '0'
-                        elif period_lower in ['1st half', '2nd half']:
-                            result['mapped_period'] = '1'
-                        else:
-                            return None
-
-                        if handicap_lower.startswith('total over('):
-                            result['mapped_direction'] = 'Over'
-                            result['mapped_handicap_param'] = format_pin888_remove_dot_zero(handicap_param)
-                        elif handicap_lower.startswith('total under('):
-                            result['mapped_direction'] = 'Under'
-                            result['mapped_handicap_param'] = format_pin888_remove_dot_zero(handicap_param)
-                        else:
-                            return None
-
-                    # Asian Handicap 匹配
-                    elif (handicap_lower.startswith('asian handicap1(') or handicap_lower.startswith('asian handicap2(')) and ('corners' not in handicap_lower):
-                        result['mapped_market'] = 'normal'
-                        result['mapped_handicap'] = 'handicap'
-
-                        period_lower = period.lower()
-                        if period_lower in ['full time', 'hidden period']:
-                            result['mapped_period'] = '0'
-                        elif period_lower in ['1st half', '2nd half']:
-                            result['mapped_period'] = '1'
-                        else:
-                            return None
-
-                        if handicap_lower.startswith('asian handicap1('):
-                            result['mapped_direction'] = 'Home'
-                            result['mapped_match'] = 'homeSpread'
-                            result['mapped_handicap_param'] = format_pin888_param(handicap_param)
-                        elif handicap_lower.startswith('asian handicap2('):
-                            result['mapped_direction'] = 'Away'
-                            result['mapped_match'] = 'awaySpread'
-                            result['mapped_handicap_param'] = format_pin888_param(handicap_param)
-                        else:
-                            return None
-
-                    # Corners Total Over/Under 匹配
-                    elif (handicap_lower.startswith('total over(') and '- corners' in handicap_lower) or \
-                         (handicap_lower.startswith('total under(') and '- corners' in handicap_lower):
-                        result['mapped_market'] = 'corners'
-                        result['mapped_handicap'] = 'overUnder'
-
-                        period_lower = period.lower()
-                        if period_lower in ['full time', 'hidden period']:
-                            result['mapped_period'] = '0'
-                        elif period_lower in ['1st half', '2nd half']:
-                            result['mapped_period'] = '1'
-                        else:
-                            return None
-
-                        if handicap_lower.startswith('total over(') and '- corners' in handicap_lower:
-                            result['mapped_direction'] = 'Over'
-                            result['mapped_match'] = 'points'
-                            result['mapped_handicap_param'] = str(handicap_param)
-                        elif handicap_lower.startswith('total under(') and '- corners' in handicap_lower:
-                            result['mapped_direction'] = 'Under'
-                            result['mapped_match'] = 'points'
-                            result['mapped_handicap_param'] = str(handicap_param)
-                        else:
-                            return None
-
-                    # Corners Asian Handicap 匹配
-                    elif (handicap_lower.startswith('asian handicap1(') and '- corners' in handicap_lower) or \
-                         (handicap_lower.startswith('asian handicap2(') and '- corners' in handicap_lower):
-                        result['mapped_market'] = 'corners'
-                        result['mapped_handicap'] = 'handicap'
-
-                        period_lower = period.lower()
-                        if period_lower in ['full time', 'hidden period']:
-                            result['mapped_period'] = '0'
-                        elif period_lower in ['1st half', '2nd half']:
-                            result['mapped_period'] = '1'
-                        else:
-                            return None
-
-                        if handicap_lower.startswith('asian handicap1(') and '- corners' in handicap_lower:
-                            result['mapped_direction'] = 'Home'
-                            result['mapped_match'] = 'homeSpread'
-                            result['mapped_handicap_param'] = str(handicap_param)
-                        elif handicap_lower.startswith('asian handicap2(') and '- corners' in handicap_lower:
-                            result['mapped_direction'] = 'Away'
-                            result['mapped_match'] = 'awaySpread'
-                            result['mapped_handicap_param'] = str(handicap_param)
-                        else:
-                            return None
-
-                    # Team Totals 匹配
-                    elif (handicap_lower.startswith('total over(') and 'for team' in handicap_lower) or \
-                         (handicap_lower.startswith('total under(') and 'for team' in handicap_lower):
-                        result['mapped_market'] = 'normal'
-                        result['mapped_handicap'] = 'teamTotals'
-
-                        period_lower = period.lower()
-                        if period_lower in ['full time', 'hidden period']:
-                            result['mapped_period'] = '0'
-                        elif period_lower in ['1st half', '2nd half']:
-                            result['mapped_period'] = '1'
-                        else:
-                            return None
-
-                        if handicap_lower.startswith('total over(') and 'for team1' in handicap_lower:
-                            result['mapped_direction'] = 'home'
-                            result['mapped_match'] = 'over'
-                            result['mapped_handicap_param'] = str(handicap_param)
-                        elif handicap_lower.startswith('total under(') and 'for team1' in handicap_lower:
-                            result['mapped_direction'] = 'home'
-                            result['mapped_match'] = 'under'
-                            result['mapped_handicap_param'] = str(handicap_param)
-                        elif handicap_lower.startswith('total over(') and 'for team2' in handicap_lower:
-                            result['mapped_direction'] = 'away'
-                            result['mapped_match'] = 'over'
-                            result['mapped_handicap_param'] = str(handicap_param)
-                        elif handicap_lower.startswith('total under(') and 'for team2' in handicap_lower:
-                            result['mapped_direction'] = 'away'
-                            result['mapped_match'] = 'under'
-                            result['mapped_handicap_param'] = str(handicap_param)
-                        else:
-                            return None
-
-                    else:
-                        return None
-
-        case 'basketball':
-            period_lower = period.lower()
-            handicap_lower = handicap.lower()
-
-            # 设置时段映射
-            if period_lower in ['full time', 'hidden period', 'with ot']:
-                result['mapped_period'] = '0'
-            elif period_lower == '1st half':
-                result['mapped_period'] = '1'
-            elif period_lower == '2nd half':
-                result['mapped_period'] = '2'
-            elif period_lower in ['1st quarter', '1st qtr', '1rd qtr']:
-                result['mapped_period'] = '3'
-            elif period_lower in ['2nd quarter', '2nd qtr', '2rd qtr']:
-                result['mapped_period'] = '4'
-            elif period_lower in ['3rd quarter', '3rd qtr']:
-                result['mapped_period'] = '5'
-            elif period_lower in ['4th quarter', '4th qtr', '4rd qtr']:
-                result['mapped_period'] = '6'
-            else:
-                return None
-
-            # 盘口匹配
-            if handicap_lower in ['1', '2', 'x']:
-                print('[PIN888 Mapping] 没有 overTime,不做处理')
-                return None
-
-            elif handicap_lower in ['team1 win', 'team2 win']:
-                result['mapped_market'] = 'normal'
-                result['mapped_handicap'] = 'moneyLine'
-                if handicap_lower == 'team1 win':
-                    result['mapped_direction'] = 'home'
-                    result['mapped_handicap_param'] = 'homePrice'
-                elif handicap_lower == 'team2 win':
-                    result['mapped_direction'] = 'away'
-                    result['mapped_handicap_param'] = 'awayPrice'
-
-            elif handicap_lower.startswith('asian handicap1(') or handicap_lower.startswith('asian handicap2('):
-                result['mapped_market'] = 'normal'
-                result['mapped_handicap'] = 'handicap'
-                if handicap_lower.startswith('asian handicap1('):
-                    result['mapped_direction'] = 'Home'
-                    result['mapped_match'] = 'homeSpread'
-                    result['mapped_handicap_param'] = str(handicap_param)
-                elif handicap_lower.startswith('asian handicap2('):
-                    result['mapped_direction'] = 'Away'
-                    result['mapped_match'] = 'awaySpread'
-                    result['mapped_handicap_param'] = str(handicap_param)
-
-            elif handicap_lower.startswith('total over(') or handicap_lower.startswith('total under('):
-                if 'for team' in handicap_lower:
-                    result['mapped_market'] = 'normal'
-                    result['mapped_handicap'] = 'teamTotals'
-                    if 'team1' in handicap_lower:
-                        result['mapped_direction'] = 'home'
-                    else:
-                        result['mapped_direction'] = 'away'
-
-                    if 'total over' in handicap_lower:
-                        result['mapped_match'] = 'over'
-                    else:
-                        result['mapped_match'] = 'under'
-                    result['mapped_handicap_param'] = str(handicap_param)
-                else:
-                    result['mapped_market'] = 'normal'
-                    result['mapped_handicap'] = 'overUnder'
-                    if handicap_lower.startswith('total over('):
-                        result['mapped_direction'] = 'Over'
-                    else:
-                        result['mapped_direction'] = 'Under'
-                    result['mapped_match'] = 'points'
-                    result['mapped_handicap_param'] = str(handicap_param)
+    spec = parse_market_spec(sport_type, handicap, period, handicap_param)
+    if spec is None:
+        print(f"❌ [PIN888 Mapping] 不支持的运动类型或盘口: {sport_type} / {handicap}")
+        return None
 
-            else:
-                return None
+    return map_market_spec(spec, home_team, away_team)
+
+
+# 足球: 时段 → mapped_period / specials 盘口名后缀
+_SOCCER_PERIODS = {
+    'full time': '0',
+    'hidden period': '0',
+    '1st half': '1',
+    '2nd half': '1'
+}
+_SOCCER_SPECIALS_SUFFIX = {
+    'full time': '',
+    'hidden period': '',
+    '1st half': ' 1st Half',
+    '2nd half': ' 2nd Half'
+}
+
+# 篮球: 时段 → mapped_period
+_BASKETBALL_PERIODS = {
+    'full time': '0', 'hidden period': '0', 'with ot': '0',
+    '1st half': '1',
+    '2nd half': '2',
+    '1st quarter': '3', '1st qtr': '3', '1rd qtr': '3',
+    '2nd quarter': '4', '2nd qtr': '4', '2rd qtr': '4',
+    '3rd quarter': '5', '3rd qtr': '5',
+    '4th quarter': '6', '4th qtr': '6', '4rd qtr': '6'
+}
+
+_PRICE_KEYS = {'home': 'homePrice', 'away': 'awayPrice', 'draw': 'drawPrice'}
+_SPREAD_SIDES = {'home': ('Home', 'homeSpread'), 'away': ('Away', 'awaySpread')}
+_TOTAL_DIRECTIONS = {'over': 'Over', 'under': 'Under'}
+
+
+def map_market_spec(spec: MarketSpec, home_team: str = None, away_team: str = None) -> dict | None:
+    """
+    将 MarketSpec 映射为 PIN888 盘口详细信息 (结果同 map_handicap_full)
+
+    Args:
+        spec: 解析后的盘口 (utils.marketSpec)
+        home_team: 主队名称 (Double Chance / Draw No Bet 需要)
+        away_team: 客队名称 (Double Chance / Draw No Bet 需要)
+
+    Returns:
+        map_handicap_full 的返回结构, 不支持时返回 None
+    """
+    if spec.sport == 'soccer':
+        return _map_soccer_spec(spec, home_team, away_team)
+    if spec.sport == 'basketball':
+        return _map_basketball_spec(spec)
+    print(f"❌ [PIN888 Mapping] 不支持的运动类型: {spec.sport}")
+    return None
+
+
+def _map_soccer_spec(spec: MarketSpec, home_team: str = None, away_team: str = None) -> dict | None:
+    family = spec.family
+    side = spec.side
+
+    # specials 盘口: 盘口名带时段后缀
+    if family in ('double_chance', 'odd_even', 'btts', 'draw_no_bet'):
+        suffix = _SOCCER_SPECIALS_SUFFIX.get(spec.period)
+        if suffix is None:
+            return None
 
-        case _:
-            print(f"❌ [PIN888 Mapping] 不支持的运动类型: {sport_type}")
+        if family == 'double_chance':
+            if side == 'home_draw':
+                if not home_team:
+                    print(f"❌ [PIN888 Mapping] 1X盘口需要home_team参数")
+                    return None
+                param = home_team + ' or Draw'
+            elif side == 'draw_away':
+                if not away_team:
+                    print(f"❌ [PIN888 Mapping] X2盘口需要away_team参数")
+                    return None
+                param = 'Draw or ' + away_team
+            else:
+                if not home_team or not away_team:
+                    print(f"❌ [PIN888 Mapping] 12盘口需要home_team和away_team参数")
+                    return None
+                param = home_team + ' or ' + away_team
+            return {
+                'mapped_market': 'specials',
+                'mapped_handicap': 'Double Chance' + suffix,
+                'mapped_handicap_param': param
+            }
+
+        if family == 'odd_even':
+            value = side.capitalize()
+            return {
+                'mapped_market': 'specials',
+                'mapped_handicap': 'Total Goals Odd/Even' + suffix,
+                'mapped_match': value,
+                'mapped_handicap_param': value
+            }
+
+        if family == 'btts':
+            return {
+                'mapped_market': 'specials',
+                'mapped_handicap': 'Both Teams To Score?' + suffix,
+                'mapped_match': 'n',
+                'mapped_handicap_param': 'Yes' if side == 'yes' else 'No'
+            }
+
+        # draw_no_bet
+        team = home_team if side == 'home' else away_team
+        if not team:
+            print(f"❌ [PIN888 Mapping] Draw No Bet需要{'home_team' if side == 'home' else 'away_team'}参数")
             return None
+        return {
+            'mapped_market': 'specials',
+            'mapped_handicap': 'Draw No Bet' + suffix,
+            'mapped_match': 'n',
+            'mapped_handicap_param': team
+        }
+
+    mapped_period = _SOCCER_PERIODS.get(spec.period)
+    if mapped_period is None:
+        return None
+
+    if family == '1x2':
+        return {
+            'mapped_market': 'normal',
+            'mapped_handicap': 'moneyLine',
+            'mapped_period': mapped_period,
+            'mapped_match': _PRICE_KEYS[side],
+            'mapped_handicap_param': _PRICE_KEYS[side]
+        }
+
+    if family == 'moneyline':
+        return {
+            'mapped_market': 'normal',
+            'mapped_handicap': 'moneyLine',
+            'mapped_period': mapped_period,
+            'mapped_direction': side,
+            'mapped_handicap_param': _PRICE_KEYS[side]
+        }
+
+    if family == 'handicap':
+        direction, match = _SPREAD_SIDES[side]
+        return {
+            'mapped_market': 'corners' if spec.corners else 'normal',
+            'mapped_handicap': 'handicap',
+            'mapped_period': mapped_period,
+            'mapped_direction': direction,
+            'mapped_match': match,
+            'mapped_handicap_param': spec.param_text if spec.corners else format_pin888_param(spec.param_text)
+        }
+
+    if family == 'total':
+        return {
+            'mapped_market': 'corners' if spec.corners else 'normal',
+            'mapped_handicap': 'overUnder',
+            'mapped_match': 'points',
+            'mapped_period': mapped_period,
+            'mapped_direction': _TOTAL_DIRECTIONS[side],
+            'mapped_handicap_param': spec.param_text if spec.corners else format_pin888_remove_dot_zero(spec.param_text)
+        }
+
+    if family == 'team_total' and not spec.corners:
+        return {
+            'mapped_market': 'normal',
+            'mapped_handicap': 'teamTotals',
+            'mapped_period': mapped_period,
+            'mapped_direction': spec.team,
+            'mapped_match': side,
+            'mapped_handicap_param': spec.param_text
+        }
+
+    return None
+
+
+def _map_basketball_spec(spec: MarketSpec) -> dict | None:
+    mapped_period = _BASKETBALL_PERIODS.get(spec.period)
+    if mapped_period is None:
+        return None
+
+    family = spec.family
+    side = spec.side
+
+    if family == '1x2':
+        print('[PIN888 Mapping] 没有 overTime,不做处理')
+        return None
+
+    if family == 'moneyline':
+        return {
+            'mapped_period': mapped_period,
+            'mapped_market': 'normal',
+            'mapped_handicap': 'moneyLine',
+            'mapped_direction': side,
+            'mapped_handicap_param': _PRICE_KEYS[side]
+        }
+
+    # "Asian Handicap1(0.0)/Draw No Bet" 在篮球按普通让分处理
+    if family in ('handicap', 'draw_no_bet'):
+        direction, match = _SPREAD_SIDES[side]
+        return {
+            'mapped_period': mapped_period,
+            'mapped_market': 'normal',
+            'mapped_handicap': 'handicap',
+            'mapped_direction': direction,
+            'mapped_match': match,
+            'mapped_handicap_param': spec.param_text
+        }
+
+    if family == 'team_total':
+        return {
+            'mapped_period': mapped_period,
+            'mapped_market': 'normal',
+            'mapped_handicap': 'teamTotals',
+            'mapped_direction': spec.team,
+            'mapped_match': side,
+            'mapped_handicap_param': spec.param_text
+        }
+
+    if family == 'total':
+        return {
+            'mapped_period': mapped_period,
+            'mapped_market': 'normal',
+            'mapped_handicap': 'overUnder',
+            'mapped_direction': _TOTAL_DIRECTIONS[side],
+            'mapped_match': 'points',
+            'mapped_handicap_param': spec.param_text
+        }
 
-    return result
+    return None
 
 
 def pin888(
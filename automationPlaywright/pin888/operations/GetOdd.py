@@ -8,19 +8,18 @@ import time
 import json
 # 导入必要的函数
 from ..jsCodeExecutors import (
-    subscribe_events_detail_euro,
-    unsubscribe_events_detail_euro,
     subscribe_live_euro_odds
 )
 from ..responseAnalysis import (
     parse_event_from_all_events,
-    parse_team_names_from_detail_data
+    get_detail_snapshot
 )
-from ..handler.timeAnalysis import analyze_remaining_time
-from ..mapping import map_handicap_full
-from ..responseAnalysis import find_odds_from_detail_data
+from utils.marketSpec import market_spec_from_bet_data
+from ..mapping import map_market_spec
 from ..handler.mappingBetParamsToIds import map_bet_params_to_ids
 from ..jsCodeExecutors import request_all_odds_selections
+from core.oddsFeedCache import OddsFeedCache
+from configs.settings import Settings as settings
 logger = logging.getLogger(__name__)
 
 
@@ -159,256 +158,278 @@ async def GetOdd(
 
     
 
-    # 2.1 优先使用 event_id 订阅事件详情
-    event_detail_data = await subscribe_events_detail_euro(self.page, matched_event_id)
+    # 2.0 启用共享赔率源时,公开赔率由 feed 页面统一拉取 (本页面只用于添加订单/下注)
+    spider_home = bet_data.get('spider_home', '')
+    spider_away = bet_data.get('spider_away', '')
+    feed_event_id, event_detail_data, used_feed = await self.get_event_detail_via_feed(
+        sportId=sportId,
+        period_num=period_num,
+        spider_home=spider_home,
+        spider_away=spider_away,
+        event_id=matched_event_id
+    )
+
+    # 本页面详情订阅的占用 (通过 feed 获取时为 None,feed 已释放)
+    detail_lease = None
+
+    try:
+        if used_feed:
+            if not event_detail_data:
+                logger.error(f"[{handler_name}] 共享赔率源未获取到比赛 {spider_home} -- {spider_away}")
+                return _create_error_response(handler_name, order_id, f'没有该场比赛 {spider_home} -- {spider_away}')
+            matched_event_id = feed_event_id
+            event_id = feed_event_id
+        else:
+            # 2.1 优先使用 event_id 订阅事件详情
+            detail_lease = await self.detail_subscription.acquire(matched_event_id)
+            event_detail_data = detail_lease.data if detail_lease else None
 
-    if not event_detail_data:
-        logger.warning(f"[{handler_name}] Betburger 提供的 eventId 无效,需要通过球队名重新匹配")
+        if not event_detail_data:
+            logger.warning(f"[{handler_name}] Betburger 提供的 eventId 无效,需要通过球队名重新匹配")
 
-        # 2.2 降级: 通过球队名匹配
-        all_events = await subscribe_live_euro_odds(self.page, sportId, period_num)
+            # 2.2 降级: 通过球队名匹配 (比赛列表优先读共享缓存)
+            odds_cache = OddsFeedCache()
+            all_events = odds_cache.get_all_events(
+                'pin888', sportId, period_num, settings.ODDS_FEED_EVENTS_MAX_AGE
+            )
+            if not all_events:
+                all_events = await subscribe_live_euro_odds(self.page, sportId, period_num)
+                odds_cache.publish_all_events('pin888', sportId, period_num, all_events)
 
-        if not all_events:
-            logger.error(f"[{handler_name}] 获取 all_events 失败")
-            return _create_error_response(handler_name, order_id, '获取 all_events 失败')
+            if not all_events:
+                logger.error(f"[{handler_name}] 获取 all_events 失败")
+                return _create_error_response(handler_name, order_id, '获取 all_events 失败')
 
-        spider_home = bet_data.get('spider_home', '')
-        spider_away = bet_data.get('spider_away', '')
+            parsed_result = parse_event_from_all_events(all_events, spider_home, spider_away)
 
-        parsed_result = parse_event_from_all_events(all_events, spider_home, spider_away)
+            if not parsed_result:
+                logger.error(f"[{handler_name}] 未能从 all_events 中匹配到比赛")
+                return _create_error_response(handler_name, order_id, '未能从 all_events 中匹配到比赛')
 
-        if not parsed_result:
-            logger.error(f"[{handler_name}] 未能从 all_events 中匹配到比赛")
-            return _create_error_response(handler_name, order_id, '未能从 all_events 中匹配到比赛')
+            matched_event_id = parsed_result['event_id']
+            event_id = matched_event_id
+            pin888_standard_home_name = parsed_result['home_name']
+            pin888_standard_away_name = parsed_result['away_name']
 
-        matched_event_id = parsed_result['event_id']
-        event_id = matched_event_id
-        pin888_standard_home_name = parsed_result['home_name']
-        pin888_standard_away_name = parsed_result['away_name']
+            # logger.info(f"[{handler_name}] ✅ 通过球队名匹配成功: {pin888_standard_home_name} vs {pin888_standard_away_name}")
 
-        # logger.info(f"[{handler_name}] ✅ 通过球队名匹配成功: {pin888_standard_home_name} vs {pin888_standard_away_name}")
+            detail_lease = await self.detail_subscription.acquire(matched_event_id)
+            event_detail_data = detail_lease.data if detail_lease else None
+            if not event_detail_data:
+                logger.error(f"[{handler_name}] 没有该场比赛 {spider_home} -- {spider_away}")
+                return _create_error_response(handler_name, order_id, f'没有该场比赛 {spider_home} -- {spider_away}')
 
-        event_detail_data = await subscribe_events_detail_euro(self.page, matched_event_id)
-        if not event_detail_data:
-            logger.error(f"[{handler_name}] 没有该场比赛 {spider_home} -- {spider_away}")
-            return _create_error_response(handler_name, order_id, f'没有该场比赛 {spider_home} -- {spider_away}')
+        # 2.3 提取标准球队名称和剩余时间 (同一 (eventId, version) 的解析结果在快照中共享)
+        detail_snapshot = get_detail_snapshot(event_detail_data)
+        team_names_result = detail_snapshot.team_names
 
-    # 2.3 提取标准球队名称和剩余时间
-    team_names_result = parse_team_names_from_detail_data(event_detail_data)
+        if not team_names_result:
+            logger.error(f"[{handler_name}] 未能提取标准球队名称")
+            return _create_error_response(handler_name, order_id, '未能提取标准球队名称')
 
-    if not team_names_result:
-        logger.error(f"[{handler_name}] 未能提取标准球队名称")
-        return _create_error_response(handler_name, order_id, '未能提取标准球队名称')
+        pin888_standard_home_name = team_names_result['pin888_home_name']
+        pin888_standard_away_name = team_names_result['pin888_away_name']
 
-    pin888_standard_home_name = team_names_result['pin888_home_name']
-    pin888_standard_away_name = team_names_result['pin888_away_name']
-    matchStateType = team_names_result['matchStateType']
+        # logger.info(f"[{handler_name}] ✅ 提取标准球队名称: {pin888_standard_home_name} vs {pin888_standard_away_name}")
 
-    # logger.info(f"[{handler_name}] ✅ 提取标准球队名称: {pin888_standard_home_name} vs {pin888_standard_away_name}")
+        # 分析剩余时间
+        remaining_time = detail_snapshot.remaining_time(sport_type)
 
-    # 分析剩余时间
-    remaining_time = analyze_remaining_time(match_state_type=matchStateType, sport_type=sport_type)
+        if not remaining_time:
+            logger.error(f"[{handler_name}] 未能分析剩余时间")
+            return _create_error_response(handler_name, order_id, '未能分析剩余时间')
 
-    if not remaining_time:
-        logger.error(f"[{handler_name}] 未能分析剩余时间")
-        return _create_error_response(handler_name, order_id, '未能分析剩余时间')
+        match_phase = remaining_time['match_phase']
+        remaining_seconds = remaining_time['remaining_seconds']
 
-    match_phase = remaining_time['match_phase']
-    remaining_seconds = remaining_time['remaining_seconds']
+        # 校准该比赛的时钟,补单时据此外推剩余时间
+        detail_snapshot.match_clock(sport_type)
 
-    minutes = remaining_seconds // 60
-    seconds = remaining_seconds % 60
-    time_display = f"{minutes:02d}:{seconds:02d}"
+        minutes = remaining_seconds // 60
+        seconds = remaining_seconds % 60
+        time_display = f"{minutes:02d}:{seconds:02d}"
 
-    logger.info(f"[{handler_name}] ⏱️ 剩余时间: {match_phase} - {time_display} ({remaining_seconds}秒)")
-    await self._send_message_to_electron(f"剩余时间: {match_phase} - {time_display} ({remaining_seconds}秒)")
+        logger.info(f"[{handler_name}] ⏱️ 剩余时间: {match_phase} - {time_display} ({remaining_seconds}秒)")
+        await self._send_message_to_electron(f"剩余时间: {match_phase} - {time_display} ({remaining_seconds}秒)")
 
-    # ========== Step 3: 映射盘口参数 ==========
-    # logger.info(f"[{handler_name}] Step 3: 映射盘口参数")
+        # ========== Step 3: 映射盘口参数 ==========
+        # logger.info(f"[{handler_name}] Step 3: 映射盘口参数")
 
     
 
-    mapping_result = map_handicap_full(
-        sport_type=sport_type,
-        handicap=bet_data.get('spider_handicap'),
-        period=bet_data.get('spider_period'),
-        handicap_param=bet_data.get('spider_handicap_param'),
-        home_team=pin888_standard_home_name,
-        away_team=pin888_standard_away_name
-    )
+        # 盘口解析为 MarketSpec (见 utils/marketSpec), 再映射为 PIN888 盘口
+        market_spec = market_spec_from_bet_data(bet_data)
+        mapping_result = None
+        if market_spec is not None:
+            mapping_result = map_market_spec(
+                market_spec,
+                home_team=pin888_standard_home_name,
+                away_team=pin888_standard_away_name
+            )
 
-    if mapping_result is None:
-        logger.error(f"[{handler_name}] Mapping 返回 None,不支持此盘口或时段")
-        await unsubscribe_events_detail_euro(self.page, event_id)
-        return _create_error_response(handler_name, order_id, 'Mapping 返回 None,不支持此盘口或时段')
+        if mapping_result is None:
+            logger.error(f"[{handler_name}] Mapping 返回 None,不支持此盘口或时段")
+            return _create_error_response(handler_name, order_id, 'Mapping 返回 None,不支持此盘口或时段')
 
-    mapped_market = mapping_result['mapped_market']
-    mapped_handicap = mapping_result['mapped_handicap']
-    mapped_handicap_param = mapping_result['mapped_handicap_param']
-    mapped_period = mapping_result['mapped_period']
-    mapped_direction = mapping_result.get('mapped_direction', '')
-    mapped_match = mapping_result.get('mapped_match', '')
+        mapped_market = mapping_result['mapped_market']
+        mapped_handicap = mapping_result['mapped_handicap']
+        mapped_handicap_param = mapping_result['mapped_handicap_param']
+        mapped_period = mapping_result['mapped_period']
+        mapped_direction = mapping_result.get('mapped_direction', '')
+        mapped_match = mapping_result.get('mapped_match', '')
 
-    # logger.info(f"[{handler_name}] ✅ 映射成功: market={mapped_market}, handicap={mapped_handicap}")
+        # logger.info(f"[{handler_name}] ✅ 映射成功: market={mapped_market}, handicap={mapped_handicap}")
 
-    # ========== Step 4: 查找赔率 ==========
-    # logger.info(f"[{handler_name}] Step 4: 查找赔率")
+        # ========== Step 4: 查找赔率 ==========
+        # logger.info(f"[{handler_name}] Step 4: 查找赔率")
 
    
 
-    odds_result = find_odds_from_detail_data(
-        sport_type=sport_type,
-        market_group=mapped_market,
-        platform_handicap=mapped_handicap,
-        platform_handicap_param=mapped_handicap_param,
-        platform_direction=mapped_direction,
-        platform_match=mapped_match,
-        period=mapped_period,
-        detail_odds=event_detail_data
-    )
+        odds_result = detail_snapshot.find_odds(
+            sport_type=sport_type,
+            market_group=mapped_market,
+            platform_handicap=mapped_handicap,
+            platform_handicap_param=mapped_handicap_param,
+            platform_direction=mapped_direction,
+            platform_match=mapped_match,
+            period=mapped_period
+        )
 
-    if odds_result == 'need refresh':
-        logger.warning(f"[{handler_name}] 需要刷新详细赔率数据")
-        await unsubscribe_events_detail_euro(self.page, event_id)
-        return _create_error_response(handler_name, order_id, '需要刷新详细赔率数据')
+        if odds_result == 'need refresh':
+            logger.warning(f"[{handler_name}] 需要刷新详细赔率数据")
+            return _create_error_response(handler_name, order_id, '需要刷新详细赔率数据')
 
-    if not odds_result:
-        logger.error(f"[{handler_name}] 未能从详细赔率数据中找到匹配的赔率")
-        await unsubscribe_events_detail_euro(self.page, event_id)
-        return _create_error_response(handler_name, order_id, '未能从详细赔率数据中找到匹配的赔率')
+        if not odds_result:
+            logger.error(f"[{handler_name}] 未能从详细赔率数据中找到匹配的赔率")
+            return _create_error_response(handler_name, order_id, '未能从详细赔率数据中找到匹配的赔率')
 
-    parsed_odd = odds_result.get('odd')
-    parsed_lineID = odds_result.get('lineID')
-    parsed_market_group_id = odds_result.get('market_group_id')
-    parsed_isAlt = odds_result.get('isAlt')
-    parsed_specials_i = odds_result.get('specials_i')
-    parsed_specials_event_id = odds_result.get('specials_event_id')
+        parsed_odd = odds_result.get('odd')
+        parsed_lineID = odds_result.get('lineID')
+        parsed_market_group_id = odds_result.get('market_group_id')
+        parsed_isAlt = odds_result.get('isAlt')
+        parsed_specials_i = odds_result.get('specials_i')
+        parsed_specials_event_id = odds_result.get('specials_event_id')
 
-    # logger.info(f"[{handler_name}] ✅ 成功解析赔率: odd={parsed_odd}, lineID={parsed_lineID}")
+        # logger.info(f"[{handler_name}] ✅ 成功解析赔率: odd={parsed_odd}, lineID={parsed_lineID}")
 
-    # ========== Step 5: 构造下单参数 ==========
-    # logger.info(f"[{handler_name}] Step 5: 构造下单参数")
+        # ========== Step 5: 构造下单参数 ==========
+        # logger.info(f"[{handler_name}] Step 5: 构造下单参数")
 
     
 
-    mapping_result = map_bet_params_to_ids(
-        sport_type=sport_type,
-        handicap=bet_data.get('spider_handicap'),
-        period=bet_data.get('spider_period'),
-        direction=mapped_direction,
-        match=mapped_match,
-        handicap_param=mapped_handicap_param,
-        line_id=parsed_lineID,
-        market_group_id=parsed_market_group_id,
-        is_alt=parsed_isAlt if parsed_isAlt else False,
-        specials_i=parsed_specials_i if parsed_specials_i else 0,
-        specials_event_id=parsed_specials_event_id if parsed_specials_event_id else 0
-    )
-
-    if not mapping_result:
-        logger.error(f"[{handler_name}] 映射失败")
-        await unsubscribe_events_detail_euro(self.page, event_id)
-        return _create_error_response(handler_name, order_id, '映射失败')
-
-    oddsID = mapping_result['oddsID']
-    oddsSelectionsType = mapping_result['oddsSelectionsType']
-    selectionID = mapping_result['selectionID']
-
-    # logger.info(f"[{handler_name}] ✅ 成功映射参数: oddsID={oddsID}")
-
-    # ========== Step 6: 验证盘口可用性 ==========
-    # logger.info(f"[{handler_name}] Step 6: 验证盘口可用性")
+        mapping_result = map_bet_params_to_ids(
+            sport_type=sport_type,
+            handicap=bet_data.get('spider_handicap'),
+            period=bet_data.get('spider_period'),
+            direction=mapped_direction,
+            match=mapped_match,
+            handicap_param=mapped_handicap_param,
+            line_id=parsed_lineID,
+            market_group_id=parsed_market_group_id,
+            is_alt=parsed_isAlt if parsed_isAlt else False,
+            specials_i=parsed_specials_i if parsed_specials_i else 0,
+            specials_event_id=parsed_specials_event_id if parsed_specials_event_id else 0
+        )
+
+        if not mapping_result:
+            logger.error(f"[{handler_name}] 映射失败")
+            return _create_error_response(handler_name, order_id, '映射失败')
+
+        oddsID = mapping_result['oddsID']
+        oddsSelectionsType = mapping_result['oddsSelectionsType']
+        selectionID = mapping_result['selectionID']
+
+        # logger.info(f"[{handler_name}] ✅ 成功映射参数: oddsID={oddsID}")
+
+        # ========== Step 6: 验证盘口可用性 ==========
+        # logger.info(f"[{handler_name}] Step 6: 验证盘口可用性")
 
     
 
-    response = await request_all_odds_selections(
-        page=self.page,
-        odds_id=oddsID,
-        selection_id=selectionID,
-        odds_selections_type=oddsSelectionsType,
-        handler_name=handler_name
-    )
-
-    if not response:
-        logger.error(f"[{handler_name}] 请求 [添加订单] 失败")
-        await unsubscribe_events_detail_euro(self.page, event_id)
-        return _create_error_response(handler_name, order_id, '请求 [添加订单] 失败')
-
-    # 解析响应数据
-    try:
-        response_data = json.loads(response['response'])
-        if not response_data or len(response_data) == 0:
-            logger.error(f"[{handler_name}] [添加订单] 响应数据为空")
-            await unsubscribe_events_detail_euro(self.page, event_id)
-            return _create_error_response(handler_name, order_id, '[添加订单] 响应数据为空')
-
-        data = response_data[0]
-
-        response_selection_id = data.get('selectionId')
-        odds_id = data.get('oddsId')
-        odds = data.get('odds') or data.get('odd')
-        max_stake = data.get('maxStake')
-        status = data.get('status')
-
-        if status == 'UNAVAILABLE':
-            logger.warning(f"[{handler_name}] [添加订单]成功,但已封盘,不能下单")
-            await self._send_message_to_electron('[添加订单]成功,但已封盘,不能下单')
-            await unsubscribe_events_detail_euro(self.page, event_id)
-            return _create_error_response(handler_name, order_id, '盘口已封盘')
-
-        if not oddsID or odds is None:
-            logger.error(f"[{handler_name}] [添加订单]成功,但回复数据不完整")
-            await self._send_message_to_electron('[添加订单]成功,但回复数据不完整')
-            await unsubscribe_events_detail_euro(self.page, event_id)
-            return _create_error_response(handler_name, order_id, '回复数据不完整')
-
-        # 存储订单记录
-        self.order_record[order_id] = {
-            'selectionId': response_selection_id,
-            'oddsId': oddsID,
-            'odds': str(odds),
-            'maxStake': max_stake,
-            'pin888_standard_home_name': pin888_standard_home_name,
-            'pin888_standard_away_name': pin888_standard_away_name,
-            'event_id': event_id,
-            'event_detail_data': event_detail_data,
-            'sport_type': sport_type,
-            'sportId': sportId,
-            'period_num': period_num,
-            'msg': original_msg,
-            'retry_count': 0,
-            'spider_handicap': bet_data.get('spider_handicap'),
-            'spider_period': bet_data.get('spider_period'),
-            'spider_sport_type': sport_type,
-            'mapped_market': mapped_market,
-            'mapped_handicap': mapped_handicap,
-            'mapped_handicap_param': mapped_handicap_param,
-            'mapped_period': mapped_period,
-            'mapped_direction': mapped_direction,
-            'mapped_match': mapped_match,
-            'remaining_seconds': remaining_seconds
-        }
-
-        await unsubscribe_events_detail_euro(self.page, event_id)
-
-        # 计算执行时间
-        duration = time.time() - start_time
-        # logger.info(f"[{handler_name}] ✅ GetOdd 完成 (耗时: {duration:.2f}秒)")
+        response = await request_all_odds_selections(
+            page=self.page,
+            odds_id=oddsID,
+            selection_id=selectionID,
+            odds_selections_type=oddsSelectionsType,
+            handler_name=handler_name
+        )
+
+        if not response:
+            logger.error(f"[{handler_name}] 请求 [添加订单] 失败")
+            return _create_error_response(handler_name, order_id, '请求 [添加订单] 失败')
+
+        # 解析响应数据
+        try:
+            response_data = json.loads(response['response'])
+            if not response_data or len(response_data) == 0:
+                logger.error(f"[{handler_name}] [添加订单] 响应数据为空")
+                return _create_error_response(handler_name, order_id, '[添加订单] 响应数据为空')
+
+            data = response_data[0]
+
+            response_selection_id = data.get('selectionId')
+            odds_id = data.get('oddsId')
+            odds = data.get('odds') or data.get('odd')
+            max_stake = data.get('maxStake')
+            status = data.get('status')
+
+            if status == 'UNAVAILABLE':
+                logger.warning(f"[{handler_name}] [添加订单]成功,但已封盘,不能下单")
+                await self._send_message_to_electron('[添加订单]成功,但已封盘,不能下单')
+                return _create_error_response(handler_name, order_id, '盘口已封盘')
+
+            if not oddsID or odds is None:
+                logger.error(f"[{handler_name}] [添加订单]成功,但回复数据不完整")
+                await self._send_message_to_electron('[添加订单]成功,但回复数据不完整')
+                return _create_error_response(handler_name, order_id, '回复数据不完整')
+
+            # 存储订单记录
+            self.order_record[order_id] = {
+                'selectionId': response_selection_id,
+                'oddsId': oddsID,
+                'odds': str(odds),
+                'maxStake': max_stake,
+                'pin888_standard_home_name': pin888_standard_home_name,
+                'pin888_standard_away_name': pin888_standard_away_name,
+                'event_id': event_id,
+                'event_detail_data': event_detail_data,
+                'sport_type': sport_type,
+                'sportId': sportId,
+                'period_num': period_num,
+                'msg': original_msg,
+                'retry_count': 0,
+                'spider_handicap': bet_data.get('spider_handicap'),
+                'spider_period': bet_data.get('spider_period'),
+                'spider_sport_type': sport_type,
+                'mapped_market': mapped_market,
+                'mapped_handicap': mapped_handicap,
+                'mapped_handicap_param': mapped_handicap_param,
+                'mapped_period': mapped_period,
+                'mapped_direction': mapped_direction,
+                'mapped_match': mapped_match,
+                'remaining_seconds': remaining_seconds
+            }
 
-        return {
-            'success': True,
-            'handler_name': handler_name,
-            'order_id': order_id,
-            'platform_odd': odds,
-            'platform_max_stake': max_stake,
-            'match_phase': match_phase,
-            'remaining_seconds': remaining_seconds,
-            'spider_handicap': bet_data.get('spider_handicap'),
-            'spider_period': bet_data.get('spider_period'),
-            'sport_type': sport_type
-        }
+            # 计算执行时间
+            duration = time.time() - start_time
+            # logger.info(f"[{handler_name}] ✅ GetOdd 完成 (耗时: {duration:.2f}秒)")
+
+            return {
+                'success': True,
+                'handler_name': handler_name,
+                'order_id': order_id,
+                'platform_odd': odds,
+                'platform_max_stake': max_stake,
+                'match_phase': match_phase,
+                'remaining_seconds': remaining_seconds,
+                'spider_handicap': bet_data.get('spider_handicap'),
+                'spider_period': bet_data.get('spider_period'),
+                'sport_type': sport_type
+            }
 
-    except Exception as e:
-        logger.error(f"[{handler_name}] 解析响应数据失败: {e}", exc_info=True)
-        await unsubscribe_events_detail_euro(self.page, event_id)
-        return _create_error_response(handler_name, order_id, f'解析响应数据失败: {str(e)}')
+        except Exception as e:
+            logger.error(f"[{handler_name}] 解析响应数据失败: {e}", exc_info=True)
+            return _create_error_response(handler_name, order_id, f'解析响应数据失败: {str(e)}')
+    finally:
+        # 所有返回路径 (包括异常) 都释放本页面的详情订阅占用
+        await self.detail_subscription.release(detail_lease)
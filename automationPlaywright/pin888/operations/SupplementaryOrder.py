@@ -9,15 +9,24 @@ import asyncio
 import json
 
 from core.config import config
-from ..responseAnalysis import (
-    find_odds_from_detail_data,
-    find_odds_from_detail_data_with_range,
-)
+from core.oddsFeedCache import OddsFeedCache
+from ..responseAnalysis import get_detail_snapshot
 from ..handler import map_bet_params_to_ids, calculate_arbitrage_range
-from ..jsCodeExecutors import request_all_odds_selections, unsubscribe_events_detail_euro
+from ..handler.timeAnalysis import get_match_clock
+from ..jsCodeExecutors import (
+    request_all_odds_selections,
+    wait_detail_odds_change,
+    get_detail_seq,
+)
 
 logger = logging.getLogger(__name__)
 
+# 兜底心跳(秒): 没有收到详情赔率推送时,最长间隔多久重新评估一次
+DETAIL_HEARTBEAT_SECONDS = 2.0
+
+# 比赛时钟超过该时间(秒)没有新的详情帧校准时不再采用,回到固定的补单窗口
+CLOCK_STALE_SECONDS = 30.0
+
 
 # ==================== 辅助函数 ====================
 
@@ -120,7 +129,10 @@ def _init_retry_context(record: Dict[str, Any]) -> Dict[str, Any]:
     """
     retry_count = int(record.get('retry_count', 0) or 0)
     max_retry = config.get_max_retry_count()
-    remaining_seconds = record.get('remaining_seconds')
+
+    # 优先使用比赛时钟外推的剩余时间 (record 中的是 GetOdd 时的值)
+    clock = get_match_clock(record.get('event_id'))
+    remaining_seconds = clock.remaining_seconds() if clock else record.get('remaining_seconds')
     try:
         remaining_seconds = float(remaining_seconds)
     except (TypeError, ValueError):
@@ -133,9 +145,48 @@ def _init_retry_context(record: Dict[str, Any]) -> Dict[str, Any]:
         'retry_count': retry_count,
         'max_retry': max_retry,
         'remaining_seconds': remaining_seconds,
+        'last_retry_at': None,
+        'last_notice_status': None,
+        'last_notice_at': None,
     }
 
 
+def _consume_retry(retry_state: Dict[str, Any], record: Dict[str, Any]) -> None:
+    """
+    记一次重试: 每个心跳间隔 (DETAIL_HEARTBEAT_SECONDS) 内最多记一次
+
+    推送只是让补单更快地重新评估,重试次数仍按原来每 2 秒一次的节奏消耗,
+    交易高峰期连续推送不会在几秒内用完 MAX_RETRY_COUNT
+    """
+    now = time.monotonic()
+    last_retry_at = retry_state['last_retry_at']
+    if last_retry_at is not None and now - last_retry_at < DETAIL_HEARTBEAT_SECONDS:
+        return
+    retry_state['last_retry_at'] = now
+    retry_state['retry_count'] += 1
+    record['retry_count'] = retry_state['retry_count']
+
+
+async def _notify_electron(self, retry_state: Dict[str, Any], status: str, message: str) -> None:
+    """
+    补单循环内的 Electron 提示: 状态变化时立即发送,同一状态每个心跳间隔内最多发送一次
+
+    循环由详情推送驱动,交易高峰期每秒可能评估多次,
+    直接发送会把 Electron 通道刷满 (原来的轮询节奏是每 2 秒一条)
+    """
+    now = time.monotonic()
+    last_notice_at = retry_state['last_notice_at']
+    if (
+        status == retry_state['last_notice_status']
+        and last_notice_at is not None
+        and now - last_notice_at < DETAIL_HEARTBEAT_SECONDS
+    ):
+        return
+    retry_state['last_notice_status'] = status
+    retry_state['last_notice_at'] = now
+    await self._send_message_to_electron(message)
+
+
 def _cycle_control_allows_retry(self) -> bool:
     """
     检查补单循环总开关
@@ -154,25 +205,85 @@ def _cycle_control_allows_retry(self) -> bool:
     return True
 
 
-async def _fetch_event_detail(
-    self,
-    context: Dict[str, Any]
-) -> Tuple[Optional[str], Optional[Any]]:
+async def _fetch_event_detail(self, context: Dict[str, Any]):
     """
-    根据球队信息获取最新的 event_id 以及详细赔率
+    根据球队信息获取最新的 event_id 以及详细赔率,并占用页面的详情订阅
+
+    Returns:
+        DetailLease (event_id / data); 获取失败返回 None
     """
     try:
-        event_id, event_detail_data = await self.get_event_id(
+        return await self.acquire_event_detail(
             sportId=context['sport_id'],
             period_num=context['period_num'],
             spider_home=context['pin_home'],
             spider_away=context['pin_away'],
             event_id=context['event_id'],
         )
-        return event_id, event_detail_data
     except Exception as exc:
         logger.error(f"[{self.handler_name}] 获取赛事详情失败: {exc}", exc_info=True)
-        return None, None
+        return None
+
+
+async def _wait_detail_update(
+    self,
+    event_id: Optional[str],
+    detail_seq: int,
+    deadline: float
+) -> Tuple[Optional[Any], int]:
+    """
+    等待已订阅赛事的详情赔率推送,超过心跳时间则返回当前快照
+
+    收到的详情同时发布到 OddsFeedCache,本页面作为共享赔率 feed 时其他账号直接读缓存
+
+    Returns:
+        (event_detail_data, detail_seq), 订阅已失效时 event_detail_data 为 None
+    """
+    timeout = min(DETAIL_HEARTBEAT_SECONDS, max(deadline - time.time(), 0.0))
+    update = await wait_detail_odds_change(
+        self.page,
+        since_seq=detail_seq,
+        timeout=timeout,
+        handler_name=self.handler_name
+    )
+    if not update:
+        return None, detail_seq
+
+    odds = update.get('odds')
+    seq = int(update.get('seq') or detail_seq)
+
+    # 页面详情订阅被切换到其他比赛 (例如作为共享赔率 feed 被借用),视为订阅失效
+    if odds and event_id and str(odds.get('eventId')) != str(event_id):
+        logger.info(f"[{self.handler_name}] 详情订阅已切换到 eventId={odds.get('eventId')},重新订阅")
+        return None, seq
+
+    if update.get('changed'):
+        logger.debug(f"[{self.handler_name}] 收到详情赔率推送: seq={seq}")
+    if odds and event_id:
+        OddsFeedCache().publish_event_detail('pin888', event_id, odds)
+    return odds, seq
+
+
+def _clock_deadline(context: Dict[str, Any], deadline: float, max_deadline: float) -> float:
+    """
+    按比赛时钟修正补单截止时间 (每次决策前调用,不访问页面)
+
+    Args:
+        context: 补单上下文
+        deadline: 上一次的截止时间
+        max_deadline: 固定补单窗口的截止时间 (开始时间 + 补单窗口),结果不会超过它
+
+    时钟只会提前截止时间 (阶段临近结束),停表不会顺延到固定窗口之外;
+    时钟已过期 (CLOCK_STALE_SECONDS 内没有新帧) 时回到固定窗口;
+    剩余时间归零 (阶段结束 / 补时) 后保持上一次的截止时间
+    """
+    clock = get_match_clock(context['event_id'])
+    if clock is None or clock.frame_age() > CLOCK_STALE_SECONDS:
+        return max_deadline
+    remaining = clock.remaining_seconds()
+    if remaining <= 0:
+        return deadline
+    return min(time.time() + remaining, max_deadline)
 
 
 def _locate_target_odds(
@@ -186,6 +297,10 @@ def _locate_target_odds(
     Returns:
         (result, need_refresh)
     """
+    # 心跳超时拿到的同一版本详情直接复用上次的查找结果
+    detail_snapshot = get_detail_snapshot(event_detail_data)
+    detail_snapshot.match_clock(context['sport_type'])
+
     bet_info = context['bet_info']
     success_handicap = (bet_info.get('success_platform_handicap') or '').lower()
     success_param = bet_info.get('success_platform_handicap_param', '')
@@ -208,26 +323,24 @@ def _locate_target_odds(
         if not arbitrage_condition:
             return None, False
 
-        odds_result = find_odds_from_detail_data_with_range(
+        odds_result = detail_snapshot.find_odds_with_range(
             sport_type=context['sport_type'],
             market_group=context['mapped_market'],
             platform_handicap=context['mapped_handicap'],
             platform_direction=context['mapped_direction'],
             platform_match=context['mapped_match'],
             period=context['mapped_period'],
-            detail_odds=event_detail_data,
             range_condition=arbitrage_condition
         )
     else:
-        odds_result = find_odds_from_detail_data(
+        odds_result = detail_snapshot.find_odds(
             sport_type=context['sport_type'],
             market_group=context['mapped_market'],
             platform_handicap=context['mapped_handicap'],
             platform_handicap_param=context['mapped_handicap_param'],
             platform_direction=context['mapped_direction'],
             platform_match=context['mapped_match'],
-            period=context['mapped_period'],
-            detail_odds=event_detail_data
+            period=context['mapped_period']
         )
 
     if odds_result == 'need refresh':
@@ -290,7 +403,8 @@ async def _calculate_target_amount(
     self,
     record: Dict[str, Any],
     bet_info: Dict[str, Any],
-    current_odd: Any
+    current_odd: Any,
+    retry_state: Dict[str, Any]
 ) -> float:
     """
     根据套利信息或原始记录计算本次补单金额
@@ -313,7 +427,8 @@ async def _calculate_target_amount(
                 our_odds=our_odds
             )
             betting_amount = round(float(optimal_amount), 1)
-            await self._send_message_to_electron(
+            await _notify_electron(
+                self, retry_state, 'arbitrage',
                 f"[PIN888] 套利计算: 对手${opponent_amount}@{opponent_odds}, "
                 f"最优金额${betting_amount}"
             )
@@ -329,7 +444,8 @@ async def _calculate_target_amount(
 async def _prepare_selection_update(
     self,
     context: Dict[str, Any],
-    odds_result: Dict[str, Any]
+    odds_result: Dict[str, Any],
+    retry_state: Dict[str, Any]
 ) -> Optional[Dict[str, Any]]:
     """
     重新映射盘口参数并通过请求确认可用性
@@ -381,7 +497,7 @@ async def _prepare_selection_update(
     status = data.get('status')
     if status == 'UNAVAILABLE':
         logger.warning(f"[{self.handler_name}] [添加订单] 成功但盘口已封盘")
-        await self._send_message_to_electron('[PIN888] [添加订单]成功,但已封盘,不能下单')
+        await _notify_electron(self, retry_state, 'unavailable', '[PIN888] [添加订单]成功,但已封盘,不能下单')
         return None
 
     odds = data.get('odds') or data.get('odd')
@@ -390,7 +506,7 @@ async def _prepare_selection_update(
 
     if odds is None:
         logger.error(f"[{self.handler_name}] [添加订单] 响应缺少赔率字段")
-        await self._send_message_to_electron('[PIN888] [添加订单]成功,但回复数据不完整')
+        await _notify_electron(self, retry_state, 'incomplete', '[PIN888] [添加订单]成功,但回复数据不完整')
         return None
 
     return {
@@ -430,41 +546,60 @@ async def SupplementaryOrder(
             f"[PIN888] 补单窗口 {timeout_seconds:.0f} 秒,最多重试 {retry_state['max_retry']} 次"
         )
 
-        while time.time() - start_time < timeout_seconds:
-            attempt = retry_state['retry_count'] + 1
-            if attempt > retry_state['max_retry']:
-                failure_reason = 'retry_count_max'
-                break
+        max_deadline = start_time + timeout_seconds
+        deadline = max_deadline
+        event_id = None
+        event_detail_data = None
+        detail_lease = None
+        detail_seq = 0
 
-            if not _cycle_control_allows_retry(self):
-                failure_reason = 'cycle_closed'
-                break
+        try:
+            while True:
+                deadline = _clock_deadline(context, deadline, max_deadline)
+                if time.time() >= deadline:
+                    break
 
-            logger.info(
-                f"[{handler_name}] 第 {attempt}/{retry_state['max_retry']} 次尝试补单, "
-                f"已耗时 {time.time() - start_time:.1f}s"
-            )
+                attempt = retry_state['retry_count'] + 1
+                if attempt > retry_state['max_retry']:
+                    failure_reason = 'retry_count_max'
+                    break
 
-            event_id, event_detail_data = await _fetch_event_detail(self, context)
-            context['event_id'] = event_id
+                if not _cycle_control_allows_retry(self):
+                    failure_reason = 'cycle_closed'
+                    break
 
-            if not event_id or not event_detail_data:
-                retry_state['retry_count'] += 1
-                context['record']['retry_count'] = retry_state['retry_count']
-                await asyncio.sleep(2)
-                continue
+                logger.info(
+                    f"[{handler_name}] 第 {attempt}/{retry_state['max_retry']} 次尝试补单, "
+                    f"已耗时 {time.time() - start_time:.1f}s"
+                )
+
+                # 订阅失效(或首次进入)时才重新获取详情,其余情况由推送驱动
+                if not event_detail_data:
+                    await self.detail_subscription.release(detail_lease)
+                    detail_lease = await _fetch_event_detail(self, context)
+                    event_id = detail_lease.event_id if detail_lease else None
+                    event_detail_data = detail_lease.data if detail_lease else None
+                    if event_id:
+                        context['event_id'] = event_id
+                        OddsFeedCache().publish_event_detail('pin888', event_id, event_detail_data)
+
+                    if not event_id or not event_detail_data:
+                        _consume_retry(retry_state, context['record'])
+                        event_detail_data = None
+                        await asyncio.sleep(DETAIL_HEARTBEAT_SECONDS)
+                        continue
+
+                    detail_seq = await get_detail_seq(self.page)
 
-            try:
                 odds_result, need_refresh = _locate_target_odds(self, context, event_detail_data)
                 if need_refresh:
-                    logger.info(f"[{handler_name}] 赔率数据需要刷新,等待重试")
-                    await asyncio.sleep(2)
+                    logger.info(f"[{handler_name}] 赔率数据需要刷新,等待推送")
+                    event_detail_data, detail_seq = await _wait_detail_update(self, event_id, detail_seq, deadline)
                     continue
 
                 if not odds_result:
-                    retry_state['retry_count'] += 1
-                    context['record']['retry_count'] = retry_state['retry_count']
-                    await asyncio.sleep(2)
+                    _consume_retry(retry_state, context['record'])
+                    event_detail_data, detail_seq = await _wait_detail_update(self, event_id, detail_seq, deadline)
                     continue
 
                 parsed_odd = odds_result.get('odd')
@@ -475,10 +610,11 @@ async def SupplementaryOrder(
                         logger.info(
                             f"[{handler_name}] 赔率下降 {abs(percent):.2f}%,超过阈值,等待更好盘口"
                         )
-                        await self._send_message_to_electron(
+                        await _notify_electron(
+                            self, retry_state, 'odds_drop',
                             f"[PIN888] 赔率下降 {abs(percent):.2f}% 超过阈值,继续等待"
                         )
-                        await asyncio.sleep(2)
+                        event_detail_data, detail_seq = await _wait_detail_update(self, event_id, detail_seq, deadline)
                         continue
                     else:
                         trend = "下降" if percent < 0 else "上升"
@@ -488,7 +624,8 @@ async def SupplementaryOrder(
                     self,
                     context['record'],
                     context['bet_info'],
-                    parsed_odd
+                    parsed_odd,
+                    retry_state
                 )
 
                 if betting_amount <= 0:
@@ -496,11 +633,10 @@ async def SupplementaryOrder(
                     logger.error(f"[{handler_name}] 无法确定补单金额")
                     break
 
-                selection_update = await _prepare_selection_update(self, context, odds_result)
+                selection_update = await _prepare_selection_update(self, context, odds_result, retry_state)
                 if not selection_update:
-                    retry_state['retry_count'] += 1
-                    context['record']['retry_count'] = retry_state['retry_count']
-                    await asyncio.sleep(2)
+                    _consume_retry(retry_state, context['record'])
+                    event_detail_data, detail_seq = await _wait_detail_update(self, event_id, detail_seq, deadline)
                     continue
 
                 record = context['record']
@@ -551,21 +687,19 @@ async def SupplementaryOrder(
                     }
 
                 logger.warning(f"[{handler_name}] 补单下注失败,准备重试")
-                retry_state['retry_count'] += 1
-                context['record']['retry_count'] = retry_state['retry_count']
+                _consume_retry(retry_state, context['record'])
 
                 if retry_state['retry_count'] >= retry_state['max_retry']:
                     failure_reason = 'retry_count_max'
                     break
 
-                await asyncio.sleep(2)
+                event_detail_data, detail_seq = await _wait_detail_update(self, event_id, detail_seq, deadline)
 
-            finally:
-                if event_id:
-                    try:
-                        await unsubscribe_events_detail_euro(self.page, event_id)
-                    except Exception as exc:  # noqa: BLE001
-                        logger.debug(f"[{handler_name}] 取消订阅赛事失败: {exc}")
+        finally:
+            try:
+                await self.detail_subscription.release(detail_lease)
+            except Exception as exc:  # noqa: BLE001
+                logger.debug(f"[{handler_name}] 取消订阅赛事失败: {exc}")
 
         failure_message = {
             "type": "supplement_order_failed",
@@ -6,6 +6,11 @@ from typing import Dict, Any
 import logging
 import asyncio
 from utils import get_js_loader
+from ..handler.sessionState import (
+    save_session_state,
+    restore_session_state,
+    delete_session_state,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +22,9 @@ async def prepare_work(
     """
     准备工作: 检查登录状态、注入 WebSocket Hook、获取余额
 
+    登录态检查优先走会话快照: 余额请求探测成功即视为已登录,
+    跳过登录流程及其中的固定等待; 探测失败才走原有的登录流程
+
     注意: 浏览器操作由 browser_controller 处理,此方法只负责业务逻辑
 
     Args:
@@ -50,27 +58,35 @@ async def prepare_work(
         except Exception as e:
             logger.warning(f"[{handler_name}] ⚠️ 等待页面加载超时: {e}")
 
-        await asyncio.sleep(15)  # 缓冲时间 (与原代码一致)
-
-        # ========== Step 2: 检查登录状态 ==========
+        # ========== Step 2: 检查登录状态 (会话探测) ==========
         logger.info(f"[{handler_name}] Step 2: 检查登录状态")
         print(f"🧾 [{handler_name}] Step 2: 检查登录状态")
 
-        deposit_link = await self.pom.find_deposit_link_element()
-        deposit_count = await deposit_link.count()
-        logger.info(f"[{handler_name}] Deposit 按钮数量: {deposit_count}")
+        ads_id = self.config.get('ads_id')
+        balance = await _probe_session(self, ads_id)
 
-        if deposit_count > 0:
-            logger.info(f"[{handler_name}] ✅ 已登录,跳过登录流程")
+        if balance:
+            logger.info(f"[{handler_name}] ✅ 会话有效,跳过登录流程")
         else:
-            # ========== Step 3: 执行登录流程 ==========
-            logger.info(f"[{handler_name}] Step 3: 执行登录流程")
-            print(f"🧾 [{handler_name}] Step 3: 执行登录流程")
+            await asyncio.sleep(15)  # 缓冲时间 (与原代码一致)
+
+            deposit_link = await self.pom.find_deposit_link_element()
+            deposit_count = await deposit_link.count()
+            logger.info(f"[{handler_name}] Deposit 按钮数量: {deposit_count}")
+
+            if deposit_count > 0:
+                logger.info(f"[{handler_name}] ✅ 已登录,跳过登录流程")
+            else:
+                # ========== Step 3: 执行登录流程 ==========
+                logger.info(f"[{handler_name}] Step 3: 执行登录流程")
+                print(f"🧾 [{handler_name}] Step 3: 执行登录流程")
+
+                login_success = await _perform_login(self)
 
-            login_success = await _perform_login(self)
+                if not login_success:
+                    return {'success': False, 'message': '登录失败'}
 
-            if not login_success:
-                return {'success': False, 'message': '登录失败'}
+            await save_session_state(self.page, ads_id)
 
         # ========== Step 4: 注入 WebSocket Hook ==========
         logger.info(f"[{handler_name}] Step 4: 注入 WebSocket Hook")
@@ -86,7 +102,8 @@ async def prepare_work(
         logger.info(f"[{handler_name}] Step 5: 获取余额并发送")
         print(f"🧾 [{handler_name}] Step 5: 获取余额并发送")
 
-        balance = await self.pom.find_balance_by_request()
+        if not balance:
+            balance = await self.pom.find_balance_by_request()
 
         if balance:
             logger.info(f"[{handler_name}] 💰 当前余额: {balance}")
@@ -129,6 +146,43 @@ async def prepare_work(
         }
 
 
+async def _probe_session(self, ads_id: str):
+    """
+    探测当前会话是否有效 (内部辅助方法)
+
+    1. 直接用余额请求探测 (浏览器仍保持登录时最快)
+    2. 失败则恢复 ads_id 对应的会话快照,刷新页面后再探测一次
+    探测成功时刷新快照,快照失效时删除
+
+    Returns:
+        str: 会话有效时返回余额字符串,否则返回 None
+    """
+    handler_name = self.handler_name
+
+    balance = await self.pom.find_balance_by_request()
+    if balance:
+        await save_session_state(self.page, ads_id)
+        return balance
+
+    if not await restore_session_state(self.page, ads_id):
+        return None
+
+    try:
+        await self.page.reload(wait_until='domcontentloaded', timeout=15000)
+    except Exception as e:
+        logger.warning(f"[{handler_name}] ⚠️ 恢复会话后刷新页面超时: {e}")
+
+    balance = await self.pom.find_balance_by_request()
+    if balance:
+        logger.info(f"[{handler_name}] ♻️ 会话快照恢复成功")
+        await save_session_state(self.page, ads_id)
+        return balance
+
+    logger.info(f"[{handler_name}] 会话快照已失效,走登录流程")
+    delete_session_state(ads_id)
+    return None
+
+
 async def _inject_websocket_hook(self) -> bool:
     """
     注入 WebSocket Hook (内部辅助方法)
@@ -66,6 +66,11 @@ class Pin888Automation(AutomationBase):
             except ImportError as e:
                 logger.warning(f"[{self.handler_name}] POM 模块未找到,将在 prepare_work 中初始化: {e}")
 
+        # ==================== 详情订阅 ====================
+        # 页面详情订阅的引用计数: 本账号的 GetOdd / 补单和借用本页面的其他账号 (作为 feed 时) 共用
+        from .handler.detailSubscription import DetailSubscription
+        self.detail_subscription = DetailSubscription(self)
+
         # ==================== 计数器 ====================
         self.count_get_ws_result: int = 0  # WebSocket 结果获取计数器 (避免日志刷屏)
         self.connect_count: int = 0  # WebSocket 连接尝试计数器
@@ -104,16 +109,17 @@ class Pin888Automation(AutomationBase):
             except Exception as e:
                 logger.warning(f"[{self.handler_name}] 发送消息到 Electron 失败: {e}")
 
-    async def get_event_id(
+    async def acquire_event_detail(
         self,
         sportId: int,
         period_num: str,
         spider_home: str,
         spider_away: str,
-        event_id: str = None
-    ) -> tuple:
+        event_id: str = None,
+        borrow: bool = False
+    ):
         """
-        获取 event_id 和 event_detail_data
+        获取比赛详情并占用本页面的详情订阅
 
         Args:
             sportId: 运动类型ID
@@ -121,75 +127,170 @@ class Pin888Automation(AutomationBase):
             spider_home: 主队名称
             spider_away: 客队名称
             event_id: 可选的初始 event_id (如果提供则先尝试直接订阅)
+            borrow: 是否为其他账号借用本页面 (页面被占用时不切换订阅,直接返回 None)
 
         Returns:
-            (event_id, event_detail_data) 或 (None, None)
+            DetailLease (event_id / data),用完后调用 self.detail_subscription.release(lease);
+            未找到比赛或借用时页面被占用返回 None
 
         Examples:
-            >>> event_id, data = await self.get_event_id(29, "0,8", "Arsenal", "Chelsea")
+            >>> lease = await self.acquire_event_detail(29, "0,8", "Arsenal", "Chelsea")
         """
-        from .jsCodeExecutors import (
-            subscribe_events_detail_euro,
-            unsubscribe_events_detail_euro,
-            subscribe_live_euro_odds
-        )
+        from .jsCodeExecutors import subscribe_live_euro_odds
         from .responseAnalysis import parse_event_from_all_events
-
-        matched_event_id = event_id
-        event_detail_data = None
+        from core.oddsFeedCache import OddsFeedCache
+        from configs.settings import Settings as settings
 
         # 如果提供了 event_id，先尝试直接订阅
-        if matched_event_id:
-            event_detail_data = await subscribe_events_detail_euro(self.page, matched_event_id)
+        if event_id:
+            lease = await self.detail_subscription.acquire(event_id, borrow=borrow)
+            if lease:
+                return lease
+
+        # 借用时不能在被占用的页面上切换到比赛列表订阅
+        if borrow and self.detail_subscription.refs > 0:
+            return None
 
-        if not event_detail_data:
-            logger.warning(f"[{self.handler_name}] Betburger 提供的 eventId 无效，需要通过球队名重新匹配")
-            await unsubscribe_events_detail_euro(self.page, event_id)
+        logger.warning(f"[{self.handler_name}] Betburger 提供的 eventId 无效，需要通过球队名重新匹配")
+
+        # 比赛列表优先从共享缓存读取 (所有账号看到的公开数据一致)
+        odds_cache = OddsFeedCache()
+        all_events = odds_cache.get_all_events(
+            'pin888', sportId, period_num, settings.ODDS_FEED_EVENTS_MAX_AGE
+        )
+        if not all_events:
             all_events = await subscribe_live_euro_odds(self.page, sportId, period_num)
+            odds_cache.publish_all_events('pin888', sportId, period_num, all_events)
+
+        if not all_events:
+            logger.error(f"[{self.handler_name}] 获取 all_events 失败")
+            if self.connect_count == 0:
+                # 尝试重新连接 WebSocket
+                try:
+                    from .operations.prepare_work import hookWebSocket
+                    await hookWebSocket(self)
+                    self.connect_count += 1
+                except Exception as e:
+                    logger.error(f"[{self.handler_name}] hookWebSocket 失败: {e}")
+
+            return None
+
+        # 解析并匹配比赛
+        parsed_result = parse_event_from_all_events(all_events, spider_home, spider_away)
+
+        if not parsed_result:
+            logger.error(
+                f"[{self.handler_name}] all_events 获取成功，但未能匹配到比赛 "
+                f"{spider_home} vs {spider_away}"
+            )
+            return None
 
-            if not all_events:
-                logger.error(f"[{self.handler_name}] 获取 all_events 失败")
-                if self.connect_count == 0:
-                    # 尝试重新连接 WebSocket
-                    try:
-                        from .operations.prepare_work import hookWebSocket
-                        await hookWebSocket(self)
-                        self.connect_count += 1
-                    except Exception as e:
-                        logger.error(f"[{self.handler_name}] hookWebSocket 失败: {e}")
-
-                return None, None
-
-            # 解析并匹配比赛
-            parsed_result = parse_event_from_all_events(all_events, spider_home, spider_away)
-
-            if not parsed_result:
-                logger.error(
-                    f"[{self.handler_name}] all_events 获取成功，但未能匹配到比赛 "
-                    f"{spider_home} vs {spider_away}"
-                )
-                return None, None
-
-            # 提取解析结果
-            matched_event_id = parsed_result['event_id']
-            event_id = matched_event_id
-            pin888_standard_home_name = parsed_result['home_name']
-            pin888_standard_away_name = parsed_result['away_name']
+        # 提取解析结果
+        matched_event_id = parsed_result['event_id']
 
-            logger.info(
-                f"[{self.handler_name}] ✅ 通过球队名匹配成功: "
-                f"{pin888_standard_home_name} vs {pin888_standard_away_name}"
+        logger.info(
+            f"[{self.handler_name}] ✅ 通过球队名匹配成功: "
+            f"{parsed_result['home_name']} vs {parsed_result['away_name']}"
+        )
+        logger.debug(f"[{self.handler_name}]   event_id: {matched_event_id}")
+
+        lease = await self.detail_subscription.acquire(matched_event_id, borrow=borrow)
+        if not lease:
+            logger.error(
+                f"[{self.handler_name}] 没有该场比赛 {spider_home} -- {spider_away}"
             )
-            logger.debug(f"[{self.handler_name}]   event_id: {matched_event_id}")
+            return None
 
-            event_detail_data = await subscribe_events_detail_euro(self.page, matched_event_id)
-            if not event_detail_data:
-                logger.error(
-                    f"[{self.handler_name}] 没有该场比赛 {spider_home} -- {spider_away}"
-                )
-                return None, None
+        return lease
+
+    def _get_odds_feed(self):
+        """
+        获取当前平台可用的 feed ActionChain
+
+        Returns:
+            feed 的 ac 对象 (可能是自己); 未启用共享赔率时返回 None
+        """
+        from core.onlinePlatform import OnlinePlatform
+
+        online_platform = OnlinePlatform.get_instance()
+        if online_platform is None:
+            return None
+
+        feed = online_platform.get_odds_feed(self.config.get('platform_name', 'pin888'))
+        if feed is None or not getattr(feed, 'page', None):
+            return None
+        return feed
+
+    async def get_event_detail_via_feed(
+        self,
+        sportId: int,
+        period_num: str,
+        spider_home: str,
+        spider_away: str,
+        event_id: str = None
+    ) -> tuple:
+        """
+        通过共享赔率源获取 event_id 和 event_detail_data
+
+        先读 OddsFeedCache (feed 自己的补单会把每次详情推送发布到缓存),
+        未命中时借用 feed 页面拉取并发布到缓存,本账号页面只用于需要登录态的请求 (添加订单 / 下注)
+
+        借用通过 feed 的详情订阅引用计数完成: feed 正在订阅其他比赛 (例如补单) 时不会被切换,
+        正在订阅同一场比赛时直接共享,读取后只释放自己的占用
+
+        Args:
+            sportId: 运动类型ID
+            period_num: 时段编号
+            spider_home: 主队名称
+            spider_away: 客队名称
+            event_id: 可选的初始 event_id
+
+        Returns:
+            (event_id, event_detail_data, used_feed)
+            未启用共享赔率或 feed 页面被占用时返回 (None, None, False),调用方应回退到本页面
+
+        Examples:
+            >>> event_id, data, used_feed = await self.get_event_detail_via_feed(29, "0,8", "Arsenal", "Chelsea")
+        """
+        from core.oddsFeedCache import OddsFeedCache
+        from configs.settings import Settings as settings
+
+        odds_cache = OddsFeedCache()
+        max_age = settings.ODDS_FEED_DETAIL_MAX_AGE
+
+        cached = odds_cache.get_event_detail('pin888', event_id, max_age)
+        if cached:
+            logger.debug(f"[{self.handler_name}] 共享赔率缓存命中: event_id={event_id}")
+            return event_id, cached, True
+
+        feed = self._get_odds_feed()
+        if feed is None:
+            return None, None, False
+
+        borrow = feed is not self
+        if borrow and event_id and not feed.detail_subscription.can_lend(event_id):
+            return None, None, False
+
+        lease = await feed.acquire_event_detail(
+            sportId=sportId,
+            period_num=period_num,
+            spider_home=spider_home,
+            spider_away=spider_away,
+            event_id=event_id,
+            borrow=borrow
+        )
+        if lease is None:
+            # feed 页面被占用 (或未找到比赛) 时回退到本页面
+            return None, None, not borrow
+
+        await feed.detail_subscription.release(lease)
+        odds_cache.publish_event_detail('pin888', lease.event_id, lease.data)
+        if borrow:
+            logger.info(
+                f"[{self.handler_name}] 📡 通过 feed [{feed.handler_name}] 获取详情: event_id={lease.event_id}"
+            )
 
-        return event_id, event_detail_data
+        return lease.event_id, lease.data, True
 
     # ==================== 绑定操作方法 ====================
     prepare_work = prepare_work
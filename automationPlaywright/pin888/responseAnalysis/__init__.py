@@ -7,10 +7,14 @@ from .parseEventFromAllEvents import parse_event_from_all_events
 from .parseTeamNamesFromDetailData import parse_team_names_from_detail_data
 from .findOddsFromDetailData import find_odds_from_detail_data
 from .findOddsWithRange import find_odds_from_detail_data_with_range
+from .detailSnapshot import DetailSnapshot, get_detail_snapshot, clear_detail_snapshots
 
 __all__ = [
     'parse_event_from_all_events',
     'parse_team_names_from_detail_data',
     'find_odds_from_detail_data',
     'find_odds_from_detail_data_with_range',
+    'DetailSnapshot',
+    'get_detail_snapshot',
+    'clear_detail_snapshots',
 ]
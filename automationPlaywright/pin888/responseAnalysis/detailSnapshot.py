@@ -0,0 +1,198 @@
+"""
+PIN888 平台 - 比赛详情快照 (DetailSnapshot)
+
+GetOdd 和 SupplementaryOrder 对同一份 EVENT_DETAILS_EURO_ODDS 数据重复做相同的解析
+(标准球队名 / 剩余时间 / 查找赔率);补单循环的心跳超时后拿到的往往是同一版本的详情。
+
+DetailSnapshot 按 (eventId, version, specialVersion) 缓存这些派生结果 (第一次使用时才计算),
+同一版本的后续调用直接复用;WS 推送新版本时 version 变化,自然得到新的快照。
+specials (双重机会 / 双方进球 / 平局退款 / 单双等) 单独用 specialVersion 计版本,
+只有 specials 变化时 version 不变,因此也要计入缓存键
+
+注意: 返回的 dict 在调用方之间共享,不要修改
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+from .parseTeamNamesFromDetailData import parse_team_names_from_detail_data
+from .findOddsFromDetailData import find_odds_from_detail_data
+from .findOddsWithRange import find_odds_from_detail_data_with_range
+from ..handler.arbitrageRange import ArbitrageRange
+from ..handler.timeAnalysis import MatchClock, analyze_remaining_time, observe_match_clock
+
+# 进程内保留的快照数 (每场比赛通常只有最新的一两个版本在使用)
+SNAPSHOT_CACHE_SIZE = 64
+
+# 尚未计算的标记 (派生结果本身可能是 None)
+_MISSING = object()
+
+
+class DetailSnapshot:
+    """
+    一个版本的比赛详情数据及其派生结果
+
+    Example:
+        >>> snapshot = get_detail_snapshot(event_detail_data)
+        >>> snapshot.team_names['pin888_home_name']
+        'Chelsea'
+        >>> snapshot.remaining_time('soccer')
+        {'match_phase': 'FirstHalf', 'remaining_seconds': 1079}
+    """
+
+    __slots__ = ('data', 'event_id', 'version', 'special_version', '_team_names', '_remaining_times', '_odds', 'stats')
+
+    def __init__(self, data: Dict[str, Any], version: Any = None):
+        self.data = data
+        self.event_id = data.get('eventId')
+        self.version = data.get('version') if version is None else version
+        self.special_version = data.get('specialVersion')
+        self._team_names = _MISSING
+        self._remaining_times: Dict[str, Optional[dict]] = {}
+        self._odds: Dict[Hashable, Union[dict, str, None]] = {}
+        self.stats = {'hits': 0, 'misses': 0}
+
+    @property
+    def key(self) -> Optional[Tuple[str, str, str]]:
+        """缓存键 (eventId, version, specialVersion); 缺少 eventId 或 version 时为 None (不共享)"""
+        if self.event_id is None or self.version is None:
+            return None
+        return str(self.event_id), str(self.version), str(self.special_version)
+
+    # ==================== 派生结果 ====================
+
+    @property
+    def team_names(self) -> Optional[dict]:
+        """parse_team_names_from_detail_data 的结果"""
+        if self._team_names is _MISSING:
+            self.stats['misses'] += 1
+            self._team_names = parse_team_names_from_detail_data(self.data)
+        else:
+            self.stats['hits'] += 1
+        return self._team_names
+
+    def remaining_time(self, sport_type: str) -> Optional[dict]:
+        """analyze_remaining_time 的结果 (按运动类型缓存)"""
+        sport_key = (sport_type or '').lower()
+        if sport_key in self._remaining_times:
+            self.stats['hits'] += 1
+            return self._remaining_times[sport_key]
+
+        team_names = self.team_names
+        match_state_type = team_names['matchStateType'] if team_names else None
+        result = analyze_remaining_time(sport_type=sport_type, match_state_type=match_state_type)
+        self.stats['misses'] += 1
+        self._remaining_times[sport_key] = result
+        return result
+
+    def match_clock(self, sport_type: str) -> Optional[MatchClock]:
+        """用本快照的剩余时间校准该比赛的时钟 (同一版本重复调用不会重置外推起点)"""
+        return observe_match_clock(self.event_id, sport_type, self.remaining_time(sport_type), self.version)
+
+    def find_odds(
+        self,
+        sport_type: str,
+        market_group: str,
+        platform_handicap: str,
+        platform_handicap_param: str,
+        platform_direction: str,
+        platform_match: str,
+        period: str
+    ) -> Union[dict, str, None]:
+        """find_odds_from_detail_data 的结果 (参数说明见该函数)"""
+        key = ('odds', sport_type, market_group, platform_handicap, platform_handicap_param,
+               platform_direction, platform_match, period)
+        return self._cached_odds(key, lambda: find_odds_from_detail_data(
+            sport_type=sport_type,
+            market_group=market_group,
+            platform_handicap=platform_handicap,
+            platform_handicap_param=platform_handicap_param,
+            platform_direction=platform_direction,
+            platform_match=platform_match,
+            period=period,
+            detail_odds=self.data
+        ))
+
+    def find_odds_with_range(
+        self,
+        sport_type: str,
+        market_group: str,
+        platform_handicap: str,
+        platform_direction: str,
+        platform_match: str,
+        period: str,
+        range_condition: Callable,
+        min_odds: Optional[float] = None
+    ) -> Union[dict, str, None]:
+        """
+        find_odds_from_detail_data_with_range 的结果 (参数说明见该函数)
+
+        只有 ArbitrageRange 区间按 (low, high) 缓存; 任意 lambda 条件无法比较,每次重新计算
+        """
+        def compute():
+            return find_odds_from_detail_data_with_range(
+                sport_type=sport_type,
+                market_group=market_group,
+                platform_handicap=platform_handicap,
+                platform_direction=platform_direction,
+                platform_match=platform_match,
+                period=period,
+                detail_odds=self.data,
+                range_condition=range_condition,
+                min_odds=min_odds
+            )
+
+        if not isinstance(range_condition, ArbitrageRange):
+            return compute()
+
+        key = ('range', sport_type, market_group, platform_handicap, platform_direction,
+               platform_match, period, range_condition.low, range_condition.high, min_odds)
+        return self._cached_odds(key, compute)
+
+    def _cached_odds(self, key: Hashable, compute: Callable[[], Any]) -> Union[dict, str, None]:
+        result = self._odds.get(key, _MISSING)
+        if result is not _MISSING:
+            self.stats['hits'] += 1
+            return result
+
+        self.stats['misses'] += 1
+        result = compute()
+        self._odds[key] = result
+        return result
+
+
+_snapshots: 'OrderedDict[Tuple[str, str, str], DetailSnapshot]' = OrderedDict()
+
+
+def get_detail_snapshot(detail_data: Dict[str, Any], version: Any = None) -> Optional[DetailSnapshot]:
+    """
+    获取详情数据对应的快照 (同一 (eventId, version, specialVersion) 返回同一个对象)
+
+    Args:
+        detail_data: window.___detailFullOdds 数据
+        version: 版本号 (缺省时使用 detail_data['version'])
+
+    Returns:
+        DetailSnapshot; detail_data 为空时返回 None
+    """
+    if not detail_data:
+        return None
+
+    snapshot = DetailSnapshot(detail_data, version)
+    key = snapshot.key
+    if key is None:
+        return snapshot
+
+    cached = _snapshots.get(key)
+    if cached is not None:
+        _snapshots.move_to_end(key)
+        return cached
+
+    _snapshots[key] = snapshot
+    while len(_snapshots) > SNAPSHOT_CACHE_SIZE:
+        _snapshots.popitem(last=False)
+    return snapshot
+
+
+def clear_detail_snapshots():
+    """清空快照缓存"""
+    _snapshots.clear()
@@ -2,8 +2,13 @@
 """
 PIN888 平台 - 使用区间条件从详细赔率数据中查找赔率
 用于套利补单场景,支持区间匹配而非精确匹配
+
+同一盘口的所有线 (例如篮球的几十条 alternate totals) 先整理成
+(参数, 赔率) 两个数组,再由 rank_lines_in_range 一次性完成区间与赔率门槛的筛选和排序
 """
-from typing import Callable, Union, Optional
+from typing import Callable, List, Optional, Tuple, Union
+
+from ..handler.arbitrageRange import rank_lines_in_range
 
 
 def find_odds_from_detail_data_with_range(
@@ -14,7 +19,8 @@ def find_odds_from_detail_data_with_range(
     platform_match: str,
     period: str,
     detail_odds: dict,
-    range_condition: Callable
+    range_condition: Callable,
+    min_odds: Optional[float] = None
 ) -> Union[dict, str, None]:
     """
     使用区间条件从详细赔率数据中查找匹配的赔率
@@ -26,16 +32,18 @@ def find_odds_from_detail_data_with_range(
         platform_direction: 方向 ('home', 'away', 'over', 'under')
         period: 时间段 ('0' 全场, '1' 上半场)
         detail_odds: 详细赔率数据
-        range_condition: 区间条件函数 (如 lambda y: y >= 2.5)
+        range_condition: 区间条件 (calculate_arbitrage_range 返回的 ArbitrageRange,或 lambda y: y >= 2.5)
+        min_odds: 可接受的最低赔率 (None 表示不限制)
 
     返回:
-        dict: 包含 odd, lineID, market_group_id, isAlt 等字段
+        dict: 包含 odd, lineID, market_group_id, isAlt, matched_param 等字段,
+              candidates 为所有可接受的线 (按赔率从高到低)
         str: 'need refresh' 表示需要刷新数据
         None: 未找到匹配
 
     示例:
         # 成功方 Over 2.5, 我方需要 Under Y (Y >= 2.5)
-        condition = lambda y: y >= 2.5
+        condition = calculate_arbitrage_range("Total Over(%s)", "2.5")
         result = find_odds_from_detail_data_with_range(
             sport_type='soccer',
             market_group='normal',
@@ -59,7 +67,8 @@ def find_odds_from_detail_data_with_range(
                             platform_direction,
                             period,
                             detail_odds,
-                            range_condition
+                            range_condition,
+                            min_odds
                         )
 
                     case 'corners':
@@ -70,7 +79,8 @@ def find_odds_from_detail_data_with_range(
                             platform_direction,
                             period,
                             detail_odds,
-                            range_condition
+                            range_condition,
+                            min_odds
                         )
 
                     case _:
@@ -100,7 +110,8 @@ def find_odds_from_detail_data_with_range(
                     platform_direction,
                     data,
                     market_group_id,
-                    range_condition
+                    range_condition,
+                    min_odds
                 )
 
     except Exception as e:
@@ -111,13 +122,99 @@ def find_odds_from_detail_data_with_range(
     return None
 
 
+# ==================== 批量选线 ====================
+
+# 盘口类型 + 方向 → (参数字段, 赔率字段)
+_SPREAD_FIELDS = {
+    'home': ('homeSpread', 'homeOdds'),
+    'away': ('awaySpread', 'awayOdds'),
+}
+_POINTS_FIELDS = {
+    'over': ('points', 'overOdds'),
+    'under': ('points', 'underOdds'),
+}
+
+
+def _select_best_line(
+    lines: list,
+    param_key: str,
+    odds_key: str,
+    range_condition: Callable,
+    min_odds: Optional[float] = None
+) -> Tuple[Optional[dict], List[dict]]:
+    """
+    一次性评估某个盘口的所有线,返回 (最优线, 按赔率排序的候选线)
+
+    Args:
+        lines: 盘口线列表 (detail 数据中的 overUnder / handicap / teamTotals 线)
+        param_key: 参数字段 ('points', 'homeSpread', 'awaySpread')
+        odds_key: 赔率字段 ('overOdds', 'underOdds', 'homeOdds', 'awayOdds')
+        range_condition: 区间条件
+        min_odds: 可接受的最低赔率
+
+    Returns:
+        (best_line, ranked_lines), 没有可接受的线时 best_line 为 None
+    """
+    params = []
+    odds = []
+    for line in lines:
+        try:
+            params.append(float(line[param_key]))
+            odds.append(float(line[odds_key]))
+        except (KeyError, TypeError, ValueError):
+            params.append(float('nan'))
+            odds.append(0.0)
+
+    ranked = [lines[i] for i in rank_lines_in_range(params, odds, range_condition, min_odds)]
+    return (ranked[0] if ranked else None), ranked
+
+
+def _build_range_result(
+    best_line: dict,
+    ranked_lines: List[dict],
+    param_key: str,
+    odds_key: str,
+    market_group_id
+) -> dict:
+    """构造区间匹配结果 (字段与精确匹配的 find_odds_from_detail_data 保持一致)"""
+    return {
+        'odd': best_line[odds_key],
+        'lineID': best_line['lineId'],
+        'isAlt': best_line['isAlt'],
+        'market_group_id': market_group_id,
+        'matched_param': best_line[param_key],
+        'candidates': [
+            {
+                'odd': line[odds_key],
+                'lineID': line['lineId'],
+                'isAlt': line['isAlt'],
+                'matched_param': line[param_key],
+            }
+            for line in ranked_lines
+        ]
+    }
+
+
+def _print_spread_lines(lines: list):
+    for idx, line in enumerate(lines, 1):
+        print(f"  [{idx}] homeSpread={line['homeSpread']}, awaySpread={line['awaySpread']}, homeOdds={line['homeOdds']}, awayOdds={line['awayOdds']}")
+
+
+def _print_points_lines(lines: list):
+    for idx, line in enumerate(lines, 1):
+        print(f"  [{idx}] points={line['points']}, over={line['overOdds']}, under={line['underOdds']}")
+
+
+# ==================== 足球 / 篮球解析 ====================
+
 def parse_soccer_normal_with_range(
     platform_handicap: str,
     platform_match: str,
     platform_direction: str,
     period: str,
     detail_odds: dict,
-    range_condition: Callable
+    range_condition: Callable,
+    min_odds: Optional[float] = None
 ) -> Optional[dict]:
     """解析足球正常盘口数据 - 区间匹配"""
     try:
@@ -138,194 +235,62 @@ def parse_soccer_normal_with_range(
     match platform_handicap:
         case 'overUnder':
             data = data['overUnder']
-            matched_lines = []
-
-            # 收集所有满足区间条件的盘口
-            for line in data:
-                points = float(line['points'])
-                if range_condition(points):
-                    matched_lines.append(line)
+            fields = _POINTS_FIELDS.get(platform_direction.lower())
+            if not fields:
+                return None
 
-            if not matched_lines:
+            best_line, ranked = _select_best_line(data, *fields, range_condition, min_odds)
+            if not best_line:
                 print(f"⚠️ [PIN888 区间补单] overUnder 未找到满足区间条件的盘口")
-                
                 print(f"📋 [PIN888 区间补单] 所有可用盘口 (共 {len(data)} 个):")
                 for idx, line in enumerate(data, 1):
                     print(f"  [{idx}] points={line['points']}, over={line['overOdds']}, under={line['underOdds']}, "
                           f"lineId={line['lineId']}, offline={line['offline']}, unavailable={line['unavailable']}")
                 return None
 
-            # 选择最优盘口 (赔率最高的)
-            best_line = None
-            best_odds = 0.0
-
-            for line in matched_lines:
-                if platform_direction.lower() == 'over':
-                    current_odds = float(line['overOdds'])
-                    if current_odds > best_odds:
-                        best_odds = current_odds
-                        best_line = line
-                elif platform_direction.lower() == 'under':
-                    current_odds = float(line['underOdds'])
-                    if current_odds > best_odds:
-                        best_odds = current_odds
-                        best_line = line
-
-            if not best_line:
-                print(f"⚠️ [PIN888 区间补单] 未找到有效赔率")
-                return None
-
-            print(f"✅ [PIN888 区间补单] 找到最优盘口: points={best_line['points']}, {platform_direction}={best_odds}")
-
-            if platform_direction.lower() == 'over':
-                return {
-                    'odd': best_line['overOdds'],
-                    'lineID': best_line['lineId'],
-                    'isAlt': best_line['isAlt'],
-                    'market_group_id': market_group_id,
-                    'matched_param': best_line['points']  # 返回匹配到的参数值
-                }
-            elif platform_direction.lower() == 'under':
-                return {
-                    'odd': best_line['underOdds'],
-                    'lineID': best_line['lineId'],
-                    'isAlt': best_line['isAlt'],
-                    'market_group_id': market_group_id,
-                    'matched_param': best_line['points']
-                }
-            else:
-                return None
+            print(f"✅ [PIN888 区间补单] 找到最优盘口: points={best_line['points']}, {platform_direction}={best_line[fields[1]]}")
+            return _build_range_result(best_line, ranked, *fields, market_group_id)
 
         case 'handicap':
             data = data['handicap']
-            matched_lines = []
-
-            # 收集所有满足区间条件的盘口
-            for line in data:
-                if platform_direction.lower() == 'home':
-                    spread = float(line['homeSpread'])
-                    if range_condition(spread):
-                        matched_lines.append(line)
-                elif platform_direction.lower() == 'away':
-                    spread = float(line['awaySpread'])
-                    if range_condition(spread):
-                        matched_lines.append(line)
-
-            if not matched_lines:
+            fields = _SPREAD_FIELDS.get(platform_direction.lower())
+            if not fields:
+                return None
+
+            best_line, ranked = _select_best_line(data, *fields, range_condition, min_odds)
+            if not best_line:
                 print(f"⚠️ [PIN888 区间补单] handicap 未找到满足区间条件的盘口")
                 print(f"🔍 [PIN888 区间补单] 方向: {platform_direction}")
                 print(f"📋 [PIN888 区间补单] 所有可用盘口 (共 {len(data)} 个):")
-                for idx, line in enumerate(data, 1):
-                    print(f"  [{idx}] homeSpread={line['homeSpread']}, awaySpread={line['awaySpread']}, homeOdds={line['homeOdds']}, awayOdds={line['awayOdds']}")
+                _print_spread_lines(data)
                 return None
 
-            # 选择最优盘口 (赔率最高的)
-            best_line = None
-            best_odds = 0.0
-
-            for line in matched_lines:
-                if platform_direction.lower() == 'home':
-                    current_odds = float(line['homeOdds'])
-                    if current_odds > best_odds:
-                        best_odds = current_odds
-                        best_line = line
-                elif platform_direction.lower() == 'away':
-                    current_odds = float(line['awayOdds'])
-                    if current_odds > best_odds:
-                        best_odds = current_odds
-                        best_line = line
-
-            if not best_line:
-                print(f"⚠️ [PIN888 区间补单] 未找到有效赔率")
-                return None
-
-            if platform_direction.lower() == 'home':
-                print(f"✅ [PIN888 区间补单] 找到最优盘口: homeSpread={best_line['homeSpread']}, homeOdds={best_odds}")
-                return {
-                    'odd': best_line['homeOdds'],
-                    'lineID': best_line['lineId'],
-                    'isAlt': best_line['isAlt'],
-                    'market_group_id': market_group_id,
-                    'matched_param': best_line['homeSpread']
-                }
-            elif platform_direction.lower() == 'away':
-                print(f"✅ [PIN888 区间补单] 找到最优盘口: awaySpread={best_line['awaySpread']}, awayOdds={best_odds}")
-                return {
-                    'odd': best_line['awayOdds'],
-                    'lineID': best_line['lineId'],
-                    'isAlt': best_line['isAlt'],
-                    'market_group_id': market_group_id,
-                    'matched_param': best_line['awaySpread']
-                }
-            else:
-                return None
+            print(f"✅ [PIN888 区间补单] 找到最优盘口: {fields[0]}={best_line[fields[0]]}, {fields[1]}={best_line[fields[1]]}")
+            return _build_range_result(best_line, ranked, *fields, market_group_id)
 
         case 'teamTotals':
             data = data['teamTotals']
             team_type = 'awayLines' if platform_direction.lower() == 'away' else 'homeLines'
             data = data[team_type]
 
-            matched_lines = []
             if not data:
                 print(f"⚠️ [PIN888 区间补单] teamTotals 数据为空，也就是说，盘口全部都关闭了")
                 return None
-    
 
-            # 收集所有满足区间条件的盘口
-            for line in data:
-                points = float(line['points'])
-                if range_condition(points):
-                    matched_lines.append(line)
+            fields = _POINTS_FIELDS.get(platform_match.lower())
+            if not fields:
+                return None
 
-            if not matched_lines:
+            best_line, ranked = _select_best_line(data, *fields, range_condition, min_odds)
+            if not best_line:
                 print(f"⚠️ [PIN888 区间补单] teamTotals 未找到满足区间条件的盘口")
                 print(f"🔍 [PIN888 区间补单] {team_type}")
                 print(f"📋 [PIN888 区间补单] 所有可用盘口 (共 {len(data)} 个):")
-                for idx, line in enumerate(data, 1):
-                    print(f"  [{idx}] points={line['points']}, over={line['overOdds']}, under={line['underOdds']}")
-                         
-                return None
-
-            # 选择最优盘口 (赔率最高的)
-            best_line = None
-            best_odds = 0.0
-
-            for line in matched_lines:
-                if platform_match.lower() == 'over':
-                    current_odds = float(line['overOdds'])
-                    if current_odds > best_odds:
-                        best_odds = current_odds 
-                        best_line = line
-                elif platform_match.lower() == 'under':
-                    current_odds = float(line['underOdds'])
-                    if current_odds > best_odds:
-                        best_odds = current_odds
-                        best_line = line
-
-            if not best_line:
-                print(f"⚠️ [PIN888 区间补单] teamTotals 未找到有效赔率")
+                _print_points_lines(data)
                 return None
 
-            print(f"✅ [PIN888 区间补单] 找到最优盘口: points={best_line['points']}, {platform_match}={best_odds}")
-
-            if platform_match.lower() == 'over':
-                return {
-                    'odd': best_line['overOdds'],
-                    'lineID': best_line['lineId'],
-                    'isAlt': best_line['isAlt'],
-                    'market_group_id': market_group_id,
-                    'matched_param': best_line['points']
-                }
-            elif platform_match.lower() == 'under':
-                return {
-                    'odd': best_line['underOdds'],
-                    'lineID': best_line['lineId'],
-                    'isAlt': best_line['isAlt'],
-                    'market_group_id': market_group_id,
-                    'matched_param': best_line['points']
-                }
-            else:
-                return None
+            print(f"✅ [PIN888 区间补单] 找到最优盘口: points={best_line['points']}, {platform_match}={best_line[fields[1]]}")
+            return _build_range_result(best_line, ranked, *fields, market_group_id)
 
         case _:
             print(f"⚠️ [PIN888 区间补单] 不支持的盘口类型: {platform_handicap}")
@@ -337,7 +302,8 @@ def parse_soccer_corners_with_range(
     platform_direction: str,
     period: str,
     detail_odds: dict,
-    range_condition: Callable
+    range_condition: Callable,
+    min_odds: Optional[float] = None
 ) -> Optional[dict]:
     """解析足球角球盘口数据 - 区间匹配"""
     try:
@@ -354,106 +320,29 @@ def parse_soccer_corners_with_range(
         match platform_handicap.lower():
             case 'handicap':
                 data = data.get('handicap', [])
-                matched_lines = []
-
-                for line in data:
-                    if platform_direction.lower() == 'home':
-                        spread = float(line['homeSpread'])
-                        if range_condition(spread):
-                            matched_lines.append(line)
-                    elif platform_direction.lower() == 'away':
-                        spread = float(line['awaySpread'])
-                        if range_condition(spread):
-                            matched_lines.append(line)
-
-                if not matched_lines:
-                    print(f"⚠️ [PIN888 区间补单] corners handicap 未找到满足区间条件的盘口")
+                fields = _SPREAD_FIELDS.get(platform_direction.lower())
+                if not fields:
                     return None
 
-                # 选择最优盘口
-                best_line = None
-                best_odds = 0.0
-
-                for line in matched_lines:
-                    if platform_direction.lower() == 'home':
-                        current_odds = float(line['homeOdds'])
-                        if current_odds > best_odds:
-                            best_odds = current_odds
-                            best_line = line
-                    elif platform_direction.lower() == 'away':
-                        current_odds = float(line['awayOdds'])
-                        if current_odds > best_odds:
-                            best_odds = current_odds
-                            best_line = line
-
+                best_line, ranked = _select_best_line(data, *fields, range_condition, min_odds)
                 if not best_line:
+                    print(f"⚠️ [PIN888 区间补单] corners handicap 未找到满足区间条件的盘口")
                     return None
 
-                if platform_direction.lower() == 'home':
-                    return {
-                        'odd': best_line['homeOdds'],
-                        'lineID': best_line['lineId'],
-                        'isAlt': best_line['isAlt'],
-                        'market_group_id': market_group_id,
-                        'matched_param': best_line['homeSpread']
-                    }
-                elif platform_direction.lower() == 'away':
-                    return {
-                        'odd': best_line['awayOdds'],
-                        'lineID': best_line['lineId'],
-                        'isAlt': best_line['isAlt'],
-                        'market_group_id': market_group_id,
-                        'matched_param': best_line['awaySpread']
-                    }
+                return _build_range_result(best_line, ranked, *fields, market_group_id)
 
             case 'overunder':
                 data = data.get('overUnder', [])
-                matched_lines = []
-
-                for line in data:
-                    points = float(line['points'])
-                    if range_condition(points):
-                        matched_lines.append(line)
-
-                if not matched_lines:
-                    print(f"⚠️ [PIN888 区间补单] corners overUnder 未找到满足区间条件的盘口")
+                fields = _POINTS_FIELDS.get(platform_direction.lower())
+                if not fields:
                     return None
 
-                # 选择最优盘口
-                best_line = None
-                best_odds = 0.0
-
-                for line in matched_lines:
-                    if platform_direction.lower() == 'over':
-                        current_odds = float(line['overOdds'])
-                        if current_odds > best_odds:
-                            best_odds = current_odds
-                            best_line = line
-                    elif platform_direction.lower() == 'under':
-                        current_odds = float(line['underOdds'])
-                        if current_odds > best_odds:
-                            best_odds = current_odds
-                            best_line = line
-
+                best_line, ranked = _select_best_line(data, *fields, range_condition, min_odds)
                 if not best_line:
+                    print(f"⚠️ [PIN888 区间补单] corners overUnder 未找到满足区间条件的盘口")
                     return None
 
-                if platform_direction.lower() == 'over':
-                    return {
-                        'odd': best_line['overOdds'],
-                        'lineID': best_line['lineId'],
-                        'isAlt': best_line['isAlt'],
-                        'market_group_id': market_group_id,
-                        'matched_param': best_line['points']
-                    }
-                elif platform_direction.lower() == 'under':
-                    return {
-                        'odd': best_line['underOdds'],
-                        'lineID': best_line['lineId'],
-                        'isAlt': best_line['isAlt'],
-                        'market_group_id': market_group_id,
-                        'matched_param': best_line['points']
-                    }
+                return _build_range_result(best_line, ranked, *fields, market_group_id)
 
             case _:
                 print(f"⚠️ [PIN888 区间补单] corners 不支持的盘口类型: {platform_handicap}")
@@ -473,7 +362,8 @@ def parse_basketball_with_range(
     platform_direction: str,
     detail_odds: dict,
     market_group_id: int,
-    range_condition: Callable
+    range_condition: Callable,
+    min_odds: Optional[float] = None
 ) -> Optional[dict]:
     """解析篮球盘口数据 - 区间匹配"""
     match platform_handicap.lower():
@@ -483,62 +373,19 @@ def parse_basketball_with_range(
                 print(f"⚠️ [PIN888 区间补单] basketball handicap 数据为空")
                 return None
 
-            matched_lines = []
-
-            for line in data:
-                if platform_direction.lower() == 'home':
-                    spread = float(line['homeSpread'])
-                    if range_condition(spread):
-                        matched_lines.append(line)
-                elif platform_direction.lower() == 'away':
-                    spread = float(line['awaySpread'])
-                    if range_condition(spread):
-                        matched_lines.append(line)
+            fields = _SPREAD_FIELDS.get(platform_direction.lower())
+            if not fields:
+                return None
 
-            if not matched_lines:
+            best_line, ranked = _select_best_line(data, *fields, range_condition, min_odds)
+            if not best_line:
                 print(f"⚠️ [PIN888 区间补单] basketball handicap 未找到满足区间条件的盘口")
                 print(f"🔍 [PIN888 区间补单] 方向: {platform_direction}")
                 print(f"📋 [PIN888 区间补单] 所有可用盘口 (共 {len(data)} 个):")
-                for idx, line in enumerate(data, 1):
-                    print(f"  [{idx}] homeSpread={line['homeSpread']}, awaySpread={line['awaySpread']}, homeOdds={line['homeOdds']}, awayOdds={line['awayOdds']}")
+                _print_spread_lines(data)
                 return None
 
-            # 选择最优盘口
-            best_line = None
-            best_odds = 0.0
-
-            for line in matched_lines:
-                if platform_direction.lower() == 'home':
-                    current_odds = float(line['homeOdds'])
-                    if current_odds > best_odds:
-                        best_odds = current_odds
-                        best_line = line
-                elif platform_direction.lower() == 'away':
-                    current_odds = float(line['awayOdds'])
-                    if current_odds > best_odds:
-                        best_odds = current_odds
-                        best_line = line
-            
-
-            if not best_line:
-                return None
-
-            if platform_direction.lower() == 'home':
-                return {
-                    'odd': best_line['homeOdds'],
-                    'lineID': best_line['lineId'],
-                    'isAlt': best_line['isAlt'],
-                    'market_group_id': market_group_id,
-                    'matched_param': best_line['homeSpread']
-                }
-            elif platform_direction.lower() == 'away':
-                return {
-                    'odd': best_line['awayOdds'],
-                    'lineID': best_line['lineId'],
-                    'isAlt': best_line['isAlt'],
-                    'market_group_id': market_group_id,
-                    'matched_param': best_line['awaySpread']
-                }
+            return _build_range_result(best_line, ranked, *fields, market_group_id)
 
         case 'overunder':
             data = detail_odds.get('overUnder')
@@ -546,56 +393,19 @@ def parse_basketball_with_range(
                 print(f"⚠️ [PIN888 区间补单] basketball overUnder 数据为空")
                 return None
 
-            matched_lines = []
-
-            for line in data:
-                points = float(line['points'])
-                if range_condition(points):
-                    matched_lines.append(line)
+            fields = _POINTS_FIELDS.get(platform_direction.lower())
+            if not fields:
+                return None
 
-            if not matched_lines:
+            best_line, ranked = _select_best_line(data, *fields, range_condition, min_odds)
+            if not best_line:
                 print(f"⚠️ [PIN888 区间补单] basketball overUnder 未找到满足区间条件的盘口")
                 print(f"🔍 [PIN888 区间补单] 方向: {platform_direction}")
                 print(f"📋 [PIN888 区间补单] 所有可用盘口 (共 {len(data)} 个):")
-                for idx, line in enumerate(data, 1):
-                    print(f"  [{idx}] points={line['points']}, over={line['overOdds']}, under={line['underOdds']}")
+                _print_points_lines(data)
                 return None
 
-            # 选择最优盘口
-            best_line = None
-            best_odds = 0.0
-
-            for line in matched_lines:
-                if platform_direction.lower() == 'over':
-                    current_odds = float(line['overOdds'])
-                    if current_odds > best_odds:
-                        best_odds = current_odds
-                        best_line = line
-                elif platform_direction.lower() == 'under':
-                    current_odds = float(line['underOdds'])
-                    if current_odds > best_odds:
-                        best_odds = current_odds
-                        best_line = line
-
-            if not best_line:
-                return None
-
-            if platform_direction.lower() == 'over':
-                return {
-                    'odd': best_line['overOdds'],
-                    'lineID': best_line['lineId'],
-                    'isAlt': best_line['isAlt'],
-                    'market_group_id': market_group_id,
-                    'matched_param': best_line['points']
-                }
-            elif platform_direction.lower() == 'under':
-                return {
-                    'odd': best_line['underOdds'],
-                    'lineID': best_line['lineId'],
-                    'isAlt': best_line['isAlt'],
-                    'market_group_id': market_group_id,
-                    'matched_param': best_line['points']
-                }
+            return _build_range_result(best_line, ranked, *fields, market_group_id)
 
         case 'teamtotals':
             teamTotalsData = detail_odds.get('teamTotals')
@@ -614,61 +424,20 @@ def parse_basketball_with_range(
                 print(f"⚠️ [PIN888 区间补单] basketball teamTotals 数据为空，也就是说，盘口全部都关闭了")
                 return None
 
-            matched_lines = []
-
-            for line in data:
-                points = float(line['points'])
-                if range_condition(points):
-                    matched_lines.append(line)
+            fields = _POINTS_FIELDS.get(platform_match.lower())
+            if not fields:
+                return None
 
-            if not matched_lines:
+            best_line, ranked = _select_best_line(data, *fields, range_condition, min_odds)
+            if not best_line:
                 print(f"⚠️ [PIN888 区间补单] basketball teamTotals 未找到满足区间条件的盘口")
                 print(f"🔍 [PIN888 区间补单] 方向: {platform_direction}")
                 print(f"📋 [PIN888 区间补单] 所有可用盘口 (共 {len(data)} 个):")
-                for idx, line in enumerate(data, 1):
-                    print(f"  [{idx}] points={line['points']}, over={line['overOdds']}, under={line['underOdds']}")
+                _print_points_lines(data)
                 return None
 
-            # 选择最优盘口 (赔率最高的)
-            best_line = None
-            best_odds = 0.0
-
-            for line in matched_lines:
-                if platform_match.lower() == 'over':
-                    current_odds = float(line['overOdds'])
-                    if current_odds > best_odds:
-                        best_odds = current_odds
-                        best_line = line
-                elif platform_match.lower() == 'under':
-                    current_odds = float(line['underOdds'])
-                    if current_odds > best_odds:
-                        best_odds = current_odds
-                        best_line = line
-
-            if not best_line:
-                print(f"⚠️ [PIN888 区间补单] basketball teamTotals 未找到有效赔率")
-                return None
-
-            print(f"✅ [PIN888 区间补单] 找到最优盘口: points={best_line['points']}, {platform_match}={best_odds}")
-
-            if platform_match.lower() == 'over':
-                return {
-                    'odd': best_line['overOdds'],
-                    'lineID': best_line['lineId'],
-                    'isAlt': best_line['isAlt'],
-                    'market_group_id': market_group_id,
-                    'matched_param': best_line['points']
-                }
-            elif platform_match.lower() == 'under':
-                return {
-                    'odd': best_line['underOdds'],
-                    'lineID': best_line['lineId'],
-                    'isAlt': best_line['isAlt'],
-                    'market_group_id': market_group_id,
-                    'matched_param': best_line['points']
-                }
-            else:
-                return None
+            print(f"✅ [PIN888 区间补单] 找到最优盘口: points={best_line['points']}, {platform_match}={best_line[fields[1]]}")
+            return _build_range_result(best_line, ranked, *fields, market_group_id)
 
         case _:
             print(f"⚠️ [PIN888 区间补单] basketball 不支持的盘口类型: {platform_handicap}")
@@ -3,6 +3,9 @@ PIN888 平台 - 从 AllEvents 数据中解析并匹配比赛事件
 """
 
 from utils.leagueName import transform_league_name
+from utils.matchGameName import calculate_pair_confidence, get_alias_store
+
+ALIAS_PLATFORM = 'pin888'
 
 
 def parse_event_from_all_events(all_events, spider_home, spider_away):
@@ -10,6 +13,8 @@ def parse_event_from_all_events(all_events, spider_home, spider_away):
     从 AllEvents 数据中通过球队名字匹配比赛事件
 
     参考 get_parsed_events 函数中的 "优先级2: 通过球队名字匹配" 逻辑
+    先查别名表 (主客队两边都学习过且指向同一场比赛),查不到再按包含关系匹配;
+    主客队两边各自匹配到对应队伍时才把这场比赛记入别名表
 
     Args:
         all_events: window.__AllEvents 数据 (包含 leagues 列表)
@@ -44,6 +49,21 @@ def parse_event_from_all_events(all_events, spider_home, spider_away):
         leagues = all_events.get('leagues', [])
         # print(f'📊 [PIN888 解析] 共获取联赛 {len(leagues)} 个')
 
+        alias_store = get_alias_store()
+        spider_home_normalized = transform_league_name(spider_home) if spider_home else ''
+        spider_away_normalized = transform_league_name(spider_away) if spider_away else ''
+
+        # 别名匹配: 两边都学习过的队名直接按 PIN888 标准化队名比较 (单边别名不可靠,交给包含匹配)
+        alias_home = alias_store.lookup(ALIAS_PLATFORM, spider_home_normalized) if spider_home_normalized else None
+        alias_away = alias_store.lookup(ALIAS_PLATFORM, spider_away_normalized) if spider_away_normalized else None
+        if alias_home and alias_away:
+            alias_result = _match_by_alias(leagues, alias_home, alias_away)
+            if alias_result is not None:
+                alias_store.confirm(ALIAS_PLATFORM, spider_home_normalized)
+                alias_store.confirm(ALIAS_PLATFORM, spider_away_normalized)
+                print(f"✅ [PIN888 解析] 别名匹配: {alias_result['home_name']} vs {alias_result['away_name']}")
+                return alias_result
+
         for league in leagues:
             events = league.get('events', [])
             # print(f"📊 [PIN888 解析] 当前联赛有 {len(events)} 场比赛")
@@ -78,8 +98,6 @@ def parse_event_from_all_events(all_events, spider_home, spider_away):
 
                         # 检查提供的主队名是否匹配比赛中的主队或客队
                         if spider_home:
-                            spider_home_normalized = transform_league_name(spider_home)
-
                             # 主队名可能匹配比赛的主队
                             if (spider_home_normalized in home_name_normalized or
                                 spider_home_normalized in home_english_normalized or
@@ -98,8 +116,6 @@ def parse_event_from_all_events(all_events, spider_home, spider_away):
 
                         # 检查提供的客队名是否匹配比赛中的主队或客队
                         if spider_away and not matched:
-                            spider_away_normalized = transform_league_name(spider_away)
-
                             # 客队名可能匹配比赛的客队
                             if (spider_away_normalized in away_name_normalized or
                                 spider_away_normalized in away_english_normalized or
@@ -125,6 +141,14 @@ def parse_event_from_all_events(all_events, spider_home, spider_away):
                             # print(f"  event_id: {event_id}")
                             # print(f"  {home_name} vs {away_name}")
 
+                            _learn_aliases(
+                                alias_store,
+                                spider_home_normalized, spider_away_normalized,
+                                home_participant, away_participant,
+                                (home_name_normalized, home_english_normalized),
+                                (away_name_normalized, away_english_normalized)
+                            )
+
                             return {
                                 'event_id': event_id,
                                 'home_name': home_name,
@@ -140,3 +164,69 @@ def parse_event_from_all_events(all_events, spider_home, spider_away):
         import traceback
         traceback.print_exc()
         return None
+
+
+def _match_by_alias(leagues, alias_home, alias_away):
+    """
+    按别名表给出的 PIN888 标准化队名查找比赛 (name / englishName 任一相同即可)
+
+    主客队别名都必须指向同一场比赛
+    """
+    for league in leagues:
+        for event in league.get('events', []):
+            participants = event.get('participants', [])
+            home_participant = next((p for p in participants if p.get('type') == 'HOME'), None)
+            away_participant = next((p for p in participants if p.get('type') == 'AWAY'), None)
+            if not home_participant or not away_participant:
+                continue
+
+            home_names = {transform_league_name(home_participant.get('name', '')),
+                          transform_league_name(home_participant.get('englishName', ''))}
+            away_names = {transform_league_name(away_participant.get('name', '')),
+                          transform_league_name(away_participant.get('englishName', ''))}
+
+            if alias_home not in home_names or alias_away not in away_names:
+                continue
+
+            return {
+                'event_id': event.get('id'),
+                'home_name': home_participant.get('name', ''),
+                'away_name': away_participant.get('name', '')
+            }
+
+    return None
+
+
+def _side_match(spider_normalized, participant_names):
+    """spider 队名与 PIN888 队名 (name / englishName) 互相包含时返回匹配的 PIN888 标准化队名"""
+    if not spider_normalized:
+        return None
+    for name in participant_names:
+        if name and (spider_normalized in name or name in spider_normalized):
+            return name
+    return None
+
+
+def _learn_aliases(alias_store, spider_home_normalized, spider_away_normalized,
+                   home_participant, away_participant, home_names, away_names):
+    """
+    记录 spider 队名 → PIN888 队名
+
+    比赛可能只靠一边队名匹配成功,只有主队对主队、客队对客队都匹配时才学习 (没有匹配的一边不能写入别名);
+    置信度为整对队名的完整相似度,低于别名表阈值的不会被查找使用
+    """
+    home_normalized = _side_match(spider_home_normalized, home_names)
+    away_normalized = _side_match(spider_away_normalized, away_names)
+    if not home_normalized or not away_normalized:
+        return
+
+    confidence = calculate_pair_confidence(
+        spider_home_normalized, spider_away_normalized, home_normalized, away_normalized
+    )
+    alias_store.learn_pair(
+        ALIAS_PLATFORM,
+        (spider_home_normalized, spider_away_normalized),
+        (home_participant.get('name', ''), away_participant.get('name', '')),
+        (home_normalized, away_normalized),
+        confidence
+    )
@@ -28,6 +28,22 @@ class Settings:
     
     # betinasian 的 duration 时间设置
     BETINASIAN_DURATION = 120
+
+    # betinasian 数据注册器运行在 Web Worker 中 (站点不支持时自动回退到主线程)
+    BETINASIAN_REGISTOR_WORKER = False
+
+    # betinasian 变更流: 比赛 / 价格 / 订单增量推送到 Python 副本,查询改为本地查找 (副本不新鲜时回退页面查询)
+    BETINASIAN_CHANGE_FEED = True
+    BETINASIAN_CHANGE_FEED_INTERVAL_MS = 100
+
+    # betinasian 批量查询 (比赛列表 / bookie 价格 / 订单列表) 使用紧凑列式编码传输
+    BETINASIAN_COMPACT_TRANSFER = False
+
+    # betinasian 下单前按市场深度梯队规划下注额: 深度不足时在允许滑点内放宽限价,仍不足则按可成交量缩减下注额
+    BETINASIAN_DEPTH_SIZING = False
+    BETINASIAN_DEPTH_MAX_SLIPPAGE = 0.0  # 限价相对 order_odds 最多下调的比例 (0.01 = 1%)
+    # 深度梯队以 GBP 计,下注货币 → GBP 的折算比例 (未配置的货币跳过深度规划)
+    BETINASIAN_DEPTH_FX_TO_GBP = {'GBP': 1.0}
      
     PLATFORM_INFO = {
         'betinasian':{
@@ -39,7 +55,10 @@ class Settings:
             'class_name': 'BetInAsianAutomation',  # 类名
 
             # * 由于不是import ,而是通过读取文件,所以会慢一点.
-            'js_base_path': os.path.join(_AUTOMATION_DIR,  "betinasian", "jsCode")
+            'js_base_path': os.path.join(_AUTOMATION_DIR,  "betinasian", "jsCode"),
+
+            # 只有 feed 页面订阅所有 in-running 比赛的 hcaps,其余账号只订阅有 betslip / 未完成订单的比赛
+            'odds_feed_pages': 1,
         },
         'pin888': {
             'platform_name': 'pin888',
@@ -48,10 +67,26 @@ class Settings:
             'folder_addr': 'automationPlaywright.pin888',  # 文件夹地址
             'file_name': 'pin888_automation',  # 文件名
             'class_name': 'Pin888Automation',  # 类名
-            'js_base_path': os.path.join(_AUTOMATION_DIR, "pin888", "jsCode")
+            'js_base_path': os.path.join(_AUTOMATION_DIR, "pin888", "jsCode"),
+
+            # 公开赔率由几个 feed 页面统一拉取并共享 (0 表示每个账号各自拉取)
+            'odds_feed_pages': 1,
         }
     }
 
+    # ==================== 共享赔率缓存 (OddsFeedCache) ====================
+    # 比赛详情缓存有效期(秒): 赔率变化快,只允许极短时间内复用
+    ODDS_FEED_DETAIL_MAX_AGE = 1.5
+    # 比赛列表缓存有效期(秒): 只用于球队名匹配 event_id,可以放宽
+    ODDS_FEED_EVENTS_MAX_AGE = 10.0
+
+    # Pin888 添加订单 (all-odds-selections) 响应复用时间(秒), 相同请求在此期间只发一次
+    ODDS_SELECTION_CACHE_TTL = 0.5
+
+    # ==================== 登录会话快照 ====================
+    # Playwright storage state 按 ads_id 保存的目录 (包含 cookies,勿提交到仓库)
+    SESSION_STATE_DIR = os.path.join(_BASE_DIR, "sessionStates")
+
     # ==================== Logging Configuration ====================
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_FORMAT = '[%(asctime)s] [%(name)s] [%(levelname)s] %(message)s'
@@ -2,5 +2,6 @@
 Core module - 核心组件
 """
 from .onlinePlatform import OnlinePlatform
+from .oddsFeedCache import OddsFeedCache
 
-__all__ = ['OnlinePlatform']
+__all__ = ['OnlinePlatform', 'OddsFeedCache']
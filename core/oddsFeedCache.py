@@ -0,0 +1,176 @@
+"""
+OddsFeedCache - 跨账号共享赔率缓存单例
+
+同一平台的公开赔率 (比赛列表 / 比赛详情) 对所有账号都是一样的,
+由 OnlinePlatform 指定的 feed 页面拉取后发布到这里,
+其余账号直接读取,只用自己的页面做需要登录态的下单请求
+"""
+from typing import Any, Dict, Optional, Tuple
+import time
+
+# 条目发布后保留的最长时间(秒): 远大于读取时的 max_age,超过后不会再被读到
+CACHE_RETENTION_SECONDS = 60.0
+
+# 两次清理过期条目的最小间隔(秒)
+CACHE_PRUNE_INTERVAL = 10.0
+
+
+class OddsFeedCache:
+    """
+    跨账号共享赔率缓存 (进程内单例)
+
+    存储结构:
+        _all_events:    {(platform_name, sport_id, period_num): (data, published_at)}
+        _event_details: {(platform_name, event_id): (data, published_at)}
+
+    发布时按 CACHE_PRUNE_INTERVAL 清理超过 CACHE_RETENTION_SECONDS 的条目
+    (比赛结束后不再发布的详情不会一直留在内存中)
+
+    Example:
+        >>> cache = OddsFeedCache()
+        >>> cache.publish_event_detail('pin888', 123456, detail)
+        >>> cache.get_event_detail('pin888', 123456, max_age=1.5)
+        {...}
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        """单例模式实现"""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        """初始化缓存 (只执行一次)"""
+        if self._initialized:
+            return
+
+        self._all_events: Dict[Tuple[str, str, str], Tuple[Any, float]] = {}
+        self._event_details: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+        self._stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'publishes': 0, 'evictions': 0}
+        self._next_prune = 0.0
+        self._initialized = True
+
+    # ==================== 比赛列表 ====================
+
+    def publish_all_events(self, platform_name: str, sport_id: Any, period_num: Any, data: Any):
+        """
+        发布比赛列表 (如 Pin888 的 LIVE_EURO_ODDS FULL_ODDS)
+
+        Args:
+            platform_name: 平台名称
+            sport_id: 运动类型ID
+            period_num: 时段参数
+            data: 比赛列表数据
+        """
+        if not data:
+            return
+        key = (platform_name, str(sport_id), str(period_num))
+        now = time.monotonic()
+        self._all_events[key] = (data, now)
+        self._stats['publishes'] += 1
+        self._maybe_prune(now)
+
+    def get_all_events(self, platform_name: str, sport_id: Any, period_num: Any, max_age: float) -> Optional[Any]:
+        """
+        读取比赛列表,超过 max_age 秒视为过期
+
+        Returns:
+            比赛列表数据,未命中或已过期返回 None
+        """
+        key = (platform_name, str(sport_id), str(period_num))
+        return self._lookup(self._all_events, key, max_age)
+
+    # ==================== 比赛详情 ====================
+
+    def publish_event_detail(self, platform_name: str, event_id: Any, data: Any):
+        """
+        发布比赛详情赔率
+
+        Args:
+            platform_name: 平台名称
+            event_id: 比赛ID
+            data: 详情赔率数据
+        """
+        if not data or event_id in (None, ''):
+            return
+        key = (platform_name, str(event_id))
+        now = time.monotonic()
+        self._event_details[key] = (data, now)
+        self._stats['publishes'] += 1
+        self._maybe_prune(now)
+
+    def get_event_detail(self, platform_name: str, event_id: Any, max_age: float) -> Optional[Any]:
+        """
+        读取比赛详情赔率,超过 max_age 秒视为过期
+
+        Returns:
+            详情赔率数据,未命中或已过期返回 None
+        """
+        if event_id in (None, ''):
+            return None
+        key = (platform_name, str(event_id))
+        return self._lookup(self._event_details, key, max_age)
+
+    # ==================== 内部方法 ====================
+
+    def _lookup(self, store: Dict, key: Tuple, max_age: float) -> Optional[Any]:
+        """按 key 读取缓存并检查是否过期 (过期条目顺便清除)"""
+        entry = store.get(key)
+        if entry is None:
+            self._stats['misses'] += 1
+            return None
+
+        data, published_at = entry
+        if time.monotonic() - published_at > max_age:
+            store.pop(key, None)
+            self._stats['misses'] += 1
+            return None
+
+        self._stats['hits'] += 1
+        return data
+
+    def _maybe_prune(self, now: float):
+        """按 CACHE_PRUNE_INTERVAL 清理超过 CACHE_RETENTION_SECONDS 的条目"""
+        if now < self._next_prune:
+            return
+        self._next_prune = now + CACHE_PRUNE_INTERVAL
+
+        expire_before = now - CACHE_RETENTION_SECONDS
+        for store in (self._all_events, self._event_details):
+            expired = [key for key, (_, published_at) in store.items() if published_at < expire_before]
+            for key in expired:
+                del store[key]
+            self._stats['evictions'] += len(expired)
+
+    def clear(self, platform_name: Optional[str] = None):
+        """
+        清空缓存
+
+        Args:
+            platform_name: 平台名称,为 None 时清空所有平台
+        """
+        if platform_name is None:
+            self._all_events.clear()
+            self._event_details.clear()
+            return
+
+        for store in (self._all_events, self._event_details):
+            for key in [k for k in store if k[0] == platform_name]:
+                del store[key]
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取命中统计"""
+        return {
+            **self._stats,
+            'all_events': len(self._all_events),
+            'event_details': len(self._event_details),
+        }
+
+    def __repr__(self):
+        return (
+            f"<OddsFeedCache: {len(self._all_events)} event lists, "
+            f"{len(self._event_details)} event details>"
+        )
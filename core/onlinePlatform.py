@@ -2,7 +2,7 @@
 OnlinePlatform - 在线平台账号管理单例
 负责接收并存储 status="scheduling" 的账号数据
 """
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from playwright.async_api import Page
 import importlib
 import sys
@@ -45,6 +45,13 @@ class OnlinePlatform:
             self._platform_info: Dict[str, dict] = platform_info or {}
             # 存储 WebSocket 客户端
             self._ws_client = ws_client
+            # 赔率源 (feed) 指定: {platform_name: [handler_name, ...]}
+            # feed 页面负责拉取公开赔率并发布到 OddsFeedCache,其余账号只读缓存
+            self._odds_feeds: Dict[str, List[str]] = {}
+            # 订阅规划: 串行执行,同步上下文 (账号移除 / 页面关闭) 中通过任务补发
+            self._plan_lock = asyncio.Lock()
+            self._plan_task: Optional[asyncio.Task] = None
+            self._plan_pending = False
             # 初始化 FingerBrowser 实例 (ADS)
             self._finger_browser = FingerBrowser(browser_type="ads")
             OnlinePlatform._initialized = True
@@ -140,12 +147,17 @@ class OnlinePlatform:
                         if value is not None:
                             existing_account[key] = value
 
-                    # 重建 page 和 ac
+                    # 重建 page 和 ac (新页面需要重新下发订阅规划)
+                    existing_account.pop('subscription_mode', None)
                     try:
                         await self._create_page_and_ac(handler_name)
                         print(f"✅ [{handler_name}] page 重建成功")
                     except Exception as e:
                         print(f"❌ [{handler_name}] page 重建失败: {e}")
+                    # 重建失败的 feed 让出角色,由其余 consumer 补位
+                    if not self._is_feed_ready(handler_name):
+                        self._release_odds_role(handler_name, existing_account.get('platform_name'))
+                    self._assign_odds_role(handler_name)
                 else:
                     # 只更新动态字段,不覆盖 port/ws_url/page/ac
                     # ⚠️ 关键修复: 只更新非 None 且非关键字段的值
@@ -231,6 +243,7 @@ class OnlinePlatform:
                     'file_name': platform_config.get('file_name'),
                     'class_name': platform_config.get('class_name'),
                     'js_base_path': platform_config.get('js_base_path'),
+                    'odds_feed_pages': platform_config.get('odds_feed_pages', 0),
                 })
 
             # 4. 添加新账号
@@ -244,6 +257,12 @@ class OnlinePlatform:
             except Exception as e:
                 print(f"❌ 创建 page/ac 失败 ({handler_name}): {e}")
 
+            # 6. 指定赔率源角色 (feed / consumer)
+            self._assign_odds_role(handler_name)
+
+        # 7. 按赔率源角色下发订阅规划 (只对角色变化的账号生效)
+        await self._plan_subscriptions()
+
         # 打印所有账号及其 balance
         print(f"\n📋 [DEBUG] 当前所有账号: {list(self._accounts.keys())}")
         if self._accounts:
@@ -371,6 +390,8 @@ class OnlinePlatform:
                 try:
                     print(f"🛠 [{handler_name}] 开始执行 prepare_work")
                     # ✅ 订阅篮球和足球的所有 in-running 比赛
+                    # 重新注入 registor 后页面回到 discovery,清除缓存的订阅模式
+                    account.pop('subscription_mode', None)
                     result = await ac.prepare_work(
                         subscribe_sports=['basket', 'fb']
                     )
@@ -387,8 +408,194 @@ class OnlinePlatform:
                     print(f"⚠️ [{handler_name}] prepare_work 异常: {exc}")
         except Exception as exc:
             print(f"❌ 创建 ActionChain 失败 ({handler_name}): {exc}")
+
+        # 页面关闭 (浏览器断开 / 标签页被关闭) 时立即让出 feed 角色,不等下一条 onlineAccount
+        final_page = account.get('page')
+        if final_page is not None and hasattr(final_page, 'on'):
+            final_page.on('close', lambda closed_page: self._on_page_closed(handler_name, closed_page))
     
     
+    # ==================== 赔率源 (feed) 指定 ====================
+
+    def _assign_odds_role(self, handler_name: str):
+        """
+        为账号指定赔率源角色
+
+        平台配置 odds_feed_pages > 0 时,前 N 个可用账号成为 feed,
+        其余账号为 consumer (从 OddsFeedCache 读取公开赔率)
+        """
+        account = self._accounts.get(handler_name)
+        if not account:
+            return
+
+        platform_name = account.get('platform_name')
+        feed_pages = int(account.get('odds_feed_pages') or 0)
+        if feed_pages <= 0:
+            account['odds_role'] = None
+            return
+
+        feeds = self._odds_feeds.setdefault(platform_name, [])
+        # 清理已失效的 feed (账号被移除或 ac 创建失败)
+        feeds[:] = [name for name in feeds if self._is_feed_ready(name)]
+
+        if handler_name in feeds:
+            account['odds_role'] = 'feed'
+        elif len(feeds) < feed_pages and self._is_feed_ready(handler_name):
+            feeds.append(handler_name)
+            account['odds_role'] = 'feed'
+            print(f"📡 [{handler_name}] 指定为 {platform_name} 赔率源 (feed {len(feeds)}/{feed_pages})")
+        else:
+            account['odds_role'] = 'consumer'
+
+    def _is_feed_ready(self, handler_name: str) -> bool:
+        """账号是否可以作为 feed (存在、page/ac 已创建且 page 未关闭)"""
+        account = self._accounts.get(handler_name)
+        if not (account and account.get('page') and account.get('ac')):
+            return False
+        try:
+            return not account['page'].is_closed()
+        except Exception:
+            return False
+
+    def _release_odds_role(self, handler_name: str, platform_name: str):
+        """账号移除时释放 feed 角色,并从剩余账号中补位"""
+        feeds = self._odds_feeds.get(platform_name)
+        if not feeds or handler_name not in feeds:
+            return
+
+        feeds.remove(handler_name)
+        print(f"📡 [{handler_name}] 释放 {platform_name} 赔率源角色")
+
+        for name, account in self._accounts.items():
+            if name != handler_name and account.get('platform_name') == platform_name \
+                    and account.get('odds_role') == 'consumer':
+                self._assign_odds_role(name)
+                if account.get('odds_role') == 'feed':
+                    # 补位的账号需要从 targeted 切换到 discovery
+                    account.pop('subscription_mode', None)
+
+    def _on_page_closed(self, handler_name: str, page: Page):
+        """页面关闭回调: 释放 feed 角色并重新规划订阅"""
+        account = self._accounts.get(handler_name)
+        if not account or account.get('page') is not page:
+            return
+
+        print(f"⚠️ [{handler_name}] 页面已关闭")
+        account.pop('subscription_mode', None)
+        if account.get('odds_role') == 'feed':
+            self._release_odds_role(handler_name, account.get('platform_name'))
+            # 页面重建后由 _assign_odds_role 重新指定
+            account['odds_role'] = None
+        self._schedule_plan_subscriptions()
+
+    def _schedule_plan_subscriptions(self):
+        """
+        在同步上下文中安排一次订阅规划
+
+        已有规划任务时只做标记,由该任务结束前再规划一轮;
+        没有运行中的事件循环时跳过 (下一次 update_accounts 会规划)
+        """
+        self._plan_pending = True
+        if self._plan_task and not self._plan_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._plan_task = loop.create_task(self._run_scheduled_plans())
+
+    async def _run_scheduled_plans(self):
+        """执行被安排的订阅规划,期间又有新的安排时继续规划"""
+        while self._plan_pending:
+            self._plan_pending = False
+            try:
+                await self._plan_subscriptions()
+            except Exception as e:
+                print(f"⚠️ 订阅规划失败: {e}")
+
+    async def _plan_subscriptions(self):
+        """
+        跨账号订阅规划
+
+        feed 账号负责发现 (discovery: 订阅所有 in-running 比赛),
+        consumer 账号只订阅自己有 betslip / 未完成订单的比赛 (targeted),
+        每个页面收到的推送量不再随账号数重复
+        只对实现了 apply_subscription_plan 的平台生效,模式未变化的账号跳过
+
+        页面刷新或重新注入 registor 后 JS 端回到 discovery,
+        因此跳过前先向页面确认当前模式 (平台实现了 get_subscription_mode 时)
+        """
+        async with self._plan_lock:
+            # 规划期间账号可能被移除,遍历快照并跳过已移除的账号
+            for handler_name, account in list(self._accounts.items()):
+                if handler_name not in self._accounts:
+                    continue
+                await self._plan_account_subscription(handler_name, account)
+
+    async def _plan_account_subscription(self, handler_name: str, account: dict):
+        """按账号当前的赔率源角色下发订阅规划 (模式未变化时跳过)"""
+        ac = account.get('ac')
+        role = account.get('odds_role')
+        if not role or not hasattr(ac, 'apply_subscription_plan'):
+            return
+
+        mode = 'discovery' if role == 'feed' else 'targeted'
+        if account.get('subscription_mode') == mode:
+            if not hasattr(ac, 'get_subscription_mode'):
+                return
+            try:
+                page_mode = await ac.get_subscription_mode()
+            except Exception:
+                page_mode = None
+            if page_mode == mode:
+                return
+            print(f"🔄 [{handler_name}] 页面订阅模式为 {page_mode},重新下发订阅规划")
+            account.pop('subscription_mode', None)
+
+        try:
+            applied = await ac.apply_subscription_plan(mode)
+        except Exception as e:
+            print(f"⚠️ [{handler_name}] 下发订阅规划失败: {e}")
+            return
+
+        if applied:
+            account['subscription_mode'] = mode
+            print(f"📡 [{handler_name}] 订阅规划: {mode}")
+
+    def get_odds_feed_handlers(self, platform_name: str) -> List[str]:
+        """获取指定平台的 feed 账号列表"""
+        return list(self._odds_feeds.get(platform_name, []))
+
+    def get_odds_feed(self, platform_name: str, exclude: Optional[str] = None):
+        """
+        获取指定平台的一个 feed ActionChain
+
+        多个 feed 时依次轮换,分摊拉取压力
+
+        Args:
+            platform_name: 平台名称
+            exclude: 需要排除的 handler_name
+
+        Returns:
+            feed 的 ac 对象,没有可用 feed 时返回 None
+        """
+        feeds = self._odds_feeds.get(platform_name)
+        if not feeds:
+            return None
+
+        for _ in range(len(feeds)):
+            handler_name = feeds.pop(0)
+            feeds.append(handler_name)
+            if handler_name == exclude or not self._is_feed_ready(handler_name):
+                continue
+            return self._accounts[handler_name].get('ac')
+        return None
+
+    @classmethod
+    def get_instance(cls) -> Optional['OnlinePlatform']:
+        """获取已初始化的单例 (未初始化时返回 None,不会触发初始化)"""
+        return cls._instance if cls._initialized else None
+
     def get_account(self, handler_name: str) -> Optional[dict]:
         """获取指定账号 (包含 page 和 ac)"""
         return self._accounts.get(handler_name)
@@ -446,13 +653,17 @@ class OnlinePlatform:
 
         # 从字典中删除
         del self._accounts[handler_name]
+        self._release_odds_role(handler_name, account.get('platform_name'))
         print(f"🗑️ 移除账号: {handler_name} (状态变为非 scheduling)")
+        # 补位的 feed 需要切换到 discovery,不等下一条 onlineAccount 消息
+        self._schedule_plan_subscriptions()
         return True
 
     def clear(self):
         """清空所有账号"""
         count = len(self._accounts)
         self._accounts.clear()
+        self._odds_feeds.clear()
         print(f"🧹 已清空 {count} 个账号")
 
     def count(self) -> int:
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+测试球队名称标准化 (clearName) 及规则重新加载
+"""
+import json
+
+import pytest
+
+from utils.matchGameName import clearName, fuzzy_match, team_alias, normalize_name, get_rules_version
+
+
+@pytest.mark.parametrize('name, expected', [
+    ("Manchester United F.C.", 'manchesterunited'),
+    ("Real Madrid C.F.", 'realmadrid'),
+    ("FC Barcelona", 'barcelona'),
+    ("Man Utd", 'manunited'),
+    ("Basketball Club Zalgiris", 'zalgiris'),
+    # 短语规则把队名删空或只剩一个词时回退到单词规则
+    ("Sporting Club", 'sporting'),
+    ("Football Club", 'football'),
+    ("Basketball Club B.C Basketball Club", 'bc'),
+    ("Sporting Club Portugal", 'sportingportugal'),
+])
+def test_normalize_name(name, expected):
+    assert normalize_name(name) == expected
+
+
+def test_phrase_stripping_keeps_names_distinct():
+    """俱乐部全称不会与国家队或其他俱乐部冲突"""
+    assert normalize_name("Sporting Club Portugal") != normalize_name("Portugal")
+    assert normalize_name("Sporting Club") != normalize_name("Football Club")
+
+
+@pytest.fixture
+def rules_file(tmp_path, monkeypatch):
+    """把规则文件指向临时文件,测试结束后恢复原规则"""
+    original = clearName._rules
+    path = tmp_path / 'team_name_rules.json'
+    path.write_text(json.dumps({"stopwords": {}, "synonyms": {}, "preserve_words": []}), encoding='utf-8')
+    monkeypatch.setattr(clearName, '_RULES_PATH', str(path))
+    yield path
+    clearName._rules = original
+    clearName.clear_normalize_cache()
+    fuzzy_match._index_cache.clear()
+
+
+def test_reload_rekeys_normalized_state(rules_file, tmp_path):
+    """规则重新加载后标准化缓存、比赛索引、别名表都不再使用旧规则的结果"""
+    assert clearName.reload_rules(force=True)
+    store = team_alias.TeamAliasStore(path=str(tmp_path / 'aliases.json'))
+    clearName.add_rules_reload_listener(store.drop_stale)
+
+    events = [{'event_key': 'k1', 'home': 'Lakers Team', 'away': 'Warriors'}]
+    old_version = get_rules_version()
+    old_index = fuzzy_match.get_match_index(events)
+    store.learn('betinasian', 'lakers', 'Lakers Team', 'lakersteam', 0.9)
+    assert normalize_name('Lakers Team') == 'lakersteam'
+    assert store.lookup('betinasian', 'lakers') == 'lakersteam'
+
+    rules_file.write_text(json.dumps({
+        "stopwords": {"organization_words": ["team"]}, "synonyms": {}, "preserve_words": []
+    }), encoding='utf-8')
+    try:
+        assert clearName.reload_rules(force=True)
+
+        assert get_rules_version() != old_version
+        assert normalize_name('Lakers Team') == 'lakers'
+        assert fuzzy_match.get_match_index(events) is not old_index
+        assert fuzzy_match.get_match_index(events).homes == ['lakers']
+        assert store.lookup('betinasian', 'lakers') is None
+        assert store.count() == 0
+    finally:
+        clearName._reload_listeners.remove(store.drop_stale)
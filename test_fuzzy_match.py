@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+测试球队名称模糊匹配的候选剪枝
+
+用 pin888 的 allEvents.json 中的队名构造比赛列表,剪枝结果必须与逐场计算 (prune=False) 完全一致
+"""
+import json
+import os
+import random
+
+import pytest
+
+from utils.matchGameName import fuzzy_match, team_alias, normalize_name, fuzzy_match_teams
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ALL_EVENTS = os.path.join(ROOT, 'automationPlaywright', 'pin888', 'response', 'allEvents.json')
+
+
+def _fixture_teams():
+    with open(ALL_EVENTS, encoding='utf-8') as f:
+        data = json.load(f)
+    return [
+        (event['participants'][0]['name'], event['participants'][1]['name'])
+        for league in data['leagues']
+        for event in league['events']
+        if len(event.get('participants', [])) >= 2
+    ]
+
+
+def _fixture_events():
+    """fixture 中的比赛,加上主客队错位组合 (扩大列表以触发剪枝)"""
+    teams = _fixture_teams()
+    homes = [home for home, _ in teams]
+    aways = [away for _, away in teams]
+    events = []
+    for shift in range(4):
+        for i, home in enumerate(homes):
+            away = aways[(i + shift) % len(aways)]
+            events.append({'event_key': f'{shift}-{i}', 'home': home, 'away': away})
+    return events
+
+
+def _perturb(name, rng):
+    """模拟外部平台的队名写法: 删字 / 换字 / 加前后缀 / 截断"""
+    choice = rng.randrange(5)
+    if choice == 0 and len(name) > 3:
+        i = rng.randrange(len(name))
+        return name[:i] + name[i + 1:]
+    if choice == 1 and len(name) > 3:
+        i = rng.randrange(len(name))
+        return name[:i] + rng.choice('aeiouxz') + name[i + 1:]
+    if choice == 2:
+        return rng.choice(['CA ', 'Club ', 'FC ', '']) + name + rng.choice([' FC', ' II', ' W', ''])
+    if choice == 3:
+        return name.split()[0]
+    return name[::-1]
+
+
+@pytest.fixture
+def small_top_k(monkeypatch):
+    # fixture 只有几十场比赛,缩小 K 让剪枝真正生效
+    monkeypatch.setattr(fuzzy_match, 'CANDIDATE_TOP_K', 5)
+
+
+def test_pruned_match_equals_brute_force(small_top_k):
+    """剪枝匹配与逐场计算选出同一场比赛、同一分数"""
+    events = _fixture_events()
+    teams = _fixture_teams()
+    rng = random.Random(42)
+
+    queries = [(_perturb(home, rng), _perturb(away, rng)) for home, away in teams for _ in range(10)]
+    queries += [(rng.choice(teams)[0][::-1], 'Unrelated Name') for _ in range(20)]
+
+    for home, away in queries:
+        for threshold in (0.0001, 0.5, 0.7):
+            pruned = fuzzy_match_teams(home, away, events, threshold=threshold, prune=True)
+            brute = fuzzy_match_teams(home, away, events, threshold=threshold, prune=False)
+            assert (pruned and (pruned['event_key'], pruned['score'])) == \
+                (brute and (brute['event_key'], brute['score'])), (home, away, threshold)
+
+
+def test_similarity_upper_bound_holds():
+    """字符计数上界不低于实际相似度"""
+    names = [normalize_name(name) for pair in _fixture_teams() for name in pair]
+    rng = random.Random(7)
+    names += [normalize_name(_perturb(name, rng)) for name in list(names)]
+
+    for a in names:
+        for b in names:
+            score = fuzzy_match.calculate_team_similarity(a, b)
+            bound = fuzzy_match._similarity_upper_bound(
+                fuzzy_match.Counter(a), len(a), fuzzy_match.Counter(b), len(b)
+            )
+            assert score <= bound + 1e-9, (a, b, score, bound)
+
+
+@pytest.fixture
+def alias_store(tmp_path, monkeypatch):
+    store = team_alias.TeamAliasStore(path=str(tmp_path / 'team_aliases.json'))
+    monkeypatch.setattr(team_alias, '_store', store)
+    return store
+
+
+def test_one_sided_alias_does_not_override_fuzzy(alias_store):
+    """只有一边命中别名时按相似度匹配,不会匹配到青年队的比赛"""
+    day1 = [
+        {'event_key': 'u19', 'home': 'Real Madrid U19', 'away': 'Atletico Madrid U19'},
+    ]
+    first = fuzzy_match_teams('Real Madrid', 'Atletico Madrid', day1, platform='betinasian')
+    assert first['event_key'] == 'u19'
+
+    day2 = [
+        {'event_key': 'u19', 'home': 'Real Madrid U19', 'away': 'Barcelona U19'},
+        {'event_key': 'senior', 'home': 'R Madrid', 'away': 'Getafe SAD'},
+    ]
+    result = fuzzy_match_teams('Real Madrid', 'Getafe', day2, platform='betinasian')
+    assert result['event_key'] == 'senior'
+    assert result['match_type'] == 'fuzzy'
+
+    only_u19 = day2[:1]
+    assert fuzzy_match_teams('Real Madrid', 'Getafe', only_u19, platform='betinasian') is None
+
+
+def test_alias_learned_per_pair(alias_store):
+    """别名按整对队名学习,两边都命中时才按别名匹配"""
+    events = [{'event_key': 'k1', 'home': 'Baxi Manresa', 'away': 'Rio Breogan'}]
+    fuzzy_match_teams('Manresa', 'Breogan', events, platform='betinasian')
+
+    home = alias_store.get('betinasian', 'manresa')
+    away = alias_store.get('betinasian', 'breogan')
+    assert home['confidence'] == away['confidence']
+    assert home['confidence'] < 1.0
+
+    alias_store.min_confidence = 0.0
+    result = fuzzy_match_teams('Manresa', 'Breogan', events, platform='betinasian')
+    assert result['match_type'] == 'alias'
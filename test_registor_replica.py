@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+测试变更流 (change_feed.js) 与 Python 副本 (registor_replica.py) 的批次处理
+"""
+import importlib
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CHANGE_FEED = os.path.join(
+    ROOT, 'automationPlaywright', 'betinasian', 'jsCode', 'wsDataRegistor', 'core', 'managers', 'change_feed.js'
+)
+
+registor_replica = importlib.import_module('automationPlaywright.betinasian.jsCodeExcutors.registor_replica')
+
+
+def _event(event_key, price):
+    return {'event_key': event_key, 'sport': 'fb', 'isInRunning': True, 'price': price}
+
+
+def _batch(seq, snapshot=False, events=()):
+    return {'seq': seq, 'snapshot': snapshot, 'events': list(events)}
+
+
+def test_seq_gap_marks_replica_stale_until_snapshot():
+    """序号缺口后副本不可读取且不再应用增量,收到快照后恢复"""
+    replica = registor_replica.RegistorReplica()
+    replica.apply(_batch(1, snapshot=True, events=[_event('e1', 1.5)]))
+    replica.apply(_batch(2, events=[_event('e1', 1.6)]))
+    assert replica.is_fresh()
+
+    replica.apply(_batch(4, events=[_event('e1', 1.9)]))
+    assert replica.stale
+    assert not replica.is_fresh()
+    assert replica.needs_snapshot()
+    assert replica.get_event('e1')['price'] == 1.6
+
+    replica.apply(_batch(5, events=[_event('e1', 2.0)]))
+    assert replica.get_event('e1')['price'] == 1.6
+    assert replica.stats['seq_gaps'] == 1
+
+    replica.apply(_batch(6, snapshot=True, events=[_event('e1', 2.1)]))
+    assert not replica.stale
+    assert replica.is_fresh()
+    assert replica.get_event('e1')['price'] == 2.1
+
+
+# 在 node 中加载 change_feed.js,依次在没有 / 抛异常 / 正常的推送通道下 flush
+NODE_HARNESS = r"""
+const fs = require('fs');
+const vm = require('vm');
+const sandbox = { console };
+sandbox.window = sandbox;
+vm.createContext(sandbox);
+vm.runInContext(fs.readFileSync(process.argv[1], 'utf8'), sandbox);
+vm.runInContext(`
+    window.__eventsStore = { getAll: () => [{ event_key: 'e1' }] };
+    const feed = window.__changeFeed;
+    feed.enabled = true;
+    feed.snapshotRequested = true;
+    feed.eventUpserted({ event_key: 'e2' });
+    const results = [];
+    results.push(feed.flush());
+    window.__registorOnDeltas = () => { throw new Error('closed'); };
+    results.push(feed.flush());
+    const batches = [];
+    window.__registorOnDeltas = (batch) => batches.push(batch);
+    results.push(feed.flush());
+    window.__result = JSON.stringify({ results, batches, seq: feed.stats.seq, pending: feed.hasPending() });
+`, sandbox);
+console.log(sandbox.__result);
+"""
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='需要 node')
+def test_flush_keeps_pending_changes_when_sink_fails():
+    """没有推送通道或推送失败时,待推送的变更和快照请求保留到下次成功推送"""
+    output = json.loads(subprocess.run(
+        ['node', '-e', NODE_HARNESS, CHANGE_FEED], capture_output=True, text=True, check=True
+    ).stdout)
+
+    assert output['results'] == [False, False, True]
+    assert output['seq'] == 1
+    assert not output['pending']
+    [batch] = output['batches']
+    assert batch['seq'] == 1
+    assert batch['snapshot'] is True
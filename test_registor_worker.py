@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+测试 Registor Worker 运行时 (worker_runtime.js) 的查询编译
+
+用 node 加载 worker_runtime.js,把 inject_hook 实际发送的代码交给 compileSource 执行
+"""
+import importlib
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+WORKER_RUNTIME = os.path.join(
+    ROOT, 'automationPlaywright', 'betinasian', 'jsCode', 'wsDataRegistor', 'worker', 'worker_runtime.js'
+)
+
+# 在 node 的 vm 中模拟 worker 全局对象,依次执行 sources 并输出结果
+NODE_HARNESS = r"""
+const fs = require('fs');
+const vm = require('vm');
+const [runtimePath, sourcesJson] = process.argv.slice(1);
+
+const calls = [];
+const sandbox = { postMessage: () => {} };
+sandbox.self = sandbox;
+vm.createContext(sandbox);
+vm.runInContext(fs.readFileSync(runtimePath, 'utf8'), sandbox);
+sandbox.configureSubscription = (config) => { calls.push(config); return 'configured'; };
+
+const results = JSON.parse(sourcesJson).map(([source, arg]) => {
+    try {
+        return { ok: true, value: vm.runInContext('compileSource', sandbox)(source)(arg) ?? null };
+    } catch (e) {
+        return { ok: false, error: String(e) };
+    }
+});
+console.log(JSON.stringify({ results, calls }));
+"""
+
+
+def _run_sources(sources):
+    output = subprocess.run(
+        ['node', '-e', NODE_HARNESS, WORKER_RUNTIME, json.dumps(sources)],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='需要 node')
+def test_compile_source_accepts_configure_subscription_statement():
+    """inject_hook 发送的 configureSubscription 语句 (带结尾分号) 可以在 worker 中执行"""
+    inject_hook = importlib.import_module('automationPlaywright.betinasian.jsCodeExcutors.inject_hook')
+    source = inject_hook.build_configure_subscription_source(['basket', 'fb'])
+
+    output = _run_sources([[source, None]])
+
+    assert output['results'] == [{'ok': True, 'value': None}]
+    assert output['calls'] == [{'sports': ['basket', 'fb'], 'autoSubscribeDelay': 10000}]
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='需要 node')
+def test_compile_source_keeps_expression_forms():
+    """函数表达式和普通表达式仍然返回结果"""
+    output = _run_sources([
+        ['(x) => x * 2', 21],
+        ['typeof window.configureSubscription', None],
+        ['window.configureSubscription({sports: []})', None],
+        ['(', None],
+    ])
+
+    results = output['results']
+    assert results[0] == {'ok': True, 'value': 42}
+    assert results[1] == {'ok': True, 'value': 'function'}
+    assert results[2] == {'ok': True, 'value': 'configured'}
+    assert results[3]['ok'] is False
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""
+统一盘口模型模块
+"""
+from .market_spec import (
+    MarketSpec,
+    LINE_SCALE,
+    SPIDER_MARKET_HANDICAPS,
+    parse_market_spec,
+    parse_market_spec_by_id,
+    market_spec_from_bet_data
+)
+
+__all__ = [
+    'MarketSpec',
+    'LINE_SCALE',
+    'SPIDER_MARKET_HANDICAPS',
+    'parse_market_spec',
+    'parse_market_spec_by_id',
+    'market_spec_from_bet_data'
+]
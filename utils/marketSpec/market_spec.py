@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+统一盘口模型 (MarketSpec)
+
+spider 的盘口有两种写法:
+- 盘口字符串 + 参数: spider_handicap="Total Over(2.5)", spider_handicap_param="2.5" (Pin888 使用)
+- 盘口 ID + 让分值: spider_market_id="19", spider_handicap_value=2.5 (BetInAsian 使用)
+
+两者都解析为同一个不可变的 MarketSpec (结果按输入缓存),
+各平台的映射只读取 MarketSpec 的字段,不再各自解析盘口字符串
+"""
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+import re
+
+
+class MarketSpec(NamedTuple):
+    """
+    解析后的盘口
+
+    family / side:
+        '1x2'               home / draw / away         ("1", "X", "2")
+        'moneyline'         home / away                ("Team1 Win", "Team2 Win")
+        'draw_no_bet'       home / away                ("Asian Handicap1(0.0)/Draw No Bet")
+        'european_handicap' home / draw / away         ("European Handicap1(%s)")
+        'btts'              yes / no                   ("Both to score", "One scoreless")
+        'double_chance'     home_draw / draw_away / home_away  ("1X", "X2", "12")
+        'handicap'          home / away                ("Asian Handicap1(%s)")
+        'total'             over / under               ("Total Over(%s)")
+        'team_total'        over / under, team=home/away  ("Total Over(%s) for Team1")
+        'odd_even'          odd / even
+        'no_goal'           yes
+    """
+    sport: str                  # 'soccer' / 'basketball'
+    period: str                 # 小写时段 ('full time', '1st half', '1st qtr', ...)
+    family: str
+    side: str
+    team: str                   # team_total 的球队 ('home' / 'away'),其它为 ''
+    corners: bool               # 角球盘口
+    line: Optional[int]         # 盘口值 ×100 的定点整数 (-1.5 → -150),无盘口值为 None
+    param_text: str             # 原始盘口参数文本 (平台需要原样输出时使用)
+    market_id: Optional[str]    # 对应的 spider 盘口 ID (无对应 ID 时为 None)
+
+    @property
+    def line_value(self) -> Optional[float]:
+        """盘口值 (float)"""
+        return None if self.line is None else self.line / LINE_SCALE
+
+
+# 盘口值的定点倍数
+LINE_SCALE = 100
+
+# spider 盘口 ID → 盘口字符串 (足球 / 篮球共用,%s 为盘口值)
+SPIDER_MARKET_HANDICAPS: Dict[str, str] = {
+    "1": "Team1 Win",
+    "2": "Team2 Win",
+    "3": "Asian Handicap1(0.0)/Draw No Bet",
+    "4": "Asian Handicap2(0.0)/Draw No Bet",
+    "5": "European Handicap1(%s)",
+    "6": "European HandicapX(%s)",
+    "7": "European Handicap2(%s)",
+    "8": "Both to score",
+    "9": "One scoreless",
+    "11": "1",
+    "12": "X",
+    "13": "2",
+    "14": "1X",
+    "15": "X2",
+    "16": "12",
+    "17": "Asian Handicap1(%s)",
+    "18": "Asian Handicap2(%s)",
+    "19": "Total Over(%s)",
+    "20": "Total Under(%s)",
+    "21": "Total Over(%s) for Team1",
+    "22": "Total Under(%s) for Team1",
+    "23": "Total Over(%s) for Team2",
+    "24": "Total Under(%s) for Team2",
+    "25": "Odd",
+    "26": "Even",
+    "49": "Asian Handicap1(%s) - Corners",
+    "50": "Asian Handicap2(%s) - Corners",
+    "51": "Total Over(%s) - Corners",
+    "52": "Total Under(%s) - Corners",
+    "165": "No goal"
+}
+
+_SPORT_ALIASES = {
+    'soccer': 'soccer',
+    'fb': 'soccer',
+    'football': 'soccer',
+    'basketball': 'basketball',
+    'basket': 'basketball'
+}
+
+# 无盘口值的盘口: 小写字符串 → (family, side)
+_FIXED_HANDICAPS = {
+    '1': ('1x2', 'home'),
+    'x': ('1x2', 'draw'),
+    '2': ('1x2', 'away'),
+    'team1 win': ('moneyline', 'home'),
+    'team2 win': ('moneyline', 'away'),
+    'asian handicap1(0.0)/draw no bet': ('draw_no_bet', 'home'),
+    'asian handicap2(0.0)/draw no bet': ('draw_no_bet', 'away'),
+    'both to score': ('btts', 'yes'),
+    'both teams to score': ('btts', 'yes'),
+    'one scoreless': ('btts', 'no'),
+    '1x': ('double_chance', 'home_draw'),
+    'x2': ('double_chance', 'draw_away'),
+    '12': ('double_chance', 'home_away'),
+    'odd': ('odd_even', 'odd'),
+    'even': ('odd_even', 'even'),
+    'no goal': ('no_goal', 'yes')
+}
+
+# 带盘口值的盘口: "asian handicap1(-1.5) - corners" / "total over(2.5) for team1"
+_LINE_HANDICAP_PATTERN = re.compile(
+    r'^(asian handicap|european handicap|total over|total under)([12x]?)\((.*?)\)\s*(- corners|for team1|for team2)?$'
+)
+
+_LINE_FAMILIES = {
+    ('asian handicap', '1'): ('handicap', 'home'),
+    ('asian handicap', '2'): ('handicap', 'away'),
+    ('european handicap', '1'): ('european_handicap', 'home'),
+    ('european handicap', 'x'): ('european_handicap', 'draw'),
+    ('european handicap', '2'): ('european_handicap', 'away'),
+    ('total over', ''): ('total', 'over'),
+    ('total under', ''): ('total', 'under')
+}
+
+
+@lru_cache(maxsize=512)
+def _classify_handicap(handicap: str) -> Optional[Tuple[str, str, str, bool, Optional[str]]]:
+    """
+    盘口字符串 → (family, side, team, corners, 括号中的盘口值)
+
+    无法识别时返回 None
+    """
+    text = handicap.strip().lower()
+
+    fixed = _FIXED_HANDICAPS.get(text)
+    if fixed is not None:
+        return fixed[0], fixed[1], '', False, None
+
+    match = _LINE_HANDICAP_PATTERN.match(text)
+    if not match:
+        return None
+
+    kind, marker, line_text, suffix = match.groups()
+    family_side = _LINE_FAMILIES.get((kind, marker))
+    if family_side is None:
+        return None
+    family, side = family_side
+
+    team = ''
+    if suffix in ('for team1', 'for team2'):
+        if family != 'total':
+            return None
+        family = 'team_total'
+        team = 'home' if suffix == 'for team1' else 'away'
+
+    return family, side, team, suffix == '- corners', line_text
+
+
+# (family, side, team, corners) → spider 盘口 ID
+_MARKET_IDS: Dict[Tuple[str, str, str, bool], str] = {
+    _classify_handicap(handicap)[:4]: market_id
+    for market_id, handicap in SPIDER_MARKET_HANDICAPS.items()
+}
+
+
+def _to_fixed_line(value: Any) -> Optional[int]:
+    if value is None or value == '':
+        return None
+    try:
+        return round(float(value) * LINE_SCALE)
+    except (TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=2048)
+def parse_market_spec(
+    sport_type: str,
+    handicap: str,
+    period: str,
+    handicap_param: Any = None
+) -> Optional[MarketSpec]:
+    """
+    解析 spider 盘口字符串
+
+    Args:
+        sport_type: 运动类型 ('soccer', 'basketball', 'fb', 'basket')
+        handicap: 盘口字符串 ('Total Over(2.5)', 'Asian Handicap1(-1.5)', '1X', ...)
+        period: 时段 ('Full Time', '1st half', '1st qtr', ...)
+        handicap_param: 盘口参数 (缺省时取盘口字符串括号中的值)
+
+    Returns:
+        MarketSpec 或 None (运动类型 / 盘口无法识别)
+
+    Examples:
+        >>> parse_market_spec('soccer', 'Asian Handicap2(-1.5)', '1st half', '-1.5')
+        MarketSpec(sport='soccer', period='1st half', family='handicap', side='away', team='',
+                   corners=False, line=-150, param_text='-1.5', market_id='18')
+    """
+    if not sport_type or not handicap or not period:
+        return None
+
+    sport = _SPORT_ALIASES.get(sport_type.strip().lower())
+    if sport is None:
+        return None
+
+    classified = _classify_handicap(handicap)
+    if classified is None:
+        return None
+    family, side, team, corners, line_text = classified
+
+    # 按 ID 解析且没有盘口值时括号中是 "%s" 占位符
+    if handicap_param is None and line_text is not None and line_text != '%s':
+        handicap_param = line_text
+
+    return MarketSpec(
+        sport=sport,
+        period=period.strip().lower(),
+        family=family,
+        side=side,
+        team=team,
+        corners=corners,
+        line=_to_fixed_line(handicap_param),
+        param_text=str(handicap_param),
+        market_id=_MARKET_IDS.get((family, side, team, corners))
+    )
+
+
+def parse_market_spec_by_id(
+    sport_type: str,
+    market_id: Any,
+    period: str = 'Full Time',
+    handicap_value: Any = None
+) -> Optional[MarketSpec]:
+    """
+    按 spider 盘口 ID 解析 (与对应盘口字符串的解析结果相同)
+
+    Examples:
+        >>> parse_market_spec_by_id('basket', '17', 'Full Time', -5.5).line
+        -550
+    """
+    handicap = SPIDER_MARKET_HANDICAPS.get(str(market_id))
+    if handicap is None:
+        return None
+    return parse_market_spec(sport_type, handicap, period, handicap_value)
+
+
+def market_spec_from_bet_data(bet_data: Dict[str, Any]) -> Optional[MarketSpec]:
+    """
+    从派发消息的 bet_data 解析 MarketSpec
+
+    有 spider_market_id 时按 ID 解析,否则按 spider_handicap 字符串解析;
+    盘口参数优先取 spider_handicap_param (原始文本),其次 spider_handicap_value
+    """
+    sport_type = bet_data.get('spider_sport_type')
+    period = bet_data.get('spider_period') or 'Full Time'
+    param = bet_data.get('spider_handicap_param')
+    if param is None:
+        param = bet_data.get('spider_handicap_value')
+
+    market_id = bet_data.get('spider_market_id')
+    if market_id is not None:
+        return parse_market_spec_by_id(sport_type, market_id, period, param)
+
+    handicap = bet_data.get('spider_handicap')
+    if not handicap:
+        return None
+    return parse_market_spec(sport_type, handicap, period, param)
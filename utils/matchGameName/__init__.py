@@ -2,12 +2,39 @@
 """
 球队名称匹配模块
 """
-from .clearName import normalize_name, clear_name
-from .fuzzy_match import fuzzy_match_teams, calculate_team_similarity
+from .clearName import (
+    normalize_name,
+    clear_name,
+    clear_normalize_cache,
+    normalize_cache_info,
+    reload_rules,
+    get_rules_version,
+    add_rules_reload_listener
+)
+from .fuzzy_match import (
+    fuzzy_match_teams,
+    fuzzy_match_teams_batch,
+    calculate_team_similarity,
+    calculate_pair_confidence,
+    TeamMatchIndex,
+    get_match_index
+)
+from .team_alias import TeamAliasStore, get_alias_store
 
 __all__ = [
     'normalize_name',
     'clear_name',
+    'clear_normalize_cache',
+    'normalize_cache_info',
+    'reload_rules',
+    'get_rules_version',
+    'add_rules_reload_listener',
     'fuzzy_match_teams',
-    'calculate_team_similarity'
+    'fuzzy_match_teams_batch',
+    'calculate_team_similarity',
+    'calculate_pair_confidence',
+    'TeamMatchIndex',
+    'get_match_index',
+    'TeamAliasStore',
+    'get_alias_store'
 ]
@@ -4,127 +4,286 @@
 """
 import re
 import json
+import hashlib
 import os
-from typing import List, Dict, Set
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, List, Dict, Set
 
 
-# ==================== 模块初始化: 加载配置 ====================
+# ==================== 规则加载 (支持热更新) ====================
 
-def _load_rules() -> Dict:
-    """加载规则文件(模块加载时执行一次)"""
+_RULES_PATH = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'configs', 'team_name_rules.json'
+))
+
+# 规则文件 mtime 检查间隔(秒): normalize_name 调用时按此间隔检查一次,文件变化后重新编译规则
+RULES_RELOAD_INTERVAL = 5.0
+
+# 短语自动机中标记短语结束的 key (值为替换文本, None 表示删除)
+_PHRASE_END = ''
+
+# 标准化算法的修订号: 算法本身变化时递增,与规则内容一起构成规则版本
+_NORMALIZER_REVISION = 2
+
+
+def _load_rules(rules_path: str = _RULES_PATH) -> Dict:
+    """读取规则文件 (失败时抛出异常,由调用方决定回退方式)"""
+    with open(rules_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class _RuleSet:
+    """
+    编译后的规则集 (只读, 热更新时整体替换)
+
+    - stopwords / synonyms: 单词级规则,字典查找
+    - phrases: 多词停用词 / 同义词的词级前缀树 ("basketball club" → basketball → club → 结束),
+      分词后按最长匹配优先于单词规则; 短语把队名删空或只剩一个词而单词规则保留更多词时,
+      改用单词规则的结果 ("Sporting Club" → sporting, "Sporting Club Portugal" → sportingportugal,
+      避免与其他队名 / 国家队 "Portugal" 冲突)
+    - version: 规则内容 (及算法修订号) 的指纹,持久化的标准化结果 (如别名表) 据此判断是否过期
+    """
+
+    def __init__(self, rules: Dict, mtime: float = 0.0):
+        self.mtime = mtime
+        fingerprint = json.dumps([_NORMALIZER_REVISION, rules], sort_keys=True, ensure_ascii=False)
+        self.version = hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()[:12]
+
+        stopwords: Set[str] = set()
+        for category, words in rules.get('stopwords', {}).items():
+            if isinstance(words, list):
+                stopwords.update(word.lower() for word in words)
+        synonyms = {k.lower(): v.lower() for k, v in rules.get('synonyms', {}).items()}
+        preserve_words = {word.lower() for word in rules.get('preserve_words', [])}
+
+        self.stopwords: Set[str] = set()
+        self.synonyms: Dict[str, str] = {}
+        self.phrases: Dict[str, Dict] = {}
+
+        # 实际生效的停用词 (保留词优先)
+        for word in stopwords - preserve_words:
+            tokens = _phrase_tokens(word)
+            if len(tokens) == 1:
+                self.stopwords.add(tokens[0])
+            elif tokens:
+                self._add_phrase(tokens, None)
+
+        for key, value in synonyms.items():
+            tokens = _phrase_tokens(key)
+            replacement = ''.join(_phrase_tokens(value))
+            if len(tokens) == 1:
+                self.synonyms[tokens[0]] = replacement
+            elif tokens:
+                self._add_phrase(tokens, replacement)
+
+    def _add_phrase(self, tokens: List[str], replacement):
+        node = self.phrases
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[_PHRASE_END] = replacement
+
+    def apply(self, tokens: List[str]) -> List[str]:
+        """对分词结果应用短语规则和单词规则"""
+        if not self.phrases:
+            return self._apply_words(tokens)
+
+        result = self._apply_phrases(tokens)
+        if len(result) <= 1:
+            # 短语删得过多 (只剩空名或一个过于宽泛的词),回退到单词规则
+            words = self._apply_words(tokens)
+            if len(words) > len(result):
+                return words
+        return result
+
+    def _apply_words(self, tokens: List[str]) -> List[str]:
+        """只应用单词规则"""
+        stopwords = self.stopwords
+        synonyms = self.synonyms
+        return [synonyms.get(token, token) for token in tokens if token not in stopwords]
+
+    def _apply_phrases(self, tokens: List[str]) -> List[str]:
+        """短语规则 (最长匹配) 优先,其余词应用单词规则"""
+        phrases = self.phrases
+        stopwords = self.stopwords
+        synonyms = self.synonyms
+
+        result = []
+        i = 0
+        count = len(tokens)
+        while i < count:
+            token = tokens[i]
+            node = phrases.get(token)
+            if node is not None:
+                # 最长匹配: 记录走过的最后一个短语结束位置
+                matched_end = -1
+                replacement = None
+                j = i + 1
+                while node is not None:
+                    if _PHRASE_END in node:
+                        matched_end = j
+                        replacement = node[_PHRASE_END]
+                    if j >= count:
+                        break
+                    node = node.get(tokens[j])
+                    j += 1
+                if matched_end > i + 1:
+                    if replacement:
+                        result.append(replacement)
+                    i = matched_end
+                    continue
+
+            if token not in stopwords:
+                result.append(synonyms.get(token, token))
+            i += 1
+        return result
+
+
+def _file_mtime(path: str) -> float:
     try:
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        rules_path = os.path.join(current_dir, '..', '..', 'configs', 'team_name_rules.json')
-        rules_path = os.path.normpath(rules_path)
+        return os.stat(path).st_mtime
+    except OSError:
+        return 0.0
+
 
-        with open(rules_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+def _initial_rules() -> _RuleSet:
+    """模块加载时的规则 (文件不可用时使用空规则)"""
+    mtime = _file_mtime(_RULES_PATH)
+    try:
+        return _RuleSet(_load_rules(_RULES_PATH), mtime)
     except (FileNotFoundError, json.JSONDecodeError) as e:
         print(f"警告: 加载规则文件失败: {e}, 使用空规则")
-        return {"stopwords": {}, "synonyms": {}, "preserve_words": []}
+        return _RuleSet({"stopwords": {}, "synonyms": {}, "preserve_words": []}, mtime)
 
 
-# 模块级别的全局变量(只加载一次)
-_RULES = _load_rules()
+# ==================== 预编译的正则和字符表 ====================
 
-# 构建停用词集合
-_STOPWORDS: Set[str] = set()
-for category, words in _RULES.get('stopwords', {}).items():
-    if isinstance(words, list):
-        _STOPWORDS.update(word.lower() for word in words)
+# 括号及括号内的内容 (按原顺序逐个移除,嵌套/交错时结果与逐个 re.sub 一致)
+_BRACKET_PATTERNS = (
+    re.compile(r'\([^)]*\)'),
+    re.compile(r'\[[^\]]*\]'),
+    re.compile(r'\{[^}]*\}'),
+    re.compile(r'<[^>]*>'),
+)
+_BRACKET_CHARS = frozenset('([{<')
 
-# 同义词映射表
-_SYNONYMS: Dict[str, str] = {
-    k.lower(): v.lower()
-    for k, v in _RULES.get('synonyms', {}).items()
-}
+_TOKEN_PATTERN = re.compile(r'[\w\u4e00-\u9fff]+')
 
-# 保留词集合
-_PRESERVE_WORDS: Set[str] = {
-    word.lower() for word in _RULES.get('preserve_words', [])
-}
+# normalize_name 基础清理: 删除引号,特殊符号替换为空格(保留分词边界)
+_BASIC_CLEAN_TABLE = str.maketrans({
+    **{char: '' for char in '"\'`'},
+    **{char: ' ' for char in '.,-_/&+*#@|~–—\\'}
+})
 
+# clear_name: 将.,替换为空格,其他特殊字符直接删除
+_CLEAR_NAME_TABLE = str.maketrans({
+    '"': '', "'": '', '`': '',
+    '.': ' ', ',': ' ',
+    '-': '', '_': '', '\\': '', '/': '',
+    '&': '', '+': '', '*': '', '#': '',
+    '@': '', '|': '', '~': '',
+    '–': '', '—': ''
+})
 
-# ==================== 辅助函数 ====================
-
-def _basic_clean(name: str) -> str:
-    """
-        基础清理(移除括号、特殊符号等)
+# normalize_name 的结果缓存上限 (球队名在订单之间大量重复)
+NORMALIZE_CACHE_SIZE = 8192
 
-        Args:
-            name: 原始名称
 
-        Returns:
-            str: 清理后的名称
-    """
-    # 移除各种括号及括号内的内容
-    cleaned = re.sub(r'\([^)]*\)', '', name)
-    cleaned = re.sub(r'\[[^\]]*\]', '', cleaned)
-    cleaned = re.sub(r'\{[^}]*\}', '', cleaned)
-    cleaned = re.sub(r'<[^>]*>', '', cleaned)
+def _phrase_tokens(text: str) -> List[str]:
+    """规则词条按 normalize_name 相同的方式分词"""
+    return _TOKEN_PATTERN.findall(_remove_brackets(text).translate(_BASIC_CLEAN_TABLE).lower())
 
-    # 移除引号类字符
-    cleaned = cleaned.replace('"', '').replace("'", '').replace('`', '')
 
-    # 将特殊符号替换为空格(保留分词边界)
-    for char in '.,-_/&+*#@|~–—\\':
-        cleaned = cleaned.replace(char, ' ')
+# 当前生效的规则集 (整体替换,读取方只取一次引用)
+_rules: _RuleSet = None
+_rules_lock = threading.Lock()
+_next_rules_check = 0.0
+_reload_listeners: List[Callable[[], None]] = []
 
-    # 合并多个空格为一个
-    cleaned = re.sub(r'\s+', ' ', cleaned)
 
-    return cleaned.strip()
+# ==================== 辅助函数 ====================
 
+def _remove_brackets(name: str) -> str:
+    """移除各种括号及括号内的内容 (没有括号时直接返回)"""
+    if _BRACKET_CHARS.isdisjoint(name):
+        return name
+    for pattern in _BRACKET_PATTERNS:
+        name = pattern.sub('', name)
+    return name
 
-def _tokenize(name: str) -> List[str]:
-    """
-        将名称分词
 
-        Args:
-            name: 球队名称
+def _maybe_reload_rules():
+    """按 RULES_RELOAD_INTERVAL 检查规则文件 mtime"""
+    global _next_rules_check
+    now = time.monotonic()
+    if now < _next_rules_check:
+        return
+    _next_rules_check = now + RULES_RELOAD_INTERVAL
+    if _file_mtime(_RULES_PATH) != _rules.mtime:
+        reload_rules()
 
-        Returns:
-            list: 词列表
-    """
-    # 使用正则提取所有单词(字母、数字、中文)
-    tokens = re.findall(r'[\w\u4e00-\u9fff]+', name.lower())
-    return tokens
 
+# ==================== 公开函数 ====================
 
-def _remove_stopwords(tokens: List[str]) -> List[str]:
+def reload_rules(force: bool = False) -> bool:
     """
-            删除停用词
-
-            Args:
-                tokens: 词列表
+    重新加载 team_name_rules.json
 
-            Returns:
-                list: 过滤后的词列表
-    """
-    # 只删除完全匹配的停用词,且不在保留词列表中
-    filtered = [
-        token for token in tokens
-        if token not in _STOPWORDS or token in _PRESERVE_WORDS
-    ]
-    return filtered
+    新规则编译完成后整体替换当前规则,并清空 normalize_name 缓存、通知监听者
+    (如 fuzzy_match 的比赛索引缓存); 文件读取或解析失败时保留当前规则
 
+    Args:
+        force: 文件 mtime 未变化时也重新加载
 
-def _replace_synonyms(tokens: List[str]) -> List[str]:
+    Returns:
+        bool: 是否替换了规则
     """
-        同义词替换
-
-        Args:
-            tokens: 词列表
+    global _rules
+    with _rules_lock:
+        mtime = _file_mtime(_RULES_PATH)
+        if not force and mtime == _rules.mtime:
+            return False
+        try:
+            new_rules = _RuleSet(_load_rules(_RULES_PATH), mtime)
+        except (OSError, json.JSONDecodeError, AttributeError) as e:
+            print(f"⚠️ 重新加载规则文件失败: {e}, 继续使用当前规则")
+            # 记录 mtime,文件再次变化前不重复尝试
+            _rules.mtime = mtime
+            return False
+
+        _rules = new_rules
+        clear_normalize_cache()
+
+    for listener in list(_reload_listeners):
+        listener()
+    print(f"✅ 队名规则已重新加载: 停用词 {len(new_rules.stopwords)} 个, "
+          f"同义词 {len(new_rules.synonyms)} 个, 短语 {_count_phrases(new_rules.phrases)} 个")
+    return True
+
+
+def add_rules_reload_listener(callback: Callable[[], None]) -> None:
+    """注册规则替换后的回调 (用于清空依赖标准化结果的缓存)"""
+    if callback not in _reload_listeners:
+        _reload_listeners.append(callback)
+
+
+def get_rules_version() -> str:
+    """
+    当前规则版本 (规则内容和标准化算法的指纹)
 
-        Returns:
-            list: 替换后的词列表
+    保存标准化队名的数据 (如 team_alias 的别名表) 记录该版本,版本变化后视为过期
     """
-    # 只替换完全匹配的词
-    replaced = [_SYNONYMS.get(token, token) for token in tokens]
-    return replaced
+    _maybe_reload_rules()
+    return _rules.version
 
 
-# ==================== 公开函数 ====================
+def _count_phrases(node: Dict) -> int:
+    return sum(
+        1 if key == _PHRASE_END else _count_phrases(child)
+        for key, child in node.items()
+    )
+
 
 def normalize_name(name: str) -> str:
     """
@@ -138,6 +297,10 @@ def normalize_name(name: str) -> str:
         5. 重组
         6. 执行clear_name最终清理
 
+        第 3、4 步同时处理多词短语 (如 "basketball club"),短语把队名删空或只剩一个词时
+        回退到单词规则; 规则文件变化后自动重新加载
+        结果按原始名称缓存 (LRU, 上限 NORMALIZE_CACHE_SIZE)
+
         Args:
             name: 原始球队名称
 
@@ -156,27 +319,47 @@ def normalize_name(name: str) -> str:
 
             >>> normalize_name("Man Utd")
             'manunited'
+
+            >>> normalize_name("Sporting Club")
+            'sporting'
+
+            >>> normalize_name("Sporting Club Portugal")
+            'sportingportugal'
     """
     if not name:
         return ''
+    _maybe_reload_rules()
+    return _normalize_cached(name, _rules)
 
-    # 1. 基础清理
-    cleaned = _basic_clean(name)
 
-    # 2. 分词
-    tokens = _tokenize(cleaned)
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_cached(name: str, rules: _RuleSet) -> str:
+    """
+        normalize_name 的单趟实现
+
+        rules 作为缓存 key 的一部分: 规则替换期间写入的旧结果不会被新规则命中
 
-    # 3. 删除停用词
-    tokens = _remove_stopwords(tokens)
+        分词结果只包含 \\w / 中文字符,clear_name 的括号和特殊字符处理
+        对它不再产生作用,第 5、6 步等价于直接拼接
+    """
+    # 1. 基础清理: 括号 + 引号/特殊符号 (分词只取单词字符,无需合并空格)
+    cleaned = _remove_brackets(name).translate(_BASIC_CLEAN_TABLE)
 
-    # 4. 同义词替换
-    tokens = _replace_synonyms(tokens)
+    # 2~4. 分词 + 删除停用词 + 同义词替换 (含多词短语)
+    tokens = rules.apply(_TOKEN_PATTERN.findall(cleaned.lower()))
 
-    # 5. 重组(用空格连接)
-    normalized = ' '.join(tokens)
+    # 5~6. 重组并移除空格
+    return ''.join(tokens)
 
-    # 6. 执行clear_name最终清理
-    return clear_name(normalized)
+
+def clear_normalize_cache() -> None:
+    """清空 normalize_name 的结果缓存 (规则变化后调用)"""
+    _normalize_cached.cache_clear()
+
+
+def normalize_cache_info():
+    """normalize_name 缓存命中统计 (functools 的 CacheInfo)"""
+    return _normalize_cached.cache_info()
 
 
 def clear_name(name: str) -> str:
@@ -194,22 +377,11 @@ def clear_name(name: str) -> str:
         return ''
 
     # 移除各种括号及括号内的内容
-    league_name = re.sub(r'\([^)]*\)', '', name)
-    league_name = re.sub(r'\[[^\]]*\]', '', league_name)
-    league_name = re.sub(r'\{[^}]*\}', '', league_name)
-    league_name = re.sub(r'<[^>]*>', '', league_name)
+    league_name = _remove_brackets(name)
 
     # 使用translate一次性移除/替换所有特殊字符
     # 将.,替换为空格,其他特殊字符直接删除
-    translation_table = str.maketrans({
-        '"': '', "'": '', '`': '',
-        '.': ' ', ',': ' ',
-        '-': '', '_': '', '\\': '', '/': '',
-        '&': '', '+': '', '*': '', '#': '',
-        '@': '', '|': '', '~': '',
-        '–': '', '—': ''
-    })
-    league_name = league_name.translate(translation_table)
+    league_name = league_name.translate(_CLEAR_NAME_TABLE)
 
     # 移除所有空格并转为小写
     league_name = league_name.replace(' ', '').lower().strip()
@@ -217,6 +389,9 @@ def clear_name(name: str) -> str:
     return league_name
 
 
+_rules = _initial_rules()
+
+
 if __name__ == "__main__":
     # 测试用例
     test_cases = [
@@ -231,7 +406,11 @@ if __name__ == "__main__":
         "Olympique Marseille",
         "Los Angeles Lakers BC",
         "北京国安俱乐部",
-        "Primera A, Clausura"
+        "Primera A, Clausura",
+        "Sporting Club",
+        "Football Club",
+        "Basketball Club B.C Basketball Club",
+        "Sporting Club Portugal"
     ]
 
     print("=" * 60)
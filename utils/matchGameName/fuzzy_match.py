@@ -2,9 +2,12 @@
 """
 球队名称模糊匹配工具
 """
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from collections import Counter, OrderedDict, defaultdict
+import heapq
 import logging
-from .clearName import normalize_name
+from .clearName import normalize_name, get_rules_version, add_rules_reload_listener
+from .team_alias import get_alias_store
 
 logger = logging.getLogger(__name__)
 
@@ -46,30 +49,218 @@ def calculate_team_similarity(team1: str, team2: str) -> float:
         return SequenceMatcher(None, team1, team2).ratio()
 
 
+def calculate_pair_confidence(
+    spider_home: str,
+    spider_away: str,
+    platform_home: str,
+    platform_away: str
+) -> float:
+    """
+    整对队名的完整相似度 (主客队完整字符串相似度的平均值),作为别名的置信度
+
+    partial_ratio 只要短队名是长队名的子串就给满分 ("realmadrid" 与 "realmadridu19"),
+    不能作为 "两个队名指同一支球队" 的依据; 这里使用完整字符串比较
+
+    Args:
+        spider_home / spider_away: 外部平台标准化队名
+        platform_home / platform_away: 平台标准化队名
+
+    Returns:
+        float: 0-1
+    """
+    def ratio(a: str, b: str) -> float:
+        if USE_FUZZYWUZZY:
+            return fuzz.ratio(a, b) / 100.0
+        return SequenceMatcher(None, a, b).ratio()
+
+    return (ratio(spider_home, platform_home) + ratio(spider_away, platform_away)) / 2
+
+
+# ==================== 候选剪枝索引 ====================
+
+NGRAM_SIZE = 3            # 字符 n-gram 长度
+CANDIDATE_TOP_K = 20      # 先对 n-gram 包含度最高的前 K 场比赛计算相似度,其余比赛按上界剪枝
+_INDEX_CACHE_SIZE = 8     # 缓存的比赛列表版本数
+_BOUND_EPSILON = 1e-9     # 上界比较的浮点容差
+
+
+def _ngrams(name: str) -> set:
+    """标准化队名的字符 n-gram 集合"""
+    return {name[i:i + NGRAM_SIZE] for i in range(len(name) - NGRAM_SIZE + 1)}
+
+
+def _similarity_upper_bound(query_chars: Counter, query_len: int, name_chars: Counter, name_len: int) -> float:
+    """
+    calculate_team_similarity 的上界 (只用字符计数,不做序列比对)
+
+    两个串的公共子序列长度 M 不超过字符多重集的交集大小 C:
+    - SequenceMatcher.ratio = 2M / (|a| + |b|) <= 2C / (|a| + |b|)
+    - partial_ratio 取短串 s 与长串窗口 w 的 ratio = 2M / (|s| + |w|),
+      M <= min(C, |w|) 时不超过 2C / (|s| + C); 结果取整到百分位,再加 0.005
+    """
+    if not query_len or not name_len:
+        return 1.0 if query_len == name_len else 0.0
+
+    common = sum((query_chars & name_chars).values())
+    if USE_FUZZYWUZZY:
+        shorter = min(query_len, name_len)
+        return min(1.0, 2 * common / (shorter + common) + 0.005) if common else 0.0
+    return 2 * common / (query_len + name_len)
+
+
+class TeamMatchIndex:
+    """
+    比赛列表的队名匹配索引 (每个比赛列表版本构建一次)
+
+    - 预先标准化所有主客队名
+    - 精确匹配: 标准化队名 → 列表中第一次出现的位置
+    - 模糊匹配: 主队 / 客队的字符 n-gram 倒排索引,用于挑选候选比赛
+
+    候选按主客队 n-gram 包含度之和排序: 共同 n-gram 数 / 两者中较少的 n-gram 数,
+    与 partial_ratio 一样,短队名被长队名完整包含时得分最高
+
+    候选只决定计算顺序;其余比赛用字符计数上界 (upper_bound) 判断能否超过当前最高分,
+    不能超过的才跳过,结果与逐场扫描一致
+    """
+
+    def __init__(self, events: List[Dict]):
+        self.events = events
+        self.homes = [normalize_name(event.get('home', '')) for event in events]
+        self.aways = [normalize_name(event.get('away', '')) for event in events]
+
+        self._exact_home: Dict[str, int] = {}
+        self._exact_away: Dict[str, int] = {}
+        self._home_grams: Dict[str, List[int]] = defaultdict(list)
+        self._away_grams: Dict[str, List[int]] = defaultdict(list)
+        self._home_gram_counts: List[int] = []
+        self._away_gram_counts: List[int] = []
+        self._home_chars = [Counter(home) for home in self.homes]
+        self._away_chars = [Counter(away) for away in self.aways]
+
+        for i, (home, away) in enumerate(zip(self.homes, self.aways)):
+            self._exact_home.setdefault(home, i)
+            self._exact_away.setdefault(away, i)
+
+            home_grams = _ngrams(home)
+            away_grams = _ngrams(away)
+            self._home_gram_counts.append(len(home_grams))
+            self._away_gram_counts.append(len(away_grams))
+            for gram in home_grams:
+                self._home_grams[gram].append(i)
+            for gram in away_grams:
+                self._away_grams[gram].append(i)
+
+    def find_exact(self, home: str, away: str) -> Optional[int]:
+        """
+        精确匹配 (主队或客队任一相同),返回列表中第一场匹配的比赛位置
+        """
+        hits = [i for i in (self._exact_home.get(home), self._exact_away.get(away)) if i is not None]
+        return min(hits) if hits else None
+
+    def candidates(self, home: str, away: str, top_k: Optional[int] = None) -> Optional[List[int]]:
+        """
+        按 n-gram 包含度挑选候选比赛
+
+        Returns:
+            前 top_k 个候选的位置 (按列表原顺序);
+            无法可靠剪枝时返回 None,调用方逐场计算 (比赛数不超过 top_k /
+            队名短于 n-gram / 与所有比赛都没有共同 n-gram)
+        """
+        top_k = top_k or CANDIDATE_TOP_K
+        if len(self.events) <= top_k or len(home) < NGRAM_SIZE or len(away) < NGRAM_SIZE:
+            return None
+
+        home_grams = _ngrams(home)
+        away_grams = _ngrams(away)
+        home_overlap = Counter()
+        away_overlap = Counter()
+        for gram in home_grams:
+            home_overlap.update(self._home_grams.get(gram, ()))
+        for gram in away_grams:
+            away_overlap.update(self._away_grams.get(gram, ()))
+
+        if not home_overlap and not away_overlap:
+            return None
+
+        home_size = len(home_grams)
+        away_size = len(away_grams)
+        scores = {}
+        for i, shared in home_overlap.items():
+            scores[i] = shared / min(home_size, self._home_gram_counts[i])
+        for i, shared in away_overlap.items():
+            scores[i] = scores.get(i, 0.0) + shared / min(away_size, self._away_gram_counts[i])
+
+        top = heapq.nlargest(top_k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return sorted(i for i, _ in top)
+
+    def upper_bound(self, i: int, home: str, away: str, home_chars: Counter, away_chars: Counter) -> float:
+        """第 i 场比赛总分 ((主队分 + 客队分) / 2) 的上界"""
+        home_bound = _similarity_upper_bound(home_chars, len(home), self._home_chars[i], len(self.homes[i]))
+        away_bound = _similarity_upper_bound(away_chars, len(away), self._away_chars[i], len(self.aways[i]))
+        return (home_bound + away_bound) / 2
+
+
+_index_cache: "OrderedDict[Tuple, TeamMatchIndex]" = OrderedDict()
+
+# 索引中保存的是标准化队名,规则重新加载后全部失效
+add_rules_reload_listener(_index_cache.clear)
+
+
+def get_match_index(events: List[Dict]) -> TeamMatchIndex:
+    """
+    获取比赛列表的匹配索引 (比赛列表未变化时复用)
+
+    比赛列表版本由队名规则版本和 (event_key, home, away) 序列确定
+    (规则刚变化、重新加载监听尚未触发时也不会命中旧规则构建的索引)
+    """
+    version = (get_rules_version(),) + tuple(
+        (event.get('event_key'), event.get('home'), event.get('away')) for event in events
+    )
+
+    index = _index_cache.get(version)
+    if index is not None:
+        _index_cache.move_to_end(version)
+        return index
+
+    index = TeamMatchIndex(events)
+    _index_cache[version] = index
+    if len(_index_cache) > _INDEX_CACHE_SIZE:
+        _index_cache.popitem(last=False)
+    return index
+
+
 def fuzzy_match_teams(
     spider_home: str,
     spider_away: str,
     events: List[Dict],
-    threshold: float = 0.7  # 降低阈值到 0.7（从 0.8）
+    threshold: float = 0.7,  # 降低阈值到 0.7（从 0.8）
+    prune: bool = True,
+    platform: Optional[str] = None
 ) -> Optional[Dict]:
     """
     对队名进行模糊匹配
 
     策略:
     1. 先尝试精确匹配 (主队或客队任一匹配即可)
-    2. 如果精确匹配失败,使用 FuzzyWuzzy 相似度匹配
+    2. 指定 platform 时查别名表 (见 team_alias.py),已学习过的队名直接命中
+    3. 如果以上都失败,使用 FuzzyWuzzy 相似度匹配
+       (先计算 n-gram 索引挑出的前 CANDIDATE_TOP_K 个候选,其余比赛只在相似度上界
+       可能超过当前最高分时计算,结果与逐场计算一致),
+       主客队单边分数都达到阈值时,按整对队名的完整相似度把对应关系记入别名表
 
     Args:
         spider_home: 外部平台主队名
         spider_away: 外部平台客队名
         events: betinasian 比赛列表
         threshold: 相似度阈值 (默认 0.7，使用 FuzzyWuzzy 时推荐 0.7)
+        prune: 是否使用候选剪枝 (False 时逐场计算相似度; 两种方式结果相同)
+        platform: 平台名 (如 'betinasian'), 为 None 时不使用别名表
 
     Returns:
         {
             'success': bool,
             'event_key': str,
-            'match_type': 'exact' | 'fuzzy',
+            'match_type': 'exact' | 'alias' | 'fuzzy',
             'score': float,
             'matched_event': dict
         }
@@ -92,55 +283,156 @@ def fuzzy_match_teams(
     # logger.info(f"标准化后: {normalized_spider_home} vs {normalized_spider_away}")
     # logger.info(f"使用算法: {'FuzzyWuzzy partial_ratio' if USE_FUZZYWUZZY else 'difflib.SequenceMatcher'}")
 
+    return _match_in_index(
+        get_match_index(events),
+        normalized_spider_home,
+        normalized_spider_away,
+        threshold,
+        prune,
+        platform
+    )
+
+
+def fuzzy_match_teams_batch(
+    pairs: List[Tuple[str, str]],
+    events: List[Dict],
+    threshold: float = 0.7,
+    prune: bool = True,
+    platform: Optional[str] = None
+) -> List[Optional[Dict]]:
+    """
+    批量匹配: 多组外部队名对同一个比赛列表匹配
+
+    共享同一个匹配索引和队名标准化缓存,相同的队名组合只匹配一次
+
+    Args:
+        pairs: [(spider_home, spider_away), ...]
+        events: betinasian 比赛列表
+        threshold: 相似度阈值
+        prune: 是否使用候选剪枝
+        platform: 平台名, 为 None 时不使用别名表
+
+    Returns:
+        与 pairs 一一对应的匹配结果 (结构同 fuzzy_match_teams, 未匹配为 None)
+
+    Examples:
+        >>> results = fuzzy_match_teams_batch([("Lakers", "Warriors"), ("Manresa", "Breogan")], events)
+        >>> [r['event_key'] if r else None for r in results]
+        ['2026-01-04,31629,36428', None]
+    """
+    index = get_match_index(events)
+    matched: Dict[Tuple[str, str], Optional[Dict]] = {}
+    results = []
+
+    for spider_home, spider_away in pairs:
+        key = (normalize_name(spider_home), normalize_name(spider_away))
+        if key not in matched:
+            matched[key] = _match_in_index(index, key[0], key[1], threshold, prune, platform)
+        results.append(matched[key])
+
+    return results
+
+
+def _match_in_index(
+    index: TeamMatchIndex,
+    normalized_spider_home: str,
+    normalized_spider_away: str,
+    threshold: float,
+    prune: bool,
+    platform: Optional[str] = None
+) -> Optional[Dict]:
+    """fuzzy_match_teams 的匹配过程 (队名已标准化)"""
+    events = index.events
+
     # 第一轮: 精确匹配 (OR 逻辑 - 主队或客队任一匹配即可)
-    for event in events:
-        betinasian_home = normalize_name(event.get('home', ''))
-        betinasian_away = normalize_name(event.get('away', ''))
-
-        if normalized_spider_home == betinasian_home or \
-           normalized_spider_away == betinasian_away:
-            logger.info(f"✅ 精确匹配: {event.get('home')} vs {event.get('away')} (score=1.0)")
-            return {
-                'success': True,
-                'event_key': event.get('event_key'),
-                'match_type': 'exact',
-                'score': 1.0,
-                'matched_event': event
-            }
-
-    # 第二轮: 相似度匹配
+    exact = index.find_exact(normalized_spider_home, normalized_spider_away)
+    if exact is not None:
+        event = events[exact]
+        logger.info(f"✅ 精确匹配: {event.get('home')} vs {event.get('away')} (score=1.0)")
+        return {
+            'success': True,
+            'event_key': event.get('event_key'),
+            'match_type': 'exact',
+            'score': 1.0,
+            'matched_event': event
+        }
+
+    # 第二轮: 别名匹配
+    if platform is not None:
+        alias_match = _match_alias(index, normalized_spider_home, normalized_spider_away, platform)
+        if alias_match is not None:
+            return alias_match
+
+    # 第三轮: 相似度匹配
     # logger.info("精确匹配失败,开始相似度匹配...")
     best_score = 0
     best_match = None
     best_home_score = 0
     best_away_score = 0
 
-    for event in events:
-        betinasian_home = normalize_name(event.get('home', ''))
-        betinasian_away = normalize_name(event.get('away', ''))
+    candidates = index.candidates(normalized_spider_home, normalized_spider_away) if prune else None
+    if candidates is None:
+        passes = [range(len(events))]
+    else:
+        # 先算候选得到较高的当前最高分,其余比赛按上界剪枝
+        passes = [candidates, None]
+        home_chars = Counter(normalized_spider_home)
+        away_chars = Counter(normalized_spider_away)
+
+    best_index = None
+    for indices in passes:
+        bounded = indices is None
+        if bounded:
+            scanned = set(candidates)
+            indices = [i for i in range(len(events)) if i not in scanned]
+
+        for i in indices:
+            if bounded:
+                # 上界低于最高分,或不高于最高分且排在其后 (同分取靠前的比赛),不可能改变结果
+                bound = index.upper_bound(i, normalized_spider_home, normalized_spider_away,
+                                          home_chars, away_chars) + _BOUND_EPSILON
+                if bound < best_score or (best_index is not None and i > best_index and bound <= best_score):
+                    continue
+
+            event = events[i]
+            betinasian_home = index.homes[i]
+            betinasian_away = index.aways[i]
 
-        # 计算主队和客队的相似度
-        home_score = calculate_team_similarity(normalized_spider_home, betinasian_home)
-        away_score = calculate_team_similarity(normalized_spider_away, betinasian_away)
+            # 计算主队和客队的相似度
+            home_score = calculate_team_similarity(normalized_spider_home, betinasian_home)
+            away_score = calculate_team_similarity(normalized_spider_away, betinasian_away)
 
-        # 总分 = 平均值
-        total_score = (home_score + away_score) / 2
+            # 总分 = 平均值
+            total_score = (home_score + away_score) / 2
 
-        logger.debug(f"  比较 {event.get('home')} vs {event.get('away')}: "
-                    f"home_score={home_score:.3f}, away_score={away_score:.3f}, "
-                    f"total={total_score:.3f}")
+            logger.debug(f"  比较 {event.get('home')} vs {event.get('away')}: "
+                        f"home_score={home_score:.3f}, away_score={away_score:.3f}, "
+                        f"total={total_score:.3f}")
 
-        if total_score > best_score:
-            best_score = total_score
-            best_match = event
-            best_home_score = home_score
-            best_away_score = away_score
+            # 同分时取列表中靠前的比赛 (与逐场扫描一致)
+            if total_score > best_score or \
+               (total_score == best_score and best_index is not None and i < best_index):
+                best_score = total_score
+                best_index = i
+                best_match = event
+                best_home_score = home_score
+                best_away_score = away_score
 
     # 检查是否超过阈值
     if best_score >= threshold:
         logger.info(f"✅ 模糊匹配成功: {best_match.get('home')} vs {best_match.get('away')}")
         logger.info(f"   分数详情: home={best_home_score:.3f}, away={best_away_score:.3f}, "
                    f"total={best_score:.3f}, threshold={threshold}")
+        if platform is not None and best_home_score >= threshold and best_away_score >= threshold:
+            # 只从两边都匹配的比赛学习; 置信度用整对队名的完整相似度,不用单边 partial_ratio
+            platform_pair = (index.homes[best_index], index.aways[best_index])
+            get_alias_store().learn_pair(
+                platform,
+                (normalized_spider_home, normalized_spider_away),
+                (best_match.get('home', ''), best_match.get('away', '')),
+                platform_pair,
+                calculate_pair_confidence(normalized_spider_home, normalized_spider_away, *platform_pair)
+            )
         return {
             'success': True,
             'event_key': best_match.get('event_key'),
@@ -154,3 +446,40 @@ def fuzzy_match_teams(
         #     logger.warning(f"   最接近的比赛: {best_match.get('home')} vs {best_match.get('away')}")
         #     logger.warning(f"   分数详情: home={best_home_score:.3f}, away={best_away_score:.3f}")
         return None
+
+
+def _match_alias(
+    index: TeamMatchIndex,
+    normalized_spider_home: str,
+    normalized_spider_away: str,
+    platform: str
+) -> Optional[Dict]:
+    """
+    通过别名表匹配: 主客队分别查别名后按平台队名精确查找
+
+    主客队两边的别名都必须命中且指向同一场比赛; 只有一边命中时交给相似度匹配
+    (单边别名会把 "Real Madrid vs Getafe" 匹配到 "Real Madrid U19 vs Barcelona U19")
+    """
+    store = get_alias_store()
+    alias_home = store.lookup(platform, normalized_spider_home)
+    alias_away = store.lookup(platform, normalized_spider_away)
+    if alias_home is None or alias_away is None:
+        return None
+
+    home_index = index._exact_home.get(alias_home)
+    away_index = index._exact_away.get(alias_away)
+    if home_index is None or home_index != away_index:
+        return None
+
+    store.confirm(platform, normalized_spider_home)
+    store.confirm(platform, normalized_spider_away)
+
+    event = index.events[home_index]
+    logger.info(f"✅ 别名匹配: {event.get('home')} vs {event.get('away')} (score=1.0)")
+    return {
+        'success': True,
+        'event_key': event.get('event_key'),
+        'match_type': 'alias',
+        'score': 1.0,
+        'matched_event': event
+    }
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+球队别名表 (spider 队名 → 平台队名)
+
+每次模糊匹配成功后记录 spider 队名与平台队名的对应关系,
+持久化到 configs/team_aliases.json (与 team_name_rules.json 放在一起),启动时加载:
+下次遇到相同的 spider 队名时先查别名表 (字典查找),查不到才做模糊匹配
+
+别名按平台分开存储,键为各平台匹配时使用的标准化队名:
+    {
+        "betinasian": {
+            "manresa": {
+                "name": "Baxi Manresa",          # 平台原始队名
+                "normalized": "baximanresa",     # 平台标准化队名
+                "confidence": 0.92,              # 学习时的匹配分数 (取历史最高)
+                "hits": 3,                       # 学习 / 命中次数
+                "last_seen": 1767225600.0,
+                "rules_version": "3f2a9c0d1e4b"  # 学习时的队名规则版本
+            }
+        }
+    }
+
+别名只从整场比赛 (主客队两边都匹配) 的结果中学习,confidence 为整对队名的完整相似度,
+查找时也要求主客队两边的别名都指向同一场比赛
+
+键和 normalized 都依赖当时的标准化规则: 规则版本不同的记录不参与查找,
+规则重新加载和启动加载时丢弃
+"""
+from typing import Any, Dict, Optional, Tuple
+import atexit
+import json
+import logging
+import os
+import time
+
+from .clearName import get_rules_version, add_rules_reload_listener
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_ALIAS_PATH = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'configs', 'team_aliases.json'
+))
+
+ALIAS_MIN_CONFIDENCE = 0.8           # 低于该分数的别名不参与查找
+ALIAS_MAX_AGE = 30 * 24 * 3600       # 超过 30 天未出现的别名在加载时丢弃
+ALIAS_SAVE_INTERVAL = 10.0           # 两次写文件的最小间隔(秒)
+
+
+class TeamAliasStore:
+    """
+    持久化的球队别名表
+
+    Example:
+        >>> store = get_alias_store()
+        >>> store.learn_pair('betinasian', ('manresa', 'breogan'), ('Baxi Manresa', 'Rio Breogan'),
+        ...                  ('baximanresa', 'riobreogan'), confidence=0.92)
+        >>> store.lookup('betinasian', 'manresa')
+        'baximanresa'
+    """
+
+    def __init__(self, path: str = _DEFAULT_ALIAS_PATH, min_confidence: float = ALIAS_MIN_CONFIDENCE):
+        self.path = path
+        self.min_confidence = min_confidence
+        self._aliases: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._dirty = False
+        self._last_save = 0.0
+        self.stats = {'hits': 0, 'misses': 0, 'learned': 0}
+        self.load()
+
+    # ==================== 查找 / 学习 ====================
+
+    def lookup(self, platform: str, spider_normalized: str) -> Optional[str]:
+        """
+        查找 spider 队名对应的平台标准化队名
+
+        Returns:
+            平台标准化队名; 没有记录或置信度不足时返回 None
+        """
+        entry = self._aliases.get(platform, {}).get(spider_normalized)
+        if entry is None or entry['confidence'] < self.min_confidence \
+                or entry.get('rules_version') != get_rules_version():
+            self.stats['misses'] += 1
+            return None
+
+        self.stats['hits'] += 1
+        return entry['normalized']
+
+    def get(self, platform: str, spider_normalized: str) -> Optional[Dict[str, Any]]:
+        """获取完整的别名记录"""
+        return self._aliases.get(platform, {}).get(spider_normalized)
+
+    def confirm(self, platform: str, spider_normalized: str):
+        """别名命中并成功匹配后调用,更新 hits / last_seen"""
+        entry = self._aliases.get(platform, {}).get(spider_normalized)
+        if entry is None:
+            return
+        entry['hits'] += 1
+        entry['last_seen'] = time.time()
+        self._dirty = True
+        self._maybe_save()
+
+    def learn_pair(
+        self,
+        platform: str,
+        spider_pair: Tuple[str, str],
+        platform_names: Tuple[str, str],
+        platform_pair: Tuple[str, str],
+        confidence: float
+    ):
+        """
+        记录一场已确认的比赛 (主客队两边都匹配) 的队名对应关系
+
+        Args:
+            platform: 平台名
+            spider_pair: (spider 主队, spider 客队) 标准化队名
+            platform_names: (平台主队, 平台客队) 原始队名
+            platform_pair: (平台主队, 平台客队) 标准化队名
+            confidence: 整对队名的匹配分数 (见 fuzzy_match.calculate_pair_confidence),
+                两边使用同一个分数; 不要传入单边 partial_ratio (只相当于子串判断)
+        """
+        for spider_normalized, platform_name, platform_normalized in zip(spider_pair, platform_names, platform_pair):
+            self.learn(platform, spider_normalized, platform_name, platform_normalized, confidence)
+
+    def learn(
+        self,
+        platform: str,
+        spider_normalized: str,
+        platform_name: str,
+        platform_normalized: str,
+        confidence: float
+    ):
+        """
+        记录单个队名的匹配结果 (由 learn_pair 调用)
+
+        spider 队名与平台队名标准化后相同时不需要别名 (精确匹配即可命中);
+        平台队名变化时,只有新的分数不低于旧记录才覆盖
+        """
+        if not spider_normalized or not platform_normalized or spider_normalized == platform_normalized:
+            return
+
+        aliases = self._aliases.setdefault(platform, {})
+        entry = aliases.get(spider_normalized)
+        now = time.time()
+        rules_version = get_rules_version()
+        if entry is not None and entry.get('rules_version') != rules_version:
+            entry = None
+
+        if entry is not None and entry['normalized'] == platform_normalized:
+            entry['confidence'] = max(entry['confidence'], confidence)
+            entry['hits'] += 1
+            entry['last_seen'] = now
+        elif entry is None or confidence >= entry['confidence']:
+            aliases[spider_normalized] = {
+                'name': platform_name,
+                'normalized': platform_normalized,
+                'confidence': confidence,
+                'hits': 1,
+                'last_seen': now,
+                'rules_version': rules_version
+            }
+            self.stats['learned'] += 1
+            logger.info(f"📝 [{platform}] 学习别名: {spider_normalized} → {platform_name} ({confidence:.2f})")
+        else:
+            return
+
+        self._dirty = True
+        self._maybe_save()
+
+    # ==================== 持久化 ====================
+
+    def load(self):
+        """从文件加载别名 (丢弃过期记录和其他规则版本的记录)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"⚠️ 加载别名文件失败: {e}, 使用空别名表")
+            return
+
+        expire_before = time.time() - ALIAS_MAX_AGE
+        rules_version = get_rules_version()
+        self._aliases = {
+            platform: {
+                spider: entry
+                for spider, entry in entries.items()
+                if entry.get('last_seen', 0) >= expire_before and entry.get('rules_version') == rules_version
+            }
+            for platform, entries in data.items()
+            if isinstance(entries, dict)
+        }
+
+    def drop_stale(self):
+        """丢弃与当前规则版本不一致的别名 (规则重新加载后调用)"""
+        rules_version = get_rules_version()
+        dropped = 0
+        for entries in self._aliases.values():
+            stale = [spider for spider, entry in entries.items() if entry.get('rules_version') != rules_version]
+            for spider in stale:
+                del entries[spider]
+            dropped += len(stale)
+
+        if dropped:
+            logger.info(f"🧹 队名规则已变化,丢弃 {dropped} 条别名")
+            self._dirty = True
+            self.save()
+
+    def save(self, force: bool = False):
+        """
+        写入文件 (先写临时文件再替换,避免写到一半的文件)
+
+        Args:
+            force: 忽略写入间隔
+        """
+        if not self._dirty and not force:
+            return
+
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._aliases, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"⚠️ 保存别名文件失败: {e}")
+            return
+
+        self._dirty = False
+        self._last_save = time.time()
+
+    def _maybe_save(self):
+        if time.time() - self._last_save >= ALIAS_SAVE_INTERVAL:
+            self.save()
+
+    def count(self, platform: Optional[str] = None) -> int:
+        if platform is not None:
+            return len(self._aliases.get(platform, {}))
+        return sum(len(entries) for entries in self._aliases.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'aliases': self.count(), 'dirty': self._dirty}
+
+
+_store: Optional[TeamAliasStore] = None
+
+
+def get_alias_store() -> TeamAliasStore:
+    """
+    获取进程内共享的别名表
+
+    首次调用时从文件加载, 进程退出时写入未保存的别名, 队名规则重新加载时丢弃过期别名
+    """
+    global _store
+    if _store is None:
+        _store = TeamAliasStore()
+        atexit.register(_store.save)
+        add_rules_reload_listener(_store.drop_stale)
+    return _store